@@ -27,3 +27,35 @@ class Processing(object):
 
     def time_processing(self):
         self.op.arguments(time_M=98)
+
+
+class Binding(object):
+
+    def setup(self):
+        grid = Grid(shape=(5, 5, 5))
+
+        funcs = [Function(name='f%d' % n, grid=grid) for n in range(30)]
+        tfuncs = [TimeFunction(name='u%d' % n, grid=grid) for n in range(30)]
+        stfuncs = [SparseTimeFunction(name='su%d' % n, grid=grid, npoint=1, nt=100)
+                   for n in range(30)]
+        v = TimeFunction(name='v', grid=grid, space_order=2)
+
+        eq = Eq(v.forward, v.laplace + sum(funcs) + sum(tfuncs) + sum(stfuncs),
+                subdomain=grid.interior)
+
+        self.op = Operator(eq, opt='noop')
+
+        # JIT-compile, allocate data, populate cached properties, etc.
+        self.op.apply(time_M=0)
+        self.handle = self.op.bind(time_M=0)
+
+    def time_apply(self):
+        # Per-timestep sweep, paying for the processing of all arguments each time
+        for i in range(10):
+            self.op.apply(time_m=i, time_M=i)
+
+    def time_bind_update_run(self):
+        # Per-timestep sweep through the pre-bound arguments
+        for i in range(10):
+            self.handle.update(time_m=i, time_M=i)
+            self.handle.run()
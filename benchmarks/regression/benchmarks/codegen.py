@@ -1,3 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from devito import (Grid, Function, TimeFunction, SparseTimeFunction, Eq, Operator,
+                    clear_cache)
+from devito.finite_differences.tools import weights_table
 from examples.seismic.tti.tti_example import tti_setup
 
 
@@ -20,3 +29,85 @@ class TTI(object):
 
     def time_adjoint(self):
         self.solver.op_adj()
+
+
+class ConcurrentBuild(object):
+
+    """
+    Build, i.e. lower and JIT-compile, N independent Operators, either one after
+    the other or on N Python threads.
+    """
+
+    # ASV config
+    repeat = 1
+    timeout = 600.0
+
+    params = [1, 2, 4, 8]
+    param_names = ['nops']
+
+    # Each Operator is made unique, so that it can't be fetched from the JIT cache
+    _counter = count()
+
+    def build(self, i):
+        grid = Grid(shape=(10 + i, 12, 14))
+        u = TimeFunction(name='u', grid=grid, space_order=2*(1 + i % 4))
+        f = Function(name='f', grid=grid)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=1 + i, nt=10)
+        eqns = [Eq(u.forward, u.laplace*f + next(self._counter)),
+                src.inject(u.forward, src)]
+
+        op = Operator(eqns, name='Op%d' % i)
+        op.cfunction
+
+    def time_serial(self, nops):
+        for i in range(nops):
+            self.build(i)
+
+    def time_threaded(self, nops):
+        with ThreadPoolExecutor(max_workers=nops) as tpe:
+            for f in [tpe.submit(self.build, i) for i in range(nops)]:
+                f.result()
+
+
+class DerivativeEvaluation(object):
+
+    """
+    Evaluate high-order derivatives, that is expand them into finite-difference
+    stencils, starting from empty caches, as a new process would do.
+    """
+
+    # ASV config
+    number = 1
+    repeat = 3
+    timeout = 600.0
+
+    params = ['empty', 'on-disk']
+    param_names = ['weights_table']
+
+    space_order = 16
+
+    def setup(self, table):
+        grid = Grid(shape=(10, 10, 10))
+        u = TimeFunction(name='u', grid=grid, space_order=self.space_order)
+        self.derivs = [u.dx, u.dy, u.dz, u.dx2, u.dy2, u.dz2, u.dxdy, u.dx.T,
+                       u.dxl, u.dxr, u.laplace]
+
+        # A private table, so as not to touch the one shared with other processes
+        self.tmpdir = mkdtemp()
+        self.path = weights_table._path
+        weights_table.path = Path(self.tmpdir).joinpath('fd-weights.json')
+        if table == 'on-disk':
+            # Populate the table on disk, as if done by a previous process
+            clear_cache()
+            [i.evaluate for i in self.derivs]
+            weights_table.flush()
+        clear_cache()
+        weights_table._mapper = None
+
+    def teardown(self, table):
+        weights_table.path = self.path
+        rmtree(self.tmpdir, ignore_errors=True)
+
+    def time_evaluate(self, table):
+        for i in self.derivs:
+            i.evaluate
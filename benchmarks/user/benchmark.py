@@ -52,7 +52,7 @@ model_type = {
 }
 
 
-def run_op(solver, operator, **options):
+def run_op(solver, operator, nshots=1, **options):
     """
     Initialize any necessary input and run the operator associated with the solver.
     """
@@ -65,6 +65,12 @@ def run_op(solver, operator, **options):
     # This is a bit ugly but not sure how to make clean input creation for different op
     if operator == "forward":
         return op(**options)
+    elif operator == "forward_batch":
+        # Spread the shots evenly along the first axis, at the source depth
+        src_positions = np.repeat(solver.geometry.src_positions, nshots, axis=0)
+        extent = solver.model.domain_size[0]
+        src_positions[:, 0] = np.linspace(0, extent, nshots + 2)[1:-1]
+        return op(src_positions=src_positions, **options)
     elif operator == "adjoint":
         rec = solver.geometry.adj_src
         return op(rec, **options)
@@ -123,8 +129,10 @@ def option_simulation(f):
         click.option('-t', '--tn', default=250,
                      help='End time of the simulation in ms'),
         click.option('-op', '--operator', default='forward', help='Operator to run',
-                     type=click.Choice(['forward', 'adjoint',
-                                        'jacobian', 'jacobian_adjoint']))]
+                     type=click.Choice(['forward', 'forward_batch', 'adjoint',
+                                        'jacobian', 'jacobian_adjoint'])),
+        click.option('-ns', '--nshots', default=1,
+                     help='Number of shots modelled at once by `forward_batch`')]
     for option in reversed(options):
         f = option(f)
     return f
@@ -247,6 +255,7 @@ def run(problem, **kwargs):
     options['autotune'] = autotune
     block_shapes = as_tuple(kwargs.pop('block_shape'))
     operator = kwargs.pop('operator', 'forward')
+    nshots = kwargs.pop('nshots', 1)
 
     # Should a specific block-shape be used? Useful if one wants to skip
     # the autotuning pass as a good block-shape is already known
@@ -257,7 +266,7 @@ def run(problem, **kwargs):
                 options['%s%d_blk%d_size' % (d, i, n)] = s
 
     solver = setup(space_order=space_order, time_order=time_order, **kwargs)
-    retval = run_op(solver, operator, **options)
+    retval = run_op(solver, operator, nshots=nshots, **options)
 
     try:
         rank = MPI.COMM_WORLD.rank
@@ -308,6 +317,7 @@ def run_jit_backdoor(problem, **kwargs):
     time_order = kwargs.pop('time_order')[0]
     space_order = kwargs.pop('space_order')[0]
     autotune = kwargs.pop('autotune')
+    kwargs.pop('nshots')
 
     info("Preparing simulation...")
     solver = setup(space_order=space_order, time_order=time_order, **kwargs)
@@ -358,6 +368,7 @@ def test(problem, **kwargs):
     """
     run = model_type[problem]['run']
     sweep_options = ('space_order', 'time_order', 'opt', 'autotune')
+    kwargs.pop('nshots')
 
     last_res = None
     for params in sweep(kwargs, keys=sweep_options):
@@ -581,10 +592,11 @@ def get_ob_exec(func):
             clear_cache()
 
             operator = kwargs.pop('operator')
+            nshots = kwargs.pop('nshots')
             dump_format = kwargs.pop('dump_format')
 
             solver = self.func(*args, **kwargs)
-            retval = run_op(solver, operator)
+            retval = run_op(solver, operator, nshots=nshots)
 
             summary = retval[-1]
             assert isinstance(summary, PerformanceSummary)
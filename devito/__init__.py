@@ -4,7 +4,7 @@ from itertools import product
 from devito.parameters import *  # noqa
 
 # DSL imports
-from devito.types import NODE, CELL, Buffer  # noqa
+from devito.types import NODE, CELL, Buffer, Compressed, Disk  # noqa
 from devito.types.caching import _SymbolCache, CacheManager  # noqa
 from devito.types.constant import *  # noqa
 from devito.types.dimension import *  # noqa
@@ -16,7 +16,8 @@ from devito.types.sparse import *  # noqa
 from devito.types.tensor import *  # noqa
 from devito.finite_differences import *  # noqa
 from devito.operations.solve import *
-from devito.operator import Operator  # noqa
+from devito.operator import (Operator, CheckpointSchedule, compile_all,  # noqa
+                             lowering_cache, revolve)
 
 # Other stuff exposed to the user
 from devito.builtins import *  # noqa
@@ -83,6 +84,16 @@ configuration.add('jit-backdoor', 0, [0, 1], preprocessor=bool, impacts_jit=Fals
 # optimisations.
 configuration.add('safe-math', 0, [0, 1], preprocessor=bool, callback=reinit_compiler)
 
+# The JIT cache: the directory, possibly on a shared filesystem, in which the
+# jit-compiled shared objects are stored (defaults to a temporary directory),
+# and its maximum size in bytes (0 for unbounded)
+configuration.add('jit-cache-dir', None, impacts_jit=False)
+configuration.add('jit-cache-maxsize', 0, preprocessor=int, impacts_jit=False)
+
+# The maximum number of bytes of released Data memory that may be retained for
+# reuse by later allocations (0 to disable memory pooling)
+configuration.add('alloc-pool-maxsize', 0, preprocessor=int, impacts_jit=False)
+
 # Enable/disable automatic padding for allocated data
 configuration.add('autopadding', False, [False, True])
 
@@ -104,6 +115,18 @@ accepted = levels + [list(i) for i in product(levels, modes)]
 configuration.add('autotuning', 'off', accepted, callback=autotune_callback,
                   impacts_jit=False)
 
+# The autotuning search strategy: either try all candidates, or rely on a cache
+# model to prune the candidates and explore the rest through coordinate descent
+configuration.add('autotuning-search', 'exhaustive', ['exhaustive', 'model'],
+                  impacts_jit=False)
+
+# The file storing the autotuning results across sessions (if unset, autotuning
+# is performed from scratch in every session), and whether the stored results
+# should be re-validated against the performance actually achieved
+configuration.add('autotuning-db', None, impacts_jit=False)
+configuration.add('autotuning-db-revalidate', 0, [0, 1], preprocessor=bool,
+                  impacts_jit=False)
+
 # In develop-mode:
 # - Some optimizations may not be applied to the generated code.
 # - The compiler performs more type and value checking
@@ -116,6 +139,19 @@ configuration.add('opt-options', {}, deprecate='dle-options')
 # Setup Operator profiling
 configuration.add('profiling', 'basic', list(profiler_registry), impacts_jit=False)
 
+# Where the timeline of the Sections executed with the `trace` profiling level
+# gets written, at exit or upon `timeline.dump()`
+configuration.add('profiling-trace', 'devito-trace.json', impacts_jit=False)
+
+# Should Devito reuse the Operators lowered in previous sessions, thus skipping
+# the whole build pipeline (symbolic processing, optimization passes, ...) upon
+# a hit in the on-disk lowering-cache?
+configuration.add('lowering-cache', 0, [0, 1], preprocessor=bool, impacts_jit=False)
+
+# Should the finite-difference weights computed in previous sessions be reused,
+# and those computed in this session be stored for future ones?
+configuration.add('fd-weights-cache', 1, [0, 1], preprocessor=bool, impacts_jit=False)
+
 # Initialize `configuration`
 init_configuration()
 
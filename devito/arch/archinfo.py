@@ -1,6 +1,8 @@
 """Collection of utilities to detect properties of the underlying architecture."""
 
+from glob import glob
 from subprocess import PIPE, Popen, DEVNULL
+import os
 
 from cached_property import cached_property
 import cpuinfo
@@ -11,7 +13,7 @@ import re
 from devito.logger import warning
 from devito.tools import all_equal, memoized_func
 
-__all__ = ['platform_registry', 'get_cpu_info', 'get_gpu_info',
+__all__ = ['platform_registry', 'get_cpu_info', 'get_gpu_info', 'get_cache_sizes',
            'Platform', 'Cpu64', 'Intel64', 'Amd', 'Arm', 'Power', 'Device',
            'NvidiaDevice', 'AmdDevice',
            'INTEL64', 'SNB', 'IVB', 'HSW', 'BDW', 'SKX', 'KNL', 'KNL7210',  # Intel
@@ -302,6 +304,51 @@ def get_gpu_info():
     return None
 
 
+@memoized_func
+def get_cache_sizes():
+    """
+    Attempt autodetection of the data caches available to a core, as a mapper
+    from cache level to cache size in bytes.
+    """
+    ret = {}
+
+    # On Linux, the caches of each CPU are described in sysfs
+    for path in sorted(glob('/sys/devices/system/cpu/cpu0/cache/index*')):
+        try:
+            with open(os.path.join(path, 'type'), 'r') as f:
+                if f.read().strip() == 'Instruction':
+                    continue
+            with open(os.path.join(path, 'level'), 'r') as f:
+                level = int(f.read())
+            with open(os.path.join(path, 'size'), 'r') as f:
+                size = parse_size(f.read())
+        except (OSError, ValueError):
+            continue
+        if size:
+            ret[level] = size
+
+    # Fallback: `lscpu`
+    if not ret:
+        for level, k in [(1, 'L1d cache'), (2, 'L2 cache'), (3, 'L3 cache')]:
+            size = parse_size(str(lscpu().get(k, '')))
+            if size:
+                ret[level] = size
+
+    return ret
+
+
+def parse_size(text):
+    """
+    Convert a string such as '48K', '2048 KiB' or '2 MiB (1 instance)' into a
+    number of bytes. Return None if the conversion isn't possible.
+    """
+    match = re.match(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)', text)
+    if match is None:
+        return None
+    value, unit = match.groups()
+    return int(float(value) * {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30}[unit])
+
+
 @memoized_func
 def lscpu():
     try:
@@ -378,6 +425,7 @@ class Platform(object):
         self.cores_logical = kwargs.get('cores_logical', cpu_info['logical'])
         self.cores_physical = kwargs.get('cores_physical', cpu_info['physical'])
         self.isa = kwargs.get('isa', self._detect_isa())
+        self.cache_sizes = kwargs.get('cache_sizes', get_cache_sizes())
 
     @classmethod
     def _mro(cls):
@@ -464,6 +512,7 @@ class Device(Platform):
         self.cores_logical = cores_logical
         self.cores_physical = cores_physical
         self.isa = isa
+        self.cache_sizes = {}
 
     @classmethod
     def _mro(cls):
@@ -1,6 +1,8 @@
 from functools import partial
-from hashlib import sha1
+from hashlib import md5, sha1
 from os import environ, path
+from pathlib import Path
+from shutil import rmtree
 from distutils import version
 from subprocess import DEVNULL, PIPE, CalledProcessError, check_output, check_call, run
 import platform
@@ -13,6 +15,7 @@ from codepy.jit import compile_from_string
 from codepy.toolchain import GCCToolchain
 
 from devito.arch import AMDGPUX, NVIDIAX, SKX, POWER8, POWER9
+from devito.arch.jitcache import jit_cache
 from devito.exceptions import CompilationError
 from devito.logger import debug, warning, error
 from devito.parameters import configuration
@@ -192,10 +195,9 @@ class Compiler(GCCToolchain):
                               mpi=kwargs.pop('mpi', configuration['mpi']),
                               **kwargs)
 
-    @memoized_meth
     def get_jit_dir(self):
-        """A deterministic temporary directory for jit-compiled objects."""
-        return make_tempdir('jitcache')
+        """The directory of the jit-compiled objects, that is the JIT cache."""
+        return jit_cache.path
 
     @memoized_meth
     def get_codepy_dir(self):
@@ -215,8 +217,21 @@ class Compiler(GCCToolchain):
         -------
         obj
             The loaded shared object.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the shared object isn't in the JIT cache, e.g. because it was
+            evicted by another process after being compiled.
         """
-        return npct.load_library(str(self.get_jit_dir().joinpath(soname)), '.')
+        sofile = self.get_jit_dir().joinpath(soname).with_suffix(self.so_ext)
+        # The shared lock prevents other processes from evicting the shared
+        # object while it's being loaded
+        with jit_cache.lock(soname, shared=True):
+            if not sofile.is_file():
+                raise FileNotFoundError("`%s` is not in the JIT cache" % sofile)
+            jit_cache.touch(soname, self.so_ext)
+            return npct.load_library(str(self.get_jit_dir().joinpath(soname)), '.')
 
     def save(self, soname, binary):
         """
@@ -230,14 +245,16 @@ class Compiler(GCCToolchain):
             The binary data.
         """
         sofile = self.get_jit_dir().joinpath(soname).with_suffix(self.so_ext)
-        if sofile.is_file():
-            debug("%s: `%s` was not saved in `%s` as it already exists"
-                  % (self, sofile.name, self.get_jit_dir()))
-        else:
-            with open(str(sofile), 'wb') as f:
-                f.write(binary)
-            debug("%s: `%s` successfully saved in `%s`"
-                  % (self, sofile.name, self.get_jit_dir()))
+        with jit_cache.lock(soname):
+            if sofile.is_file():
+                debug("%s: `%s` was not saved in `%s` as it already exists"
+                      % (self, sofile.name, self.get_jit_dir()))
+            else:
+                with open(str(sofile), 'wb') as f:
+                    f.write(binary)
+                debug("%s: `%s` successfully saved in `%s`"
+                      % (self, sofile.name, self.get_jit_dir()))
+        jit_cache.evict(keep=soname)
 
     def make(self, loc, args):
         """Invoke the ``make`` command from within ``loc`` with arguments ``args``."""
@@ -308,16 +325,41 @@ class Compiler(GCCToolchain):
         # Spinlock in case of MPI
         sleep_delay = 0 if configuration['mpi'] else 1
 
-        # `catch_warnings` suppresses codepy complaining that it's taking
-        # too long to acquire the cache lock. This warning can only appear
-        # in a multiprocess session, typically (but not necessarily) when
-        # many processes are frequently attempting jit-compilation (e.g.,
-        # when running the test suite in parallel)
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore')
-            _, _, _, recompiled = compile_from_string(self, target, code, src_file,
-                                                      cache_dir=cache_dir, debug=debug,
-                                                      sleep_delay=sleep_delay)
+        sofile = Path(target).with_suffix(self.so_ext)
+
+        # Only one process compiles `soname`; all others wait on the lock and
+        # then simply pick up the shared object
+        with jit_cache.lock(soname):
+            if sofile.is_file() and configuration['jit-backdoor'] is False:
+                jit_cache.touch(soname, self.so_ext)
+                recompiled = False
+            else:
+                if configuration['jit-backdoor'] is False:
+                    # The shared object is missing (e.g., evicted, or never
+                    # compiled in this JIT cache), so whatever codepy may have
+                    # cached is stale and would prevent recompilation. NOTE:
+                    # `cache_dir` is shared by all sonames with the same prefix,
+                    # so only this soname's codepy entry, keyed like codepy does
+                    # on the code and the ABI, gets dropped
+                    checksum = md5(code.encode('utf-8'))
+                    checksum.update(str(self.abi_id()).encode('utf-8'))
+                    rmtree(str(cache_dir.joinpath(checksum.hexdigest())),
+                           ignore_errors=True)
+                # `catch_warnings` suppresses codepy complaining that it's taking
+                # too long to acquire the cache lock. This warning can only appear
+                # in a multiprocess session, typically (but not necessarily) when
+                # many processes are frequently attempting jit-compilation (e.g.,
+                # when running the test suite in parallel)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    _, _, _, recompiled = compile_from_string(self, target, code,
+                                                              src_file,
+                                                              cache_dir=cache_dir,
+                                                              debug=debug,
+                                                              sleep_delay=sleep_delay)
+
+        if recompiled:
+            jit_cache.evict(keep=soname)
 
         return recompiled, src_file
 
@@ -0,0 +1,317 @@
+"""
+The cache of JIT-compiled shared objects.
+
+The cache is a directory, possibly on a shared filesystem, whose entries are
+keyed on the Operators' ``_soname``. Each entry consists of the generated
+source file, the shared object, and a lock file. The lock guarantees that,
+across all processes (e.g., MPI ranks, possibly on different nodes), exactly
+one process compiles a given entry, while the others wait and eventually
+load the shared object as soon as it becomes available. The processes loading
+an entry hold the lock in shared mode, so that no other process may evict it
+in the meantime. Evicting an entry also removes its lock file.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from weakref import WeakValueDictionary
+import fcntl
+import os
+import sys
+
+import click
+
+from devito.logger import debug
+from devito.parameters import configuration
+from devito.tools import make_tempdir
+
+__all__ = ['JITCache', 'jit_cache']
+
+
+class JITCache(object):
+
+    """
+    A content-addressed, size-capped, cache of JIT-compiled shared objects.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The cache directory. Defaults to ``configuration['jit-cache-dir']`` if
+        set, otherwise to a deterministic directory within the OS temporary
+        directory.
+    maxsize : int, optional
+        The maximum amount of disk space, in bytes, the cache may use. Once
+        exceeded, the least recently used entries are evicted. Defaults to
+        ``configuration['jit-cache-maxsize']``; 0 means unbounded.
+    """
+
+    _lock_suffix = '.lock'
+
+    def __init__(self, path=None, maxsize=None):
+        self._path = Path(path) if path is not None else None
+        self._maxsize = maxsize
+
+        # POSIX record locks are per-process, so threads need their own locks.
+        # These only live as long as some thread is using them
+        self._thread_locks = WeakValueDictionary()
+        self._thread_locks_guard = Lock()
+
+    @property
+    def path(self):
+        if self._path is not None:
+            path = self._path
+        elif configuration['jit-cache-dir']:
+            path = Path(configuration['jit-cache-dir'])
+        else:
+            return make_tempdir('jitcache')
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @path.setter
+    def path(self, val):
+        self._path = Path(val) if val is not None else None
+
+    @property
+    def maxsize(self):
+        if self._maxsize is not None:
+            return self._maxsize
+        return configuration['jit-cache-maxsize']
+
+    @maxsize.setter
+    def maxsize(self, val):
+        self._maxsize = val
+
+    @property
+    def entries(self):
+        """
+        The cache entries, as a mapper from soname to the files making up the
+        entry, from the least to the most recently used.
+        """
+        entries = OrderedDict()
+        for i in self.path.iterdir():
+            if i.is_file():
+                entries.setdefault(i.stem, []).append(i)
+
+        def last_used(files):
+            return max(_mtime(i) for i in files if i.suffix != self._lock_suffix)
+
+        # Entries that are just a lock file are being compiled, or were left
+        # behind by a crashed process; either way, they're not cache entries
+        entries = [(k, v) for k, v in entries.items()
+                   if any(i.suffix != self._lock_suffix for i in v)]
+        return OrderedDict(sorted(entries, key=lambda i: last_used(i[1])))
+
+    @property
+    def nbytes(self):
+        return sum(_nbytes(v) for v in self.entries.values())
+
+    def stats(self):
+        """Return a summary of the cache occupancy."""
+        entries = self.entries
+        return OrderedDict([
+            ('path', str(self.path)),
+            ('entries', len(entries)),
+            ('nbytes', sum(_nbytes(v) for v in entries.values())),
+            ('maxsize', self.maxsize)
+        ])
+
+    @contextmanager
+    def lock(self, soname, blocking=True, shared=False):
+        """
+        Acquire a cross-process lock on the entry ``soname``. The lock is
+        exclusive, unless ``shared=True``.
+
+        With ``blocking=False``, yield False, rather than waiting, if the
+        lock is held by another process; yield True otherwise.
+        """
+        with self._thread_locks_guard:
+            thread_lock = self._thread_locks.get(soname)
+            if thread_lock is None:
+                thread_lock = self._thread_locks[soname] = Lock()
+        if not thread_lock.acquire(blocking):
+            yield False
+            return
+
+        try:
+            lockfile = self.path.joinpath(soname).with_suffix(self._lock_suffix)
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            while True:
+                # NOTE: a shared record lock requires read access to the lock file
+                f = open(str(lockfile), 'a+')
+                try:
+                    # NOTE: POSIX record locks, unlike `flock`, also work across
+                    # nodes on most shared filesystems (e.g., NFS, Lustre)
+                    fcntl.lockf(f, flags)
+                except OSError:
+                    f.close()
+                    yield False
+                    return
+                # The entry, lock file included, may have been evicted while
+                # waiting, in which case the lock must be taken on a new file
+                try:
+                    if os.fstat(f.fileno()).st_ino == os.stat(str(lockfile)).st_ino:
+                        break
+                except FileNotFoundError:
+                    pass
+                fcntl.lockf(f, fcntl.LOCK_UN)
+                f.close()
+            try:
+                yield True
+            finally:
+                fcntl.lockf(f, fcntl.LOCK_UN)
+                f.close()
+        finally:
+            thread_lock.release()
+
+    def touch(self, soname, suffix):
+        """Mark the entry ``soname`` as most recently used."""
+        try:
+            os.utime(str(self.path.joinpath(soname).with_suffix(suffix)))
+        except OSError:
+            # E.g., read-only, shared cache
+            pass
+
+    def evict(self, keep=None):
+        """
+        Evict the least recently used entries until the cache size drops below
+        ``maxsize``. Entries locked by other processes, that is being compiled or
+        loaded, are never evicted, nor is the entry ``keep``.
+        """
+        maxsize = self.maxsize
+        if not maxsize:
+            return 0
+
+        entries = self.entries
+        nbytes = sum(_nbytes(v) for v in entries.values())
+        nevicted = 0
+        for soname, files in entries.items():
+            if nbytes <= maxsize:
+                break
+            if soname == keep:
+                continue
+            with self.lock(soname, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                size = _nbytes(files)
+                self._remove(soname, files)
+            nbytes -= size
+            nevicted += 1
+            debug("JIT-cache: evicted `%s`" % soname)
+        return nevicted
+
+    def clear(self):
+        """Drop all entries."""
+        for soname, files in self.entries.items():
+            with self.lock(soname):
+                self._remove(soname, files)
+
+    def _remove(self, soname, files):
+        """
+        Remove the entry ``soname``. The caller must hold the exclusive lock,
+        which is why the lock file goes last.
+        """
+        lockfile = self.path.joinpath(soname).with_suffix(self._lock_suffix)
+        for i in [i for i in files if i != lockfile] + [lockfile]:
+            try:
+                i.unlink()
+            except FileNotFoundError:
+                pass
+
+
+jit_cache = JITCache()
+"""The cache used for all JIT-compiled Operators."""
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+
+def _nbytes(files):
+    ret = 0
+    for i in files:
+        try:
+            ret += i.stat().st_size
+        except FileNotFoundError:
+            pass
+    return ret
+
+
+# The `devito-cache` command line interface
+
+@click.group()
+@click.option('--path', default=None, help='The cache directory. Defaults to '
+              'DEVITO_JIT_CACHE_DIR, or to the default temporary directory')
+def main(path):
+    """Inspect, prune and pre-warm the Devito JIT cache."""
+    if path is not None:
+        jit_cache.path = path
+
+
+@main.command()
+def info():
+    """Summarize the cache occupancy."""
+    for k, v in jit_cache.stats().items():
+        click.echo("%s: %s" % (k, v))
+
+
+@main.command(name='list')
+def list_entries():
+    """List the cache entries, from the least to the most recently used."""
+    for soname, files in jit_cache.entries.items():
+        suffixes = ','.join(sorted(i.suffix for i in files))
+        click.echo("%s  %10d  %s" % (soname, _nbytes(files), suffixes))
+
+
+@main.command()
+@click.option('--maxsize', type=int, default=None,
+              help='Prune down to this many bytes. Defaults to DEVITO_JIT_CACHE_MAXSIZE')
+@click.option('--all', 'everything', is_flag=True, help='Drop all entries')
+def prune(maxsize, everything):
+    """Evict the least recently used entries."""
+    if everything:
+        n = len(jit_cache.entries)
+        jit_cache.clear()
+    else:
+        if maxsize is not None:
+            jit_cache.maxsize = maxsize
+        if not jit_cache.maxsize:
+            raise click.UsageError("No cache size limit given; use `--maxsize` "
+                                   "or DEVITO_JIT_CACHE_MAXSIZE")
+        n = jit_cache.evict()
+    click.echo("Evicted %d entries" % n)
+
+
+@main.command()
+@click.argument('sources', nargs=-1, type=click.Path(exists=True))
+def warm(sources):
+    """
+    Compile the generated source files SOURCES (or those within the given
+    directories) that aren't in the cache yet, e.g. to populate the cache of a
+    new node from the sources generated elsewhere.
+    """
+    compiler = configuration['compiler']
+
+    files = []
+    for i in sources:
+        i = Path(i)
+        if i.is_dir():
+            files.extend(sorted(i.glob('*.%s' % compiler.src_ext)))
+        else:
+            files.append(i)
+
+    for i in files:
+        soname = i.stem
+        with open(str(i), 'r') as f:
+            code = f.read()
+        recompiled, _ = compiler.jit_compile(soname, code)
+        click.echo("%s: %s" % (soname, 'compiled' if recompiled else 'cached'))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
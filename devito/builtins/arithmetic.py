@@ -1,10 +1,12 @@
 import numpy as np
 
 import devito as dv
-from devito.builtins.utils import MPIReduction
+from devito.builtins.utils import (ReductionKernel, builtins_registry, mpi_allreduce,
+                                   signature, time_extent)
+from devito.tools import as_tuple
 
 
-__all__ = ['norm', 'sumall', 'inner', 'mmin', 'mmax']
+__all__ = ['norm', 'norms', 'sumall', 'inner', 'mmin', 'mmax']
 
 
 @dv.switchconfig(log_level='ERROR')
@@ -19,27 +21,54 @@ def norm(f, order=2):
     order : int, optional
         The order of the norm. Defaults to 2.
     """
-    Pow = dv.finite_differences.differentiable.Pow
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
+    return norms([f], order=order)[0]
 
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    p, eqns = f.guard() if f.is_SparseFunction else (f, [])
 
-    s = dv.types.Symbol(name='sum', dtype=f.dtype)
+@dv.switchconfig(log_level='ERROR')
+def norms(functions, order=2):
+    """
+    Compute the norms of several Functions in a single pass.
+
+    Parameters
+    ----------
+    functions : list of Function
+        Input Functions.
+    order : int, optional
+        The order of the norms. Defaults to 2.
 
-    with MPIReduction(f) as mr:
-        op = dv.Operator([dv.Eq(s, 0.0)] +
-                         eqns +
-                         [dv.Inc(s, dv.Abs(Pow(p, order))), dv.Eq(mr.n[0], s)],
-                         name='norm%d' % order)
-        op.apply(**kwargs)
+    Notes
+    -----
+    The reductions are fused within the same Operator whenever possible, that is
+    when all Functions are defined over the same Grid and require the same number
+    of timesteps. Otherwise, the norms are computed one at a time.
+    """
+    functions = as_tuple(functions)
+    if not functions:
+        return []
 
-    v = np.power(mr.v, 1/order)
+    extents = {time_extent(f) for f in functions} - {None}
+    grids = {f.grid for f in functions} - {None}
+    if len(functions) > 1 and (len(extents) > 1 or len(grids) > 1):
+        return [norm(f, order=order) for f in functions]
 
-    return f.dtype(v)
+    def callback(proxies):
+        Pow = dv.finite_differences.differentiable.Pow
+        items = []
+        for p in proxies:
+            # Protect SparseFunctions from accessing duplicated (out-of-domain)
+            # data, otherwise we would eventually be summing more than expected
+            p, eqns = p.guard() if p.is_SparseFunction else (p, [])
+            items.append((dv.Abs(Pow(p, order)), eqns))
+        return items
+
+    key = ('norm%d' % order,) + tuple(signature(f) for f in functions)
+    kernel = builtins_registry.fetch(
+        key, lambda: ReductionKernel('norm%d' % order, functions, callback)
+    )
+
+    values = kernel.apply(functions, **_time_bounds(functions))
+
+    return [f.dtype(np.power(v, 1/order)) for f, v in zip(functions, values)]
 
 
 def sumall(f):
@@ -51,24 +80,18 @@ def sumall(f):
     f : Function
         Input Function.
     """
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
+    def callback(proxies):
+        p, = proxies
+        # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
+        # otherwise we would eventually be summing more than expected
+        return [p.guard() if p.is_SparseFunction else (p, [])]
 
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    p, eqns = f.guard() if f.is_SparseFunction else (f, [])
+    key = ('sum', signature(f))
+    kernel = builtins_registry.fetch(key, lambda: ReductionKernel('sum', [f], callback))
 
-    s = dv.types.Symbol(name='sum', dtype=f.dtype)
+    v, = kernel.apply([f], **_time_bounds([f]))
 
-    with MPIReduction(f) as mr:
-        op = dv.Operator([dv.Eq(s, 0.0)] +
-                         eqns +
-                         [dv.Inc(s, p), dv.Eq(mr.n[0], s)],
-                         name='sum')
-        op.apply(**kwargs)
-
-    return f.dtype(mr.v)
+    return f.dtype(v)
 
 
 def inner(f, g):
@@ -105,24 +128,30 @@ def inner(f, g):
     if f.is_SparseFunction and not np.all(f.coordinates_data == g.coordinates_data):
         raise ValueError("Non-matching coordinates")
 
-    kwargs = {}
-    if f.is_TimeFunction and f._time_buffering:
-        kwargs[f.time_dim.max_name] = f._time_size - 1
+    def callback(proxies):
+        p0, p1 = proxies
+        # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
+        # otherwise we would eventually be summing more than expected
+        return [p0.guard(p0*p1) if p0.is_SparseFunction else (p0*p1, [])]
 
-    # Protect SparseFunctions from accessing duplicated (out-of-domain) data,
-    # otherwise we would eventually be summing more than expected
-    rhs, eqns = f.guard(f*g) if f.is_SparseFunction else (f*g, [])
+    key = ('inner', signature(f), signature(g))
+    kernel = builtins_registry.fetch(
+        key, lambda: ReductionKernel('inner', [f, g], callback)
+    )
 
-    s = dv.types.Symbol(name='sum', dtype=f.dtype)
+    v, = kernel.apply([f, g], **_time_bounds([f]))
+
+    return f.dtype(v)
 
-    with MPIReduction(f, g) as mr:
-        op = dv.Operator([dv.Eq(s, 0.0)] +
-                         eqns +
-                         [dv.Inc(s, rhs), dv.Eq(mr.n[0], s)],
-                         name='inner')
-        op.apply(**kwargs)
 
-    return f.dtype(mr.v)
+def _time_bounds(functions):
+    """
+    The runtime arguments to iterate over all timesteps of ``functions``.
+    """
+    for f in functions:
+        if time_extent(f) is not None:
+            return {f.time_dim.max_name: time_extent(f) - 1}
+    return {}
 
 
 def mmin(f):
@@ -137,9 +166,8 @@ def mmin(f):
     if isinstance(f, dv.Constant):
         return f.data
     elif isinstance(f, dv.types.dense.DiscreteFunction):
-        with MPIReduction(f, op=dv.mpi.MPI.MIN) as mr:
-            mr.n.data[0] = np.min(f.data_ro_domain).item()
-        return mr.v.item()
+        v = np.array([np.min(f.data_ro_domain).item()], dtype=f.dtype)
+        return mpi_allreduce(f, v, op=dv.mpi.MPI.MIN)[0].item()
     else:
         raise ValueError("Expected Function, not `%s`" % type(f))
 
@@ -156,8 +184,7 @@ def mmax(f):
     if isinstance(f, dv.Constant):
         return f.data
     elif isinstance(f, dv.types.dense.DiscreteFunction):
-        with MPIReduction(f, op=dv.mpi.MPI.MAX) as mr:
-            mr.n.data[0] = np.max(f.data_ro_domain).item()
-        return mr.v.item()
+        v = np.array([np.max(f.data_ro_domain).item()], dtype=f.dtype)
+        return mpi_allreduce(f, v, op=dv.mpi.MPI.MAX)[0].item()
     else:
         raise ValueError("Expected Function, not `%s`" % type(f))
@@ -2,7 +2,8 @@ import numpy as np
 
 import devito as dv
 from devito.tools import as_tuple, as_list
-from devito.builtins.utils import nbl_to_padsize, pad_outhalo
+from devito.builtins.utils import (Kernel, builtins_registry, nbl_to_padsize,
+                                   pad_outhalo, signature)
 
 __all__ = ['assign', 'smooth', 'gaussian_smooth', 'initialize_function']
 
@@ -51,6 +52,21 @@ def assign(f, rhs=0, options=None, name='assign', **kwargs):
     """
     if not isinstance(rhs, list):
         rhs = len(as_list(f))*[rhs, ]
+
+    # Assigning scalars to Functions is by far the most common case, so we
+    # compile it once and then reuse it for all Functions with the same signature
+    if not options and not kwargs and _is_scalar_assignment(as_list(f), rhs):
+        lhs = as_list(f)
+
+        def callback(proxies):
+            return [dv.Eq(p, dv.Constant(name='c%d' % n, dtype=p.dtype))
+                    for n, p in enumerate(proxies)]
+
+        key = ('assign', name) + tuple(signature(i) for i in lhs)
+        kernel = builtins_registry.fetch(key, lambda: Kernel(name, lhs, callback))
+        kernel.apply(lhs, scalars=rhs)
+        return
+
     eqs = []
     if options:
         for i, j, k in zip(as_list(f), rhs, options):
@@ -64,6 +80,12 @@ def assign(f, rhs=0, options=None, name='assign', **kwargs):
     dv.Operator(eqs, name=name, **kwargs)()
 
 
+def _is_scalar_assignment(lhs, rhs):
+    return (all(isinstance(i, dv.types.dense.DiscreteFunction) and i is i.function
+                for i in lhs) and
+            all(isinstance(i, (int, float, np.number)) for i in rhs))
+
+
 def smooth(f, g, axis=None):
     """
     Smooth a Function through simple moving average.
@@ -90,7 +112,17 @@ def smooth(f, g, axis=None):
     else:
         if axis is None:
             axis = g.dimensions[-1]
-        dv.Operator(dv.Eq(f, g.avg(dims=axis)), name='smoother')()
+        axis = as_tuple(axis)
+
+        def callback(proxies):
+            pf, pg = proxies
+            return [dv.Eq(pf, pg.avg(dims=axis))]
+
+        key = ('smooth', signature(f), signature(g), axis)
+        kernel = builtins_registry.fetch(
+            key, lambda: Kernel('smoother', [f, g], callback)
+        )
+        kernel.apply([f, g])
 
 
 def gaussian_smooth(f, sigma=1, truncate=4.0, mode='reflect'):
@@ -1,44 +1,217 @@
+from collections import OrderedDict
+
 import numpy as np
 
 import devito as dv
-from devito.tools import as_tuple
+from devito.tools import Singleton, as_tuple
+
 
+class BuiltinsRegistry(OrderedDict, metaclass=Singleton):
 
-class MPIReduction(object):
     """
-    A context manager to build MPI-aware reduction Operators.
+    A registry for the Operators implementing the builtins:
+
+        (builtin, signatures) -> kernel
+
+    where:
+
+        * `builtin` is a string uniquely identifying the computation (e.g., 'norm2').
+        * `signatures` are the signatures of the input Functions, as returned by
+          ``signature``.
+        * `kernel` is an object wrapping a compiled Operator, defined over
+          data-less replicas of the input Functions (see ``make_proxy``).
+
+    Thus, the first call to a builtin pays for symbolic processing and
+    jit-compilation, while subsequent calls over Functions with the same
+    signature only need to rebind the runtime arguments.
     """
 
-    def __init__(self, *functions, op=dv.mpi.MPI.SUM):
-        grids = {f.grid for f in functions}
-        if len(grids) == 0:
-            self.grid = None
-        elif len(grids) == 1:
-            self.grid = grids.pop()
-        else:
-            raise ValueError("Multiple Grids found")
+    maxsize = 128
+    """The maximum number of kernels in the registry."""
+
+    def fetch(self, key, builder):
+        """
+        Retrieve the kernel mapped to ``key``. If not in the registry, the kernel
+        is created via ``builder()``, and the least recently used kernel is
+        evicted should the registry exceed ``maxsize``.
+        """
+        # Kernels built under a different configuration (e.g., OpenMP on/off)
+        # are not interchangeable
+        key = (key, dv.configuration._signature_items())
+        try:
+            kernel = self[key]
+            self.move_to_end(key)
+        except KeyError:
+            kernel = self[key] = builder()
+            if len(self) > self.maxsize:
+                self.popitem(last=False)
+        return kernel
+
+
+builtins_registry = BuiltinsRegistry()
+
+
+def signature(f):
+    """
+    A hashable object uniquely identifying the code a builtin generates for the
+    DiscreteFunction ``f``. Functions with the same signature are interchangeable
+    as runtime arguments to the same Operator.
+    """
+    grid = f.grid
+    if grid is not None:
+        grid = (grid.dimensions, grid.time_dim, grid.distributor.topology)
+    if f.is_TimeFunction and f._time_buffering:
+        buffering = f._time_size
+    else:
+        buffering = None
+    return (f.__class__.__base__, np.dtype(f.dtype), f.dimensions, f.halo, f.padding,
+            f.staggered, buffering, grid)
+
+
+def make_proxy(f, name):
+    """
+    A data-less replica of the DiscreteFunction ``f``, named ``name``. A proxy
+    may be used in lieu of ``f`` to build an Operator, to which ``f``, or any
+    other DiscreteFunction with the same signature, is then passed at
+    application time.
+    """
+    args, kwargs = f.__getnewargs_ex__()
+    kwargs['name'] = name
+    for i in ('initializer', 'coordinates_data', 'gridpoints_data',
+              'interpolation_coeffs_data'):
+        kwargs.pop(i, None)
+    return f.__class__.__base__(*args, **kwargs)
+
+
+def time_extent(f):
+    """
+    The number of timesteps the builtins must iterate over to visit all of the
+    data in ``f``, or None if ``f`` isn't time-dependent.
+    """
+    if f.is_TimeFunction:
+        return f._time_size
+    elif f.is_SparseTimeFunction:
+        return f.nt
+    else:
+        return None
+
+
+class Kernel(object):
+
+    """
+    A compiled Operator defined over data-less proxies of the input Functions,
+    so that it can be applied to any Functions with the same signatures.
+
+    Parameters
+    ----------
+    name : str
+        Name of the Operator.
+    functions : list of DiscreteFunction
+        The Functions defining the signature of the kernel.
+    callback : callable
+        Given the proxies of ``functions``, return the equations of the kernel.
+        Any runtime scalar must be a Constant named ``c0, c1, ...``.
+    """
+
+    def __init__(self, name, functions, callback):
+        self.proxies = [make_proxy(f, 'f%d' % n) for n, f in enumerate(functions)]
+        self.operator = dv.Operator(callback(self.proxies), name=name)
+
+    def _arguments(self, functions, scalars=(), **kwargs):
+        kwargs.update({p.name: f for p, f in zip(self.proxies, functions)})
+        kwargs.update({'c%d' % n: v for n, v in enumerate(scalars)})
+        return kwargs
+
+    def apply(self, functions, scalars=(), **kwargs):
+        """
+        Run the kernel over ``functions``, which must have the same signatures
+        as those used to build the kernel.
+        """
+        return self.operator.apply(**self._arguments(functions, scalars, **kwargs))
+
+
+class ReductionKernel(Kernel):
+
+    """
+    A compiled, MPI-aware, Operator performing one or more reductions in a
+    single pass over the input Functions.
+
+    Parameters
+    ----------
+    name : str
+        Name of the Operator.
+    functions : list of DiscreteFunction
+        The Functions defining the signature of the kernel.
+    callback : callable
+        Given the proxies of ``functions``, return a list of 2-tuples
+        ``(expr, eqns)``, where ``expr`` is the expression to be summed over
+        and ``eqns`` are (possibly empty) auxiliary equations, such as the
+        guards for SparseFunctions.
+    op : MPI.Op, optional
+        The reduction operation across MPI ranks. Defaults to MPI.SUM.
+    """
+
+    def __init__(self, name, functions, callback, op=dv.mpi.MPI.SUM):
         dtype = {f.dtype for f in functions}
         if len(dtype) == 1:
-            self.dtype = dtype.pop()
+            dtype = dtype.pop()
         else:
             raise ValueError("Illegal mixed data types")
-        self.v = None
+        grids = {f.grid for f in functions}
+        grids.discard(None)
+        if len(grids) > 1:
+            raise ValueError("Multiple Grids found")
+        grid = grids.pop() if grids else None
+
         self.op = op
 
-    def __enter__(self):
-        i = dv.Dimension(name='i',)
-        self.n = dv.Function(name='n', shape=(1,), dimensions=(i,),
-                             grid=self.grid, dtype=self.dtype)
-        self.n.data[0] = 0
-        return self
-
-    def __exit__(self, exc_type, exc_value, traceback):
-        if self.grid is None or not dv.configuration['mpi']:
-            assert self.n.data.size == 1
-            self.v = self.n.data[0]
-        else:
-            comm = self.grid.distributor.comm
-            self.v = comm.allreduce(np.asarray(self.n.data), self.op)[0]
+        def _callback(proxies):
+            items = callback(proxies)
+
+            i = dv.Dimension(name='i')
+            self.n = dv.Function(name='n', shape=(len(items),), dimensions=(i,),
+                                 grid=grid, dtype=dtype)
+
+            eqns = []
+            for n, (expr, aux) in enumerate(items):
+                s = dv.types.Symbol(name='sum%d' % n, dtype=dtype)
+                eqns.extend([dv.Eq(s, 0.0)] + aux +
+                            [dv.Inc(s, expr), dv.Eq(self.n[n], s)])
+            return eqns
+
+        super().__init__(name, functions, _callback)
+
+    def apply(self, functions, **kwargs):
+        """
+        Run the reductions over ``functions``, which must have the same
+        signatures as those used to build the kernel. Return an array with
+        one entry per reduction.
+        """
+        # Under MPI, `n` must be attached to the Grid of `functions`, which may
+        # differ from that used at build time. Thus, `n` is only reallocated
+        # when switching to another Grid
+        grids = {f.grid for f in functions} - {None}
+        grid = grids.pop() if grids else None
+        if grid is not self.n.grid:
+            self.n = dv.Function(name='n', shape=self.n.shape,
+                                 dimensions=self.n.dimensions, grid=grid,
+                                 dtype=self.n.dtype)
+        self.n.data[:] = 0
+
+        self.operator.apply(n=self.n, **self._arguments(functions, **kwargs))
+
+        return mpi_allreduce(functions[0], np.array(self.n.data), op=self.op)
+
+
+def mpi_allreduce(f, v, op=dv.mpi.MPI.SUM):
+    """
+    Reduce ``v`` across the MPI ranks over which the DiscreteFunction ``f``
+    is distributed. Without MPI, ``v`` is returned as is.
+    """
+    if f.grid is None or not dv.configuration['mpi']:
+        return v
+    else:
+        return f.grid.distributor.comm.allreduce(v, op)
 
 
 def nbl_to_padsize(nbl, ndim):
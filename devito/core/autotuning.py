@@ -1,6 +1,15 @@
 from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import combinations, product
-from functools import total_ordering
+from functools import partial, total_ordering
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+import fcntl
+import json
+import os
+import time
+
+from sympy import S
 
 from devito.arch import KNL, KNL7210
 from devito.ir import Backward, retrieve_iteration_tree
@@ -8,10 +17,11 @@ from devito.logger import perf, warning as _warning
 from devito.mpi.distributed import MPI, MPINeighborhood
 from devito.mpi.routines import MPIMsgEnriched
 from devito.parameters import configuration
+from devito.symbolics import subs_op_args
 from devito.tools import filter_ordered, flatten, is_integer, prod
 from devito.types import Timer
 
-__all__ = ['autotune']
+__all__ = ['autotune', 'AutotuningDB', 'autotuning_db']
 
 
 def autotune(operator, args, level, mode):
@@ -39,6 +49,15 @@ def autotune(operator, args, level, mode):
         raise ValueError("The accepted `(level, mode)` combinations are `%s`; "
                          "provided `%s` instead" % (accepted, key))
 
+    roots = [operator.body] + [i.root for i in operator._func_table.values()]
+    trees = filter_ordered(retrieve_iteration_tree(roots), key=lambda i: i.root)
+
+    # Reuse the outcome of a previous autotuning session, if any
+    db_key = autotuning_db.key(operator, trees, args, level)
+    entry = autotuning_db.get(db_key)
+    if entry is not None:
+        return reuse(operator, trees, args, db_key, entry)
+
     # We get passed all the arguments, but the cfunction only requires a subset
     at_args = OrderedDict([(p.name, args[p.name]) for p in operator.parameters])
 
@@ -65,12 +84,9 @@ def autotune(operator, args, level, mode):
                     i.fromrank = MPI.PROC_NULL
                     i.torank = MPI.PROC_NULL
 
-    roots = [operator.body] + [i.root for i in operator._func_table.values()]
-    trees = filter_ordered(retrieve_iteration_tree(roots), key=lambda i: i.root)
-
     # Detect the time-stepping Iteration; shrink its iteration range so that
     # each autotuning run only takes a few iterations
-    steppers = {i for i in flatten(trees) if i.dim.is_Time}
+    steppers = find_steppers(trees)
     if len(steppers) == 0:
         stepper = None
         timesteps = 1
@@ -87,49 +103,72 @@ def autotune(operator, args, level, mode):
     timer = Timer('timers', list(operator._profiler.all_sections))
     at_args.update(timer._arg_values())
 
+    def run(n, nblocks_per_thread, bs, nt):
+        """
+        Run the Operator with the tunable arguments ``bs`` and ``nt``, and return
+        the elapsed time, or None if the run was dropped.
+        """
+        # Can we safely autotune over the given time range?
+        if not check_time_bounds(stepper, at_args, args, mode):
+            raise StopTuning
+
+        # Update `at_args` to use the new tunable arguments
+        items = [(k, v) for k, v in bs + nt if k in at_args]
+        at_args.update(dict(items))
+
+        # Drop run if not at least one block per thread
+        if not configuration['develop-mode'] and nblocks_per_thread.subs(at_args) < 1:
+            return None
+
+        # Run the Operator
+        operator.cfunction(*list(at_args.values()))
+
+        # Record timing
+        elapsed = timer.total
+        timings.setdefault(nt, OrderedDict()).setdefault(n, {})[bs] = elapsed
+        trajectory.append((dict(items), elapsed))
+        log("run <%s> took %f (s) in %d timesteps" %
+            (','.join('%s=%s' % i for i in items), elapsed, timesteps))
+
+        # Prepare for the next autotuning run
+        update_time_bounds(stepper, at_args, timesteps, mode)
+        timer.reset()
+
+        return elapsed
+
     # Perform autotuning
     timings = {}
+    trajectory = []
     for n, tree in enumerate(trees):
         blockable = [i.dim for i in tree if not is_integer(i.step)]
 
         # Tunable arguments
         try:
-            tunable = []
-            tunable.append(generate_block_shapes(blockable, args, level))
-            tunable.append(generate_nthreads(operator.nthreads, args, level))
-            tunable = list(product(*tunable))
+            block_shapes = generate_block_shapes(blockable, args, level, timesteps)
+            nthreads = generate_nthreads(operator.nthreads, args, level)
         except ValueError:
             # Some arguments are compulsory, otherwise autotuning is skipped
             continue
 
-        # Symbolic number of loop-blocking blocks per thread
-        nblocks_per_thread = calculate_nblocks(tree, blockable) / operator.nthreads
-
-        for bs, nt in tunable:
-            # Can we safely autotune over the given time range?
-            if not check_time_bounds(stepper, at_args, args, mode):
-                break
-
-            # Update `at_args` to use the new tunable arguments
-            run = [(k, v) for k, v in bs + nt if k in at_args]
-            at_args.update(dict(run))
-
-            # Drop run if not at least one block per thread
-            if not configuration['develop-mode'] and nblocks_per_thread.subs(at_args) < 1:
-                continue
-
-            # Run the Operator
-            operator.cfunction(*list(at_args.values()))
-
-            # Record timing
-            elapsed = timer.total
-            timings.setdefault(nt, OrderedDict()).setdefault(n, {})[bs] = elapsed
-            log("run <%s> took %f (s) in %d timesteps" %
-                (','.join('%s=%s' % i for i in run), elapsed, timesteps))
+        # Symbolic number of loop-blocking blocks per thread. With time tiling,
+        # the blocks are executed in sequence, and the threads share the
+        # iterations within a block instead
+        if any(d.is_Time for d in blockable):
+            nblocks_per_thread = S.One
+        else:
+            nblocks_per_thread = calculate_nblocks(tree, blockable) / operator.nthreads
 
-            # Prepare for the next autotuning run
-            update_time_bounds(stepper, at_args, timesteps, mode)
-            timer.reset()
+        try:
+            if configuration['autotuning-search'] == 'model':
+                footprints = calculate_footprints(operator, tree, blockable,
+                                                  block_shapes, args)
+                search_model(partial(run, n, nblocks_per_thread), block_shapes,
+                             nthreads, footprints)
+            else:
+                search_exhaustive(partial(run, n, nblocks_per_thread), block_shapes,
+                                  nthreads)
+        except StopTuning:
+            pass
 
     # The best variant is the one that for a given number of threads had the minium
     # turnaround time
@@ -142,6 +181,7 @@ def autotune(operator, args, level, mode):
                 record = mapper.setdefault(k, Record())
                 record.add(min(i, key=i.get), min(i.values()))
         best = min(mapper, key=mapper.get)
+        elapsed = mapper[best].time
         best = OrderedDict(best + tuple(mapper[best].args))
         best.pop(None, None)
         log("selected <%s>" % (','.join('%s=%s' % i for i in best.items())))
@@ -152,6 +192,9 @@ def autotune(operator, args, level, mode):
     # Update the argument list with the tuned arguments
     args.update(best)
 
+    # Save the tuned arguments for later runs
+    autotuning_db.put(db_key, best, elapsed/max(timesteps, 1))
+
     # In `runtime` mode, some timesteps have been executed already, so we must
     # adjust the time range
     finalize_time_bounds(stepper, at_args, args, mode)
@@ -161,10 +204,384 @@ def autotune(operator, args, level, mode):
     summary['runs'] = runs
     summary['tpr'] = timesteps  # tpr -> timesteps per run
     summary['tuned'] = dict(best)
+    summary['trajectory'] = trajectory
 
     return args, summary
 
 
+def reuse(operator, trees, args, key, entry):
+    """
+    Update ``args`` with the tuned arguments found in the autotuning database
+    ``entry``, thus skipping the autotuning search.
+    """
+    best = OrderedDict((k, v) for k, v in entry['tuned'].items() if k in args)
+    args.update(best)
+    log("selected <%s> from the autotuning database" %
+        (','.join('%s=%s' % i for i in best.items())))
+
+    summary = {}
+    summary['runs'] = 0
+    summary['tpr'] = 0
+    summary['tuned'] = dict(best)
+
+    if configuration['autotuning-db-revalidate']:
+        # The number of timesteps about to be run, to be compared against the
+        # timings in the database once the Operator has run (see `revalidate`)
+        steppers = find_steppers(trees)
+        if len(steppers) == 1:
+            stepper = steppers.pop()
+            dim = stepper.dim.root
+            timesteps = stepper.size(args[dim.min_name], args[dim.max_name])
+        else:
+            timesteps = 1
+        summary['revalidate'] = (key, entry['time'], timesteps)
+
+    return args, summary
+
+
+def revalidate(key, expected, timesteps, elapsed):
+    """
+    Check that the time per timestep achieved by a run using the tuned arguments
+    of the autotuning database entry ``key`` is in line with ``expected``, that
+    is the time recorded during autotuning. Otherwise, as it might happen
+    following a change in the machine configuration, the entry is dropped, so
+    that the Operator gets tuned again in the next run.
+
+    This way, the database entries are re-validated at no cost, off the
+    critical path of the autotuning search.
+    """
+    observed = elapsed / max(timesteps, 1)
+    if observed > options['revalidate-tolerance']*expected:
+        warning("run took %f (s) per timestep, rather than the expected %f (s); "
+                "dropping stale autotuning database entry" % (observed, expected))
+        autotuning_db.drop(key)
+    else:
+        log("autotuning database entry re-validated")
+
+
+class AutotuningDB(object):
+
+    """
+    A persistent database of autotuning results.
+
+    An entry is keyed on the Operator's ``_soname``, the extent of the blocked
+    iteration space (i.e., the local grid shape), the platform, the number of
+    threads and the autotuning level. An entry is the set of tuned arguments
+    (block shapes, number of threads) and the time per timestep they achieved.
+    Thus, once an Operator has been autotuned, all later runs, in the same as
+    well as in other processes, skip the autotuning search altogether.
+
+    The database is a JSON file, which may be shared by multiple processes, and
+    can be exported and imported, for example to populate the database of a
+    new node.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The database file. Defaults to ``configuration['autotuning-db']``; if
+        unset, the database is disabled.
+    """
+
+    _version = 1
+
+    def __init__(self, path=None):
+        self._path = Path(path) if path is not None else None
+        self._cache = (None, {})
+
+    @property
+    def path(self):
+        if self._path is not None:
+            return self._path
+        elif configuration['autotuning-db']:
+            return Path(configuration['autotuning-db'])
+        else:
+            return None
+
+    @path.setter
+    def path(self, val):
+        self._path = Path(val) if val is not None else None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    @property
+    def entries(self):
+        """The database entries, as a mapper from keys to entries."""
+        path = self.path
+        if path is None:
+            return {}
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        # Only re-read the file if it has changed in the meantime
+        cached_mtime, entries = self._cache
+        if mtime != cached_mtime:
+            entries = _load(path)
+            self._cache = (mtime, entries)
+        return entries
+
+    def key(self, operator, trees, args, level):
+        """
+        The database key of ``operator``, autotuned at ``level`` over the
+        iteration trees ``trees`` with the runtime arguments ``args``. Return
+        None if the database is disabled or ``operator`` cannot be autotuned.
+        """
+        if not self.enabled:
+            return None
+
+        # Note: the time tiles, if any, don't depend on the local grid shape
+        blockable = filter_ordered(i.dim.root for i in flatten(trees)
+                                   if not is_integer(i.step) and not i.dim.is_Time)
+        if not blockable:
+            return None
+        extents = ','.join('%s=%s' % (d.name, d.symbolic_size.subs(args))
+                           for d in blockable)
+
+        nthreads = operator.nthreads
+        if nthreads != 1:
+            nthreads = args[nthreads.name]
+
+        return '|'.join([operator._soname, extents, configuration['platform'].name,
+                         'nthreads=%s' % nthreads, level])
+
+    def get(self, key):
+        """Retrieve the entry mapped to ``key``, or None upon a miss."""
+        if key is None:
+            return None
+        return self.entries.get(key)
+
+    def put(self, key, tuned, elapsed):
+        """
+        Map ``key`` to the tuned arguments ``tuned``, which achieved a time per
+        timestep of ``elapsed`` seconds.
+        """
+        if key is None:
+            return
+        # Note: some tuned values may be SymPy Integers (e.g., the degenerate
+        # block shape), which aren't JSON-serializable
+        tuned = {k: int(v) for k, v in tuned.items()}
+        entry = {'tuned': tuned, 'time': elapsed, 'timestamp': time.time()}
+        try:
+            with self._update() as entries:
+                entries[key] = entry
+        except OSError as e:
+            # E.g., a read-only, shared database
+            warning("couldn't update the autotuning database [%s]" % e)
+
+    def drop(self, key):
+        """Drop the entry mapped to ``key``, if any."""
+        with self._update() as entries:
+            entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._update() as entries:
+            entries.clear()
+
+    def export(self, path):
+        """Write all entries to the file ``path``."""
+        _dump(Path(path), self.entries)
+
+    def merge(self, path):
+        """
+        Import the entries in the file ``path``, as produced by ``export``.
+        Upon a clash, the entry achieving the lower time per timestep wins.
+        """
+        imported = _load(Path(path))
+        with self._update() as entries:
+            for k, v in imported.items():
+                if k not in entries or v['time'] < entries[k]['time']:
+                    entries[k] = v
+
+    @contextmanager
+    def _update(self):
+        """
+        Read-modify-write the database, while holding an exclusive, cross-process
+        lock. Readers are never blocked, as the file is atomically replaced.
+        """
+        path = self.path
+        if path is None:
+            raise ValueError("No autotuning database set; see "
+                             "`configuration['autotuning-db']`")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(str(path.with_suffix('.lock')), 'a') as f:
+            fcntl.lockf(f, fcntl.LOCK_EX)
+            try:
+                entries = _load(path)
+                yield entries
+                _dump(path, entries)
+            finally:
+                fcntl.lockf(f, fcntl.LOCK_UN)
+
+
+autotuning_db = AutotuningDB()
+"""The autotuning database, used when ``configuration['autotuning-db']`` is set."""
+
+
+def _load(path):
+    try:
+        with open(str(path), 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        warning("corrupted autotuning database `%s`; ignoring it" % path)
+        return {}
+    if data.get('version') != AutotuningDB._version:
+        warning("incompatible autotuning database `%s`; ignoring it" % path)
+        return {}
+    return data['entries']
+
+
+def _dump(path, entries):
+    data = {'version': AutotuningDB._version, 'entries': entries}
+    # Write-then-rename, so that concurrent readers never see partial files
+    with NamedTemporaryFile('w', dir=str(path.parent), delete=False) as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(f.name, str(path))
+
+
+class StopTuning(Exception):
+
+    """Raised when no more autotuning runs can be performed."""
+
+    pass
+
+
+def search_exhaustive(run, block_shapes, nthreads):
+    """
+    Run all combinations of the candidate ``block_shapes`` and ``nthreads``.
+    """
+    for bs, nt in product(block_shapes, nthreads):
+        run(bs, nt)
+
+
+def search_model(run, block_shapes, nthreads, footprints):
+    """
+    Search the candidate ``block_shapes`` through coordinate descent, for each
+    of the candidate ``nthreads``.
+
+    The candidates whose memory footprint, as given by ``footprints``, exceeds
+    the cache capacity available to each thread are pruned. The search starts
+    from the candidate with the largest footprint still fitting in cache, and
+    then moves to the fastest neighbouring candidate (i.e., the next smaller or
+    larger block along one Dimension) until no neighbour is faster.
+    """
+    if footprints:
+        capacity = cache_capacity(nthreads)
+        candidates = sorted(block_shapes, key=lambda i: footprints[i])
+        fitting = [i for i in candidates if footprints[i] <= capacity]
+        # Don't trust the model blindly
+        block_shapes = fitting or candidates[:options['search-minsize']]
+        # Among the candidates with the same footprint, prefer those with larger
+        # innermost blocks, which are typically more SIMD friendly
+        start = max(block_shapes,
+                    key=lambda i: (footprints[i], tuple(reversed([v for _, v in i]))))
+    else:
+        # No model available (e.g., unknown cache sizes)
+        start = block_shapes[0]
+
+    for nt in nthreads:
+        timings = {}
+        current = start
+        timings[current] = run(current, nt)
+        while True:
+            for i in neighbours(current, block_shapes):
+                if i not in timings:
+                    timings[i] = run(i, nt)
+            # Dropped runs (None) never win
+            best = min(timings, key=lambda i: (timings[i] is None, timings[i] or 0))
+            if best == current:
+                break
+            current = best
+
+
+def neighbours(bs, block_shapes):
+    """
+    The neighbours of the block shape ``bs`` in ``block_shapes``, that is the
+    block shapes differing from ``bs`` only along one Dimension, where they
+    take the next smaller or larger value.
+    """
+    ret = []
+    for n, (name, v) in enumerate(bs):
+        line = [i for i in block_shapes
+                if len(i) == len(bs) and all(i[j] == bs[j] for j in range(len(bs))
+                                             if j != n)]
+        line = sorted(line, key=lambda i: i[n][1])
+        k = line.index(bs)
+        ret.extend(line[max(k-1, 0):k] + line[k+1:k+2])
+    return filter_ordered(ret, key=lambda i: i)
+
+
+def cache_capacity(nthreads):
+    """
+    The cache capacity, in bytes, available to each thread, that is the
+    private caches (beyond L1) plus a share of the last-level cache.
+    """
+    platform = configuration['platform']
+    nthreads = max(v for nt in nthreads for _, v in nt)
+    cache_sizes = getattr(platform, 'cache_sizes', {})
+    if not cache_sizes:
+        return None
+    llc = max(cache_sizes)
+    ret = sum(v for k, v in cache_sizes.items() if 1 < k < llc)
+    ret += cache_sizes[llc] // nthreads
+    return ret
+
+
+def calculate_footprints(operator, tree, blockable, block_shapes, args):
+    """
+    The memory footprint, in bytes, of a block of the iteration ``tree`` for each
+    of the ``block_shapes``. The number of bytes moved per grid point is derived
+    from the compulsory traffic estimated by the Operator's profiler. Return
+    an empty dict if no estimate is possible.
+    """
+    if cache_capacity([((None, 1),)]) is None:
+        return {}
+
+    # Bytes moved per grid point
+    traffic = 0
+    points = 0
+    for i in operator._profiler._sections.values():
+        try:
+            traffic += int(subs_op_args(i.traffic, args))
+            points += int(subs_op_args(i.points, args))
+        except TypeError:
+            # Non-numeric, e.g. unsupported iteration spaces
+            continue
+    if not points:
+        return {}
+    nbytes = traffic / points * operator._dtype().itemsize
+
+    # The extent of the non-blocked, space Dimensions
+    roots = {d.root for d in blockable}
+    extent = 1
+    for i in tree:
+        d = i.dim
+        if d.is_Time or d.root in roots or not is_integer(i.step):
+            continue
+        try:
+            extent *= int(d.root.symbolic_size.subs(args))
+        except TypeError:
+            continue
+
+    # The block size along each Dimension is the one at the innermost level
+    mapper = {d.step.name: d.root for d in blockable}
+    ret = {}
+    for bs in block_shapes:
+        sizes = {}
+        for k, v in bs:
+            root = mapper[k]
+            if root.is_Time:
+                # The time tile height doesn't affect the footprint of a block
+                continue
+            sizes[root] = min(sizes.get(root, v), v)
+        ret[bs] = prod(sizes.values())*extent*nbytes
+    return ret
+
+
 @total_ordering
 class Record(object):
 
@@ -190,8 +607,12 @@ def init_time_bounds(stepper, at_args, args):
     if stepper is None:
         return
     dim = stepper.dim.root
+    squeezer = options['squeezer']
+    if stepper.dim.is_Incr:
+        # Time tiling -- run at least two of the tallest time tiles
+        squeezer = max(squeezer, 2*max(options['blocksize-time']) - 1)
     if stepper.direction is Backward:
-        at_args[dim.min_name] = at_args[dim.max_name] - options['squeezer']
+        at_args[dim.min_name] = at_args[dim.max_name] - squeezer
         if dim.size_name in args:
             # May need to shrink to avoid OOB accesses
             at_args[dim.min_name] = max(at_args[dim.min_name], args[dim.min_name])
@@ -199,7 +620,7 @@ def init_time_bounds(stepper, at_args, args):
             warning("too few time iterations; skipping")
             return False
     else:
-        at_args[dim.max_name] = at_args[dim.min_name] + options['squeezer']
+        at_args[dim.max_name] = at_args[dim.min_name] + squeezer
         if dim.size_name in args:
             # May need to shrink to avoid OOB accesses
             at_args[dim.max_name] = min(at_args[dim.max_name], args[dim.max_name])
@@ -249,6 +670,21 @@ def finalize_time_bounds(stepper, at_args, args, mode):
         args[dim.max_name] = args[dim.max_name]
 
 
+def find_steppers(trees):
+    """
+    The time-stepping Iterations in ``trees``, that is the outermost Iteration
+    over a time Dimension in each tree. With time tiling, this is the Iteration
+    over the time tiles.
+    """
+    steppers = set()
+    for tree in trees:
+        for i in tree:
+            if i.dim.is_Time:
+                steppers.add(i)
+                break
+    return steppers
+
+
 def calculate_nblocks(tree, blockable):
     collapsed = tree[:(tree[0].ncollapsed or 1)]
     blocked = [i.dim for i in collapsed if i.dim in blockable]
@@ -259,10 +695,14 @@ def calculate_nblocks(tree, blockable):
     return nblocks
 
 
-def generate_block_shapes(blockable, args, level):
+def generate_block_shapes(blockable, args, level, timesteps=None):
     if not blockable:
         raise ValueError
 
+    # With time tiling, the time tile height is tuned along with the block shape
+    tiles = [d for d in blockable if d.is_Time]
+    blockable = [d for d in blockable if not d.is_Time]
+
     mapper = OrderedDict()
     for d in blockable:
         mapper[d] = mapper.get(d.parent, -1) + 1
@@ -321,6 +761,12 @@ def generate_block_shapes(blockable, args, level):
     # Normalize
     ret = [tuple((k.name, v) for k, v in bs) for bs in ret]
 
+    # Generate the time tile heights, which must not exceed the number of timesteps
+    for d in tiles:
+        heights = [v for v in options['blocksize-time']
+                   if timesteps is None or v <= timesteps]
+        ret = [((d.step.name, v),) + bs for v in heights for bs in ret]
+
     return ret
 
 
@@ -360,6 +806,9 @@ options = {
     'squeezer': 4,
     'blocksize-l0': (8, 16, 24, 32, 64, 96, 128),
     'blocksize-l1': (8, 16, 32),
+    'blocksize-time': (1, 2, 4, 8),
+    'revalidate-tolerance': 1.5,
+    'search-minsize': 4,
 }
 """Autotuning options."""
 
@@ -81,6 +81,7 @@ class Cpu64OperatorMixin(object):
         o['blockinner'] = oo.pop('blockinner', False)
         o['blocklevels'] = oo.pop('blocklevels', cls.BLOCK_LEVELS)
         o['skewing'] = oo.pop('skewing', False)
+        o['time-tiling'] = oo.pop('time-tiling', False)
 
         # CIRE
         o['min-storage'] = oo.pop('min-storage', False)
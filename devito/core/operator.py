@@ -1,6 +1,7 @@
-from devito.core.autotuning import autotune
+from devito.core.autotuning import autotune, revalidate
 from devito.exceptions import InvalidOperator
 from devito.logger import warning
+from devito.mpi import MPI
 from devito.parameters import configuration
 from devito.operator import Operator
 from devito.tools import as_tuple, timed_pass
@@ -62,6 +63,20 @@ class BasicOperator(Operator):
 
         return args
 
+    def _emit_apply_profiling(self, args):
+        summary = super()._emit_apply_profiling(args)
+
+        # Re-validate the tuned values retrieved from the autotuning database
+        try:
+            key, expected, timesteps = self._state['autotuning'][-1].pop('revalidate')
+        except (KeyError, IndexError):
+            return summary
+        rank = args.comm.rank if args.comm is not MPI.COMM_NULL else None
+        elapsed = sum(v.time for k, v in summary.items() if k.rank in (None, rank))
+        revalidate(key, expected, timesteps, elapsed)
+
+        return summary
+
     @property
     def nthreads(self):
         nthreads = [i for i in self.input if isinstance(i, NThreads)]
@@ -1,6 +1,9 @@
 import abc
+from collections import OrderedDict, defaultdict
 from functools import reduce
+from itertools import count
 from operator import mul
+from threading import Lock
 import mmap
 import os
 import sys
@@ -15,7 +18,7 @@ from devito.tools import dtype_to_ctype
 
 __all__ = ['ALLOC_FLAT', 'ALLOC_NUMA_LOCAL', 'ALLOC_NUMA_ANY',
            'ALLOC_KNL_MCDRAM', 'ALLOC_KNL_DRAM', 'ALLOC_GUARD',
-           'default_allocator']
+           'PooledAllocator', 'default_allocator']
 
 
 class MemoryAllocator(object):
@@ -368,6 +371,172 @@ class ExternalAllocator(MemoryAllocator):
         return (self.numpy_array, None)
 
 
+class PooledAllocator(MemoryAllocator):
+
+    """
+    A MemoryAllocator recycling the memory released by the Data it allocated.
+
+    Rather than being handed back to the system, the released blocks are kept
+    in size-class free lists, and then used to satisfy subsequent allocations
+    of the same size class. This spares the cost of allocating and, most of
+    all, page-faulting in the memory over and over again, for example when
+    the same (possibly very large) Functions are repeatedly created and
+    destroyed, as typical of the shot loops in inversion workflows.
+
+    Parameters
+    ----------
+    allocator : MemoryAllocator, optional
+        The MemoryAllocator used to obtain new blocks from the system (and to
+        return them). Defaults to ALLOC_FLAT.
+    maxsize : int, optional
+        The maximum number of bytes held in the free lists. Once exceeded,
+        the least recently released blocks are handed back to ``allocator``.
+        Defaults to ``configuration['alloc-pool-maxsize']``.
+
+    Notes
+    -----
+    Allocations are rounded up to the next size class, namely to one of four
+    equally spaced sizes within each power of two, with a minimum of one page.
+    Hence, at most 25% of a block is wasted. With ALLOC_GUARD, out-of-bounds
+    accesses falling within the rounding slack go undetected.
+    """
+
+    _size_class_bits = 2
+    """Size classes per power of two, as a power of two."""
+
+    def __init__(self, allocator=None, maxsize=None):
+        self._allocator = allocator if allocator is not None else ALLOC_FLAT
+        self._maxsize = maxsize
+
+        # Mapper `key -> (c_pointer, nbytes, memfree_args)`, from the least to
+        # the most recently released block, and mapper `nbytes -> [keys]`
+        self._blocks = OrderedDict()
+        self._free = defaultdict(list)
+        self._keys = count()
+
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+        # Data may be garbage collected in any thread
+        self._lock = Lock()
+
+    def __repr__(self):
+        return "PooledAllocator(%s)" % self.allocator.__class__.__name__
+
+    def available(self):
+        return self.allocator.available()
+
+    @property
+    def allocator(self):
+        return self._allocator
+
+    @property
+    def guaranteed_alignment(self):
+        return self.allocator.guaranteed_alignment
+
+    @property
+    def maxsize(self):
+        if self._maxsize is not None:
+            return self._maxsize
+        return configuration['alloc-pool-maxsize']
+
+    @maxsize.setter
+    def maxsize(self, val):
+        self._maxsize = val
+
+    @property
+    def nbytes(self):
+        """The number of bytes currently held in the free lists."""
+        return self._nbytes
+
+    def stats(self):
+        """Return a summary of the pool usage."""
+        with self._lock:
+            return OrderedDict([
+                ('hits', self._hits),
+                ('misses', self._misses),
+                ('blocks', len(self._blocks)),
+                ('nbytes', self._nbytes),
+                ('maxsize', self.maxsize)
+            ])
+
+    def _size_class(self, nbytes):
+        pagesize = mmap.PAGESIZE
+        nbytes = max(nbytes, pagesize)
+        # The granularity of the size classes between 2**n and 2**(n+1)
+        step = 1 << max(nbytes.bit_length() - 1 - self._size_class_bits, 0)
+        step = max(step, pagesize)
+        return -(-nbytes // step) * step
+
+    def _alloc_C_libcall(self, size, ctype):
+        nbytes = self._size_class(size * ctypes.sizeof(ctype))
+
+        with self._lock:
+            try:
+                # The most recently released block, as the least likely to
+                # have been swapped out
+                key = self._free[nbytes].pop()
+            except IndexError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._nbytes -= nbytes
+                block = self._blocks.pop(key)
+                return block[0], block
+
+        alloc = self.allocator._alloc_C_libcall
+        c_pointer, memfree_args = alloc(nbytes, ctypes.c_char)
+        if c_pointer is None and self.trim():
+            # Under memory pressure, hand back the free blocks and try again
+            c_pointer, memfree_args = alloc(nbytes, ctypes.c_char)
+        if c_pointer is None:
+            return None, None
+
+        return c_pointer, (c_pointer, nbytes, memfree_args)
+
+    def free(self, c_pointer, nbytes, memfree_args):
+        with self._lock:
+            key = next(self._keys)
+            self._blocks[key] = (c_pointer, nbytes, memfree_args)
+            self._free[nbytes].append(key)
+            self._nbytes += nbytes
+            released = self._evict(self.maxsize)
+
+        for i in released:
+            self.allocator.free(*i)
+
+    def _evict(self, maxsize):
+        """
+        Drop the least recently released blocks from the free lists until
+        at most ``maxsize`` bytes are held. Return the dropped blocks' memfree
+        arguments. To be called with the lock held.
+        """
+        released = []
+        while self._nbytes > maxsize:
+            key, (_, nbytes, memfree_args) = self._blocks.popitem(last=False)
+            self._free[nbytes].remove(key)
+            self._nbytes -= nbytes
+            released.append(memfree_args)
+        return released
+
+    def trim(self, maxsize=0):
+        """
+        Hand back the free blocks to the underlying allocator, the least
+        recently released first, until at most ``maxsize`` bytes are held.
+        Return the number of bytes handed back.
+        """
+        with self._lock:
+            nbytes = self._nbytes
+            released = self._evict(maxsize)
+            nbytes -= self._nbytes
+
+        for i in released:
+            self.allocator.free(*i)
+
+        return nbytes
+
+
 ALLOC_GUARD = GuardAllocator(1048576)
 ALLOC_FLAT = PosixAllocator()
 ALLOC_KNL_DRAM = NumaAllocator(0)
@@ -381,6 +550,9 @@ def infer_knl_mode():
     return 'flat' if os.path.exists(path) else 'cache'
 
 
+_pools = {}
+
+
 def default_allocator():
     """
     Return a suitable MemoryAllocator for the architecture on which the process
@@ -406,13 +578,24 @@ def default_allocator():
           return ALLOC_KNL_MCDRAM;
         * If on a multi-socket Intel Xeon platform, return ALLOC_NUMA_LOCAL;
         * In all other cases, return ALLOC_FLAT.
+
+    Further, if ``configuration['alloc-pool-maxsize']`` is non-zero, the chosen
+    allocator is wrapped by a PooledAllocator, shared by all Data, holding up
+    to that many bytes of released memory for later reuse.
     """
     if configuration['develop-mode']:
-        return ALLOC_GUARD
+        allocator = ALLOC_GUARD
     elif NumaAllocator.available():
         if configuration['platform'].name == 'knl' and infer_knl_mode() == 'flat':
-            return ALLOC_KNL_MCDRAM
+            allocator = ALLOC_KNL_MCDRAM
         else:
-            return ALLOC_NUMA_LOCAL
+            allocator = ALLOC_NUMA_LOCAL
     else:
-        return ALLOC_FLAT
+        allocator = ALLOC_FLAT
+
+    if configuration['alloc-pool-maxsize']:
+        if allocator not in _pools:
+            _pools[allocator] = PooledAllocator(allocator)
+        allocator = _pools[allocator]
+
+    return allocator
@@ -1,4 +1,5 @@
 from collections.abc import Iterable
+from contextlib import contextmanager
 from functools import wraps
 
 import numpy as np
@@ -518,6 +519,101 @@ class Data(np.ndarray):
             gather_rank = None
         return np.array(self.__getitem__(idx, gather_rank=gather_rank))
 
+    def _dump(self, filename):
+        """
+        Write the Data to ``filename`` in the NumPy ``.npy`` format. With MPI,
+        each rank writes its own subdomain straight into the shared file, at
+        the corresponding global offsets, via collective MPI-IO. See the public
+        ``data_dump`` method of `Function`.
+        """
+        header = npy_header(self._glb_shape, self.dtype)
+
+        if not self._is_mpi_distributed:
+            with open(filename, 'wb') as f:
+                f.write(header)
+                np.asarray(self).tofile(f)
+            return
+
+        from mpi4py import MPI
+        comm = self._distributor.comm
+        f = MPI.File.Open(comm, filename, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+        try:
+            f.Set_size(0)
+            if comm.rank == 0:
+                f.Write_at(0, header)
+            with self._mpi_slab(MPI, f, len(header)) as buf:
+                f.Write_all(buf)
+        finally:
+            f.Close()
+
+    def _load(self, filename):
+        """
+        Read the Data from ``filename``, a file in the NumPy ``.npy`` format
+        with the same global shape and dtype as ``self``. With MPI, each rank
+        only reads its own subdomain. See the public ``data_load`` method of
+        `Function`.
+        """
+        shape, dtype, fortran_order, offset = npy_read_header(filename)
+        if shape != self._glb_shape or dtype != self.dtype or fortran_order:
+            raise ValueError("Cannot load a `%s` array of shape %s into Data of "
+                             "shape %s and dtype `%s`" %
+                             (dtype, shape, self._glb_shape, self.dtype))
+
+        if not self._is_mpi_distributed:
+            self._local[:] = np.memmap(filename, dtype, 'r', offset, shape)
+            return
+
+        from mpi4py import MPI
+        comm = self._distributor.comm
+        f = MPI.File.Open(comm, filename, MPI.MODE_RDONLY)
+        try:
+            with self._mpi_slab(MPI, f, offset) as buf:
+                f.Read_all(buf)
+        finally:
+            f.Close()
+
+    @property
+    def _glb_shape(self):
+        """The shape of ``self`` as seen from the global domain."""
+        if not self._is_mpi_distributed:
+            return self.shape
+        return tuple(s if dec is None else dec.size
+                     for s, dec in zip(self.shape, self._decomposition))
+
+    @contextmanager
+    def _mpi_slab(self, MPI, f, offset):
+        """
+        Set the view of the MPI file ``f``, whose data starts at ``offset``,
+        to the local subdomain, and yield an MPI buffer spec mapping the
+        local subdomain in memory. No copies are involved, as both the
+        in-file and the in-memory layouts are captured by MPI datatypes.
+        """
+        etype = MPI._typedict[self.dtype.char]
+
+        offsets = [0 if dec is None else dec.loc_abs_min - dec.glb_min
+                   for dec in self._decomposition]
+        if self.size == 0:
+            # This rank owns no points, but must take part in the collective
+            f.Set_view(offset, etype, etype)
+            yield [np.empty(0, dtype=self.dtype), 0, etype]
+            return
+
+        filetype = etype.Create_subarray(self._glb_shape, self.shape, offsets)
+        memtype = etype
+        for n, s in zip(reversed(self.shape), reversed(self.strides)):
+            memtype = memtype.Create_hvector(n, 1, s)
+        filetype.Commit()
+        memtype.Commit()
+
+        nbytes = sum((n - 1)*s for n, s in zip(self.shape, self.strides))
+        buf = MPI.memory.fromaddress(self.ctypes.data, nbytes + self.itemsize)
+        try:
+            f.Set_view(offset, etype, filetype)
+            yield [buf, 1, memtype]
+        finally:
+            filetype.Free()
+            memtype.Free()
+
     def reset(self):
         """Set all Data entries to 0."""
         self[:] = 0.0
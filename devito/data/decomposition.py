@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from collections.abc import Iterable
 
 import numpy as np
@@ -52,6 +53,8 @@ class Decomposition(tuple):
     1
     """
 
+    _glb_to_loc_cache_maxsize = 128
+
     def __new__(cls, items, local):
         if len(items) == 0:
             raise ValueError("The decomposition must contain at least one subdomain")
@@ -101,6 +104,26 @@ class Decomposition(tuple):
     def loc_rel_max(self):
         return self.loc_abs_max - self.loc_abs_min
 
+    @cached_property
+    def _loc_is_range(self):
+        """True if the local subdomain is a range of consecutive indices."""
+        numb = self.loc_abs_numb
+        return numb.size == 0 or bool(np.all(np.diff(numb) == 1))
+
+    @cached_property
+    def _glb_to_loc_cache(self):
+        """
+        The most recently translated ranges, from the least to the most
+        recently used, up to ``_glb_to_loc_cache_maxsize`` entries.
+        """
+        return OrderedDict()
+
+    def _is_loc(self, glb_idx):
+        if self._loc_is_range:
+            return self.loc_abs_min <= glb_idx <= self.loc_abs_max
+        else:
+            return glb_idx in self.loc_abs_numb
+
     @cached_property
     def size(self):
         return sum(i.size for i in self)
@@ -129,7 +152,7 @@ class Decomposition(tuple):
         if mode == 'glb_to_loc':
             return self.index_glb_to_loc(*args, rel=rel)
         elif mode == 'loc_to_glb':
-            return self.index_loc_to_glb(*args, rel=rel)
+            return self.index_loc_to_glb(*args)
         else:
             raise ValueError("Mode not recognised. Available options: "
                              "'glb_to_loc', 'loc_to_glb'")
@@ -156,6 +179,10 @@ class Decomposition(tuple):
               with ``n > 1``.
             * slice(a, b). Like above, with ``min=a`` and ``max=b-1``.
               Return ``slice(min', max'+1)``.
+            * numpy.ndarray of ints. Convert all of the global indices at once,
+              as in the first case. If all of them belong to the local
+              subdomain, return an array of ints, otherwise an object array
+              with ``None`` in place of the non-local indices.
         rel : bool, optional
             If False, convert into an absolute, instead of a relative, local index.
 
@@ -203,8 +230,79 @@ class Decomposition(tuple):
         (5, 7)
         >>> d.index_glb_to_loc((1, 6), rel=False)
         (5, 6)
+
+        Convert an array of global indices
+
+        >>> d.index_glb_to_loc(np.array([5, 7, 6]))
+        array([0, 2, 1])
+        >>> d.index_glb_to_loc(np.array([5, 3, 6]))
+        array([0, None, 1], dtype=object)
         """
+        if len(args) == 1:
+            glb_idx = args[0]
+            if isinstance(glb_idx, np.ndarray):
+                return self._index_glb_to_loc_array(glb_idx, rel)
+            elif isinstance(glb_idx, slice):
+                key = (glb_idx.start, glb_idx.stop, glb_idx.step, rel)
+            elif isinstance(glb_idx, tuple):
+                key = (glb_idx, rel)
+            else:
+                key = None
+
+            # Translating ranges is expensive, so the results for the most
+            # recently used ones are cached
+            cache = self._glb_to_loc_cache
+            if key is not None:
+                try:
+                    retval = cache[key]
+                    cache.move_to_end(key)
+                    return retval
+                except KeyError:
+                    pass
+                except TypeError:
+                    # Unhashable, e.g. a tuple of arrays
+                    key = None
+            retval = self._index_glb_to_loc(*args, rel=rel)
+            if key is not None:
+                cache[key] = retval
+                while len(cache) > self._glb_to_loc_cache_maxsize:
+                    try:
+                        cache.popitem(last=False)
+                    except KeyError:
+                        # Emptied by another thread
+                        break
+            return retval
+
+        return self._index_glb_to_loc(*args, rel=rel)
+
+    def _index_glb_to_loc_array(self, glb_idx, rel=True):
+        if glb_idx.dtype.kind not in 'iu':
+            raise TypeError("Cannot convert index from `%s` array" % glb_idx.dtype)
+        if self.loc_empty:
+            return np.full(glb_idx.shape, None, dtype=object)
+
+        base = self.loc_abs_min if rel is True else 0
+
+        # Handle negative indices
+        idx = glb_idx.astype(np.intp)
+        idx[idx < 0] += self.glb_max + 1
 
+        if self._loc_is_range:
+            is_loc = (idx >= self.loc_abs_min) & (idx <= self.loc_abs_max)
+        else:
+            is_loc = np.isin(idx, self.loc_abs_numb)
+        if is_loc.all():
+            idx -= base
+            return idx
+
+        # As with a single index, the non-local, yet globally legal, indices
+        # become None, while the illegal ones are returned as they are
+        retval = idx.astype(object)
+        retval[is_loc] -= base
+        retval[~is_loc & (idx >= self.glb_min) & (idx <= self.glb_max)] = None
+        return retval
+
+    def _index_glb_to_loc(self, *args, rel=True):
         base = self.loc_abs_min if rel is True else 0
         top = self.loc_abs_max
 
@@ -219,7 +317,7 @@ class Decomposition(tuple):
                 if glb_idx < 0:
                     glb_idx = self.glb_max + glb_idx + 1
                 # -> Do the actual conversion
-                if glb_idx in self.loc_abs_numb:
+                if self._is_loc(glb_idx):
                     return glb_idx - base
                 elif self.glb_min <= glb_idx <= self.glb_max:
                     return None
@@ -341,6 +439,8 @@ class Decomposition(tuple):
             * int. Given ``I``, a local index, return the corresponding
               global local.
             * slice(a, b, c). As above, return the corresponding global slice.
+            * numpy.ndarray of ints. Convert all of the local indices at once,
+              as in the first case.
 
         Raises
         ------
@@ -369,13 +469,29 @@ class Decomposition(tuple):
 
         >>> d.index_loc_to_glb(slice(0, 2, 1))
         slice(5, 7, 1)
+
+        An array of local indices:
+
+        >>> d.index_loc_to_glb(np.array([2, 0, 1]))
+        array([7, 5, 6])
         """
 
         rank_length = self.loc_abs_max - self.loc_abs_min
 
         if len(args) == 1:
             loc_idx = args[0]
-            if is_integer(loc_idx):
+            if isinstance(loc_idx, np.ndarray):
+                if loc_idx.dtype.kind not in 'iu':
+                    raise TypeError("Cannot convert index from `%s` array" %
+                                    loc_idx.dtype)
+                retval = loc_idx + self.loc_abs_min
+                is_oob = (loc_idx < 0) | (loc_idx > rank_length)
+                if is_oob.any():
+                    retval = retval.astype(object)
+                    for i in zip(*np.nonzero(is_oob)):
+                        retval[i] = slice(-1, -2, 1)
+                return retval
+            elif is_integer(loc_idx):
                 # index_loc_to_glb(index)
                 # -> Check the index is in range
                 if loc_idx < 0 or loc_idx > rank_length:
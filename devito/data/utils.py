@@ -1,10 +1,13 @@
+import io
+
 import numpy as np
 
 from devito.tools import Tag, as_tuple, is_integer
 
 __all__ = ['Index', 'NONLOCAL', 'PROJECTED', 'index_is_basic', 'index_apply_modulo',
            'index_dist_to_repl', 'convert_index', 'index_handle_oob',
-           'loc_data_idx', 'mpi_index_maps', 'flip_idx']
+           'loc_data_idx', 'mpi_index_maps', 'flip_idx', 'npy_header',
+           'npy_read_header']
 
 
 class Index(Tag):
@@ -95,7 +98,7 @@ def convert_index(idx, decomposition, mode='glb_to_loc'):
     elif isinstance(idx, (tuple, list)):
         return [decomposition(i, mode=mode) for i in idx]
     elif isinstance(idx, np.ndarray):
-        return np.vectorize(lambda i: decomposition(i, mode=mode))(idx)
+        return decomposition(idx, mode=mode)
     else:
         raise ValueError("Cannot convert index of type `%s` " % type(idx))
 
@@ -108,11 +111,11 @@ def index_handle_oob(idx):
     elif isinstance(idx, (tuple, list)):
         return [i for i in idx if i is not None]
     elif isinstance(idx, np.ndarray):
-        if idx.dtype == np.bool_:
-            # A boolean mask, nothing to do
+        if idx.dtype != object:
+            # A boolean mask or fully local indices, nothing to do
             return idx
         elif idx.ndim == 1:
-            return np.delete(idx, np.where(idx == None))  # noqa
+            return np.delete(idx, np.where(idx == None)).astype(np.intp)  # noqa
         else:
             raise ValueError("Cannot identify OOB accesses when using "
                              "multidimensional index arrays")
@@ -456,3 +459,32 @@ def distributed_data_size(shape, coords, topology):
                     n_dat.append(c_dat+p_dat)
             cshape[my_coords] = as_tuple(n_dat)
     return cshape
+
+
+def npy_header(shape, dtype):
+    """
+    The header of a file in the NumPy ``.npy`` format holding a C-ordered array
+    of given shape and dtype.
+    """
+    header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              'fortran_order': False,
+              'shape': tuple(int(i) for i in shape)}
+    buf = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buf, header)
+    return buf.getvalue()
+
+
+def npy_read_header(filename):
+    """
+    Read the header of the NumPy ``.npy`` file ``filename``. Return the shape
+    and dtype of the stored array, the order flag, and the offset of the data.
+    """
+    with open(filename, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            raise ValueError("Unsupported `.npy` format version %s" % str(version))
+        return shape, dtype, fortran_order, f.tell()
@@ -1,8 +1,8 @@
-import sympy
 import numpy as np
 from cached_property import cached_property
 
 from devito.finite_differences import generate_indices
+from devito.finite_differences.tools import numeric_weights
 from devito.tools import filter_ordered, as_tuple
 from devito.symbolics.search import retrieve_dimensions
 
@@ -248,7 +248,7 @@ def default_rules(obj, functions):
         indices, x0 = generate_indices(function, dim,
                                        fd_order, side=None, x0=mapper)
 
-        coeffs = sympy.finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+        coeffs = numeric_weights(deriv_order, indices, x0)
 
         for j in range(len(coeffs)):
             subs.update({function._coeff_symbol
@@ -1,10 +1,19 @@
+import atexit
+import fcntl
+import json
+import os
 from functools import wraps, partial
 from itertools import product
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
 
 import numpy as np
-from sympy import S, finite_diff_weights, cacheit, sympify
+from sympy import Rational, S, finite_diff_weights, cacheit, sympify
 
-from devito.tools import Tag, as_tuple
+from devito.logger import debug
+from devito.parameters import configuration
+from devito.tools import Tag, as_tuple, make_tempdir
 
 
 class Transpose(Tag):
@@ -146,7 +155,151 @@ def symbolic_weights(function, deriv_order, indices, dim):
 
 @cacheit
 def numeric_weights(deriv_order, indices, x0):
-    return finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+    # The weights only depend on the distance of the indices from `x0`, in
+    # units of grid spacing, so whenever possible they're retrieved from the
+    # table of exact weights, and then scaled by the spacing
+    offsets = [sympify(i - x0) for i in indices]
+    spacings = set().union(*[i.free_symbols for i in offsets])
+    if len(spacings) > 1:
+        return finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+    h = spacings.pop() if spacings else S.One
+
+    offsets = tuple((i/h).expand() for i in offsets)
+    if not all(i.is_Rational for i in offsets):
+        # E.g., an `x0` with a floating-point shift
+        return finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+
+    return [i*h**-deriv_order for i in weights_table.get(deriv_order, offsets)]
+
+
+class WeightsTable(object):
+
+    """
+    A table of finite-difference weights, stored as exact rationals.
+
+    An entry is keyed on the derivative order and the stencil offsets, that is
+    the distance of the stencil points from the expansion point in units of
+    grid spacing. Hence, the same entry serves all Dimensions, grid spacings,
+    and data types. Unless ``configuration['fd-weights-cache']`` is unset, the
+    table is persisted on disk, so that new processes can skip the SymPy
+    computation of the weights altogether. The new entries are written in
+    batches, every ``flush_interval`` entries and at exit.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The file in which the table is stored. Defaults to a file within a
+        deterministic directory in the OS temporary directory.
+    """
+
+    _filename = 'fd-weights.json'
+
+    flush_interval = 64
+    """The number of new entries after which the table is written to disk."""
+
+    def __init__(self, path=None):
+        self._path = Path(path) if path is not None else None
+        self._mapper = None
+        self._pending = {}
+        self._atexit = False
+        self._lock = Lock()
+
+    @property
+    def path(self):
+        if self._path is None:
+            return make_tempdir('fdweights').joinpath(self._filename)
+        return self._path
+
+    @path.setter
+    def path(self, val):
+        with self._lock:
+            self._flush()
+            self._path = Path(val) if val is not None else None
+            self._mapper = None
+
+    @classmethod
+    def _key(cls, deriv_order, offsets):
+        return '%d:%s' % (deriv_order, ','.join(str(i) for i in offsets))
+
+    def _read(self):
+        try:
+            with open(str(self.path)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            debug("Ignoring unreadable finite-difference weights table [%s]" % e)
+            return {}
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            path = self.path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(str(path.with_suffix('.lock')), 'a') as lock:
+                fcntl.lockf(lock, fcntl.LOCK_EX)
+                try:
+                    # Merge with the entries added by other processes in the
+                    # meantime, and write-then-rename, so that readers never
+                    # see partial tables
+                    table = self._read()
+                    table.update(pending)
+                    with NamedTemporaryFile('w', dir=str(path.parent),
+                                            delete=False) as f:
+                        json.dump(table, f)
+                    os.replace(f.name, str(path))
+                finally:
+                    fcntl.lockf(lock, fcntl.LOCK_UN)
+        except OSError as e:
+            debug("Couldn't store the finite-difference weights table [%s]" % e)
+
+    def flush(self):
+        """Write the entries added since the last flush to disk."""
+        with self._lock:
+            self._flush()
+
+    def get(self, deriv_order, offsets):
+        """
+        The weights of the ``deriv_order`` derivative for a stencil whose
+        points are at ``offsets`` from the expansion point.
+        """
+        key = self._key(deriv_order, offsets)
+        persistent = configuration['fd-weights-cache']
+        with self._lock:
+            if self._mapper is None:
+                self._mapper = self._read() if persistent else {}
+
+            try:
+                weights = self._mapper[key]
+            except KeyError:
+                weights = finite_diff_weights(deriv_order, offsets, 0)[-1][-1]
+                weights = [str(i) for i in weights]
+                self._mapper[key] = weights
+                if persistent:
+                    if not self._atexit:
+                        atexit.register(self.flush)
+                        self._atexit = True
+                    self._pending[key] = weights
+                    if len(self._pending) >= self.flush_interval:
+                        self._flush()
+
+        return [Rational(i) for i in weights]
+
+    def clear(self):
+        """Drop all entries, both in memory and on disk."""
+        with self._lock:
+            self._mapper = None
+            self._pending.clear()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+weights_table = WeightsTable()
+"""The default table of finite-difference weights."""
 
 
 def generate_indices(func, dim, order, side=None, x0=None):
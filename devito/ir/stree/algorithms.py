@@ -1,5 +1,6 @@
 from anytree import findall
 
+from devito.exceptions import InvalidOperator
 from devito.ir.stree.tree import (ScheduleTree, NodeIteration, NodeConditional,
                                   NodeSync, NodeExprs, NodeSection, NodeHalo, insert)
 from devito.ir.support import SEQUENTIAL, IterationSpace, normalize_properties
@@ -131,11 +132,27 @@ def stree_make_halo(stree):
 
     # Now fuse the HaloSchemes at the same `stree` depth and perform the insertion
     for spot, halo_schemes in mapper.items():
-        insert(NodeHalo(HaloScheme.union(halo_schemes)), spot.parent, [spot])
+        try:
+            hs = HaloScheme.union(halo_schemes)
+        except ValueError as e:
+            # Time tiling may nest accesses at different time indices within the
+            # same block; harmless, as time tiling is never applied with MPI
+            if not configuration['mpi'] and _is_time_tiled(spot):
+                continue
+            raise InvalidOperator(str(e)) from e
+        insert(NodeHalo(hs), spot.parent, [spot])
 
     return stree
 
 
+def _is_time_tiled(node):
+    """
+    True if ``node`` is nested within a time tile, False otherwise.
+    """
+    return any(n.is_Iteration and n.dim.is_Incr and n.dim.root.is_Time
+               for n in (node,) + node.ancestors)
+
+
 def stree_section(stree):
     """
     Add NodeSections to a ScheduleTree. A NodeSection, or simply "section",
@@ -1,4 +1,6 @@
-from itertools import chain
+from itertools import chain, count
+from threading import get_ident
+from time import time
 
 from cached_property import cached_property
 from sympy import S
@@ -7,10 +9,10 @@ from devito.ir.support.space import Backward, IterationSpace
 from devito.ir.support.vector import LabeledVector, Vector
 from devito.symbolics import retrieve_terminals, q_constant, q_affine
 from devito.tools import (Tag, as_tuple, is_integer, filter_sorted, flatten,
-                          memoized_meth, memoized_generator)
+                          memoized_meth, memoized_generator, timed_pass)
 from devito.types import Dimension, DimensionTuple
 
-__all__ = ['IterationInstance', 'TimedAccess', 'Scope']
+__all__ = ['IterationInstance', 'TimedAccess', 'Scope', 'ScopeCache']
 
 
 class IndexMode(Tag):
@@ -180,6 +182,8 @@ class TimedAccess(IterationInstance):
 
     _modes = ('R', 'W', 'RI', 'WI')
 
+    _tokens = count()
+
     def __new__(cls, indexed, mode, timestamp, ispace=None):
         assert mode in cls._modes
         assert is_integer(timestamp)
@@ -193,6 +197,28 @@ class TimedAccess(IterationInstance):
 
         obj.ispace = ispace or IterationSpace([])
 
+        # The distances computed from `obj` to other TimedAccesses, keyed by
+        # their token. Since a distance only depends on `indexed` and `ispace`,
+        # token and distances may be shared by all TimedAccesses with same
+        # `indexed` and `ispace` (see ScopeCache)
+        obj._token = next(cls._tokens)
+        obj._distances = {}
+
+        # The ScopeCache accounting for the reused distances, if any
+        obj._cache = None
+
+        return obj
+
+    def _rebuild(self, timestamp):
+        """
+        A copy of ``self`` with a different timestamp. As opposed to building
+        a new TimedAccess from scratch, the cached properties (e.g., the
+        ``aindices``) and any distances already computed are retained, as they
+        don't depend on the timestamp.
+        """
+        obj = tuple.__new__(self.__class__, self)
+        obj.__dict__.update(self.__dict__)
+        obj.timestamp = timestamp
         return obj
 
     def __repr__(self):
@@ -305,6 +331,25 @@ class TimedAccess(IterationInstance):
         other : TimedAccess
             The TimedAccess w.r.t. which the distance is computed.
         """
+        try:
+            retval, elapsed = self._distances[other._token]
+        except AttributeError:
+            # E.g., `other` is a plain Vector
+            return self._distance(other)
+        except KeyError:
+            pass
+        else:
+            if self._cache is not None:
+                self._cache._reused_time += elapsed
+            return retval
+
+        tic = time()
+        retval = self._distance(other)
+        self._distances[other._token] = (retval, time() - tic)
+
+        return retval
+
+    def _distance(self, other):
         ret = []
         for sit, oit in zip(self.itintervals, other.itintervals):
             n = len(ret)
@@ -680,56 +725,59 @@ class DependenceGroup(set):
 
 class Scope(object):
 
-    def __init__(self, exprs, rules=None):
+    def __new__(cls, exprs, rules=None):
         """
         A Scope enables data dependence analysis on a totally ordered sequence
         of expressions.
         """
         exprs = as_tuple(exprs)
 
-        self.reads = {}
-        self.writes = {}
+        # A set of rules to drive the collection of dependencies
+        rules = as_tuple(rules)
+        assert all(callable(i) for i in rules)
 
-        self.initialized = set()
+        # Outside of a ScopeCache, a throwaway one is used, which still allows
+        # sharing the distances among the TimedAccesses of this Scope
+        cache = ScopeCache.current() or ScopeCache()
 
-        for i, e in enumerate(exprs):
-            # Reads
-            for j in retrieve_terminals(e.rhs):
-                v = self.reads.setdefault(j.function, [])
-                mode = 'RI' if e.is_Increment and j.function is e.lhs.function else 'R'
-                v.append(TimedAccess(j, mode, i, e.ispace))
+        return cache.fetch(cls, exprs, rules)
 
-            # Write
-            v = self.writes.setdefault(e.lhs.function, [])
-            mode = 'WI' if e.is_Increment else 'W'
-            v.append(TimedAccess(e.lhs, mode, i, e.ispace))
+    def __init__(self, exprs, rules=None):
+        # Bypass the silent call to __init__, as the Scope is fully built in
+        # __new__, or retrieved from a ScopeCache
+        pass
+
+    @classmethod
+    def _build(cls, exprs, rules, accesses, symbol_access):
+        obj = super(Scope, cls).__new__(cls)
+
+        obj.reads = {}
+        obj.writes = {}
 
-            # If an increment, we got one implicit read
-            if e.is_Increment:
-                v = self.reads.setdefault(e.lhs.function, [])
-                v.append(TimedAccess(e.lhs, 'RI', i, e.ispace))
+        obj.initialized = set()
+
+        for e, v in zip(exprs, accesses):
+            for a in v:
+                if a.is_write:
+                    obj.writes.setdefault(a.function, []).append(a)
+                else:
+                    obj.reads.setdefault(a.function, []).append(a)
 
             # If writing to a scalar, we have an initialization
             if not e.is_Increment and e.is_scalar:
-                self.initialized.add(e.lhs.function)
-
-            # Look up ConditionalDimensions
-            for v in e.conditionals.values():
-                for j in retrieve_terminals(v):
-                    v = self.reads.setdefault(j.function, [])
-                    v.append(TimedAccess(j, 'R', -1, e.ispace))
+                obj.initialized.add(e.lhs.function)
 
         # The iteration symbols too
         dimensions = set().union(*[e.dimensions for e in exprs])
         for d in dimensions:
             for i in d._defines_symbols:
                 for j in i.free_symbols:
-                    v = self.reads.setdefault(j.function, [])
-                    v.append(TimedAccess(j, 'R', -1))
+                    v = obj.reads.setdefault(j.function, [])
+                    v.append(symbol_access(j))
 
-        # A set of rules to drive the collection of dependencies
-        self.rules = as_tuple(rules)
-        assert all(callable(i) for i in self.rules)
+        obj.rules = rules
+
+        return obj
 
     def getreads(self, function):
         return as_tuple(self.reads.get(function))
@@ -891,3 +939,170 @@ class Scope(object):
         TimedAccess objects.
         """
         return DependenceGroup(self.d_from_access_gen(accesses))
+
+
+class ScopeCache(object):
+
+    """
+    A context manager to share the data dependence analysis among all of the
+    Scopes built within it. This is useful when many Scopes are built over the
+    same, or largely the same, expressions, as it happens when lowering an
+    Operator, where each compiler pass rebuilds the Scopes of the Clusters it
+    processes.
+
+    Within a ScopeCache:
+
+        * A Scope over the same expressions (with same IterationSpaces,
+          conditionals, etc.) as a previously built Scope is not built again;
+          rather, the previous Scope is returned, including any dependences it
+          has already computed.
+        * The TimedAccesses of an expression are built only the first time the
+          expression is seen; any subsequent Scope reuses copies of them.
+        * The distances between TimedAccesses are computed only once, and
+          shared by all TimedAccesses with same Indexed and IterationSpace.
+          Thus, if only a few expressions are rewritten (e.g., by a compiler
+          pass), only the dependences involving them are actually recomputed.
+
+    The reuse is accumulated, and then recorded, via `timed_pass.record`, in
+    the timings of the ongoing `timed_pass`, if any, once per fetched Scope.
+    """
+
+    caches = {}
+    """
+    A ``thread_id -> ScopeCache`` mapper, so that separate Python threads
+    (e.g., building different Operators) use separate ScopeCaches.
+    """
+
+    def __init__(self):
+        self._scopes = {}
+        self._accesses = {}
+        self._symbols = {}
+        self._distances = {}
+
+        # The reuse not recorded yet
+        self._reused_scopes = 0
+        self._reused_time = 0.
+
+    @classmethod
+    def current(cls):
+        """The ScopeCache in use by the running thread, if any."""
+        return cls.caches.get(get_ident())
+
+    def __enter__(self):
+        # If nested, the outermost ScopeCache is retained
+        self.active = ScopeCache.caches.setdefault(get_ident(), self) is self
+        return self
+
+    def __exit__(self, *args):
+        if self.active:
+            self._record()
+            del ScopeCache.caches[get_ident()]
+
+    def fetch(self, cls, exprs, rules):
+        """
+        Retrieve the Scope of ``exprs`` from the cache, or build it reusing
+        as much as possible of the previously built Scopes.
+        """
+        tic = time()
+
+        # Note: the IterationSpaces are compared by identity, as they are
+        # typically shared by many expressions, while hashing them is expensive
+        keys = [(e, e.is_Increment, id(e.ispace), tuple(e.conditionals.items()))
+                for e in exprs]
+
+        # Scopes with custom rules (typically lambdas) are never reused as a
+        # whole, but they still reuse the TimedAccesses
+        if not rules:
+            dimensions = frozenset().union(*[e.dimensions for e in exprs])
+            key = (cls, tuple(keys), dimensions)
+            try:
+                scope, _, elapsed = self._scopes[key]
+                self._reused_scopes += 1
+                self._reused_time += elapsed
+                self._record()
+                return scope
+            except KeyError:
+                pass
+
+        accesses = []
+        for i, (k, e) in enumerate(zip(keys, exprs)):
+            try:
+                v, _, elapsed = self._accesses[k]
+                self._reused_time += elapsed
+            except KeyError:
+                t0 = time()
+                v = [self._share(a) for a in _timed_accesses(e, i)]
+                # The IterationSpace is retained, so that its id can't be recycled
+                self._accesses[k] = (v, e.ispace, time() - t0)
+            accesses.append([a if a.timestamp in (-1, i) else a._rebuild(i) for a in v])
+
+        scope = cls._build(exprs, rules, accesses, self.symbol_access)
+
+        if not rules:
+            self._scopes[key] = (scope, exprs, time() - tic)
+
+        self._record()
+
+        return scope
+
+    def _record(self):
+        """
+        Record the reuse accumulated so far, including that of the distances
+        computed by the Scopes already fetched.
+        """
+        if self._reused_scopes:
+            timed_pass.record('reused-scopes', self._reused_scopes)
+        if self._reused_time:
+            timed_pass.record('reused-time', self._reused_time)
+        self._reused_scopes = 0
+        self._reused_time = 0.
+
+    def symbol_access(self, symbol):
+        """
+        The TimedAccess reading an iteration symbol (e.g., `x_m`).
+        """
+        try:
+            return self._symbols[symbol]
+        except KeyError:
+            return self._symbols.setdefault(symbol, TimedAccess(symbol, 'R', -1))
+
+    def _share(self, access):
+        """
+        Attach to ``access`` the token and distances of the TimedAccesses with
+        same Indexed and IterationSpace, if any.
+        """
+        key = (access.indexed, id(access.ispace))
+        try:
+            _, access._token, access._distances = self._distances[key]
+        except KeyError:
+            self._distances[key] = (access.ispace, access._token, access._distances)
+        access._cache = self
+        return access
+
+
+def _timed_accesses(e, timestamp):
+    """
+    The TimedAccesses performed by the expression ``e``, which appears in the
+    position ``timestamp`` of the execution flow.
+    """
+    retval = []
+
+    # Reads
+    for j in retrieve_terminals(e.rhs):
+        mode = 'RI' if e.is_Increment and j.function is e.lhs.function else 'R'
+        retval.append(TimedAccess(j, mode, timestamp, e.ispace))
+
+    # Write
+    mode = 'WI' if e.is_Increment else 'W'
+    retval.append(TimedAccess(e.lhs, mode, timestamp, e.ispace))
+
+    # If an increment, we got one implicit read
+    if e.is_Increment:
+        retval.append(TimedAccess(e.lhs, 'RI', timestamp, e.ispace))
+
+    # Look up ConditionalDimensions
+    for v in e.conditionals.values():
+        for j in retrieve_terminals(v):
+            retval.append(TimedAccess(j, 'R', -1, e.ispace))
+
+    return retval
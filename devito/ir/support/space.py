@@ -185,6 +185,11 @@ class Interval(AbstractInterval):
             assert d.symbolic_incr == self.dim.symbolic_max
             npoints += 1 * (n-1)
             npoints /= n
+        elif self.dim.is_Incr and self.dim.size is not None:
+            # Special case 2)
+            # An IncrDimension with a nominal size, e.g. one whose bounds are
+            # clipped to the parent's by time tiling
+            npoints = self.dim.symbolic_size + self.upper - self.lower
         else:
             # Typically we end up here (Dimension, SubDimension, IncrDimension)
             assert not self.dim.is_Modulo
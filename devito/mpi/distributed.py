@@ -372,11 +372,42 @@ class Distributor(AbstractDistributor):
 
         return ret
 
+    @cached_property
+    def neighbours(self):
+        """
+        The calling MPI rank's neighbours in the decomposed grid, including the
+        diagonal ones, as a tuple of 2-tuples ``(sides, p)``, where ``sides`` is
+        a tuple of DataSides as in :attr:`neighborhood` and ``p`` the rank of
+        the neighbour. Ranks beyond the grid boundary (MPI.PROC_NULL) are
+        excluded.
+        """
+        neighborhood = self.neighborhood
+        ret = []
+        for i in product([LEFT, CENTER, RIGHT], repeat=self.ndim):
+            if all(s is CENTER for s in i) or neighborhood[i] == MPI.PROC_NULL:
+                continue
+            ret.append((i, neighborhood[i]))
+        return tuple(ret)
+
+    @cached_property
+    def graph_comm(self):
+        """
+        A distributed graph communicator connecting the calling MPI rank to its
+        :attr:`neighbours`, in the same order, for neighbourhood collectives.
+        """
+        ranks = [p for _, p in self.neighbours]
+        return self.comm.Create_dist_graph_adjacent(ranks, ranks, reorder=False)
+
     @cached_property
     def _obj_comm(self):
         """An Object representing the MPI communicator."""
         return MPICommObject(self.comm)
 
+    @cached_property
+    def _obj_graph_comm(self):
+        """An Object representing the distributed graph communicator."""
+        return MPIGraphCommObject(self.graph_comm)
+
     @cached_property
     def _obj_neighborhood(self):
         """
@@ -495,6 +526,19 @@ class MPICommObject(Object):
     _pickle_args = []
 
 
+class MPIGraphCommObject(MPICommObject):
+
+    name = 'gcomm'
+
+    def _arg_values(self, *args, **kwargs):
+        grid = kwargs.get('grid', None)
+        # Update `gcomm` based on object attached to `grid`
+        if grid is not None:
+            return grid.distributor._obj_graph_comm._arg_defaults()
+        else:
+            return self._arg_defaults()
+
+
 class MPINeighborhood(CompositeObject):
 
     def __init__(self, neighborhood):
@@ -1,10 +1,11 @@
 import abc
 from collections import OrderedDict
-from ctypes import POINTER, c_void_p, c_int, sizeof
+from ctypes import POINTER, c_void_p, c_int, c_ssize_t, sizeof
 from functools import reduce
 from itertools import product
 from operator import mul
 
+import numpy as np
 from sympy import Integer
 
 from devito.data import OWNED, HALO, NOPAD, LEFT, CENTER, RIGHT, default_allocator
@@ -910,6 +911,200 @@ class FullHaloExchangeBuilder(Overlap2HaloExchangeBuilder):
         return Prodder(poke.name, poke.parameters, single_thread=True, periodic=True)
 
 
+class PersistentHaloExchangeBuilder(Diag2HaloExchangeBuilder):
+
+    """
+    A Diag2HaloExchangeBuilder using persistent communication requests.
+    The requests are created in Python-land, through MPI_Send_init and
+    MPI_Recv_init, before jumping to C-land, so that each halo exchange only
+    needs to (re)activate them through MPI_Start.
+
+    Generates:
+
+        haloupdate()
+        halowait()
+        compute()
+    """
+
+    def _make_msg(self, f, hse, key):
+        # Only retain the halos required by the Diag scheme
+        halos = sorted(i for i in hse.halos if isinstance(i.dim, tuple))
+        return MPIMsgPersistent('msg%d' % key, f, halos)
+
+    def _make_haloupdate(self, f, hse, key, msg=None):
+        fixed = {d: Symbol(name="o%s" % d.root) for d in hse.loc_indices}
+
+        dim = Dimension(name='i')
+
+        msgi = IndexedPointer(msg, dim)
+
+        bufg = FieldFromComposite(msg._C_field_bufg, msgi)
+
+        torank = FieldFromComposite(msg._C_field_to, msgi)
+
+        sizes = [FieldFromComposite('%s[%d]' % (msg._C_field_sizes, i), msgi)
+                 for i in range(len(f._dist_dimensions))]
+        ofsg = [FieldFromComposite('%s[%d]' % (msg._C_field_ofsg, i), msgi)
+                for i in range(len(f._dist_dimensions))]
+        ofsg = [fixed.get(d) or ofsg.pop(0) for d in f.dimensions]
+
+        # The `gather` is unnecessary if sending to MPI.PROC_NULL
+        gather = Call('gather%s' % key, [bufg] + sizes + [f] + ofsg)
+        gather = Conditional(CondNe(torank, Macro('MPI_PROC_NULL')), gather)
+
+        # The requests are already bound to the buffers and peers, so they
+        # only need to be activated. Note: MPI_Startall isn't an option, as the
+        # requests are scattered over the `msg` entries rather than contiguous
+        rrecv = Byref(FieldFromComposite(msg._C_field_rrecv, msgi))
+        rsend = Byref(FieldFromComposite(msg._C_field_rsend, msgi))
+        recv = Call('MPI_Start', [rrecv])
+        send = Call('MPI_Start', [rsend])
+
+        # The -1 below is because an Iteration, by default, generates <=
+        ncomms = Symbol(name='ncomms')
+        iet = Iteration([recv, gather, send], dim, ncomms - 1)
+        parameters = ([f, msg, ncomms]) + list(fixed.values())
+        return HaloUpdate(key, iet, parameters)
+
+    def _call_haloupdate(self, name, f, hse, msg):
+        args = [f, msg, msg.npeers] + list(hse.loc_indices.values())
+        return HaloUpdateCall(name, args)
+
+
+class OverlapPersistentHaloExchangeBuilder(Overlap2HaloExchangeBuilder):
+
+    """
+    An Overlap2HaloExchangeBuilder using persistent communication requests,
+    as in PersistentHaloExchangeBuilder.
+
+    Generates:
+
+        haloupdate()
+        compute_core()
+        halowait()
+        remainder()
+    """
+
+    _make_msg = PersistentHaloExchangeBuilder._make_msg
+    _make_haloupdate = PersistentHaloExchangeBuilder._make_haloupdate
+    _call_haloupdate = PersistentHaloExchangeBuilder._call_haloupdate
+
+
+class NeighborhoodHaloExchangeBuilder(DiagHaloExchangeBuilder):
+
+    """
+    A DiagHaloExchangeBuilder performing the halo exchanges through neighbourhood
+    collectives (MPI_Neighbor_alltoallw) over a distributed graph communicator,
+    which connects each MPI rank to all of its neighbours, including the
+    diagonal ones. The halo regions are described by MPI derived datatypes, built
+    in Python-land, so no explicit gather/scatter is required. The Functions in
+    a HaloSpot with same ``loc_indices`` and layout are exchanged by the same
+    collective.
+
+    Generates:
+
+        haloupdate()
+        compute()
+    """
+
+    def make(self, hs):
+        # Sanity check
+        assert all(f.is_Function and f.grid is not None for f in hs.fmapper)
+
+        # Group the Functions whose halos can be exchanged by the same collective
+        groups = OrderedDict()
+        for f, hse in hs.fmapper.items():
+            groups.setdefault(self._make_group_key(f, hse), []).append((f, hse))
+
+        haloupdates = []
+        for group in groups.values():
+            group = tuple(group)
+            functions, hses = zip(*group)
+
+            # Build an MPIMsgNeighborhood, carrying the datatypes for all of
+            # the `functions`
+            if group not in self._msgs:
+                key = self._gen_msgkey()
+                msg = self._msgs.setdefault(group, self._make_msg(functions, hses, key))
+            else:
+                msg = self._msgs[group]
+
+            # Callable for the collective
+            key = (tuple(f.dimensions for f in functions), tuple(hses[0].loc_indices))
+            try:
+                haloupdate = self._cache_dims[key]
+            except KeyError:
+                haloupdate = self._make_haloupdate(functions, hses[0],
+                                                   self._gen_commkey(), msg=msg)
+                self._cache_dims[key] = haloupdate
+                self._efuncs.append(haloupdate)
+            self._objs.add(functions[0].grid.distributor._obj_graph_comm)
+
+            haloupdates.append(self._call_haloupdate(haloupdate.name, functions,
+                                                     hses[0], msg))
+
+        return List(body=[HaloUpdateList(body=haloupdates), hs.body])
+
+    def _make_group_key(self, f, hse):
+        # The Functions in a group share the address offset of the halo regions
+        # along the `loc_indices`, hence they must have the same layout along
+        # the Dimensions of the `loc_indices`
+        strides = tuple(reduce(mul, f.shape_allocated[i+1:], 1)
+                        for i, d in enumerate(f.dimensions) if d in hse.loc_indices)
+        return (f.grid, tuple(hse.loc_indices.items()), np.dtype(f.dtype), strides)
+
+    def _make_msg(self, functions, hses, key):
+        # Only retain the halos required by the Diag scheme
+        halos = [sorted(i for i in hse.halos if isinstance(i.dim, tuple))
+                 for hse in hses]
+        return MPIMsgNeighborhood('msg%d' % key, functions, halos)
+
+    def _make_haloupdate(self, functions, hse, key, msg=None):
+        gcomm = functions[0].grid.distributor._obj_graph_comm
+
+        dfs = [f.__class__.__base__(name='a%d' % i, grid=f.grid, shape=f.shape_global,
+                                    dimensions=f.dimensions)
+               for i, f in enumerate(functions)]
+
+        fixed = {d: Symbol(name="o%s" % d.root) for d in hse.loc_indices}
+
+        # The datatypes are relative to the first element of the first Function
+        # along the `loc_indices`
+        df = dfs[0]
+        buf = Byref(df.indexed[[fixed.get(d, 0) for d in df.dimensions]])
+
+        sbuf = FieldFromPointer(msg._C_field_sbuf, msg)
+        ssize = FieldFromPointer(msg._C_field_ssize, msg)
+        pcount = FieldFromPointer(msg._C_field_pcount, msg)
+        ptype = FieldFromPointer(msg._C_field_ptype, msg)
+        scounts = FieldFromPointer(msg._C_field_scounts, msg)
+        rcounts = FieldFromPointer(msg._C_field_rcounts, msg)
+        sdispls = FieldFromPointer(msg._C_field_sdispls, msg)
+        rdispls = FieldFromPointer(msg._C_field_rdispls, msg)
+        stypes = FieldFromPointer(msg._C_field_stypes, msg)
+        rtypes = FieldFromPointer(msg._C_field_rtypes, msg)
+
+        # MPI forbids aliased send and receive buffers (and neighbourhood
+        # collectives don't support MPI_IN_PLACE), so the OWNED regions are
+        # first packed into a separate send buffer, while the HALO regions are
+        # still received in place
+        position = Symbol(name='position')
+        iet = List(body=[
+            Expression(DummyEq(position, 0)),
+            Call('MPI_Pack', [buf, pcount, ptype, sbuf, ssize, Byref(position),
+                              gcomm]),
+            Call('MPI_Neighbor_alltoallw', [sbuf, scounts, sdispls, stypes,
+                                            buf, rcounts, rdispls, rtypes, gcomm])
+        ])
+        parameters = dfs + [gcomm, msg] + list(fixed.values())
+        return HaloUpdate(key, iet, parameters)
+
+    def _call_haloupdate(self, name, functions, hse, msg):
+        gcomm = functions[0].grid.distributor._obj_graph_comm
+        args = list(functions) + [gcomm, msg] + list(hse.loc_indices.values())
+        return HaloUpdateCall(name, args)
+
+
 mpi_registry = {
     True: BasicHaloExchangeBuilder,
     'basic': BasicHaloExchangeBuilder,
@@ -917,7 +1112,10 @@ mpi_registry = {
     'diag2': Diag2HaloExchangeBuilder,
     'overlap': OverlapHaloExchangeBuilder,
     'overlap2': Overlap2HaloExchangeBuilder,
-    'full': FullHaloExchangeBuilder
+    'full': FullHaloExchangeBuilder,
+    'persistent': PersistentHaloExchangeBuilder,
+    'overlap-persistent': OverlapPersistentHaloExchangeBuilder,
+    'neighborhood': NeighborhoodHaloExchangeBuilder
 }
 
 
@@ -1155,6 +1353,238 @@ class MPIMsgEnriched(MPIMsg):
         return {self.name: self.value}
 
 
+class MPIMsgPersistent(MPIMsgEnriched):
+
+    """
+    An MPIMsgEnriched whose send/recv requests are persistent. The requests are
+    created along with the buffers they're bound to, right before jumping to
+    C-land, and released along with them upon returning to Python-land.
+    """
+
+    def __init__(self, name, target, halos):
+        super(MPIMsgPersistent, self).__init__(name, target, halos)
+
+        # The persistent requests, to be freed upon returning from C-land
+        self._requests = []
+
+    def _C_memfree(self):
+        # The requests must be freed before the buffers they're bound to. Upon
+        # interpreter exit, MPI may have been finalized, and the requests with it
+        if not MPI.Is_finalized():
+            for i in self._requests:
+                i.Free()
+        self._requests[:] = []
+        super(MPIMsgPersistent, self)._C_memfree()
+
+    def _arg_defaults(self, alias=None):
+        super(MPIMsgPersistent, self)._arg_defaults(alias)
+
+        target = alias or self.target
+        comm = target.grid.distributor.comm
+        ctype = dtype_to_ctype(target.dtype)
+        mpitype = MPI._typedict[np.dtype(target.dtype).char]
+        for i, halo in enumerate(self.halos):
+            entry = self.value[i]
+            size = reduce(mul, [entry.sizes[j] for j in range(len(halo.dim))], 1)
+            # Wrap the just allocated buffers so that mpi4py can bind them
+            bufg = (ctype*size).from_address(entry.bufg)
+            bufs = (ctype*size).from_address(entry.bufs)
+            rrecv = comm.Recv_init([bufs, mpitype], source=entry.fromrank, tag=13)
+            rsend = comm.Send_init([bufg, mpitype], dest=entry.torank, tag=13)
+            entry.rrecv = MPI._handleof(rrecv)
+            entry.rsend = MPI._handleof(rsend)
+            self._requests.extend([rrecv, rsend])
+
+        return {self.name: self.value}
+
+
+class MPIMsgNeighborhood(CompositeObject):
+
+    """
+    The arguments of a neighbourhood collective exchanging the halos of one or
+    more Functions. For each neighbour in the distributed graph communicator,
+    the send (OWNED) and receive (HALO) regions of all Functions are described
+    by a single MPI derived datatype. The send regions are packed, through the
+    concatenation of all send datatypes, into a separate send buffer, as the
+    send and receive buffers may not be aliased. The datatypes are created right
+    before jumping to C-land and released upon returning to Python-land.
+    """
+
+    _C_field_sbuf = 'sbuf'
+    _C_field_ssize = 'ssize'
+    _C_field_pcount = 'pcount'
+    _C_field_ptype = 'ptype'
+    _C_field_scounts = 'scounts'
+    _C_field_rcounts = 'rcounts'
+    _C_field_sdispls = 'sdispls'
+    _C_field_rdispls = 'rdispls'
+    _C_field_stypes = 'stypes'
+    _C_field_rtypes = 'rtypes'
+
+    if MPI._sizeof(MPI.Datatype) == sizeof(c_int):
+        c_mpidatatype = type('MPI_Datatype', (c_int,), {})
+    else:
+        c_mpidatatype = type('MPI_Datatype', (c_void_p,), {})
+    c_mpiaint = type('MPI_Aint', (c_ssize_t,), {})
+
+    fields = [
+        (_C_field_sbuf, c_void_p),
+        (_C_field_ssize, c_int),
+        (_C_field_pcount, c_int),
+        (_C_field_ptype, c_mpidatatype),
+        (_C_field_scounts, POINTER(c_int)),
+        (_C_field_rcounts, POINTER(c_int)),
+        (_C_field_sdispls, POINTER(c_mpiaint)),
+        (_C_field_rdispls, POINTER(c_mpiaint)),
+        (_C_field_stypes, POINTER(c_mpidatatype)),
+        (_C_field_rtypes, POINTER(c_mpidatatype))
+    ]
+
+    def __init__(self, name, targets, halos):
+        self._targets = tuple(targets)
+        self._halos = tuple(tuple(i) for i in halos)
+
+        super(MPIMsgNeighborhood, self).__init__(name, 'nmsg', self.fields)
+
+        # The derived datatypes, to be freed upon returning from C-land
+        self._datatypes = []
+
+        # The send buffer, to be kept alive while in C-land
+        self._sbuf = None
+
+    def __del__(self):
+        self._C_memfree()
+
+    def _C_memfree(self):
+        if MPI.Is_finalized():
+            return
+        for i in self._datatypes:
+            i.Free()
+        self._datatypes[:] = []
+        self._sbuf = None
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def halos(self):
+        return self._halos
+
+    def _make_datatype(self, target, halos, sides, recv):
+        """
+        The subarray datatype describing the region of ``target`` to be sent
+        to (``recv=False``) or received from (``recv=True``) the neighbour at
+        ``sides``, or None if there's nothing to exchange.
+        """
+        # Sending to `sides` the OWNED region facing `sides`, receiving from
+        # `sides` into the HALO region facing `sides`
+        if recv:
+            sides = tuple(i.flip() for i in sides)
+        wanted = dict(zip(target.grid.distributor.dimensions, sides))
+        for halo in halos:
+            mapper = dict(zip(halo.dim, halo.side))
+            if mapper == wanted:
+                break
+        else:
+            return None
+
+        subsizes = []
+        starts = []
+        for d in target.dimensions:
+            try:
+                side = mapper[d]
+            except KeyError:
+                # A `loc_index`, resolved in C-land
+                subsizes.append(1)
+                starts.append(0)
+                continue
+            if side is CENTER:
+                subsizes.append(target._size_domain[d])
+                starts.append(target._offset_owned[d].left)
+            elif recv:
+                subsizes.append(getattr(target._size_owned[d], side.name))
+                starts.append(getattr(target._offset_halo[d], side.flip().name))
+            else:
+                subsizes.append(getattr(target._size_owned[d], side.name))
+                starts.append(getattr(target._offset_owned[d], side.name))
+        if any(i == 0 for i in subsizes):
+            return None
+
+        mpitype = MPI._typedict[np.dtype(target.dtype).char]
+        return mpitype.Create_subarray(target.shape_allocated, subsizes, starts)
+
+    def _arg_defaults(self, targets=None):
+        targets = targets or self.targets
+        neighbours = targets[0].grid.distributor.neighbours
+
+        # The displacement of each target w.r.t. the first one
+        addresses = [i._data_buffer.ctypes.data for i in targets]
+        displacements = [i - addresses[0] for i in addresses]
+
+        # One (send, recv) pair of derived datatypes per neighbour, or None
+        # if there's nothing to exchange
+        entries = ([], [])
+        for sides, _ in neighbours:
+            for recv, v in enumerate(entries):
+                items = [(self._make_datatype(f, h, sides, recv), i)
+                         for f, h, i in zip(targets, self.halos, displacements)]
+                items = [(t, i) for t, i in items if t is not None]
+                if not items:
+                    v.append(None)
+                    continue
+                types, displs = zip(*items)
+                datatype = MPI.Datatype.Create_struct([1]*len(types), displs, types)
+                datatype.Commit()
+                for t in types:
+                    t.Free()
+                self._datatypes.append(datatype)
+                v.append(datatype)
+        stypes, rtypes = entries
+
+        # The send regions, in neighbour order, are packed by a single MPI_Pack
+        # into the send buffer, where they are then sent from as MPI_PACKED.
+        # Note: the packed size of a datatype is its size, as packing is a plain
+        # copy within homogeneous MPI environments
+        types = [i for i in stypes if i is not None]
+        if types:
+            ptype = MPI.Datatype.Create_struct([1]*len(types), [0]*len(types), types)
+            ptype.Commit()
+            self._datatypes.append(ptype)
+        else:
+            ptype = MPI.BYTE
+        scounts = [0 if i is None else i.Get_size() for i in stypes]
+        sdispls = [sum(scounts[:i]) for i in range(len(scounts))]
+        ssize = sum(scounts)
+        self._sbuf = np.empty(max(ssize, 1), dtype=np.uint8)
+
+        n = len(neighbours)
+        value = self.value._obj
+        value.sbuf = self._sbuf.ctypes.data
+        value.ssize = ssize
+        value.pcount = int(bool(types))
+        value.ptype = MPI._handleof(ptype)
+        value.scounts = (c_int*n)(*scounts)
+        value.sdispls = (self.c_mpiaint*n)(*sdispls)
+        value.stypes = (self.c_mpidatatype*n)(*[MPI._handleof(MPI.PACKED)]*n)
+        value.rcounts = (c_int*n)(*[int(i is not None) for i in rtypes])
+        value.rtypes = (self.c_mpidatatype*n)(*[MPI._handleof(i or MPI.BYTE)
+                                                for i in rtypes])
+        # The receive displacements are embedded in the datatypes
+        value.rdispls = (self.c_mpiaint*n)()
+
+        return {self.name: self.value}
+
+    def _arg_values(self, args=None, **kwargs):
+        return self._arg_defaults([kwargs.get(i.name, i) for i in self.targets])
+
+    def _arg_apply(self, *args, **kwargs):
+        self._C_memfree()
+
+    # Pickling support
+    _pickle_args = ['name', 'targets', 'halos']
+
+
 class MPIRegion(CompositeObject):
 
     def __init__(self, prefix, key, arguments, owned):
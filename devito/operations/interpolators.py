@@ -10,7 +10,8 @@ from devito.tools import powerset, flatten, prod
 from devito.types import (ConditionalDimension, Dimension, DefaultDimension, Eq, Inc,
                           Evaluable, Symbol, SubFunction)
 
-__all__ = ['LinearInterpolator', 'PrecomputedInterpolator']
+__all__ = ['LinearInterpolator', 'PrecomputedInterpolator', 'LagrangeInterpolator',
+           'SincInterpolator']
 
 
 class UnevaluatedSparseOperation(Evaluable):
@@ -92,6 +93,12 @@ class GenericInterpolator(ABC):
     Abstract base class defining the interface for an interpolator.
     """
 
+    _sub_functions = ()
+    """
+    Names of the SubFunctions, attached to the SparseFunction, carrying metadata
+    derived from the sparse point coordinates.
+    """
+
     @abstractmethod
     def inject(self, *args, **kwargs):
         pass
@@ -100,6 +107,13 @@ class GenericInterpolator(ABC):
     def interpolate(self, *args, **kwargs):
         pass
 
+    def _sub_function_values(self, coordinates):
+        """
+        The runtime values of the SubFunctions in ``_sub_functions``, given the
+        (rank-local) coordinates of the sparse points.
+        """
+        return {}
+
 
 class LinearInterpolator(GenericInterpolator):
 
@@ -161,6 +175,14 @@ class LinearInterpolator(GenericInterpolator):
         A = A.subs(reference_cell)
         return A.inv().T * p
 
+    @cached_property
+    def _point_dimensions(self):
+        """
+        The Dimensions of ``self.sfunction`` up to, and including, the sparse one.
+        """
+        dimensions = self.sfunction.dimensions
+        return dimensions[:dimensions.index(self.sfunction._sparse_dim) + 1]
+
     def _interpolation_indices(self, variables, offset=0, field_offset=0):
         """
         Generate interpolation indices for the DiscreteFunctions in ``variables``.
@@ -184,16 +206,20 @@ class LinearInterpolator(GenericInterpolator):
             # Track Indexed substitutions
             idx_subs.append(mapper)
 
+        # The temporaries only depend on the sparse point, not on the Dimensions
+        # following it, if any (e.g., a batch of shots)
+        implicit_dims = self._point_dimensions
+
         # Temporaries for the position
-        temps = [Eq(v, k, implicit_dims=self.sfunction.dimensions)
+        temps = [Eq(v, k, implicit_dims=implicit_dims)
                  for k, v in self.sfunction._position_map.items()]
         # Temporaries for the indirection dimensions
         temps.extend([Eq(v, k.subs(self.sfunction._position_map),
-                         implicit_dims=self.sfunction.dimensions)
+                         implicit_dims=implicit_dims)
                       for k, v in points.items()])
         # Temporaries for the coefficients
         temps.extend([Eq(p, c.subs(self.sfunction._position_map),
-                         implicit_dims=self.sfunction.dimensions)
+                         implicit_dims=implicit_dims)
                       for p, c in zip(self.sfunction._point_symbols,
                                       self.sfunction._coordinate_bases(field_offset))])
 
@@ -233,11 +259,18 @@ class LinearInterpolator(GenericInterpolator):
             args = [_expr.xreplace(v_sub) * b.xreplace(v_sub)
                     for b, v_sub in zip(self._interpolation_coeffs, idx_subs)]
 
-            # Accumulate point-wise contributions into a temporary
-            rhs = Symbol(name='sum', dtype=self.sfunction.dtype)
-            summands = [Eq(rhs, 0., implicit_dims=self.sfunction.dimensions)]
-            summands.extend([Inc(rhs, i, implicit_dims=self.sfunction.dimensions)
-                            for i in args])
+            if self._point_dimensions == self.sfunction.dimensions:
+                # Accumulate point-wise contributions into a temporary
+                rhs = Symbol(name='sum', dtype=self.sfunction.dtype)
+                summands = [Eq(rhs, 0., implicit_dims=self.sfunction.dimensions)]
+                summands.extend([Inc(rhs, i, implicit_dims=self.sfunction.dimensions)
+                                for i in args])
+            else:
+                # A scalar temporary can't be shared across the Dimensions
+                # following the sparse one, so the contributions are summed up
+                # straight away
+                rhs = sympy.Add(*args)
+                summands = []
 
             # Write/Incr `self`
             lhs = self.sfunction.subs(self_subs)
@@ -297,7 +330,7 @@ class PrecomputedInterpolator(GenericInterpolator):
         self.obj = obj
         self._npoint = obj._npoint
         gridpoints = SubFunction(name="%s_gridpoints" % self.obj.name, dtype=np.int32,
-                                 dimensions=(self.obj.indices[-1], Dimension(name='d')),
+                                 dimensions=(self.obj._sparse_dim, Dimension(name='d')),
                                  shape=(self._npoint, self.obj.grid.dim), space_order=0,
                                  parent=self.obj)
 
@@ -306,7 +339,7 @@ class PrecomputedInterpolator(GenericInterpolator):
         self.obj._gridpoints = gridpoints
 
         interpolation_coeffs = SubFunction(name="%s_interpolation_coeffs" % self.obj.name,
-                                           dimensions=(self.obj.indices[-1],
+                                           dimensions=(self.obj._sparse_dim,
                                                        Dimension(name='d'),
                                                        Dimension(name='i')),
                                            shape=(self.obj.npoint, self.obj.grid.dim,
@@ -380,3 +413,261 @@ class PrecomputedInterpolator(GenericInterpolator):
             return [Eq(_field, _field + rhs.subs(dim_subs))]
 
         return Injection(field, expr, offset, self, callback)
+
+
+class WeightedInterpolator(GenericInterpolator):
+
+    """
+    Abstract base class for separable interpolation schemes of radius ``r``,
+    in which a sparse point interacts with the ``2r`` closest grid points along
+    each Dimension through one weight per grid point and Dimension.
+
+    The reference grid point and the weights of each sparse point are computed
+    from the coordinates, with NumPy, right before running an Operator. They
+    are then passed to the Operator through two SubFunctions, so the generated
+    code consists of ``2r``-long loops within the loop over the sparse points.
+
+    Parameters
+    ----------
+    sfunction: The SparseFunction that this Interpolator operates on.
+    r : int
+        The radius of the interpolation scheme.
+
+    Notes
+    -----
+    With MPI, a sparse point lying within ``r`` grid points from the boundary
+    of a subdomain is interpolated correctly only if the halo of the
+    interpolated Functions is at least ``r`` points wide.
+    """
+
+    _sub_functions = ('_interpolation_gridpoints', '_interpolation_coeffs')
+
+    def __init__(self, sfunction, r):
+        if not isinstance(r, int):
+            raise TypeError('Need `r` int argument')
+        if r <= 0:
+            raise ValueError('`r` must be > 0')
+        self.sfunction = sfunction
+        self.r = r
+
+        p = sfunction._sparse_dim
+        d = Dimension(name='d')
+        i = Dimension(name='i_%s' % sfunction.name)
+        sfunction._interpolation_gridpoints = SubFunction(
+            name="%s_gridpoints" % sfunction.name, dtype=np.int32, dimensions=(p, d),
+            shape=(sfunction.npoint, self.grid.dim), space_order=0, parent=sfunction
+        )
+        sfunction._interpolation_coeffs = SubFunction(
+            name="%s_interpolation_coeffs" % sfunction.name, dtype=sfunction.dtype,
+            dimensions=(p, d, i), shape=(sfunction.npoint, self.grid.dim, 2*r),
+            space_order=0, parent=sfunction
+        )
+
+    @property
+    def grid(self):
+        return self.sfunction.grid
+
+    @cached_property
+    def _taps(self):
+        """The offsets of the grid points from the reference grid point."""
+        return np.arange(-self.r + 1, self.r + 1)
+
+    @abstractmethod
+    def _weights(self, x):
+        """
+        The weights of the grid points at offsets ``self._taps`` for the sparse
+        points at fractional positions ``x``, in [0, 1), from the reference grid
+        point. The returned array has shape ``x.shape + (2r,)``.
+        """
+        pass
+
+    def _sub_function_values(self, coordinates):
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        coordinates = coordinates.reshape(-1, self.grid.dim)
+        origin = np.array(self.grid.origin, dtype=np.float64)
+        spacing = np.array(self.grid.spacing, dtype=np.float64)
+
+        position = (coordinates - origin) / spacing
+        reference = np.floor(position)
+
+        gridpoints = reference.astype(np.int32) + self._taps[0]
+        coeffs = self._weights(position - reference).astype(self.sfunction.dtype)
+
+        return {self.sfunction._interpolation_gridpoints: gridpoints,
+                self.sfunction._interpolation_coeffs: coeffs}
+
+    def _interpolation_indices(self, variables, halo=False):
+        """
+        Generate the interpolation indices for the DiscreteFunctions in
+        ``variables``. Return the substitutions from the grid Dimensions to the
+        interpolation indices, the interpolation weights, and the
+        ConditionalDimensions preventing out-of-bounds accesses.
+
+        With ``halo=True``, the grid points within the halo of ``variables``
+        are accessed too.
+        """
+        for f in variables:
+            if any(i != 0 for i in f.origin):
+                raise NotImplementedError("`%s` doesn't support staggered Functions"
+                                          % type(self).__name__)
+
+        sf = self.sfunction
+        p = sf._sparse_dim
+
+        subs = {}
+        weights = []
+        conditionals = []
+        for n, d in enumerate(self.grid.dimensions):
+            rd = DefaultDimension(name='r%s_%s' % (d.name, sf.name),
+                                  default_value=2*self.r)
+            idx = sf._interpolation_gridpoints[p, n] + rd
+
+            if halo:
+                sizes = [f._size_halo[d] for f in variables if d in f.dimensions]
+                lpad = min([i.left for i in sizes], default=0)
+                rpad = min([i.right for i in sizes], default=0)
+            else:
+                lpad = rpad = 0
+            lb = sympy.And(idx >= d.symbolic_min - lpad, evaluate=False)
+            ub = sympy.And(idx <= d.symbolic_max + rpad, evaluate=False)
+            condition = sympy.And(lb, ub, evaluate=False)
+
+            subs[d] = idx
+            weights.append(sf._interpolation_coeffs[p, n, rd])
+            conditionals.append(ConditionalDimension('%s_c' % rd.name, rd,
+                                                     condition=condition))
+
+        return subs, prod(weights), tuple(conditionals)
+
+    def interpolate(self, expr, offset=0, increment=False, self_subs={}):
+        """
+        Generate equations interpolating an arbitrary expression into ``self``.
+
+        Parameters
+        ----------
+        expr : expr-like
+            Input expression to interpolate.
+        offset : int, optional
+            Unused, only present for API compatibility with LinearInterpolator.
+        increment: bool, optional
+            If True, generate increments (Inc) rather than assignments (Eq).
+        """
+        def callback():
+            # Derivatives must be evaluated before the introduction of indirect accesses
+            try:
+                _expr = expr.evaluate
+            except AttributeError:
+                # E.g., a generic SymPy expression or a number
+                _expr = expr
+
+            variables = list(retrieve_function_carriers(_expr))
+            subs, weight, conditionals = self._interpolation_indices(variables,
+                                                                     halo=True)
+
+            # Accumulate the contributions of the grid points into a temporary
+            dims = self.sfunction.dimensions
+            rhs = Symbol(name='sum', dtype=self.sfunction.dtype)
+            summands = [Eq(rhs, 0., implicit_dims=dims),
+                        Inc(rhs, weight*indexify(_expr).xreplace(subs),
+                            implicit_dims=dims + conditionals)]
+
+            # Write/Incr `self`
+            lhs = self.sfunction.subs(self_subs)
+            last = [Inc(lhs, rhs)] if increment else [Eq(lhs, rhs)]
+
+            return summands + last
+
+        return Interpolation(expr, offset, increment, self_subs, self, callback)
+
+    def inject(self, field, expr, offset=0):
+        """
+        Generate equations injecting an arbitrary expression into a field.
+
+        Parameters
+        ----------
+        field : Function
+            Input field into which the injection is performed.
+        expr : expr-like
+            Injected expression.
+        offset : int, optional
+            Unused, only present for API compatibility with LinearInterpolator.
+        """
+        def callback():
+            # Derivatives must be evaluated before the introduction of indirect accesses
+            try:
+                _expr = expr.evaluate
+            except AttributeError:
+                # E.g., a generic SymPy expression or a number
+                _expr = expr
+
+            variables = list(retrieve_function_carriers(_expr)) + [field]
+            subs, weight, conditionals = self._interpolation_indices(variables)
+
+            lhs = indexify(field).xreplace(subs)
+            rhs = weight*indexify(_expr).xreplace(subs)
+
+            return [Inc(lhs, rhs, implicit_dims=self.sfunction.dimensions + conditionals)]
+
+        return Injection(field, expr, offset, self, callback)
+
+
+class LagrangeInterpolator(WeightedInterpolator):
+
+    """
+    Concrete implementation of GenericInterpolator implementing a Lagrange
+    interpolation scheme of radius ``r``, i.e. a polynomial interpolation of
+    degree ``2r - 1`` along each Dimension. ``r=1`` is equivalent to Linear
+    interpolation, ``r=2`` to [bi,tri]cubic interpolation.
+
+    Parameters
+    ----------
+    sfunction: The SparseFunction that this Interpolator operates on.
+    r : int, optional
+        The radius of the interpolation scheme. Defaults to 2.
+    """
+
+    def __init__(self, sfunction, r=2):
+        super().__init__(sfunction, r)
+
+    def _weights(self, x):
+        ret = np.ones(x.shape + (len(self._taps),))
+        for n, k in enumerate(self._taps):
+            for m in self._taps:
+                if m != k:
+                    ret[..., n] *= (x - m) / (k - m)
+        return ret
+
+
+class SincInterpolator(WeightedInterpolator):
+
+    """
+    Concrete implementation of GenericInterpolator implementing a Kaiser-windowed
+    sinc interpolation scheme of radius ``r``, as described in:
+
+        Hicks, G. J. (2002). Arbitrary source and receiver positioning in
+        finite-difference schemes using Kaiser windowed sinc functions.
+        Geophysics, 67(1), 156-165.
+
+    Parameters
+    ----------
+    sfunction: The SparseFunction that this Interpolator operates on.
+    r : int, optional
+        The radius of the interpolation scheme, between 2 and 10. Defaults to 4.
+    """
+
+    _b_table = {2: 2.94, 3: 4.53, 4: 4.14, 5: 5.26, 6: 6.40,
+                7: 7.51, 8: 8.56, 9: 9.56, 10: 10.64}
+    """The optimal Kaiser window shape, per radius (Table 1 in Hicks, 2002)."""
+
+    def __init__(self, sfunction, r=4):
+        if r not in self._b_table:
+            raise ValueError("`r` must be in [%d, %d] for sinc interpolation"
+                             % (min(self._b_table), max(self._b_table)))
+        super().__init__(sfunction, r)
+
+    def _weights(self, x):
+        b = self._b_table[self.r]
+        # Signed distance of each grid point from the sparse point
+        t = self._taps - x[..., None]
+        window = np.i0(b*np.sqrt(np.maximum(1 - (t/self.r)**2, 0))) / np.i0(b)
+        return np.sinc(t) * window
@@ -1,4 +1,6 @@
 from .symbols import SymbolRegistry  # noqa
-from .operator import Operator  # noqa
+from .caching import LoweringCache, lowering_cache  # noqa
+from .operator import Operator, compile_all  # noqa
+from .checkpointing import CheckpointSchedule, revolve  # noqa
 from .profiling import profiler_registry  # noqa
 from .registry import operator_registry  # noqa
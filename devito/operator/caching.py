@@ -0,0 +1,400 @@
+import copyreg
+import os
+import pickle
+from collections import OrderedDict
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from sympy import Add, Function, Mul, Pow
+from sympy.core.function import UndefinedFunction
+
+from devito.logger import debug, warning
+from devito.parameters import configuration
+from devito.symbolics import retrieve_functions, retrieve_symbols
+from devito.tools import (Signer, as_tuple, filter_ordered, flatten, make_tempdir,
+                          memoized_func)
+from devito.types import Eq
+
+__all__ = ['LoweringCache', 'lowering_cache']
+
+
+class LoweringCache(object):
+
+    """
+    A disk-backed cache of lowered Operators.
+
+    An entry is keyed on a canonical hash of the input expressions, the
+    metadata of the Functions and Dimensions they use, the Operator build
+    arguments, and the `configuration` entries that impact code generation.
+    An entry is the pickled Operator, with all references to user-level
+    objects (Functions, Dimensions, Grids, Constants) replaced by symbolic
+    placeholders. Upon a hit, the placeholders are re-bound to the live objects
+    provided by the caller, so the returned Operator is ready to run without
+    going through any of the lowering passes.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        The directory in which the entries are stored. Defaults to a
+        deterministic directory within the OS temporary directory.
+    maxsize : int, optional
+        The maximum amount of disk space, in bytes, the cache may use. Once
+        exceeded, the least recently used entries are evicted. Defaults to 1 GB.
+    """
+
+    _suffix = '.pkl'
+
+    def __init__(self, path=None, maxsize=2**30):
+        self._path = Path(path) if path is not None else None
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = make_tempdir('lowcache')
+        else:
+            self._path.mkdir(parents=True, exist_ok=True)
+        return self._path
+
+    @path.setter
+    def path(self, val):
+        self._path = Path(val)
+
+    @property
+    def entries(self):
+        """The cache entries, from the least to the most recently used."""
+        ret = [i for i in self.path.iterdir() if i.suffix == self._suffix]
+        return sorted(ret, key=lambda i: i.stat().st_mtime)
+
+    @property
+    def nbytes(self):
+        return sum(i.stat().st_size for i in self.entries)
+
+    def stats(self):
+        """Return a summary of the cache activity and occupancy."""
+        entries = self.entries
+        return OrderedDict([
+            ('hits', self.hits),
+            ('misses', self.misses),
+            ('stores', self.stores),
+            ('evictions', self.evictions),
+            ('entries', len(entries)),
+            ('nbytes', sum(i.stat().st_size for i in entries)),
+            ('maxsize', self.maxsize)
+        ])
+
+    def key(self, expressions, **kwargs):
+        """
+        A unique, deterministic key for the Operator that ``expressions`` would
+        be lowered to, given the build arguments ``kwargs``.
+        """
+        items = [str(type(i).__name__) for i in expressions]
+        items.extend(_signature(i) for i in expressions)
+        items.extend(_signature(i, full=True) for i in _retrieve_live(expressions))
+
+        for k in ('name', 'mode', 'language', 'subs'):
+            items.append('%s:%s' % (k, _signature(kwargs.get(k))))
+        options = sorted(kwargs.get('options', {}).items())
+        items.append('options:%s' % _signature(options))
+        items.append('platform:%s' % kwargs['platform'])
+        items.append('compiler:%s' % kwargs['compiler'])
+
+        # Not (necessarily) part of the `configuration` signature, but affect
+        # the code generated for C-level profiling
+        items.append('profiling:%s' % configuration['profiling'])
+        items.append('log-level:%s' % configuration['log-level'])
+
+        # The entries produced by a different Devito may well unpickle, yet
+        # lower the expressions differently
+        items.append('devito:%s' % _devito_signature())
+
+        return Signer._digest(Signer._sign(items), configuration)
+
+    def get(self, key, expressions):
+        """
+        Retrieve the Operator mapped to ``key``, with all user-level objects
+        re-bound to those found in ``expressions``. Return None upon a miss.
+        """
+        sofile = self.path.joinpath(key).with_suffix(self._suffix)
+        try:
+            with open(str(sofile), 'rb') as f:
+                binary = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        live = _retrieve_live(expressions)
+        try:
+            op = _Unpickler(BytesIO(binary), live).load()
+        except Exception as e:
+            # E.g., an entry produced by a different Devito version
+            debug("Dropping unusable lowering-cache entry `%s` [%s]" % (key, e))
+            sofile.unlink()
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        os.utime(str(sofile))
+        self.hits += 1
+
+        return op
+
+    def put(self, key, op, expressions):
+        """
+        Store the Operator ``op``, built out of ``expressions``, in the cache.
+        Return True if ``op`` was stored, False otherwise.
+        """
+        live = _retrieve_live(expressions)
+
+        # If any of the Operator inputs weren't detected in the expressions, we
+        # can't re-bind them to the live objects upon a hit, so we give up
+        ids = {id(i) for i in live}
+        if any(id(i) not in ids for i in op.input if _is_live(i)):
+            debug("Operator `%s` not cacheable by the lowering-cache" % op.name)
+            return False
+
+        buf = BytesIO()
+        try:
+            _Pickler(buf, live).dump(op)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            warning("Couldn't store Operator `%s` in the lowering-cache [%s]"
+                    % (op.name, e))
+            return False
+
+        # Write-then-rename, so that concurrent readers never see partial entries
+        with NamedTemporaryFile(dir=str(self.path), delete=False) as f:
+            f.write(buf.getvalue())
+        os.replace(f.name, str(self.path.joinpath(key).with_suffix(self._suffix)))
+        self.stores += 1
+
+        self._evict()
+
+        return True
+
+    def _evict(self):
+        entries = self.entries
+        nbytes = sum(i.stat().st_size for i in entries)
+        for i in entries:
+            if nbytes <= self.maxsize:
+                break
+            try:
+                size = i.stat().st_size
+                i.unlink()
+            except FileNotFoundError:
+                # Evicted by another process in the meantime
+                continue
+            nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries."""
+        for i in self.entries:
+            try:
+                i.unlink()
+            except FileNotFoundError:
+                pass
+
+
+lowering_cache = LoweringCache()
+"""The default lowering-cache, used when ``configuration['lowering-cache']`` is set."""
+
+
+@memoized_func
+def _devito_signature():
+    """
+    The Devito version along with a hash of its sources, which also tells apart
+    different states of a development install.
+    """
+    import devito
+    root = Path(devito.__file__).parent
+    h = sha1(devito.__version__.encode())
+    for i in sorted(root.rglob('*.py')):
+        h.update(str(i.relative_to(root)).encode())
+        h.update(i.read_bytes())
+    return '%s:%s' % (devito.__version__, h.hexdigest())
+
+
+# Helpers to detect and re-bind the user-level objects
+
+def _is_live(obj):
+    # The objects carrying user data, which therefore cannot be pickled by value
+    return (getattr(obj, 'is_DiscreteFunction', False) or
+            getattr(obj, 'is_Constant', False))
+
+
+def _retrieve_live(expressions):
+    """
+    Retrieve all user-level objects -- Functions, along with their SliceStores,
+    Dimensions, Grids, and Constants -- used by ``expressions``, in a
+    deterministic order.
+    """
+    found = []
+    for e in expressions:
+        # E.g., Interpolation/Injection, wrapping the actual SparseFunction
+        interpolator = getattr(e, 'interpolator', None)
+        if interpolator is not None:
+            found.append(getattr(interpolator, 'sfunction', None) or
+                         getattr(interpolator, 'obj', None))
+            exprs = [getattr(e, 'expr', None), getattr(e, 'field', None)]
+        else:
+            exprs = [e]
+            found.extend(as_tuple(getattr(e, 'implicit_dims', None)))
+        for i in exprs:
+            try:
+                found.extend(retrieve_functions(i))
+                found.extend(retrieve_symbols(i))
+            except AttributeError:
+                # E.g., plain numbers
+                pass
+
+    functions = []
+    for f in found:
+        f = getattr(f, 'function', f)
+        functions.append(f)
+        for i in getattr(f, '_sub_functions', ()):
+            functions.append(getattr(f, i))
+    functions = [f for f in filter_ordered(functions, key=id) if _is_live(f)]
+    functions = sorted(functions, key=lambda f: f.name)
+
+    # The SliceStores, holding the time slices of e.g. `save=Disk(...)`
+    stores = [getattr(f, 'storage', None) for f in functions]
+    stores = [i for i in stores if i is not None]
+
+    grids = [getattr(f, 'grid', None) for f in functions]
+    grids = filter_ordered([g for g in grids if g is not None], key=id)
+
+    dimensions = flatten(getattr(f, 'dimensions', ()) for f in functions)
+    dimensions.extend(flatten((g.time_dim, g.stepping_dim) + g.dimensions
+                              for g in grids))
+    dimensions.extend(i for i in found if getattr(i, 'is_Dimension', False))
+    parents = []
+    for d in dimensions:
+        while d.is_Derived:
+            d = d.parent
+            parents.append(d)
+    dimensions = filter_ordered(dimensions + parents, key=id)
+    dimensions = sorted(dimensions, key=lambda d: d.name)
+
+    return tuple(functions + stores + dimensions + grids)
+
+
+def _signature(obj, full=False):
+    """
+    A deterministic string representation of ``obj``. With ``full=True``,
+    the metadata of the user-level objects is also included.
+    """
+    if isinstance(obj, (list, tuple)):
+        return '(%s)' % ','.join(_signature(i) for i in obj)
+    elif isinstance(obj, dict):
+        return _signature(sorted((str(k), v) for k, v in obj.items()))
+    elif not full:
+        if getattr(obj, 'interpolator', None) is not None:
+            # Interpolation/Injection
+            return '%s<%s>(%s)' % (type(obj.interpolator).__name__,
+                                   getattr(obj.interpolator, 'r', ''),
+                                   ','.join(_signature(getattr(obj, i, None))
+                                            for i in ('expr', 'field', 'offset',
+                                                      'increment', 'self_subs')))
+        elif isinstance(obj, Eq):
+            return '%s[%s,%s,%s]' % (obj, _signature(obj.subdomain),
+                                     _signature(obj.implicit_dims),
+                                     _signature(obj.substitutions))
+        return str(obj)
+
+    if getattr(obj, 'is_Dimension', False):
+        items = [type(obj).__name__, obj.name]
+        for i in obj._pickle_args[1:] + obj._pickle_kwargs:
+            items.append(_signature(getattr(obj, i, None)))
+    elif getattr(obj, 'is_Input', False):
+        cls = type(obj).__base__ if obj.is_AbstractFunction else type(obj)
+        items = [cls.__name__, obj.name, str(obj.dtype)]
+        for i in ('shape', 'dimensions', 'halo', 'padding', 'staggered',
+                  'space_order', 'time_order', 'save', 'npoint', 'nt'):
+            items.append(_signature(getattr(obj, i, None)))
+        items.append(_signature(getattr(getattr(obj, 'grid', None), 'shape', None)))
+    elif getattr(obj, 'is_AbstractObject', False):
+        # A SliceStore, entirely determined by the Function it belongs to
+        items = [type(obj).__name__, obj.name]
+    else:
+        # A Grid
+        items = [type(obj).__name__, _signature(obj.shape), _signature(obj.dimensions),
+                 str(obj.dtype), _signature(obj.distributor.topology)]
+    return '%s' % ';'.join(items)
+
+
+def _rebuild_unevaluated(cls, args):
+    return cls(*args, evaluate=False)
+
+
+def _reduce_unevaluated(obj):
+    return _rebuild_unevaluated, (type(obj), obj.args)
+
+
+class _DispatchTable(dict):
+
+    """
+    By default, SymPy objects get re-evaluated upon unpickling, which may undo
+    the rewrites (e.g., factorization) performed by the lowering passes. Here
+    we make sure that arithmetic operations are instead rebuilt verbatim.
+    """
+
+    def __missing__(self, cls):
+        if issubclass(cls, (Add, Mul, Pow)):
+            return _reduce_unevaluated
+        raise KeyError(cls)
+
+
+class _Pickler(pickle.Pickler):
+
+    """
+    A Pickler replacing the user-level objects with placeholders.
+    """
+
+    def __init__(self, file, live):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.dispatch_table = _DispatchTable(copyreg.dispatch_table)
+        self._mapper = {id(v): n for n, v in enumerate(live)}
+
+    def persistent_id(self, obj):
+        try:
+            return self._mapper[id(obj)]
+        except KeyError:
+            pass
+        # Dynamically created SymPy functions (e.g., `FLOOR`) can't be pickled
+        # by reference, but they are uniquely identified by their name
+        if isinstance(obj, UndefinedFunction):
+            return ('UndefinedFunction', obj.__name__)
+        # Any object derived from a user-level AbstractFunction, such as `f(x + 1)`
+        function = getattr(obj, 'function', None)
+        if function is not obj and getattr(obj, 'is_AbstractFunction', False):
+            try:
+                return (self._mapper[id(function)], obj.args)
+            except KeyError:
+                pass
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    """
+    An Unpickler re-binding the placeholders to the user-level objects.
+    """
+
+    def __init__(self, file, live):
+        super().__init__(file)
+        self._live = live
+
+    def persistent_load(self, pid):
+        if isinstance(pid, tuple):
+            n, args = pid
+            if n == 'UndefinedFunction':
+                return Function(args)
+            return self._live[n].func(*args)
+        return self._live[pid]
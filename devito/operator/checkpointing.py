@@ -0,0 +1,335 @@
+from collections import namedtuple
+
+import numpy as np
+
+from devito.tools import Tag, as_tuple, is_integer
+from devito.types.utils import Disk
+
+__all__ = ['CheckpointSchedule', 'revolve']
+
+
+class Action(Tag):
+    pass
+
+
+ADVANCE = Action('advance')
+TAKESHOT = Action('takeshot')
+RESTORE = Action('restore')
+REVERSE = Action('reverse')
+
+
+Step = namedtuple('Step', 'action start end slot')
+Step.__doc__ = """
+An action of a checkpointing schedule.
+
+    * ``ADVANCE`` runs the forward Operator over the timesteps [start, end).
+    * ``TAKESHOT`` stores the forward state at timestep ``start`` in ``slot``.
+    * ``RESTORE`` loads the forward state at timestep ``start`` from ``slot``.
+    * ``REVERSE`` runs the forward and then the adjoint Operator over the
+      single timestep ``start``.
+"""
+
+
+def _beta(s, r):
+    # The binomial coefficient `(s + r)! / (s! r!)`. NOTE: not using
+    # `math.comb` as it's only available from Python 3.8
+    if r < 0:
+        return 0
+    v = 1
+    for i in range(1, s + 1):
+        v = v * (r + i) // i
+    return v
+
+
+def _split(nsteps, nfree):
+    """
+    The optimal number of timesteps to advance by, before taking a checkpoint,
+    to reverse `nsteps` timesteps using `nfree` checkpoints on top of the one
+    holding the starting state.
+    """
+    s = nfree + 1
+    r = 0
+    while _beta(s, r) < nsteps:
+        r += 1
+    return min(_beta(s, r - 1), nsteps - _beta(s - 1, r - 1), nsteps - 1)
+
+
+def _binomial(start, end, slot, free, schedule):
+    """
+    Append to `schedule` the steps to reverse the timesteps [start, end), given
+    that the state at `start` is both current and stored in `slot`.
+    """
+    while end - start > 1:
+        if free:
+            m = _split(end - start, len(free))
+            schedule.append(Step(ADVANCE, start, start + m, None))
+            schedule.append(Step(TAKESHOT, start + m, None, free[0]))
+            _binomial(start + m, end, free[0], free[1:], schedule)
+        else:
+            m = end - start - 1
+            if m > 0:
+                schedule.append(Step(ADVANCE, start, start + m, None))
+            schedule.append(Step(REVERSE, start + m, None, None))
+        schedule.append(Step(RESTORE, start, None, slot))
+        end = start + m
+    schedule.append(Step(REVERSE, start, None, None))
+
+
+def revolve(nt, ncheckpoints, ndisk=0):
+    """
+    Compute a checkpointing schedule to reverse ``nt`` timesteps.
+
+    With ``ndisk=0``, the schedule is the binomial one of the Revolve algorithm,
+    which minimizes the number of recomputed timesteps given ``ncheckpoints``
+    in-memory checkpoints. Otherwise, the schedule is two-level: the forward
+    state is stored on disk at ``ndisk`` evenly spaced timesteps, and each of
+    the resulting segments is reversed, backwards, with a binomial schedule
+    over the in-memory checkpoints.
+
+    Parameters
+    ----------
+    nt : int
+        The number of timesteps.
+    ncheckpoints : int
+        The number of in-memory checkpoints, numbered from 0.
+    ndisk : int, optional
+        The number of on-disk checkpoints, numbered from ``ncheckpoints``.
+
+    Returns
+    -------
+    list of Step
+        The schedule. The initial forward state is stored in checkpoint 0.
+        The first ``REVERSE`` marks the end of the forward sweep.
+    """
+    if not is_integer(nt) or nt <= 0:
+        raise ValueError("Expected a positive number of timesteps, got `%s`" % nt)
+    if not is_integer(ncheckpoints) or ncheckpoints <= 0:
+        raise ValueError("At least one in-memory checkpoint is required")
+    if not is_integer(ndisk) or ndisk < 0:
+        raise ValueError("Expected a non-negative number of disk checkpoints, "
+                         "got `%s`" % ndisk)
+
+    free = tuple(range(1, ncheckpoints))
+
+    # The segments starting at the disk checkpoints
+    nsegments = min(ndisk, nt - 1) + 1
+    bounds = [nt*i // nsegments for i in range(nsegments + 1)]
+    segments = list(zip(bounds, bounds[1:]))
+
+    schedule = []
+    for n, (start, end) in enumerate(segments[:-1]):
+        schedule.append(Step(TAKESHOT, start, None, ncheckpoints + n))
+        schedule.append(Step(ADVANCE, start, end, None))
+
+    start, end = segments[-1]
+    schedule.append(Step(TAKESHOT, start, None, 0))
+    _binomial(start, end, 0, free, schedule)
+
+    for n, (start, end) in reversed(list(enumerate(segments[:-1]))):
+        schedule.append(Step(RESTORE, start, None, ncheckpoints + n))
+        schedule.append(Step(TAKESHOT, start, None, 0))
+        _binomial(start, end, 0, free, schedule)
+
+    return schedule
+
+
+class CheckpointSchedule(object):
+
+    """
+    Run a forward and an adjoint Operator with checkpointing, that is without
+    storing the whole forward wavefield in time.
+
+    The forward state is saved at a few timesteps only, and recomputed from
+    these checkpoints as the adjoint Operator proceeds backwards in time,
+    following the schedule computed by ``revolve``.
+
+    Parameters
+    ----------
+    forward : Operator
+        The forward Operator.
+    adjoint : Operator
+        The adjoint Operator, which reads the forward state.
+    fields : TimeFunction or list of TimeFunction
+        The forward state, e.g. the wavefield. Checkpoints comprise ``time_order``
+        time slices of each of these TimeFunctions.
+    nt : int
+        The number of timesteps.
+    ncheckpoints : int, optional
+        The number of in-memory checkpoints.
+    memory : int, optional
+        The memory budget for the in-memory checkpoints, in bytes. Used, in
+        place of ``ncheckpoints``, to derive the number of checkpoints.
+    disk : Disk, optional
+        Additional, on-disk checkpoints. Under MPI, each rank uses its own file,
+        namely ``disk.path`` suffixed by the rank.
+
+    Notes
+    -----
+    The checkpoints are allocated once, and then reused by every subsequent
+    ``apply_forward``/``apply_reverse``, for example over multiple shots. The
+    runtime arguments of the two Operators are processed only upon the first
+    run or whenever a non-scalar argument changes; from then on, the Operators
+    run over each time window through their ``bind`` handles.
+
+    Examples
+    --------
+    >>> from devito import Eq, Function, Grid, Operator, TimeFunction
+    >>> grid = Grid(shape=(4, 4))
+    >>> u = TimeFunction(name='u', grid=grid)
+    >>> v = TimeFunction(name='v', grid=grid)
+    >>> grad = Function(name='grad', grid=grid)
+    >>> fwd = Operator(Eq(u.forward, u + 1))
+    >>> adj = Operator([Eq(v.backward, v + 1), Eq(grad, grad + u*v)])
+    >>> schedule = CheckpointSchedule(fwd, adj, u, nt=10, ncheckpoints=3)
+    >>> schedule.apply_forward()
+    >>> schedule.apply_reverse()
+    """
+
+    def __init__(self, forward, adjoint, fields, nt, ncheckpoints=None,
+                 memory=None, disk=None):
+        self.forward = forward
+        self.adjoint = adjoint
+        self.fields = as_tuple(fields)
+        self.nt = nt
+
+        if any(not f.is_TimeFunction for f in self.fields):
+            raise ValueError("Only TimeFunctions can be checkpointed")
+        if disk is not None and not isinstance(disk, Disk):
+            raise TypeError("Expected a Disk, got `%s`" % type(disk))
+
+        # The layout of a checkpoint
+        self._layout = []
+        offset = 0
+        for f in self.fields:
+            shape = (f.time_order,) + f.shape_allocated[1:]
+            nbytes = int(np.prod(shape))*np.dtype(f.dtype).itemsize
+            self._layout.append((f, shape, offset, nbytes))
+            offset += nbytes
+        self.nbytes = offset
+
+        if memory is not None:
+            if ncheckpoints is not None:
+                raise ValueError("Cannot provide both `ncheckpoints` and `memory`")
+            ncheckpoints = memory // self.nbytes
+            if ncheckpoints == 0:
+                raise ValueError("A memory budget of %d bytes can't fit a single "
+                                 "checkpoint (%d bytes)" % (memory, self.nbytes))
+        elif ncheckpoints is None:
+            raise ValueError("Either `ncheckpoints` or `memory` must be provided")
+        ndisk = 0 if disk is None else disk.nt
+
+        self.schedule = revolve(nt, ncheckpoints, ndisk)
+
+        # The checkpoints, allocated once and for all
+        storage = [np.empty((ncheckpoints, self.nbytes), dtype=np.uint8)]
+        if disk is not None:
+            path = disk.path
+            distributor = self.fields[0].grid.distributor
+            if distributor.nprocs > 1:
+                path = '%s.%d' % (path, distributor.myrank)
+            storage.append(np.memmap(path, dtype=np.uint8, mode='w+',
+                                     shape=(ndisk, self.nbytes)))
+        self._storage = storage
+        self.ncheckpoints = ncheckpoints
+
+        self._handles = {}
+        self._offsets = {}
+        self._position = None
+
+    def _bind(self, op, **kwargs):
+        handle = self._handles.get(op)
+        if handle is None:
+            # The first timestep the Operator would run by default, which is
+            # where its time windows are anchored
+            time = self._time
+            offset = op._prepare_arguments(**kwargs)[time.min_name]
+            self._offsets[op] = offset
+            self._handles[op] = op.bind(**{time.min_name: offset,
+                                           time.max_name: self.nt - 1 + offset,
+                                           **kwargs})
+        elif kwargs:
+            handle.update(**kwargs)
+
+    @property
+    def _time(self):
+        return self.fields[0].grid.time_dim
+
+    def _run(self, op, start, end):
+        offset = self._offsets[op]
+        handle = self._handles[op]
+        handle.update(**{self._time.min_name: start + offset,
+                         self._time.max_name: end - 1 + offset})
+        handle.run()
+
+    def _checkpoint(self, slot):
+        if slot < self.ncheckpoints:
+            return self._storage[0][slot]
+        else:
+            return self._storage[1][slot - self.ncheckpoints]
+
+    def _transfer(self, t, slot, store):
+        checkpoint = self._checkpoint(slot)
+        offset = self._offsets[self.forward]
+        for f, shape, start, nbytes in self._layout:
+            data = f._data_allocated
+            buf = checkpoint[start:start + nbytes].view(f.dtype).reshape(shape)
+            for i in range(f.time_order):
+                idx = (t + offset - i) % f._time_size
+                if store:
+                    buf[i] = data[idx]
+                else:
+                    data[idx] = buf[i]
+
+    def _execute(self, step, adjoint=True):
+        if step.action is ADVANCE:
+            self._run(self.forward, step.start, step.end)
+        elif step.action is TAKESHOT:
+            self._transfer(step.start, step.slot, True)
+        elif step.action is RESTORE:
+            self._transfer(step.start, step.slot, False)
+        else:
+            self._run(self.forward, step.start, step.start + 1)
+            if adjoint:
+                self._run(self.adjoint, step.start, step.start + 1)
+
+    def apply_forward(self, **kwargs):
+        """
+        Run the forward Operator over all timesteps, taking checkpoints along
+        the way.
+
+        Parameters
+        ----------
+        **kwargs
+            The runtime arguments of the forward Operator, as in ``Operator.apply``,
+            except for the time bounds.
+        """
+        self._bind(self.forward, **kwargs)
+
+        for n, step in enumerate(self.schedule):
+            self._execute(step, adjoint=False)
+            if step.action is REVERSE:
+                break
+        self._position = n
+
+    def apply_reverse(self, **kwargs):
+        """
+        Run the adjoint Operator over all timesteps, backwards, recomputing the
+        forward state from the checkpoints as needed. Must follow ``apply_forward``.
+
+        Parameters
+        ----------
+        **kwargs
+            The runtime arguments of the adjoint Operator, as in ``Operator.apply``,
+            except for the time bounds.
+        """
+        if self._position is None:
+            raise RuntimeError("`apply_forward` must be called first")
+        self._bind(self.adjoint, **kwargs)
+
+        # The forward half of the first reversed timestep was run by `apply_forward`
+        step = self.schedule[self._position]
+        self._run(self.adjoint, step.start, step.start + 1)
+
+        for step in self.schedule[self._position + 1:]:
+            self._execute(step)
+        self._position = None
@@ -1,7 +1,10 @@
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import reduce
 from operator import attrgetter, mul
 from math import ceil
+from threading import Lock
+import os
 
 from cached_property import cached_property
 import ctypes
@@ -13,18 +16,20 @@ from devito.ir.equations import LoweredEq, lower_exprs, generate_implicit_exprs
 from devito.ir.clusters import ClusterGroup, clusterize
 from devito.ir.iet import Callable, EntryFunction, MetaCall, derive_parameters, iet_build
 from devito.ir.stree import stree_build
+from devito.ir.support import ScopeCache
+from devito.operator.caching import lowering_cache
 from devito.operator.profiling import create_profile
 from devito.operator.registry import operator_selector
 from devito.operator.symbols import SymbolRegistry
 from devito.mpi import MPI
 from devito.parameters import configuration
-from devito.passes import Graph, instrument
+from devito.passes import Graph, instrument, lower_storage
 from devito.symbolics import estimate_cost
 from devito.tools import (DAG, Signer, ReducerMap, as_tuple, flatten, filter_ordered,
                           filter_sorted, split, timed_pass, timed_region)
-from devito.types import Evaluable
+from devito.types import Evaluable, PerfCounters, Timer, Tracer
 
-__all__ = ['Operator']
+__all__ = ['Operator', 'BoundOperator', 'compile_all']
 
 
 class Operator(Callable):
@@ -152,9 +157,18 @@ class Operator(Callable):
         # Create a symbol registry
         kwargs['sregistry'] = SymbolRegistry()
 
-        # Lower to a JIT-compilable object
+        # Lower to a JIT-compilable object, unless already available in the
+        # lowering-cache
+        expressions = as_tuple(expressions)
         with timed_region('op-compile') as r:
-            op = cls._build(expressions, **kwargs)
+            if configuration['lowering-cache']:
+                key = lowering_cache.key(expressions, **kwargs)
+                op = cls._build_from_cache(key, expressions, **kwargs)
+                if op is None:
+                    op = cls._build(expressions, **kwargs)
+                    lowering_cache.put(key, op, expressions)
+            else:
+                op = cls._build(expressions, **kwargs)
         op._profiler.py_timers.update(r.timings)
 
         # Emit info about how long it took to perform the lowering
@@ -177,17 +191,20 @@ class Operator(Callable):
         # Python-level (i.e., compile time) and C-level (i.e., run time) performance
         profiler = create_profile('timers')
 
-        # Lower input expressions
-        expressions = cls._lower_exprs(expressions, **kwargs)
+        # The compiler passes keep analyzing the data dependences of largely
+        # the same expressions, so the dependence analysis is shared
+        with ScopeCache():
+            # Lower input expressions
+            expressions = cls._lower_exprs(expressions, **kwargs)
 
-        # Group expressions based on iteration spaces and data dependences
-        clusters = cls._lower_clusters(expressions, profiler, **kwargs)
+            # Group expressions based on iteration spaces and data dependences
+            clusters = cls._lower_clusters(expressions, profiler, **kwargs)
 
-        # Lower Clusters to a ScheduleTree
-        stree = cls._lower_stree(clusters, **kwargs)
+            # Lower Clusters to a ScheduleTree
+            stree = cls._lower_stree(clusters, **kwargs)
 
-        # Lower ScheduleTree to an Iteration/Expression Tree
-        iet, byproduct = cls._lower_iet(stree, profiler, **kwargs)
+            # Lower ScheduleTree to an Iteration/Expression Tree
+            iet, byproduct = cls._lower_iet(stree, profiler, **kwargs)
 
         # Make it an actual Operator
         op = Callable.__new__(cls, **iet.args)
@@ -205,6 +222,8 @@ class Operator(Callable):
         op._compiler = kwargs['compiler']
         op._lib = None
         op._cfunction = None
+        op._compilation = None
+        op._compilation_lock = Lock()
 
         # References to local or external routines
         op._func_table = OrderedDict()
@@ -226,6 +245,27 @@ class Operator(Callable):
 
         return op
 
+    @classmethod
+    def _build_from_cache(cls, key, expressions, **kwargs):
+        """
+        Retrieve a lowered Operator from the lowering-cache. Return None upon
+        a cache miss.
+        """
+        op = lowering_cache.get(key, expressions)
+        if op is None:
+            return None
+
+        # Reset the state as if the Operator had just been built
+        op._compiler = kwargs['compiler']
+        op._lib = None
+        op._cfunction = None
+        op._compilation = None
+        op._compilation_lock = Lock()
+        op._state = cls._initialize_state(**kwargs)
+        op._profiler.py_timers.clear()
+
+        return op
+
     def __init__(self, *args, **kwargs):
         # Bypass the silent call to __init__ triggered through the backends engine
         pass
@@ -386,6 +426,9 @@ class Operator(Callable):
         graph = Graph(iet)
         graph = cls._specialize_iet(graph, **kwargs)
 
+        # Transfer time slices from/to the TimeFunctions' storage, if any
+        lower_storage(graph, **kwargs)
+
         # Instrument the IET for C-level profiling
         # Note: this is postponed until after _specialize_iet because during
         # specialization further Sections may be introduced
@@ -423,6 +466,46 @@ class Operator(Callable):
         Process runtime arguments passed to ``.apply()` and derive
         default values for any remaining arguments.
         """
+        args, grid = self._prepare_data_arguments(**kwargs)
+        return self._complete_arguments(args, grid, **kwargs)
+
+    def _complete_arguments(self, args, grid, **kwargs):
+        """
+        Derive, on top of the processed runtime arguments of the data carriers
+        ``args``, which are updated in place, all of the remaining runtime
+        arguments, in a format suitable for the generated code.
+        """
+        self._prepare_scalar_arguments(args, grid, **kwargs)
+
+        # Turn arguments into a format suitable for the generated code
+        # E.g., instead of NumPy arrays for Functions, the generated code expects
+        # pointers to ctypes.Struct
+        for p in self.parameters:
+            try:
+                args.update(kwargs.get(p.name, p)._arg_as_ctype(args, alias=p))
+            except AttributeError:
+                # User-provided floats/ndarray obviously do not have `_arg_as_ctype`
+                args.update(p._arg_as_ctype(args, alias=p))
+
+        # Execute autotuning and adjust arguments accordingly
+        args = self._autotune(args, kwargs.pop('autotune', configuration['autotuning']))
+
+        # Check all user-provided keywords are known to the Operator
+        if not configuration['ignore-unknowns']:
+            for k, v in kwargs.items():
+                if k not in self._known_arguments:
+                    raise ValueError("Unrecognized argument %s=%s" % (k, v))
+
+        # Attach `grid` to the arguments map
+        args = ArgumentsMap(grid, **args)
+
+        return args
+
+    def _prepare_data_arguments(self, **kwargs):
+        """
+        Process the runtime arguments of the data carriers (Functions, Constants,
+        ...) and the Grid. Return the processed arguments and the Grid.
+        """
         overrides, defaults = split(self.input, lambda p: p.name in kwargs)
 
         # Process data-carrier overrides
@@ -460,19 +543,27 @@ class Operator(Callable):
         except KeyError:
             grid = None
 
-        # Process Dimensions
-        # A topological sorting is used so that derived Dimensions are processed after
-        # their parents (note that a leaf Dimension can have an arbitrary long list of
-        # ancestors)
-        dag = DAG(self.dimensions,
-                  [(i, i.parent) for i in self.dimensions if i.is_Derived])
-        for d in reversed(dag.topological_sort()):
-            args.update(d._arg_values(args, self._dspace[d], grid, **kwargs))
+        return args, grid
+
+    def _prepare_scalar_arguments(self, args, grid, **kwargs):
+        """
+        Process, in place, the runtime arguments of the Dimensions and Objects,
+        which may depend on those of the data carriers already in ``args``.
+        """
+        self._prepare_dimension_arguments(args, grid, **kwargs)
 
         # Process Objects (which may need some `args`)
         for o in self.objects:
             args.update(o._arg_values(args, grid=grid, **kwargs))
 
+    def _prepare_dimension_arguments(self, args, grid, **kwargs):
+        """
+        Process, in place, the runtime arguments of the Dimensions, which may
+        depend on those of the data carriers already in ``args``.
+        """
+        for d in self._dimensions_toposort:
+            args.update(d._arg_values(args, self._dspace[d], grid, **kwargs))
+
         # Sanity check
         for p in self.parameters:
             p._arg_check(args, self._dspace[p])
@@ -480,37 +571,34 @@ class Operator(Callable):
             if d.is_Derived:
                 d._arg_check(args, self._dspace[p])
 
-        # Turn arguments into a format suitable for the generated code
-        # E.g., instead of NumPy arrays for Functions, the generated code expects
-        # pointers to ctypes.Struct
-        for p in self.parameters:
-            try:
-                args.update(kwargs.get(p.name, p)._arg_as_ctype(args, alias=p))
-            except AttributeError:
-                # User-provided floats/ndarray obviously do not have `_arg_as_ctype`
-                args.update(p._arg_as_ctype(args, alias=p))
-
-        # Execute autotuning and adjust arguments accordingly
-        args = self._autotune(args, kwargs.pop('autotune', configuration['autotuning']))
-
-        # Check all user-provided keywords are known to the Operator
-        if not configuration['ignore-unknowns']:
-            for k, v in kwargs.items():
-                if k not in self._known_arguments:
-                    raise ValueError("Unrecognized argument %s=%s" % (k, v))
-
-        # Attach `grid` to the arguments map
-        args = ArgumentsMap(grid, **args)
-
-        return args
+    @cached_property
+    def _dimensions_toposort(self):
+        """
+        The Dimensions sorted such that derived Dimensions come after their
+        parents (note that a leaf Dimension can have an arbitrary long list of
+        ancestors).
+        """
+        dag = DAG(self.dimensions,
+                  [(i, i.parent) for i in self.dimensions if i.is_Derived])
+        return tuple(reversed(dag.topological_sort()))
 
     def _postprocess_arguments(self, args, **kwargs):
         """Process runtime arguments upon returning from ``.apply()``."""
         for p in self.parameters:
             try:
-                p._arg_apply(args[p.name], args[p.coordinates.name], kwargs.get(p.name))
+                coordinates = p.coordinates
             except AttributeError:
                 p._arg_apply(args[p.name], kwargs.get(p.name))
+                continue
+            # The coordinates are only available in C-land if actually used by
+            # the Operator, e.g. for interpolation. Further, they only need to be
+            # gathered back if the Operator moved the sparse points, as writing
+            # them would invalidate the SparseFunction's point ownership index
+            if coordinates in self.parameters and coordinates in self.output:
+                coordsobj = args[coordinates.name]
+            else:
+                coordsobj = None
+            p._arg_apply(args[p.name], coordsobj, kwargs.get(p.name))
 
     @cached_property
     def _known_arguments(self):
@@ -533,11 +621,14 @@ class Operator(Callable):
     def arguments(self, **kwargs):
         """Arguments to run the Operator."""
         args = self._prepare_arguments(**kwargs)
-        # Check all arguments are present
+        self._check_arguments(args)
+        return args
+
+    def _check_arguments(self, args):
+        """Check all arguments are present."""
         for p in self.parameters:
             if args.get(p.name) is None:
                 raise ValueError("No value found for parameter %s" % p.name)
-        return args
 
     # JIT compilation
 
@@ -551,27 +642,99 @@ class Operator(Callable):
         JIT-compile the C code generated by the Operator.
 
         It is ensured that JIT compilation will only be performed once per
-        Operator, reagardless of how many times this method is invoked.
+        Operator, reagardless of how many times this method is invoked. If
+        a background compilation is pending (see ``compile_async``), this
+        method waits for its completion.
         """
         if self._lib is None:
+            with self._compilation_lock:
+                if self._compilation is None:
+                    self._compilation = Future()
+                    self._compilation.set_running_or_notify_cancel()
+                    compilation = None
+                else:
+                    compilation = self._compilation
+            if compilation is None:
+                self._run_jit_compile(self._compilation)
+            self._compilation.result()
+
+    def _run_jit_compile(self, future):
+        try:
             with self._profiler.timer_on('jit-compile'):
                 recompiled, src_file = self._compiler.jit_compile(self._soname,
                                                                   str(self.ccode))
+        except BaseException as e:
+            future.set_exception(e)
+            return
 
-            elapsed = self._profiler.py_timers['jit-compile']
-            if recompiled:
-                perf("Operator `%s` jit-compiled `%s` in %.2f s with `%s`" %
-                     (self.name, src_file, elapsed, self._compiler))
-            else:
-                perf("Operator `%s` fetched `%s` in %.2f s from jit-cache" %
-                     (self.name, src_file, elapsed))
+        elapsed = self._profiler.py_timers['jit-compile']
+        if recompiled:
+            perf("Operator `%s` jit-compiled `%s` in %.2f s with `%s`" %
+                 (self.name, src_file, elapsed, self._compiler))
+        else:
+            perf("Operator `%s` fetched `%s` in %.2f s from jit-cache" %
+                 (self.name, src_file, elapsed))
+
+        future.set_result(src_file)
+
+    def compile_async(self, executor=None):
+        """
+        JIT-compile the Operator in the background.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, optional
+            The executor running the compilation. Defaults to a thread pool
+            shared by all Operators, with as many workers as available cores.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The pending compilation, whose result is the path to the generated
+            source file. There is no need to wait on it explicitly, as ``apply``
+            does so transparently.
+
+        Notes
+        -----
+        The actual compilation is carried out by a separate compiler process,
+        so multiple Operators compile in parallel even though driven by threads.
+        """
+        with self._compilation_lock:
+            if self._compilation is not None:
+                return self._compilation
+            self._compilation = future = Future()
+        if self._lib is not None:
+            # E.g., unpickled Operators
+            future.set_result(None)
+            return future
+
+        executor = executor or jit_executor()
+
+        def callback():
+            if future.set_running_or_notify_cancel():
+                self._run_jit_compile(future)
+
+        executor.submit(callback)
+
+        return future
+
+    def _load(self):
+        """
+        Load the shared object from the JIT cache, recompiling it first if
+        another process evicted it since it was compiled.
+        """
+        try:
+            return self._compiler.load(self._soname)
+        except FileNotFoundError:
+            self._compiler.jit_compile(self._soname, str(self.ccode))
+            return self._compiler.load(self._soname)
 
     @property
     def cfunction(self):
         """The JIT-compiled C function as a ctypes.FuncPtr object."""
         if self._lib is None:
             self._jit_compile()
-            self._lib = self._compiler.load(self._soname)
+            self._lib = self._load()
             self._lib.name = self._soname
 
         if self._cfunction is None:
@@ -654,6 +817,16 @@ class Operator(Callable):
 
         # Invoke kernel function with args
         arg_values = [args[p.name] for p in self.parameters]
+        self._invoke(args, arg_values)
+
+        # Post-process runtime arguments
+        self._postprocess_arguments(args, **kwargs)
+
+        # Output summary of performance achieved
+        return self._emit_apply_profiling(args)
+
+    def _invoke(self, args, arg_values):
+        """Call the JIT-compiled C function with the ctypes arguments ``arg_values``."""
         try:
             cfunction = self.cfunction
             with self._profiler.timer_on('apply', comm=args.comm):
@@ -669,11 +842,33 @@ class Operator(Callable):
             else:
                 raise
 
-        # Post-process runtime arguments
-        self._postprocess_arguments(args, **kwargs)
+    def bind(self, **kwargs):
+        """
+        Process the runtime arguments once and for all, returning a handle
+        through which the Operator can then be run repeatedly.
 
-        # Output summary of performance achieved
-        return self._emit_apply_profiling(args)
+        ``kwargs`` are the same key-value arguments accepted by ``apply``. Compared
+        to multiple calls to ``apply``, the handle avoids processing all of the
+        runtime arguments at each run, and allows cheap updates of the scalar
+        arguments, such as the iteration bounds along a Dimension.
+
+        Examples
+        --------
+        >>> from devito import Eq, Grid, TimeFunction, Operator
+        >>> grid = Grid(shape=(3, 3))
+        >>> u = TimeFunction(name='u', grid=grid, save=10)
+        >>> op = Operator(Eq(u.forward, u + 1))
+        >>> handle = op.bind(time_M=3)
+        >>> summary = handle.run()
+        >>> handle.update(time_m=4, time_M=7)
+        >>> summary = handle.run()
+        >>> u.data[:, 0, 0]
+        Data([0., 1., 2., 3., 4., 5., 6., 7., 8., 0.], dtype=float32)
+
+        Updating any argument other than a scalar, such as a Function, triggers
+        the processing of all of the runtime arguments.
+        """
+        return BoundOperator(self, **kwargs)
 
     # Performance profiling
 
@@ -693,13 +888,22 @@ class Operator(Callable):
         threshold = 20.
 
         def _emit_timings(timings, indent=''):
-            timings.pop('total', None)
+            # Besides the nested passes, there may be statistics attached to
+            # a pass via `timed_pass.record`
+            timings = {k: v for k, v in timings.items() if isinstance(v, dict)}
             entries = sorted(timings, key=lambda i: timings[i]['total'], reverse=True)
             for i in entries[:max_hotspots]:
                 v = fround(timings[i]['total'])
                 perc = fround(v/tot*100, n=10)
                 if perc > threshold:
-                    perf("%s%s: %.2f s (%.1f %%)" % (indent, i.lstrip('_'), v, perc))
+                    # Floats are timings, the rest are counters
+                    stats = ['%s: %s' % (k, '%.2f s' % fround(s) if isinstance(s, float)
+                                         else s)
+                             for k, s in timings[i].items()
+                             if k != 'total' and not isinstance(s, dict)]
+                    stats = ' [%s]' % ', '.join(stats) if stats else ''
+                    perf("%s%s: %.2f s (%.1f %%)%s" % (indent, i.lstrip('_'), v, perc,
+                                                       stats))
                     _emit_timings(timings[i], ' '*len(indent) + ' * ')
 
         _emit_timings(timings, '  * ')
@@ -762,6 +966,17 @@ class Operator(Callable):
             name = "%s%s<%s>" % (k.name, rank, itershapes)
 
             perf("%s* %s ran in %.2f s [%s]" % (indent, name, fround(v.time), metrics))
+            c = summary.counters.get(k)
+            if c is not None:
+                measured = [("%s=%d" % (e, n)) for e, n in c.counters.items()
+                            if n is not None]
+                if c.ipc is not None:
+                    measured.append("IPC=%.2f" % fround(c.ipc))
+                if c.oi is not None:
+                    measured.append("OI=%.2f" % fround(c.oi))
+                if c.gbytess is not None:
+                    measured.append("%.2f GB/s" % fround(c.gbytess))
+                perf("%s  measured: [%s]" % (indent, ', '.join(measured)))
             for n, time in summary.subsections.get(k.name, {}).items():
                 perf("%s+ %s ran in %.2f s [%.2f%%]" %
                      (indent*2, n, time, fround(time/v.time*100)))
@@ -831,9 +1046,13 @@ class Operator(Callable):
             with open(self._lib._name, 'rb') as f:
                 state['binary'] = f.read()
                 state['soname'] = self._soname
-            return state
         else:
-            return self.__dict__
+            state = dict(self.__dict__)
+        # A pending compilation cannot be pickled; the unpickled Operator will
+        # simply compile itself again, if necessary
+        state['_compilation'] = None
+        state.pop('_compilation_lock', None)
+        return state
 
     def __getnewargs_ex__(self):
         return (None,), {}
@@ -843,14 +1062,63 @@ class Operator(Callable):
         binary = state.pop('binary', None)
         for k, v in state.items():
             setattr(self, k, v)
+        self._compilation_lock = Lock()
         if soname is not None:
             self._compiler.save(soname, binary)
-            self._lib = self._compiler.load(soname)
+            self._lib = self._load()
             self._lib.name = soname
 
 
 # Misc helpers
 
+_jit_executor = None
+_jit_executor_lock = Lock()
+
+
+def jit_executor():
+    """The default executor for background JIT compilation."""
+    global _jit_executor
+    with _jit_executor_lock:
+        if _jit_executor is None:
+            _jit_executor = ThreadPoolExecutor(max_workers=os.cpu_count(),
+                                               thread_name_prefix='devito-jit')
+        return _jit_executor
+
+
+def compile_all(operators, workers=None):
+    """
+    JIT-compile multiple Operators in parallel, blocking until all of them
+    are compiled.
+
+    Parameters
+    ----------
+    operators : list of Operator
+        The Operators to be compiled.
+    workers : int, optional
+        The maximum number of concurrent compilations. Defaults to the number
+        of available cores.
+
+    Examples
+    --------
+    >>> from devito import Eq, Grid, TimeFunction, Operator, compile_all
+    >>> grid = Grid(shape=(4, 4))
+    >>> u = TimeFunction(name='u', grid=grid)
+    >>> op0 = Operator(Eq(u.forward, u + 1))
+    >>> op1 = Operator(Eq(u.forward, u + 2))
+    >>> compile_all([op0, op1])
+    """
+    operators = as_tuple(operators)
+    if workers is None:
+        futures = [op.compile_async() for op in operators]
+        for f in futures:
+            f.result()
+    else:
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='devito-jit') as executor:
+            futures = [op.compile_async(executor) for op in operators]
+            for f in futures:
+                f.result()
+
 
 class ArgumentsMap(dict):
 
@@ -864,6 +1132,137 @@ class ArgumentsMap(dict):
         return self.grid.comm if self.grid is not None else MPI.COMM_NULL
 
 
+class BoundOperator(object):
+
+    """
+    An Operator along with a pre-processed set of runtime arguments. This is
+    not meant to be instantiated directly; use ``Operator.bind`` instead.
+
+    Parameters
+    ----------
+    operator : Operator
+        The Operator to be run.
+    **kwargs
+        The key-value arguments, as in ``Operator.apply``.
+    """
+
+    def __init__(self, operator, **kwargs):
+        self.operator = operator
+        self._bind(**kwargs)
+
+    def _bind(self, **kwargs):
+        op = self.operator
+
+        self._kwargs = kwargs
+
+        # The instrumentation (timers, counters, traces) is reset at each run
+        self._instruments = [i for i in op.objects
+                             if isinstance(i, (Timer, PerfCounters, Tracer))]
+        # Some objects, such as the MPI messages, release their runtime values
+        # (e.g., buffers, requests) upon returning from C-land, so they're set
+        # up right before each run
+        self._transients = [i for i in op.objects if hasattr(i, '_C_memfree')]
+        # Any other object is cheap to set up, and its runtime value may derive
+        # from those of the Dimensions (e.g., the MPI regions)
+        self._objects = [i for i in op.objects
+                         if i not in self._instruments + self._transients]
+
+        with op._profiler.timer_on('arguments'):
+            # The runtime arguments of the data carriers, which stay unchanged
+            # until the next `_bind`
+            self._data_args, self._grid = op._prepare_data_arguments(**kwargs)
+
+            self.args = op._complete_arguments(dict(self._data_args), self._grid,
+                                               **kwargs)
+            op._check_arguments(self.args)
+
+            # The scalar arguments as derived from `kwargs`, prior to autotuning
+            self._scalar_args = self._derive_scalar_arguments(**kwargs)
+
+        # Anything else may use the transient objects until the next run
+        for i in self._transients:
+            i._C_memfree()
+
+        self._positions = {p.name: n for n, p in enumerate(op.parameters)}
+        self._values = [self.args[p.name] for p in op.parameters]
+
+    @cached_property
+    def _scalar_names(self):
+        op = self.operator
+        ret = set(flatten(d._arg_names for d in op.dimensions))
+        ret.update(o.name for o in op.objects)
+        return frozenset(ret)
+
+    def _derive_scalar_arguments(self, **kwargs):
+        args = dict(self._data_args)
+        self.operator._prepare_dimension_arguments(args, self._grid, **kwargs)
+        for o in self._objects:
+            args.update(o._arg_values(args, grid=self._grid, **kwargs))
+        return {k: args[k] for k in self._scalar_names if k in args}
+
+    def update(self, **kwargs):
+        """
+        Update the runtime arguments. Only the scalar arguments that actually
+        change, e.g. ``time_M``, are rewritten; any other argument retains its
+        current value, including those produced by autotuning.
+
+        If any of ``kwargs`` is not a Dimension-related argument, for example
+        a Function or a Constant, then all of the runtime arguments are
+        processed again from scratch.
+        """
+        op = self.operator
+
+        fast = all(k in self._scalar_names for k in kwargs)
+        kwargs = {**self._kwargs, **kwargs}
+        if not fast:
+            self._bind(**kwargs)
+            return
+
+        with op._profiler.timer_on('arguments'):
+            scalar_args = self._derive_scalar_arguments(**kwargs)
+
+        for k, v in scalar_args.items():
+            if self._scalar_args.get(k) == v:
+                continue
+            self.args[k] = v
+            try:
+                self._values[self._positions[k]] = v
+            except KeyError:
+                # Not an Operator parameter, e.g. a Dimension size
+                pass
+
+        self._kwargs = kwargs
+        self._scalar_args = scalar_args
+
+    def run(self):
+        """
+        Execute the Operator with the current runtime arguments.
+
+        Returns
+        -------
+        PerformanceSummary
+            As returned by ``Operator.apply``.
+        """
+        op = self.operator
+
+        # Reset the C-level timers, counters and traces, as `apply` would do
+        for i in self._instruments:
+            i.reset()
+
+        # Note: the values of the transient objects are updated in place, so
+        # `self._values` retains valid references
+        for i in self._transients:
+            self.args.update(i._arg_values(self.args, grid=self._grid, **self._kwargs))
+
+        op._invoke(self.args, self._values)
+
+        op._postprocess_arguments(self.args, **self._kwargs)
+
+        return op._emit_apply_profiling(self.args)
+
+    __call__ = run
+
+
 def parse_kwargs(**kwargs):
     """
     Parse keyword arguments provided to an Operator.
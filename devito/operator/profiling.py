@@ -1,24 +1,30 @@
-from collections import OrderedDict, namedtuple
+from collections import OrderedDict, deque, namedtuple
 from contextlib import contextmanager
 from functools import reduce
 from operator import mul
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, run
 from time import time as seq_time
+import atexit
+import ctypes
+import json
 import os
+import platform
 
 import cgen as c
+import numpy as np
 from sympy import S
 
 from devito.ir.iet import (BusyWait, ExpressionBundle, List, TimedList, Section,
-                           Iteration, FindNodes, Transformer)
+                           Iteration, FindNodes, MapNodes, Transformer)
 from devito.ir.support import IntervalGroup
 from devito.logger import warning, error
 from devito.mpi import MPI
 from devito.mpi.routines import MPICall, MPIList, RemainderCall
 from devito.parameters import configuration
 from devito.symbolics import subs_op_args
-from devito.tools import DefaultOrderedDict, flatten
+from devito.tools import DefaultOrderedDict, flatten, memoized_func
+from devito.types import NThreads, PerfCounters, Tracer
 
 __all__ = ['create_profile']
 
@@ -27,11 +33,14 @@ SectionData = namedtuple('SectionData', 'ops sops points traffic itermaps')
 PerfKey = namedtuple('PerfKey', 'name rank')
 PerfInput = namedtuple('PerfInput', 'time ops points traffic sops itershapes')
 PerfEntry = namedtuple('PerfEntry', 'time gflopss gpointss oi ops itershapes')
+PerfCountersEntry = namedtuple('PerfCountersEntry', 'counters threads ipc traffic '
+                                                    'gbytess oi')
 
 
 class Profiler(object):
 
     _default_includes = []
+    _default_headers = []
     _default_libs = []
     _ext_calls = []
 
@@ -153,6 +162,11 @@ class Profiler(object):
     def trackable_subsections(self):
         return ()
 
+    @property
+    def _ext_args(self):
+        """Additional objects in input to the instrumented IET."""
+        return ()
+
     def summary(self, args, dtype, reduce_over=None):
         """
         Return a PerformanceSummary of the profiled sections.
@@ -292,6 +306,363 @@ class AdvancedProfilerVerbose2(AdvancedProfiler):
         return (MPICall, BusyWait)
 
 
+class PerfEventProfiler(AdvancedProfiler):
+
+    """
+    Augment the `advanced` profiling with hardware performance counters, read
+    through the Linux perf_event interface at the beginning and at the end of
+    each Section, separately for each thread.
+
+    The counters are opened once per run by each thread of the OpenMP team, so
+    threads spawned by nested parallel regions aren't accounted for. Events
+    that can't be opened (e.g., the hardware events within most virtual
+    machines) are reported as unavailable; if no event can be opened at all
+    (e.g., because of `/proc/sys/kernel/perf_event_paranoid`), the profiler
+    doesn't initialize.
+    """
+
+    _default_includes = ['linux/perf_event.h', 'sys/syscall.h', 'unistd.h',
+                         'string.h']
+    _default_headers = [
+        # `syscall` isn't part of POSIX
+        ('_DEFAULT_SOURCE', '1'),
+        ('PERF_OPEN(C,T)', ('for (int e_ = 0; e_ < C->nevents; e_++) { '
+                            'struct perf_event_attr a_; memset(&a_, 0, sizeof(a_)); '
+                            'a_.type = C->types[e_]; a_.size = sizeof(a_); '
+                            'a_.config = C->configs[e_]; a_.exclude_kernel = 1; '
+                            'a_.exclude_hv = 1; C->fds[(T)*C->nevents + e_] = '
+                            'syscall(__NR_perf_event_open, &a_, 0, -1, -1, 0); }')),
+        ('PERF_CLOSE(C)', ('for (int i_ = 0; i_ < C->size; i_++) { '
+                           'if (C->fds[i_] >= 0) close(C->fds[i_]); }')),
+        ('PERF_READ(FD,V)', ('if (FD < 0 || read(FD, &V, sizeof(long)) != '
+                             'sizeof(long)) V = 0;')),
+        ('START_COUNTERS(S,C)', ('long startc_ ## S [C->size]; '
+                                 'for (int i_ = 0; i_ < C->size; i_++) '
+                                 '{ PERF_READ(C->fds[i_], startc_ ## S [i_]) }')),
+        ('STOP_COUNTERS(S,C)', ('for (int i_ = 0; i_ < C->size; i_++) { long v_; '
+                                'PERF_READ(C->fds[i_], v_) '
+                                'C->S[i_] += v_ - startc_ ## S [i_]; }'))
+    ]
+
+    # The `(type, config)` of the events, as in `linux/perf_event.h`
+    _events = OrderedDict([
+        ('cycles', (0, 0)),  # PERF_COUNT_HW_CPU_CYCLES
+        ('instructions', (0, 1)),  # PERF_COUNT_HW_INSTRUCTIONS
+        ('llc-misses', (0, 3)),  # PERF_COUNT_HW_CACHE_MISSES
+        ('task-clock', (1, 1)),  # PERF_COUNT_SW_TASK_CLOCK
+    ])
+
+    # Bytes moved from memory upon a last-level cache miss
+    _cacheline = 64
+
+    def __init__(self, name):
+        super().__init__(name)
+
+        self.events = available_perf_events(tuple(self._events.items()))
+        if not self.events:
+            self.initialized = False
+
+        self.counters = None
+
+    @property
+    def _ext_args(self):
+        return (self.counters,) if self.counters is not None else ()
+
+    def instrument(self, iet, timer):
+        sections = FindNodes(Section).visit(iet)
+        if not sections:
+            return iet
+
+        if self.counters is None:
+            self.counters = PerfCounters('counters', list(self._sections),
+                                         list(self.events.values()))
+        cname = self.counters.name
+
+        mapper = {}
+        for i in sections:
+            n = i.name
+            assert n in timer.fields
+            body = TimedList(timer=timer, lname=n, body=i.body)
+            if n in self._sections:
+                body = List(header=c.Line('START_COUNTERS(%s,%s)' % (n, cname)),
+                            body=body,
+                            footer=c.Line('STOP_COUNTERS(%s,%s)' % (n, cname)))
+            mapper[i] = i._rebuild(body=body)
+        iet = Transformer(mapper, nested=True).visit(iet)
+
+        # Each thread opens its own counters
+        if any(isinstance(i, NThreads) for i in iet.parameters):
+            init = [c.Pragma('omp parallel num_threads(nthreads)'),
+                    c.Block([c.Initializer(c.Value('const int', 'tid'),
+                                           'omp_get_thread_num()'),
+                             c.If('tid < %s->maxthreads' % cname,
+                                  c.Line('PERF_OPEN(%s,tid)' % cname))])]
+        else:
+            init = [c.Line('PERF_OPEN(%s,0)' % cname)]
+        finalize = [c.Line('PERF_CLOSE(%s)' % cname)]
+
+        # The counters must be opened before, and closed after, all Sections
+        return iet._rebuild(body=wrap_sections(iet.body, init, finalize))
+
+    def summary(self, args, dtype, reduce_over=None):
+        summary = super().summary(args, dtype, reduce_over=reduce_over)
+
+        if self.counters is None:
+            return summary
+        comm = args.comm
+
+        values, fds = self.counters.read(args[self.counters.name]._obj)
+        for name, v in values.items():
+            counters = OrderedDict()
+            threads = OrderedDict()
+            for n, k in enumerate(self.events):
+                if v.mask[:, n].all():
+                    counters[k] = threads[k] = None
+                else:
+                    counters[k] = int(v[:, n].sum())
+                    threads[k] = tuple(None if i is np.ma.masked else int(i)
+                                       for i in v[:, n])
+
+            if comm is not MPI.COMM_NULL:
+                # With MPI enabled, we add one entry per section per rank
+                items = comm.allgather((counters, threads))
+                for rank in range(comm.size):
+                    summary.add_counters(name, rank, *items[rank],
+                                         cacheline=self._cacheline)
+            else:
+                summary.add_counters(name, None, counters, threads,
+                                     cacheline=self._cacheline)
+
+        return summary
+
+
+def wrap_sections(nodes, header, footer):
+    """
+    Wrap the smallest span of `nodes` enclosing all of the Sections within a
+    List with the given `header` and `footer`.
+    """
+    indices = [n for n, i in enumerate(nodes) if FindNodes(Section).visit(i)]
+    start, end = indices[0], indices[-1] + 1
+    node = nodes[start]
+    if end - start == 1 and node.is_List and not node.header and not node.footer:
+        node = node._rebuild(body=wrap_sections(node.body, header, footer))
+    else:
+        node = List(header=header, body=nodes[start:end], footer=footer)
+    return nodes[:start] + (node,) + nodes[end:]
+
+
+class PerfEventAttr(ctypes.Structure):
+
+    """The leading fields of a `struct perf_event_attr`."""
+
+    _fields_ = [('type', ctypes.c_uint32),
+                ('size', ctypes.c_uint32),
+                ('config', ctypes.c_uint64),
+                ('sample_period', ctypes.c_uint64),
+                ('sample_type', ctypes.c_uint64),
+                ('read_format', ctypes.c_uint64),
+                ('disabled', ctypes.c_uint64, 1),
+                ('inherit', ctypes.c_uint64, 1),
+                ('pinned', ctypes.c_uint64, 1),
+                ('exclusive', ctypes.c_uint64, 1),
+                ('exclude_user', ctypes.c_uint64, 1),
+                ('exclude_kernel', ctypes.c_uint64, 1),
+                ('exclude_hv', ctypes.c_uint64, 1),
+                ('flags', ctypes.c_uint64, 57),
+                # Zero-initialized, up to PERF_ATTR_SIZE_VER0
+                ('padding', ctypes.c_uint64 * 2)]
+
+
+@memoized_func
+def available_perf_events(events):
+    """
+    Return the subset of `events`, a tuple of `(name, (type, config))`, that
+    the current process may count through the Linux perf_event interface.
+    """
+    try:
+        nr = {'x86_64': 298, 'aarch64': 241, 'ppc64le': 319,
+              'ppc64': 319}[platform.machine()]
+        libc = ctypes.CDLL(None, use_errno=True)
+    except (KeyError, OSError):
+        return OrderedDict()
+
+    ret = OrderedDict()
+    for name, (type, config) in events:
+        attr = PerfEventAttr(type=type, size=ctypes.sizeof(PerfEventAttr),
+                             config=config, exclude_kernel=1, exclude_hv=1)
+        fd = libc.syscall(nr, ctypes.byref(attr), 0, -1, -1, 0)
+        if fd >= 0:
+            os.close(fd)
+            ret[name] = (type, config)
+
+    unavailable = [name for name, _ in events if name not in ret]
+    if ret and unavailable:
+        warning("perf_event: events %s unavailable" % ', '.join(unavailable))
+
+    return ret
+
+
+class TraceProfiler(AdvancedProfilerVerbose2):
+
+    """
+    Augment the `advanced2` profiling with a timeline of all executed Sections,
+    including the MPI halo exchanges, each event carrying its begin and end
+    timestamps and the timestep at which it occurred.
+
+    The events are recorded into a fixed-size ring buffer on the C side, and
+    at the end of each run they are gathered on rank 0 and appended to the
+    process-wide `timeline`. The timeline is written, in the Chrome trace
+    format, which can be loaded into Perfetto or `chrome://tracing`, to
+    ``configuration['profiling-trace']`` at exit, or upon `timeline.dump()`.
+    """
+
+    _default_headers = [
+        ('TRACE_EVENT(S,I,N,C)', ('{ long n_ = C->count % C->size; C->ids[n_] = I; '
+                                  'C->steps[n_] = N; '
+                                  'C->begins[n_] = start_ ## S .tv_sec*1000000L + '
+                                  'start_ ## S .tv_usec; '
+                                  'C->ends[n_] = end_ ## S .tv_sec*1000000L + '
+                                  'end_ ## S .tv_usec; C->count += 1; }'))
+    ]
+
+    # The maximum number of events retained per run
+    _capacity = 2**16
+
+    def __init__(self, name):
+        super().__init__(name)
+
+        # The nature of each Section (e.g., 'compute', 'injection', 'halowait')
+        self._kinds = OrderedDict()
+
+        self.tracer = None
+
+    def analyze(self, iet):
+        super().analyze(iet)
+
+        for s in FindNodes(Section).visit(iet):
+            exprs = [e for i in FindNodes(ExpressionBundle).visit(s) for e in i.exprs]
+            if any(e.write is not None and e.write.is_SparseFunction for e in exprs):
+                self._kinds[s.name] = 'interpolation'
+            elif any(getattr(f, 'is_SparseFunction', False)
+                     for e in exprs for f in e.functions):
+                self._kinds[s.name] = 'injection'
+            else:
+                self._kinds[s.name] = 'compute'
+
+    def track_subsection(self, sname, name):
+        super().track_subsection(sname, name)
+        self._kinds[name] = name.rstrip('0123456789')
+
+    @property
+    def _ext_args(self):
+        return (self.tracer,) if self.tracer is not None else ()
+
+    def instrument(self, iet, timer):
+        sections = FindNodes(Section).visit(iet)
+        if not sections:
+            return iet
+
+        if self.tracer is None:
+            self.tracer = Tracer('tracer', timer.sections, self._capacity)
+        ids = {n: i for i, n in enumerate(self.tracer.sections)}
+
+        # The timestep at which each Section is executed, if any
+        steps = {}
+        for k, v in MapNodes(Iteration, Section).visit(iet).items():
+            if k.dim.is_Time:
+                steps.update({i: k.index for i in v})
+
+        mapper = {}
+        for i in sections:
+            n = i.name
+            assert n in timer.fields
+            event = c.Line('TRACE_EVENT(%s,%d,%s,%s)' %
+                           (n, ids[n], steps.get(i, -1), self.tracer.name))
+            mapper[i] = i._rebuild(body=List(body=TimedList(timer=timer, lname=n,
+                                                            body=i.body),
+                                             footer=event))
+        return Transformer(mapper, nested=True).visit(iet)
+
+    def summary(self, args, dtype, reduce_over=None):
+        summary = super().summary(args, dtype, reduce_over=reduce_over)
+
+        if self.tracer is None:
+            return summary
+        comm = args.comm
+        rank = comm.rank if comm is not MPI.COMM_NULL else None
+
+        events, ndropped = self.tracer.read(args[self.tracer.name]._obj)
+        summary.timeline = [TraceEvent(name, self._kinds.get(name), rank, *i)
+                            for name, *i in events]
+        if ndropped:
+            warning("Timeline: dropped the %d oldest events, as the trace buffer "
+                    "holds at most %d events" % (ndropped, self.tracer.capacity))
+
+        if comm is not MPI.COMM_NULL:
+            timelines = comm.gather(summary.timeline, root=0)
+        else:
+            timelines = [summary.timeline]
+        if rank in (None, 0):
+            timeline.extend([i for events in timelines for i in events])
+
+        return summary
+
+
+TraceEvent = namedtuple('TraceEvent', 'name kind rank timestep begin end')
+
+
+class Timeline(object):
+
+    """
+    The timeline of the events traced throughout the lifetime of the process,
+    bounded to the `maxlen` most recent events. It is written to file only
+    once, at exit, unless explicitly dumped.
+    """
+
+    def __init__(self, maxlen=2**20):
+        self.events = deque(maxlen=maxlen)
+        self.nruns = 0
+        self._atexit = False
+
+    def extend(self, events):
+        """Add the events traced in a new run."""
+        if not self._atexit:
+            atexit.register(self._dump_at_exit)
+            self._atexit = True
+        self.events.extend((self.nruns, i) for i in events)
+        self.nruns += 1
+
+    def clear(self):
+        self.events.clear()
+        self.nruns = 0
+
+    def _dump_at_exit(self):
+        if self.events:
+            self.dump()
+
+    def dump(self, path=None):
+        """
+        Write the timeline in the Chrome trace format to `path`, which defaults
+        to ``configuration['profiling-trace']``.
+        """
+        path = path or configuration['profiling-trace']
+        ranks = sorted({i.rank or 0 for _, i in self.events})
+        trace = [{'name': 'process_name', 'ph': 'M', 'pid': r,
+                  'args': {'name': 'rank%d' % r}} for r in ranks]
+        for n, i in self.events:
+            trace.append({'name': i.name, 'cat': i.kind, 'ph': 'X',
+                          'ts': i.begin, 'dur': i.end - i.begin,
+                          'pid': i.rank or 0, 'tid': 0,
+                          'args': {'run': n, 'timestep': i.timestep}})
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+
+timeline = Timeline()
+"""The timeline the `trace` profiling level writes to."""
+
+
 class AdvisorProfiler(AdvancedProfiler):
 
     """
@@ -349,6 +720,8 @@ class PerformanceSummary(OrderedDict):
         self.subsections = DefaultOrderedDict(lambda: OrderedDict())
         self.input = OrderedDict()
         self.globals = {}
+        self.counters = OrderedDict()
+        self.timeline = []
 
     def add(self, name, rank, time,
             ops=None, points=None, traffic=None, sops=None, itershapes=None):
@@ -381,6 +754,39 @@ class PerformanceSummary(OrderedDict):
 
         self.subsections[sname][name] = time
 
+    def add_counters(self, name, rank, counters, threads, cacheline=64):
+        """
+        Add the hardware performance counters measured in a given code section,
+        as mappers from event names to total and thread-wise counts, and
+        derive the measured counterparts of the estimated performance metrics.
+        """
+        k = PerfKey(name, rank)
+        if k not in self:
+            # Unexecuted Section
+            return
+        v = self[k]
+
+        cycles = counters.get('cycles')
+        instructions = counters.get('instructions')
+        if cycles and instructions is not None:
+            ipc = instructions/cycles
+        else:
+            ipc = None
+
+        misses = counters.get('llc-misses')
+        if misses is not None:
+            traffic = misses*cacheline
+            gbytess = float(traffic)/10**9/v.time
+            try:
+                oi = float(self.input[k].ops)/traffic
+            except (TypeError, ZeroDivisionError):
+                oi = None
+        else:
+            traffic = gbytess = oi = None
+
+        self.counters[k] = PerfCountersEntry(counters, threads, ipc, traffic,
+                                             gbytess, oi)
+
     def add_glb_vanilla(self, time):
         """
         Reduce the following performance data:
@@ -457,6 +863,8 @@ profiler_registry = {
     'advanced': AdvancedProfiler,
     'advanced1': AdvancedProfilerVerbose1,
     'advanced2': AdvancedProfilerVerbose2,
+    'perf': PerfEventProfiler,
+    'trace': TraceProfiler,
     'advisor': AdvisorProfiler
 }
 """Profiling levels."""
@@ -150,6 +150,7 @@ env_vars_mapper = {
     'DEVITO_ARCH': 'compiler',
     'DEVITO_PLATFORM': 'platform',
     'DEVITO_PROFILING': 'profiling',
+    'DEVITO_PROFILING_TRACE': 'profiling-trace',
     'DEVITO_DEVELOP': 'develop-mode',
     'DEVITO_OPT': 'opt',
     'DEVITO_MPI': 'mpi',
@@ -159,7 +160,15 @@ env_vars_mapper = {
     'DEVITO_FIRST_TOUCH': 'first-touch',
     'DEVITO_JIT_BACKDOOR': 'jit-backdoor',
     'DEVITO_IGNORE_UNKNOWN_PARAMS': 'ignore-unknowns',
-    'DEVITO_SAFE_MATH': 'safe-math'
+    'DEVITO_SAFE_MATH': 'safe-math',
+    'DEVITO_LOWERING_CACHE': 'lowering-cache',
+    'DEVITO_FD_WEIGHTS_CACHE': 'fd-weights-cache',
+    'DEVITO_JIT_CACHE_DIR': 'jit-cache-dir',
+    'DEVITO_JIT_CACHE_MAXSIZE': 'jit-cache-maxsize',
+    'DEVITO_ALLOC_POOL_MAXSIZE': 'alloc-pool-maxsize',
+    'DEVITO_AUTOTUNING_DB': 'autotuning-db',
+    'DEVITO_AUTOTUNING_DB_REVALIDATE': 'autotuning-db-revalidate',
+    'DEVITO_AUTOTUNING_SEARCH': 'autotuning-search'
 }
 
 env_vars_deprecated = {
@@ -1,10 +1,13 @@
-from collections import Counter
+from collections import Counter, OrderedDict
+
+from sympy import And, Max, Min, Not, Or
 
 from devito.ir.clusters import Queue
-from devito.ir.support import (SEQUENTIAL, SKEWABLE, TILABLE, Interval, IntervalGroup,
-                               IterationSpace)
-from devito.symbolics import uxreplace
-from devito.types import IncrDimension
+from devito.ir.support import (SEQUENTIAL, SKEWABLE, TILABLE, Forward, Interval,
+                               IntervalGroup, IterationSpace)
+from devito.logger import warning
+from devito.symbolics import CondEq, retrieve_indexed, uxreplace
+from devito.types import IncrDimension, ModuloDimension
 
 from devito.symbolics import xreplace_indices
 
@@ -26,11 +29,17 @@ def blocking(clusters, options):
         * `blocklevels` (int, 1): 1 => classic loop blocking; 2 for two-level
            hierarchical blocking.
         * `skewing` (boolean, False): enable/disable loop skewing.
+        * `time-tiling` (boolean, False): enable/disable time tiling, that is
+           wavefront blocking of the time loop along with the space Dimensions.
 
     Notes
     ------
     In case of skewing, if 'blockinner' is enabled, the innermost loop is also skewed.
+    Likewise, in case of time tiling, the innermost loop is also tiled.
     """
+    if options['time-tiling']:
+        clusters = TimeTiling(options).process(clusters)
+
     processed = preprocess(clusters, options)
 
     if options['blocklevels'] > 0:
@@ -274,3 +283,301 @@ class Skewing(Queue):
                                        properties=c.properties))
 
         return processed
+
+
+class TimeTiling(Queue):
+
+    """
+    Time tiling, or wavefront temporal blocking, of a time loop along with the
+    TILABLE Dimensions nested within it.
+
+    Notes
+    -----
+    The time loop is decomposed into time tiles of `time0_blk0_size` timesteps,
+    and then each time tile into blocks along the TILABLE Dimensions. Each block
+    is skewed w.r.t. time, so that it can be computed over all of the timesteps
+    of a time tile while its data is still in cache. For example:
+
+    .. code-block:: python
+
+        for time = time_m, time_M
+          for x = x_m, x_M
+            u[t1,x] = u[t0,x-1] + u[t0,x] + u[t0,x+1]
+
+    becomes
+
+    .. code-block:: python
+
+        for time0_blk0 = time_m, time_M, time0_blk0_size
+          for x0_blk0 = x_m, x_M + time0_blk0_size - 1, x0_blk0_size
+            for time = time0_blk0, min(time0_blk0 + time0_blk0_size - 1, time_M)
+              for x = max(x0_blk0 - (time - time0_blk0), x_m),
+                      min(x0_blk0 + x0_blk0_size - 1 - (time - time0_blk0), x_M)
+                u[t1,x] = u[t0,x-1] + u[t0,x] + u[t0,x+1]
+
+    The skewing factor is such that a block only reads values computed either by
+    itself or by the blocks preceding it, and never overwrites a value that a
+    subsequent block is still to read, which is what makes this transformation
+    legal with time-buffered TimeFunctions. The blocks are computed one after the
+    other, while the iterations within a block may run in parallel.
+
+    The Clusters in the time loop that access TimeFunctions at sparse points, such
+    as source injection and receiver interpolation, are executed within each block,
+    guarded so that each sparse point is only handled by the block computing (or
+    having computed) the accessed value.
+    """
+
+    template = "%s%d_blk%s"
+
+    def __init__(self, options):
+        self.inner = bool(options['blockinner'])
+        self.mpi = bool(options['mpi'])
+
+        super(TimeTiling, self).__init__()
+
+    def callback(self, clusters, prefix):
+        if len(prefix) != 1:
+            return clusters
+
+        d = prefix[-1].dim
+        if not d.is_Time or not all(SEQUENTIAL in c.properties[d] for c in clusters):
+            return clusters
+
+        stencils = [c for c in clusters
+                    if any(TILABLE in v for v in c.properties.values())]
+        if not stencils:
+            return clusters
+
+        if self.mpi:
+            warning("time tiling is unsupported with MPI; skipping")
+            return clusters
+        if prefix[-1].direction is not Forward:
+            warning("time tiling is only supported in forward time loops; skipping")
+            return clusters
+
+        try:
+            return self._tile(clusters, stencils, d)
+        except ValueError as e:
+            warning("couldn't apply time tiling (%s); skipping" % e)
+            return clusters
+
+    def _tile(self, clusters, stencils, d):
+        # The Dimensions to be tiled along with `d`
+        dims = None
+        for c in stencils:
+            tilable = [i.dim for i in c.itintervals if TILABLE in c.properties[i.dim]]
+            if not self.inner and tilable[-1] is c.itintervals[-1].dim:
+                tilable = tilable[:-1]
+            if dims is None:
+                dims = tilable
+            elif dims != tilable:
+                raise ValueError("Clusters tilable along different Dimensions")
+            if any(c.ispace[i].offsets != (0, 0) for i in dims):
+                raise ValueError("Clusters iterating over partial domains")
+        if not dims:
+            return clusters
+
+        # The Functions written at each point of the tiled iteration space
+        writers = OrderedDict()
+        for c in stencils:
+            for e in c.exprs:
+                if not e.lhs.is_Indexed:
+                    continue
+                f = e.lhs.function
+                if writers.get(f, (c,))[0] is not c:
+                    raise ValueError("`%s` written by multiple Clusters" % f.name)
+                if any(_index(e.lhs, i) != i for i in dims):
+                    raise ValueError("`%s` not written at the iteration points" % f.name)
+                writers[f] = (c, _time_offset(e.lhs, d))
+
+        # The maximum distance, along each tiled Dimension, at which a Cluster
+        # reads a value written in the time loop
+        radius = {}
+        for c in stencils:
+            for i in dims:
+                distances = [_index(a, i) - i for a in retrieve_indexed(c.exprs)
+                             if a.function in writers]
+                if not all(j.is_Integer for j in distances):
+                    raise ValueError("non-affine accesses")
+                radius[(c, i)] = max([abs(int(j)) for j in distances], default=0)
+
+        # Within a timestep, each Cluster is shifted w.r.t. the previous one by
+        # its radius, so that it only reads values already computed. The skewing
+        # factor, in turn, guarantees that the same holds across timesteps, with
+        # a margin that prevents a block from overwriting the values of a
+        # time-buffered TimeFunction still to be read by the subsequent blocks
+        shift = {}
+        skew = {}
+        for i in dims:
+            v = 0
+            for n, c in enumerate(stencils):
+                v += radius[(c, i)] if n > 0 else 0
+                shift[(c, i)] = v
+            skew[i] = v + max(radius[(c, i)] for c in stencils)
+
+        # The non-tiled Clusters accessing a Function written in the time loop
+        # (e.g., sparse operations) are guarded, so that each point is handled
+        # by the block owning it
+        guarded = OrderedDict()
+        for c in clusters:
+            if c in stencils:
+                continue
+            if any(i.dim in dims for i in c.itintervals):
+                raise ValueError("non-tilable Clusters iterating over %s" % dims)
+            accesses = [a for a in retrieve_indexed(c.exprs) if a.function in writers]
+            if not accesses:
+                continue
+            # All accesses must be owned by the same block (e.g., `u[t, x] +
+            # v[t, x]`, with `u` and `v` computed by the same Cluster)
+            keys = set()
+            for a in accesses:
+                w, v = writers[a.function]
+                if _time_offset(a, d) is None:
+                    raise ValueError("`%s` not defined over `%s`" % (a.function.name, d))
+                keys.add((_time_offset(a, d) - v,
+                          tuple((_index(a, i), shift[(w, i)]) for i in dims)))
+            if len(keys) > 1:
+                raise ValueError("sparse accesses owned by different blocks")
+            guarded[c] = accesses[0]
+
+        # All other Clusters are executed by all blocks, so they must be idempotent.
+        # The only exception is the reduction of partial results, computed by the
+        # guarded Clusters (e.g., interpolation), into a Function
+        partials = {e.lhs for c in guarded for e in c.exprs if not e.lhs.is_Indexed}
+        for c in clusters:
+            if c in stencils or c in guarded:
+                continue
+            for e in c.exprs:
+                reads = e.rhs.free_symbols & partials
+                if e.lhs in partials:
+                    if reads or e.is_Increment:
+                        raise ValueError("unsupported reduction")
+                elif reads:
+                    if not e.lhs.is_Indexed or e.rhs not in partials or len(c.exprs) > 1:
+                        raise ValueError("unsupported reduction")
+                elif e.lhs.is_Indexed and e.is_Increment:
+                    raise ValueError("unsupported increment")
+
+        # Create the time tile Dimensions
+        name = self.template % (d.name, 0, '%d')
+        tbd = IncrDimension(name % 0, d, d.symbolic_min, d.symbolic_max)
+        height = tbd.step
+        ti = IncrDimension(d.name, tbd, tbd, Min(tbd + height - 1, d.symbolic_max), 1,
+                           size=height)
+
+        modulos = {}
+        for i in stencils[0].ispace.sub_iterators.get(d, []):
+            if not i.is_Modulo:
+                raise ValueError("unsupported sub-iterator `%s`" % i)
+            modulos[i] = ModuloDimension(i.name, ti, i.offset, i.modulo, i.incr,
+                                         i.origin)
+
+        # Create the block Dimensions, spanning the skewed iteration space. Their
+        # nominal size, however, is that of the tiled Dimensions, as the skewed
+        # iteration space has as many points as the original one
+        block_dims = []
+        for i in dims:
+            v = skew[i]*(height - 1) + max(shift[(c, i)] for c in stencils)
+            block_dims.append(IncrDimension(self.template % (i.name, 0, 0), i,
+                                            i.symbolic_min, i.symbolic_max + v,
+                                            size=i.symbolic_size))
+
+        mapper = {}
+        for c in stencils:
+            for i, bd in zip(dims, block_dims):
+                v = skew[i]*(ti - tbd) + shift[(c, i)]
+                mapper[(c, i)] = IncrDimension(i.name, bd,
+                                               Max(bd - v, i.symbolic_min),
+                                               Min(bd + bd.step - 1 - v, i.symbolic_max),
+                                               1, size=bd.step)
+
+        # A guarded Cluster handles a point if its block computes it. Along each
+        # tiled Dimension, the points out of the domain (e.g., in the halo) are
+        # handled by the block computing the closest point in the domain. The
+        # first block also handles the points computed in the previous time tile
+        def owner(a):
+            c, v = writers[a.function]
+            timestep = ti + _time_offset(a, d) - v
+
+            conditions = []
+            for i, bd in zip(dims, block_dims):
+                m, M = i.symbolic_min, i.symbolic_max
+                g = _index(a, i)
+                lower = bd - skew[i]*(timestep - tbd) - shift[(c, i)]
+                upper = lower + bd.step - 1
+                conditions.append(Or(CondEq(bd, m), m >= lower, Min(g, M) >= lower))
+                conditions.append(And(m <= upper, Min(g, M) <= upper))
+            return And(*conditions)
+
+        first = And(*[CondEq(bd, bd.symbolic_min) for bd in block_dims])
+
+        processed = []
+        for c in clusters:
+            subs = dict(modulos)
+            subs[d] = ti
+
+            intervals = [Interval(i, 0, 0) for i in [tbd] + block_dims]
+            directions = {i: Forward for i in [tbd] + block_dims}
+            properties = {i: {SEQUENTIAL} for i in [tbd] + block_dims}
+            for i in c.ispace:
+                dim = mapper.get((c, i.dim), subs.get(i.dim, i.dim))
+                subs[i.dim] = dim
+                intervals.append(i.switch(dim))
+                directions[dim] = c.ispace.directions[i.dim]
+                properties[dim] = c.properties[i.dim] - {TILABLE, SKEWABLE}
+            intervals = IntervalGroup(intervals, relations=[[i.dim for i in intervals]])
+
+            sub_iterators = {i: [] for i in [tbd] + block_dims}
+            sub_iterators.update({subs[k]: [subs.get(i, i) for i in v]
+                                  for k, v in c.ispace.sub_iterators.items()})
+            ispace = IterationSpace(intervals, sub_iterators, directions)
+
+            exprs = [uxreplace(e, subs) for e in c.exprs]
+
+            guards = {subs.get(k, k): uxreplace(v, subs) for k, v in c.guards.items()}
+            key = intervals[-1].dim
+            guard = guards.get(key, True)
+
+            if c in guarded:
+                guards[key] = And(guard, owner(uxreplace(guarded[c], subs)))
+            elif any(e.rhs in partials and not e.is_Increment for e in c.exprs):
+                # The first block initializes the reduction, the others increment it
+                e, = exprs
+                processed.append(c.rebuild(exprs=e, ispace=ispace, properties=properties,
+                                           guards={**guards, key: And(guard, first)}))
+                exprs = [e.func(e.lhs, e.rhs, is_Increment=True)]
+                guards[key] = And(guard, Not(first))
+
+            processed.append(c.rebuild(exprs=exprs, ispace=ispace, properties=properties,
+                                       guards=guards))
+
+        return processed
+
+
+def _index(indexed, d):
+    """
+    The index of ``indexed`` along the Dimension ``d``, relative to the domain
+    origin, or None if the indexed Function isn't defined over ``d``.
+    """
+    f = indexed.function
+    for i, dim, v in zip(indexed.indices, f.dimensions, f._offset_domain):
+        if dim.root is d.root:
+            return i - v
+    return None
+
+
+def _time_offset(indexed, d):
+    """
+    The offset of ``indexed`` along the time Dimension ``d`` (e.g., 1 for
+    ``u[t+1, x]``), or None if the indexed Function isn't defined over ``d``.
+    """
+    i = _index(indexed, d)
+    if i is None:
+        return None
+    if getattr(i, 'is_Modulo', False):
+        i = i.origin
+    v = i.subs({j: 0 for j in i.free_symbols
+                if getattr(j, 'is_Dimension', False) and j.root is d.root})
+    if not v.is_Integer:
+        raise ValueError("non-affine accesses along `%s`" % d)
+    return int(v)
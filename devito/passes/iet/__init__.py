@@ -4,4 +4,5 @@ from .mpi import *  # noqa
 from .misc import *  # noqa
 from .definitions import *  # noqa
 from .instrument import *  # noqa
+from .storage import *  # noqa
 from .languages import *  # noqa
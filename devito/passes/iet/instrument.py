@@ -68,5 +68,6 @@ def instrument_sections(iet, **kwargs):
         return piet, {}
 
     headers = [TimedList._start_timer_header(), TimedList._stop_timer_header()]
+    headers.extend(profiler._default_headers)
 
-    return piet, {'args': timer, 'headers': headers}
+    return piet, {'args': (timer,) + tuple(profiler._ext_args), 'headers': headers}
@@ -74,6 +74,10 @@ def relax_incr_dimensions(iet, **kwargs):
         if root in mapper:
             continue
 
+        # Time tiles come with clipped block bounds, hence without remainders
+        if any(i.dim.is_Time for i in iterations):
+            continue
+
         outer, inner = split(iterations, lambda i: not i.dim.parent.is_Incr)
 
         # Compute the iteration ranges
@@ -98,6 +98,10 @@ def _hoist_halospots(iet):
                                               for q in d._defines])
 
                 for n, i in enumerate(iters):
+                    if i.dim.is_Time and _is_loaded(f):
+                        # The halo must be exchanged as each slice is loaded
+                        continue
+
                     candidates = [i.dim._defines for i in iters[n:]]
 
                     test = True
@@ -212,7 +216,7 @@ def _drop_if_unwritten(iet):
     mapper = {}
     for hs in FindNodes(HaloSpot).visit(iet):
         for f in hs.fmapper:
-            if f not in writes:
+            if f not in writes and not _is_loaded(f):
                 mapper[hs] = mapper.get(hs, hs.halo_scheme).drop(f)
 
     # Post-process analysis
@@ -225,6 +229,14 @@ def _drop_if_unwritten(iet):
     return iet
 
 
+def _is_loaded(f):
+    """
+    True if the time slices of `f` are loaded from a storage at each time step
+    (e.g., ``save=Compressed(...)``), hence `f` is written even if only read.
+    """
+    return f.is_TimeFunction and f.storage is not None
+
+
 class OverlappableHaloSpot(HaloSpot):
     """A HaloSpot allowing computation/communication overlap."""
     pass
@@ -7,7 +7,7 @@ from devito.ir import (DummyEq, Conditional, Dereference, Expression, Expression
                        List, ParallelTree, Prodder, FindSymbols, FindNodes, Return,
                        VECTORIZED, Transformer, IsPerfectIteration, filter_iterations,
                        retrieve_iteration_tree)
-from devito.symbolics import CondEq, INT, ccode
+from devito.symbolics import CondEq, INT, ccode, uxreplace
 from devito.passes.iet.engine import iet_pass
 from devito.passes.iet.langbase import LangBB, LangTransformer, DeviceAwareMixin
 from devito.passes.iet.misc import is_on_device
@@ -175,6 +175,39 @@ class PragmaShmTransformer(PragmaSimdTransformer):
                 collapsable.append(i)
         return collapsable
 
+    def _lower_uindices(self, root, ncollapse):
+        """
+        Drop the unbounded indices of the `ncollapse` outermost Iterations in
+        `root`, replacing them with affine functions of the iteration variables.
+        For example:
+
+            for (x = x_m, xs = 0; x <= x_M; x += 1, xs += 1)
+              r[xs] = ...
+
+        becomes:
+
+            for (x = x_m; x <= x_M; x += 1)
+              r[x - x_m] = ...
+        """
+        iterations = [root]
+        for i in range(ncollapse - 1):
+            iterations.append(iterations[-1].nodes[0])
+
+        subs = {}
+        for i in iterations:
+            for u in i.uindices:
+                if not u.is_Incr or i.step != 1 or u.symbolic_incr != 1:
+                    return root
+                subs[u] = u.symbolic_min + i.dim - i.symbolic_min
+        if not subs:
+            return root
+
+        mapper = {i: i._rebuild(uindices=()) for i in iterations}
+        mapper.update({e: e._rebuild(expr=uxreplace(e.expr, subs))
+                       for e in FindNodes(Expression).visit(root)})
+
+        return Transformer(mapper, nested=True).visit(root)
+
     def _make_reductions(self, partree):
         if not any(i.is_ParallelAtomic for i in partree.collapsed):
             return partree
@@ -209,6 +242,9 @@ class PragmaShmTransformer(PragmaSimdTransformer):
         collapsable = self._find_collapsable(root, candidates)
         ncollapse = 1 + len(collapsable)
 
+        # A parallel loop may only have one iteration variable
+        iteration = self._lower_uindices(root, ncollapse)
+
         # Prepare to build a ParallelTree
         if all(i.is_Affine for i in candidates):
             bundles = FindNodes(ExpressionBundle).visit(root)
@@ -221,12 +257,12 @@ class PragmaShmTransformer(PragmaSimdTransformer):
                 # pragma ... for ... schedule(..., 1)
                 nthreads = self.nthreads
                 body = self.HostIteration(schedule=schedule, ncollapse=ncollapse,
-                                          **root.args)
+                                          **iteration.args)
             else:
                 # pragma ... parallel for ... schedule(..., 1)
                 body = self.HostIteration(schedule=schedule, parallel=True,
                                           ncollapse=ncollapse, nthreads=nthreads,
-                                          **root.args)
+                                          **iteration.args)
             prefix = []
         else:
             # pragma ... for ... schedule(..., expr)
@@ -234,7 +270,7 @@ class PragmaShmTransformer(PragmaSimdTransformer):
             nthreads = self.nthreads_nonaffine
             chunk_size = Symbol(name='chunk_size')
             body = self.HostIteration(ncollapse=ncollapse, chunk_size=chunk_size,
-                                      **root.args)
+                                      **iteration.args)
 
             niters = prod([root.symbolic_size] + [j.symbolic_size for j in collapsable])
             value = INT(Max(niters / (nthreads*self.chunk_nonaffine), 1))
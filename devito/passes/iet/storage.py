@@ -0,0 +1,315 @@
+from collections import defaultdict, namedtuple
+
+from sympy import Mod
+
+from devito.arch import Device
+from devito.exceptions import InvalidOperator
+from devito.ir.iet import (Call, Conditional, Expression, FindNodes, Iteration, List,
+                           Transformer)
+from devito.ir.support import Backward
+from devito.passes.iet.engine import iet_pass
+from devito.symbolics import CondEq, retrieve_indexed, uxreplace
+from devito.tools import is_integer
+from devito.types import CompressedStore, DiskStore
+
+__all__ = ['lower_storage']
+
+
+StorageMacros = namedtuple('StorageMacros', 'init finalize sync store load prefetch '
+                           'includes headers libs')
+"""
+The C-level interface to a SliceStore. Given the store `S`, the TimeFunction
+struct `V`, a slot `SLOT` of the alternating buffer and a time slice `T`:
+
+    * `init(S)`: to be called before the time loop;
+    * `finalize(S)`: to be called after the time loop, optional;
+    * `sync(S,SLOT)`: wait until SLOT may be overwritten, optional;
+    * `store(S,V,SLOT,T)`: store the slice T, held by SLOT;
+    * `load(S,V,SLOT,T)`: load the slice T into SLOT, unless already there;
+    * `prefetch(S,V,SLOT,T)`: start loading the slice T into SLOT, optional.
+"""
+
+_compressed = StorageMacros(
+    'ZINIT', None, None, 'ZSTORE', 'ZLOAD', None,
+    ['zlib.h', 'errno.h', 'string.h'],
+    [('ZINIT(S)', 'for (int s_ = 0; s_ < S->nslots; s_++) S->tags[s_] = -1;'),
+     ('ZERROR(S,E)', '{ if (!S->error) S->error = (E); }'),
+     ('ZSTORE(S,V,SLOT,T)', (
+         'if ((T) >= 0 && (T) < S->nt) { '
+         'const long n_ = S->size; const int w_ = S->tolerance > 0 ? 8 : S->itemsize; '
+         'const char *src_ = ((char*)V->data) + (long)(SLOT)*n_*S->itemsize; '
+         'uLongf len_ = compressBound(n_*w_); '
+         'unsigned char *sh_ = malloc(n_*w_), *z_ = malloc(len_); '
+         'if (!sh_ || !z_) { free(sh_); free(z_); ZERROR(S,ENOMEM) } else { '
+         'for (long i_ = 0; i_ < n_; i_++) { '
+         'union { long q; double d; float f; unsigned char b[8]; } v_; '
+         'if (S->tolerance <= 0) memcpy(v_.b, src_ + i_*w_, w_); '
+         'else if (S->itemsize == 4) v_.q = llrint(((float*)src_)[i_] / '
+         '(2*S->tolerance)); '
+         'else v_.q = llrint(((double*)src_)[i_] / (2*S->tolerance)); '
+         'for (int k_ = 0; k_ < w_; k_++) sh_[k_*n_ + i_] = v_.b[k_]; } '
+         'int e_ = compress2(z_, &len_, sh_, n_*w_, 1); free(sh_); '
+         'if (e_ != Z_OK) { free(z_); ZERROR(S,e_) } else { '
+         'unsigned char *b_ = realloc(z_, len_); '
+         'free(S->blobs[T]); S->blobs[T] = b_ ? b_ : z_; S->lengths[T] = len_; } } '
+         'S->tags[SLOT] = (T); }')),
+     ('ZLOAD(S,V,SLOT,T)', (
+         'if (S->tags[SLOT] != (T)) { '
+         'const long n_ = S->size; const int w_ = S->tolerance > 0 ? 8 : S->itemsize; '
+         'char *dst_ = ((char*)V->data) + (long)(SLOT)*n_*S->itemsize; '
+         'if ((T) < 0 || (T) >= S->nt || S->lengths[T] == 0) '
+         'memset(dst_, 0, n_*S->itemsize); else { '
+         'uLongf len_ = n_*w_; unsigned char *sh_ = malloc(len_); '
+         'int e_ = sh_ ? uncompress(sh_, &len_, S->blobs[T], S->lengths[T]) : Z_OK; '
+         'if (!sh_ || e_ != Z_OK || len_ != n_*w_) { '
+         'memset(dst_, 0, n_*S->itemsize); '
+         'ZERROR(S,!sh_ ? ENOMEM : e_ != Z_OK ? e_ : Z_DATA_ERROR) } else '
+         'for (long i_ = 0; i_ < n_; i_++) { '
+         'union { long q; double d; float f; unsigned char b[8]; } v_; '
+         'for (int k_ = 0; k_ < w_; k_++) v_.b[k_] = sh_[k_*n_ + i_]; '
+         'if (S->tolerance <= 0) memcpy(dst_ + i_*w_, v_.b, w_); '
+         'else if (S->itemsize == 4) ((float*)dst_)[i_] = v_.q*(2*S->tolerance); '
+         'else ((double*)dst_)[i_] = v_.q*(2*S->tolerance); } '
+         'free(sh_); } S->tags[SLOT] = (T); }'))],
+    ['z']
+)
+
+_disk = StorageMacros(
+    'DINIT', 'DFINALIZE', 'DWAIT', 'DSTORE', 'DLOAD', 'DPREFETCH',
+    ['aio.h', 'errno.h', 'string.h'],
+    [('DINIT(S)', ('if (!S->aio) S->aio = calloc(S->nslots, sizeof(struct aiocb)); '
+                   'for (int s_ = 0; s_ < S->nslots; s_++) S->tags[s_] = -1;')),
+     ('DERROR(S,E)', '{ if (!S->error) S->error = (E); }'),
+     ('DFINALIZE(S)', 'for (int s_ = 0; s_ < S->nslots; s_++) { DWAIT(S,s_) }'),
+     ('DWAIT(S,SLOT)', (
+         'if (S->pending[SLOT]) { '
+         'struct aiocb *a_ = ((struct aiocb*)S->aio) + (SLOT); '
+         'const struct aiocb *l_[1] = {a_}; '
+         'while (aio_error(a_) == EINPROGRESS) aio_suspend(l_, 1, NULL); '
+         'int e_ = aio_error(a_); ssize_t r_ = aio_return(a_); '
+         'if (e_ || r_ != (ssize_t)a_->aio_nbytes) DERROR(S,e_ ? e_ : EIO) '
+         'S->pending[SLOT] = 0; }')),
+     ('DSUBMIT(S,V,SLOT,T,OP)', (
+         '{ struct aiocb *a_ = ((struct aiocb*)S->aio) + (SLOT); '
+         'memset(a_, 0, sizeof(struct aiocb)); a_->aio_fildes = S->fd; '
+         'a_->aio_buf = ((char*)V->data) + (long)(SLOT)*S->size*S->itemsize; '
+         'a_->aio_nbytes = S->size*S->itemsize; '
+         'a_->aio_offset = (off_t)(T)*S->size*S->itemsize; '
+         'if (OP(a_)) DERROR(S,errno) else S->pending[SLOT] = 1; }')),
+     ('DSTORE(S,V,SLOT,T)', (
+         'if ((T) >= 0 && (T) < S->nt) { DWAIT(S,SLOT) '
+         'DSUBMIT(S,V,SLOT,T,aio_write) S->tags[SLOT] = (T); }')),
+     ('DPREFETCH(S,V,SLOT,T)', (
+         'if (S->tags[SLOT] != (T)) { DWAIT(S,SLOT) S->tags[SLOT] = (T); '
+         'if ((T) >= 0 && (T) < S->nt) { DSUBMIT(S,V,SLOT,T,aio_read) } '
+         'else memset(((char*)V->data) + (long)(SLOT)*S->size*S->itemsize, 0, '
+         'S->size*S->itemsize); }')),
+     ('DLOAD(S,V,SLOT,T)', '{ DPREFETCH(S,V,SLOT,T) DWAIT(S,SLOT) }')],
+    ['rt']
+)
+
+storage_macros = {
+    CompressedStore: _compressed,
+    DiskStore: _disk
+}
+
+
+def lower_storage(graph, **kwargs):
+    """
+    Transfer the time slices of the TimeFunctions with out-of-data storage
+    (e.g., ``save=Compressed(...)``) between their alternating buffer and
+    their storage.
+
+    In an Operator writing to such a TimeFunction, the slices are stored as
+    soon as they are computed. Otherwise, the slices are loaded right before
+    the time step in which they are first read, so that each slice is loaded
+    at most once; if supported by the storage, the slice to be read next is
+    prefetched in the meantime. Under MPI, each rank stores its own portion
+    of the slices.
+    """
+    _lower_storage(graph, efuncs=graph.efuncs, **kwargs)
+
+
+@iet_pass
+def _lower_storage(iet, **kwargs):
+    efuncs = kwargs['efuncs']
+    platform = kwargs['platform']
+    compiler = kwargs['compiler']
+
+    # Subsampled TimeFunctions are accessed through their alternating buffer
+    iet = _index_buffers(iet)
+
+    mapper = {}
+    macros = []
+    objs = []
+    for i in FindNodes(Iteration).visit(iet):
+        if not i.dim.is_Time:
+            continue
+
+        # The time slices at which each TimeFunction is read and written
+        reads = defaultdict(set)
+        writes = defaultdict(set)
+        for e in _retrieve_expressions(i, efuncs):
+            for v, indexeds in [(writes, retrieve_indexed(e.expr.lhs)),
+                                (reads, retrieve_indexed(e.expr.rhs))]:
+                for a in indexeds:
+                    if _is_stored(a.function):
+                        v[a.function].add(_time_slice(i, a))
+        functions = sorted(set(reads) | set(writes), key=lambda f: f.name)
+        if not functions:
+            continue
+
+        if isinstance(platform, Device):
+            raise InvalidOperator("`save=%s(...)` isn't supported on device "
+                                  "backends" % functions[0].save.name)
+
+        # Where the time loop starts, and where the newest slices lie
+        if i.direction is Backward:
+            start, step, lead = i.symbolic_max, -1, min
+        else:
+            start, step, lead = i.symbolic_min, 1, max
+
+        init = []
+        before = []
+        after = []
+        finalize = []
+        for f in functions:
+            m = storage_macros[type(f.storage)]
+            macros.append(m)
+            objs.append(f.storage)
+
+            def transfer(name, t, time=i.dim):
+                t = t.subs(i.dim, time)
+                return Call(name, [f.storage, f, t % f._time_size, t])
+
+            init.append(Call(m.init, f.storage))
+            if m.finalize:
+                finalize.append(Call(m.finalize, f.storage))
+
+            # The offsets of the slices from the current time step, if `f` is
+            # accessed through the SteppingDimension; None if `f` is subsampled
+            is_written = f in writes
+            offsets = _time_offsets(f, i, reads[f] | writes[f])
+
+            if is_written:
+                # Store the slices as soon as they are written. The slices
+                # only read are stored upfront (e.g., the initial conditions)
+                init.extend(transfer(m.store, t, start)
+                            for t in sorted(reads[f] - writes[f], key=str))
+                for t in sorted(writes[f], key=str):
+                    # Wait until a slot may be overwritten only right before it
+                    # actually is, that is, if `f` is subsampled, only at the
+                    # time steps in which `f` is written
+                    sync = [Call(m.sync, [f.storage, t % f._time_size])] if m.sync else []
+                    if offsets is None:
+                        d = f.time_dim
+                        cond = CondEq(d.parent % d.factor, 0)
+                        if sync:
+                            before.append(Conditional(cond, sync))
+                        after.append(Conditional(cond, transfer(m.store, t)))
+                    else:
+                        before.extend(sync)
+                        after.append(transfer(m.store, t))
+            else:
+                # Load the newest slice at each time step, all others upfront
+                if offsets is None:
+                    t, = reads[f]
+                    window = 1
+                else:
+                    t = lead(reads[f], key=lambda j: offsets[j])
+                    window = max(offsets.values()) - min(offsets.values()) + 1
+                init.extend(transfer(m.load, j, start)
+                            for j in sorted(reads[f] - {t}, key=str))
+                before.append(transfer(m.load, t))
+
+                # Prefetch the slice to be read next, unless its slot is still
+                # in use
+                if m.prefetch and window < f._time_size:
+                    before.append(transfer(m.prefetch, t + step))
+
+        body = List(body=before + list(i.nodes) + after)
+        mapper[i] = List(body=init + [i._rebuild(nodes=body)] + finalize)
+
+    if not mapper:
+        return iet, {}
+
+    iet = Transformer(mapper).visit(iet)
+
+    includes = []
+    headers = []
+    for m in macros:
+        compiler.add_libraries(m.libs)
+        includes.extend(m.includes)
+        headers.extend(m.headers)
+
+    return iet, {'includes': includes, 'headers': headers, 'args': objs}
+
+
+def _is_stored(f):
+    return f.is_TimeFunction and f.storage is not None
+
+
+def _index_buffers(iet):
+    """
+    Access the subsampled TimeFunctions with storage through their alternating
+    buffer, that is `f[time/factor, ...] -> f[(time/factor) % nslots, ...]`.
+    """
+    mapper = {}
+    for e in FindNodes(Expression).visit(iet):
+        subs = {}
+        for a in retrieve_indexed(e.expr):
+            f = a.function
+            if not _is_stored(f) or f.time_dim.is_Stepping:
+                continue
+            indices = list(a.indices)
+            indices[f._time_position] = Mod(indices[f._time_position], f._time_size)
+            subs[a] = a.func(a.base, *indices)
+        if subs:
+            mapper[e] = e._rebuild(expr=uxreplace(e.expr, subs))
+
+    return Transformer(mapper).visit(iet)
+
+
+def _time_slice(iteration, indexed):
+    """
+    The time slice of `indexed` within `iteration`, e.g. `time + 1` for
+    `u[t1, x]`, where `t1 = (time + 1) % 3`.
+    """
+    f = indexed.function
+    t = indexed.indices[f._time_position]
+    if f.time_dim.is_Stepping:
+        for d in iteration.uindices:
+            if d is t:
+                return d.offset
+    elif isinstance(t, Mod):
+        # Drop the modulo introduced by `_index_buffers`
+        return t.args[0]
+    raise InvalidOperator("Cannot access `%s`, with storage `%s`, through `%s`"
+                          % (f.name, f.save, indexed))
+
+
+def _time_offsets(f, iteration, slices):
+    """
+    Map the time slices of `f` to their offset from the current time step, or
+    return None if `f` is subsampled.
+    """
+    if not f.time_dim.is_Stepping:
+        if len(slices) > 1:
+            raise InvalidOperator("Cannot access more than one time slice of the "
+                                  "subsampled `%s` per time step" % f.name)
+        return None
+    offsets = {t: t - iteration.dim for t in slices}
+    assert all(is_integer(i) for i in offsets.values())
+    return offsets
+
+
+def _retrieve_expressions(iet, efuncs):
+    """
+    Retrieve all Expressions within `iet`, including those within the
+    ElementalFunctions called by `iet`.
+    """
+    exprs = FindNodes(Expression).visit(iet)
+    for i in FindNodes(Call).visit(iet):
+        if i.name in efuncs:
+            exprs.extend(_retrieve_expressions(efuncs[i.name], efuncs))
+    return exprs
@@ -3,6 +3,7 @@ Utilities to turn SymPy objects into C strings.
 """
 
 import numpy as np
+import sympy
 
 from mpmath.libmp import prec_to_dps, to_str
 from sympy.printing.precedence import precedence
@@ -116,6 +117,30 @@ class CodePrinter(C99CodePrinter):
 
         return rv
 
+    def _print_Min(self, expr):
+        """
+        Print a Min over integer operands as a C ternary; `fmin` would return
+        a double, which is illegal in, e.g., the controlling predicate of an
+        OpenMP loop.
+        """
+        if _is_integral(expr):
+            return self._print_ternary(expr.args, '<')
+        return super()._print_Min(expr)
+
+    def _print_Max(self, expr):
+        """Print a Max over integer operands as a C ternary. See `_print_Min`."""
+        if _is_integral(expr):
+            return self._print_ternary(expr.args, '>')
+        return super()._print_Max(expr)
+
+    def _print_ternary(self, args, op):
+        if len(args) == 1:
+            return self._print(args[0])
+        half = len(args) // 2
+        a = self._print_ternary(args[:half], op)
+        b = self._print_ternary(args[half:], op)
+        return "((%s %s %s) ? %s : %s)" % (a, op, b, a, b)
+
     def _print_Differentiable(self, expr):
         return "(" + self._print(expr._expr) + ")"
 
@@ -152,6 +177,15 @@ class CodePrinter(C99CodePrinter):
         return str(expr)
 
 
+def _is_integral(expr):
+    """True if all of the ``expr`` operands are integers, False otherwise."""
+    for i in expr.free_symbols:
+        dtype = getattr(i, 'dtype', None)
+        if dtype is None or not np.issubdtype(dtype, np.integer):
+            return False
+    return all(i.is_Integer for i in expr.atoms(sympy.Number))
+
+
 def ccode(expr, dtype=np.float32, **settings):
     """Generate C++ code from an expression.
 
@@ -1,6 +1,52 @@
 import threading
 
-__all__ = ['sympy_mutex']
+from sympy.core.assumptions import _assume_rules
+
+__all__ = ['sympy_mutex', 'assumptions_mutex', 'threadsafe_assumptions']
 
 
 sympy_mutex = threading.RLock()
+
+assumptions_mutex = threading.RLock()
+"""
+Serialise the evaluation of the SymPy assumptions (e.g., ``expr.is_real``) of
+the Devito objects.
+"""
+
+
+def threadsafe_assumptions(cls):
+    """
+    Class decorator protecting the lazily evaluated SymPy assumptions of the
+    instances of ``cls`` with ``assumptions_mutex``.
+
+    SymPy evaluates the assumptions of an object lazily, and caches the outcome
+    in the object itself. Devito objects are cached too, hence shared, e.g. by
+    multiple Operators built in separate Python threads, and two threads
+    querying the same object at once may corrupt its assumptions (thus raising
+    ``InconsistentAssumptions``). The facts known a priori, e.g. ``is_real`` for
+    an AbstractSymbol, are class attributes and need no protection.
+    """
+    for fact in _assume_rules.defined_facts:
+        pname = 'is_%s' % fact
+        prop = getattr(cls, pname, None)
+        if isinstance(prop, property):
+            setattr(cls, pname, _threadsafe_property(fact, prop))
+    return cls
+
+
+def _threadsafe_property(fact, prop):
+    def getit(self):
+        try:
+            return self._assumptions[fact]
+        except KeyError:
+            pass
+        with assumptions_mutex:
+            # Another thread might have evaluated `fact` while we were waiting;
+            # or, if `fact` is None, this thread is evaluating it further up in
+            # the stack, and SymPy must not recurse
+            try:
+                return self._assumptions[fact]
+            except KeyError:
+                return prop.fget(self)
+
+    return property(getit)
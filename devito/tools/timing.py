@@ -57,6 +57,25 @@ class timed_pass(object):
     def is_enabled(cls):
         return isinstance(cls.timings.get(get_ident()), dict)
 
+    @classmethod
+    def record(cls, key, value):
+        """
+        Accumulate ``value`` into the entry ``key`` of the timings of the
+        innermost `timed_pass` being executed, if any. This may be used to
+        attach statistics (e.g., the amount of work a pass could reuse from
+        a previous pass) to the timing of a pass.
+        """
+        tid = get_ident()
+
+        timings = cls.timings.get(tid)
+        stack = cls.stack.get(tid)
+        if not isinstance(timings, dict) or not stack:
+            return
+
+        for f in stack:
+            timings = timings.setdefault(f, {})
+        timings[key] = timings.get(key, 0) + value
+
     def __call__(self, *args, **kwargs):
         tid = get_ident()
 
@@ -13,7 +13,8 @@ from cgen import Struct, Value
 from devito.data import default_allocator
 from devito.symbolics import aligned_indices
 from devito.tools import (Pickable, ctypes_to_cstr, dtype_to_cstr, dtype_to_ctype,
-                          frozendict, memoized_meth, sympy_mutex)
+                          frozendict, memoized_meth, sympy_mutex,
+                          threadsafe_assumptions)
 from devito.types.args import ArgProvider
 from devito.types.caching import Cached
 from devito.types.lazy import Evaluable
@@ -179,6 +180,7 @@ class Basic(object):
         return self
 
 
+@threadsafe_assumptions
 class AbstractSymbol(sympy.Symbol, Basic, Pickable, Evaluable):
 
     """
@@ -225,6 +227,12 @@ class AbstractSymbol(sympy.Symbol, Basic, Pickable, Evaluable):
                 assumptions[i] = kwargs.pop(i)
         return assumptions, kwargs
 
+    @property
+    def assumptions0(self):
+        # Another thread may be evaluating, and thus adding, assumptions while
+        # `self` is being hashed, so iterate over an (atomic) snapshot
+        return {k: v for k, v in dict.copy(self._assumptions).items() if v is not None}
+
     def __new__(cls, *args, **kwargs):
         name = kwargs.get('name') or args[0]
         assumptions, kwargs = cls._filter_assumptions(**kwargs)
@@ -387,10 +395,8 @@ class Symbol(AbstractSymbol, Cached):
         newobj._dtype = cls.__dtype_setup__(**kwargs)
         newobj.__init_finalize__(*args, **kwargs)
 
-        # Store new instance in symbol cache
-        Cached.__init__(newobj, key)
-
-        return newobj
+        # Store new instance in symbol cache, unless another thread got there first
+        return newobj._cache_setdefault(key)
 
     __hash__ = Cached.__hash__
 
@@ -604,6 +610,7 @@ class AbstractTensor(sympy.ImmutableDenseMatrix, Basic, Pickable, Evaluable):
         return []
 
 
+@threadsafe_assumptions
 class AbstractFunction(sympy.Function, Basic, Cached, Pickable, Evaluable):
 
     """
@@ -681,8 +688,7 @@ class AbstractFunction(sympy.Function, Basic, Cached, Pickable, Evaluable):
             with sympy_mutex:
                 newobj = sympy.Function.__new__(cls, *args, **options)
             newobj.__init_cached__(obj)
-            Cached.__init__(newobj, key)
-            return newobj
+            return newobj._cache_setdefault(key)
 
         # Preprocess arguments
         args, kwargs = cls.__args_setup__(*args, **kwargs)
@@ -1,5 +1,6 @@
 import gc
 import weakref
+from threading import Lock, RLock
 
 import sympy
 from sympy.core import cache
@@ -10,6 +11,22 @@ __all__ = ['Cached', '_SymbolCache', 'CacheManager']
 _SymbolCache = {}
 """The symbol cache."""
 
+_SymbolCache_lock = RLock()
+"""
+Guard the insertion and removal of entries in the symbol cache. Lookups are
+atomic operations, so they don't need it.
+"""
+
+
+def _evict(key, ref):
+    """
+    Drop ``key`` from the symbol cache, but only if it's still mapped to ``ref``,
+    as another thread may have mapped it to a new, alive object in the meantime.
+    """
+    with _SymbolCache_lock:
+        if _SymbolCache.get(key) is ref:
+            del _SymbolCache[key]
+
 
 class AugmentedWeakRef(weakref.ref):
 
@@ -63,8 +80,7 @@ class Cached(object):
             obj = obj_cached()
             if obj is None:
                 # Cleanup _SymbolCache (though practically unnecessary)
-                # does not fail if it's already gone
-                _SymbolCache.pop(key, None)
+                _evict(key, obj_cached)
                 return None
             else:
                 return obj
@@ -87,8 +103,27 @@ class Cached(object):
 
         # Add ourselves to the symbol cache
         awr = AugmentedWeakRef(self, self._cache_meta())
-        for i in (key,) + aliases:
-            _SymbolCache[i] = awr
+        with _SymbolCache_lock:
+            for i in (key,) + aliases:
+                _SymbolCache[i] = awr
+
+    def _cache_setdefault(self, key):
+        """
+        Store `self` in the symbol cache, unless another thread has stored an
+        object with the same key since `_cache_get` missed it. In the latter
+        case, the other object is returned, otherwise `self`.
+
+        Notes
+        -----
+        Two distinct, yet equal, objects (e.g., two Symbols with the same name)
+        must not coexist, as the compiler relies on their identity.
+        """
+        with _SymbolCache_lock:
+            obj = self._cache_get(key)
+            if obj is not None:
+                return obj
+            Cached.__init__(self, key)
+            return self
 
     def __init_cached__(self, cached_obj):
         """
@@ -148,47 +183,51 @@ class CacheManager(object):
     """
     ncalls_w_force_false = 0
 
+    _lock = Lock()
+
     @classmethod
     def clear(cls, force=True):
-        # Wipe out the "true" SymPy cache
-        cache.clear_cache()
-
-        # Wipe out the hidden module-private SymPy caches
-        sympy.polys.rootoftools.ComplexRootOf.clear_cache()
-        sympy.polys.rings._ring_cache.clear()
-        sympy.polys.fields._field_cache.clear()
-        sympy.polys.domains.modularinteger._modular_integer_cache.clear()
-
-        # Take a copy of the dictionary so we can safely iterate over it
-        # even if another thread is making changes
-
-        # mydict.copy() is safer than list(mydict) for getting an unchanging list
-        # See https://bugs.python.org/issue40327 for terrifying discussion
-        # on this issue.
-        cache_copied = _SymbolCache.copy()
-
-        # Maybe trigger garbage collection
-        if force is False:
-            if cls.ncalls_w_force_false + 1 == cls.force_ths:
-                # Case 1: too long since we called gc.collect, let's do it now
-                gc.collect()
-                cls.ncalls_w_force_false = 0
-            elif any(i.nbytes > cls.gc_ths for i in cache_copied.values()):
-                # Case 2: we got big objects in cache, we try to reclaim memory
-                gc.collect()
-                cls.ncalls_w_force_false = 0
+        # Concurrent calls would only duplicate work (e.g., garbage collection)
+        with cls._lock:
+            # Wipe out the "true" SymPy cache
+            cache.clear_cache()
+
+            # Wipe out the hidden module-private SymPy caches
+            sympy.polys.rootoftools.ComplexRootOf.clear_cache()
+            sympy.polys.rings._ring_cache.clear()
+            sympy.polys.fields._field_cache.clear()
+            sympy.polys.domains.modularinteger._modular_integer_cache.clear()
+
+            # Take a copy of the dictionary so we can safely iterate over it
+            # even if another thread is making changes
+
+            # mydict.copy() is safer than list(mydict) for getting an unchanging list
+            # See https://bugs.python.org/issue40327 for terrifying discussion
+            # on this issue.
+            cache_copied = _SymbolCache.copy()
+
+            # Maybe trigger garbage collection
+            if force is False:
+                if cls.ncalls_w_force_false + 1 == cls.force_ths:
+                    # Case 1: too long since we called gc.collect, let's do it now
+                    gc.collect()
+                    cls.ncalls_w_force_false = 0
+                elif any(i.nbytes > cls.gc_ths for i in cache_copied.values()):
+                    # Case 2: we got big objects in cache, we try to reclaim memory
+                    gc.collect()
+                    cls.ncalls_w_force_false = 0
+                else:
+                    # We won't call gc.collect() this time
+                    cls.ncalls_w_force_false += 1
             else:
-                # We won't call gc.collect() this time
-                cls.ncalls_w_force_false += 1
-        else:
-            gc.collect()
+                gc.collect()
 
-        for key in cache_copied:
-            obj = _SymbolCache.get(key)
-            if obj is None:
-                # deleted by another thread since we took the copy
-                continue
-            if obj() is None:
-                # pop(x, None) does not error if already gone
-                # (key could be removed in another thread since get() above)
-                _SymbolCache.pop(key, None)
+            for key in cache_copied:
+                obj = _SymbolCache.get(key)
+                if obj is None:
+                    # deleted by another thread since we took the copy
+                    continue
+                if obj() is None:
+                    # Not evicted if, since get() above, the key was removed or
+                    # mapped to a new object by another thread
+                    _evict(key, obj)
@@ -3,6 +3,7 @@ from ctypes import POINTER, Structure, c_void_p, c_int, cast, byref
 from functools import wraps, reduce
 from math import ceil
 from operator import mul
+import weakref
 
 import numpy as np
 import sympy
@@ -25,7 +26,7 @@ from devito.types.dimension import Dimension
 from devito.types.args import ArgProvider
 from devito.types.caching import CacheManager
 from devito.types.basic import AbstractFunction, Size
-from devito.types.utils import Buffer, DimensionTuple, NODE, CELL
+from devito.types.utils import Buffer, DimensionTuple, Storage, NODE, CELL
 
 __all__ = ['Function', 'TimeFunction', 'SubFunction', 'TempFunction']
 
@@ -74,6 +75,7 @@ class DiscreteFunction(AbstractFunction, ArgProvider, Differentiable):
 
         # Data-related properties and data initialization
         self._data = None
+        self._halo_plan = None
         self._first_touch = kwargs.get('first_touch', configuration['first-touch'])
         self._allocator = kwargs.get('allocator') or default_allocator()
         initializer = kwargs.get('initializer')
@@ -447,6 +449,44 @@ class DiscreteFunction(AbstractFunction, ArgProvider, Differentiable):
         """
         return self.data._gather(start=start, stop=stop, step=step, rank=rank)
 
+    def data_dump(self, filename):
+        """
+        Write the domain data to ``filename``, in the NumPy ``.npy`` format.
+
+        Parameters
+        ----------
+        filename : str
+            The output file, which must be on a filesystem shared by all MPI ranks.
+
+        Notes
+        -----
+        Alias to ``self.data._dump``.
+
+        Unlike ``data_gather``, with MPI the data is never gathered onto a single
+        rank; instead, all ranks concurrently write their own subdomain into the
+        output file, which can then be read back with ``numpy.load``.
+        """
+        self.data_ro_domain._dump(filename)
+
+    def data_load(self, filename):
+        """
+        Read the domain data from ``filename``, a file in the NumPy ``.npy``
+        format, as written by ``data_dump`` or ``numpy.save``.
+
+        Parameters
+        ----------
+        filename : str
+            The input file, storing an array with the same (global) shape and
+            dtype as ``self.data``.
+
+        Notes
+        -----
+        Alias to ``self.data._load``.
+
+        With MPI, each rank only reads its own subdomain.
+        """
+        self.data_domain._load(filename)
+
     @property
     @_allocate_memory
     def data_domain(self):
@@ -761,31 +801,69 @@ class DiscreteFunction(AbstractFunction, ArgProvider, Differentiable):
             raise RuntimeError("`%s` cannot perform a halo exchange as it has "
                                "no Grid attached" % self.name)
 
-        neighborhood = self._distributor.neighborhood
-        comm = self._distributor.comm
-
-        for d in self._dist_dimensions:
-            for i in [LEFT, RIGHT]:
-                # Get involved peers
-                dest = neighborhood[d][i]
-                source = neighborhood[d][i.flip()]
+        # One Dimension at a time, so that the corners get exchanged too
+        for reqs in self._halo_requests():
+            MPI.Prequest.Startall(reqs)
+            MPI.Request.Waitall(reqs)
 
-                # Gather send data
-                data = self._data_in_region(OWNED, d, i)
-                sendbuf = np.ascontiguousarray(data)
-
-                # Setup recv buffer
-                shape = self._data_in_region(HALO, d, i.flip()).shape
-                recvbuf = np.ndarray(shape=shape, dtype=self.dtype)
+        self._is_halo_dirty = False
 
-                # Communication
-                comm.Sendrecv(sendbuf, dest=dest, recvbuf=recvbuf, source=source)
+    def _halo_requests(self):
+        """
+        The persistent MPI requests performing the halo exchange, grouped by
+        distributed Dimension.
 
-                # Scatter received data
-                if recvbuf is not None and source != MPI.PROC_NULL:
-                    self._data_in_region(HALO, d, i.flip())[:] = recvbuf
+        The requests operate directly on the allocated data through subarray
+        datatypes, so no buffer gets packed or allocated in Python. They are
+        set up only once, upon the first halo exchange, and released along with
+        the datatypes once either the data or the Function go away.
+        """
+        if self._halo_plan is not None:
+            data, requests, free = self._halo_plan
+            if data is self._data:
+                return requests
+            # Stale plan, as the data has been reallocated
+            free()
 
-        self._is_halo_dirty = False
+        neighborhood = self._distributor.neighborhood
+        comm = self._distributor.comm
+        buf = np.asarray(self._data)
+        etype = MPI._typedict[np.dtype(self.dtype).char]
+
+        def subarray(region, d, side):
+            offset = getattr(getattr(self, '_offset_%s' % region.name)[d], side.name)
+            size = getattr(getattr(self, '_size_%s' % region.name)[d], side.name)
+            if size == 0:
+                return None
+            subsizes = [size if i is d else s for i, s in zip(self.dimensions, buf.shape)]
+            starts = [offset if i is d else 0 for i in self.dimensions]
+            datatype = etype.Create_subarray(buf.shape, subsizes, starts).Commit()
+            datatypes.append(datatype)
+            return datatype
+
+        datatypes = []
+        requests = []
+        for d in self._dist_dimensions:
+            reqs = []
+            for tag, i in enumerate([LEFT, RIGHT]):
+                # Send the OWNED region to the peer on side `i`, and receive
+                # the HALO region on the other side from the opposite peer
+                recvtype = subarray(HALO, d, i.flip())
+                if recvtype is not None:
+                    reqs.insert(0, comm.Recv_init([buf, 1, recvtype],
+                                                  source=neighborhood[d][i.flip()],
+                                                  tag=tag))
+                sendtype = subarray(OWNED, d, i)
+                if sendtype is not None:
+                    reqs.append(comm.Send_init([buf, 1, sendtype],
+                                               dest=neighborhood[d][i], tag=tag))
+            if reqs:
+                requests.append(reqs)
+
+        free = weakref.finalize(self, _free_halo_plan, requests, datatypes)
+        self._halo_plan = (self._data, requests, free)
+
+        return requests
 
     @property
     def _arg_names(self):
@@ -872,6 +950,15 @@ class DiscreteFunction(AbstractFunction, ArgProvider, Differentiable):
         ['grid', 'staggered', 'initializer']
 
 
+def _free_halo_plan(requests, datatypes):
+    if MPI.Is_finalized():
+        return
+    for i in flatten(requests):
+        i.Free()
+    for i in datatypes:
+        i.Free()
+
+
 class Function(DiscreteFunction):
 
     """
@@ -1217,7 +1304,7 @@ class TimeFunction(Function):
     dtype : data-type, optional
         Any object that can be interpreted as a numpy data type. Defaults
         to `np.float32`.
-    save : int or Buffer, optional
+    save : int or Buffer or Storage, optional
         By default, ``save=None``, which indicates the use of alternating buffers. This
         enables cyclic writes to the TimeFunction. For example, if the TimeFunction
         ``u(t, x)`` has shape (3, 100), then, in an Operator, ``t`` will assume the
@@ -1227,7 +1314,11 @@ class TimeFunction(Function):
         the time buffer, one should use the syntax ``save=Buffer(mysize)``.
         Alternatively, if all of the intermediate results are required (or, simply, to
         avoid using an alternating buffer), an explicit value for ``save`` ( an integer)
-        must be provided.
+        must be provided. With ``save=Compressed(nt, tolerance=...)``, up to ``nt``
+        intermediate results are retained in compressed form, while the data of
+        the TimeFunction is an alternating buffer as with ``save=None``. Likewise,
+        with ``save=Disk(path, nt)``, the intermediate results are retained in
+        the file ``path``.
     time_dim : Dimension, optional
         TimeDimension to be used in the TimeFunction. Defaults to ``grid.time_dim``.
     staggered : Dimension or tuple of Dimension or Stagger, optional
@@ -1314,6 +1405,21 @@ class TimeFunction(Function):
 
         self.save = kwargs.get('save')
 
+        if isinstance(self.save, Storage):
+            # The slices must be addressable either through the SteppingDimension
+            # or through a factor-subsampled TimeDimension (i.e., snapshots)
+            d = self.time_dim
+            if not (d is self.grid.stepping_dim or
+                    (d.is_Conditional and d.parent is self.grid.time_dim and
+                     d.condition is None)):
+                raise NotImplementedError("`save=%s(...)` requires `time_dim` to "
+                                          "be either the default time Dimension "
+                                          "or a ConditionalDimension with `factor`"
+                                          % self.save.name)
+            self._storage = self.save._make_store(self)
+        else:
+            self._storage = None
+
     def __fd_setup__(self):
         """
         Dynamically add derivative short-cuts.
@@ -1356,12 +1462,15 @@ class TimeFunction(Function):
             shape = list(grid.shape_local)
             if save is None:
                 shape.insert(cls._time_position, time_order + 1)
+            elif isinstance(save, Storage):
+                shape.insert(cls._time_position, time_order + 1 + save._extra_slots)
             elif isinstance(save, Buffer):
                 shape.insert(cls._time_position, save.val)
             elif isinstance(save, int):
                 shape.insert(cls._time_position, save)
             else:
-                raise TypeError("`save` can be None, int or Buffer, not %s" % type(save))
+                raise TypeError("`save` can be None, int, Buffer or Storage, "
+                                "not %s" % type(save))
         elif dimensions is None:
             raise TypeError("`dimensions` required if both `grid` and "
                             "`shape` are provided")
@@ -1397,6 +1506,14 @@ class TimeFunction(Function):
 
         return self._subs(_t, _t - i * _t.spacing)
 
+    @property
+    def storage(self):
+        """
+        The storage of the time slices, if not the data of the TimeFunction
+        itself (e.g., with ``save=Compressed(...)``), otherwise None.
+        """
+        return self._storage
+
     @property
     def _time_size(self):
         return self.shape_allocated[self._time_position]
@@ -1,8 +1,17 @@
-from ctypes import c_int, c_double, c_void_p
+from ctypes import CDLL, POINTER, c_int, c_int64, c_double, c_void_p, string_at
+from uuid import uuid4
+import errno
+import os
+import weakref
+import zlib
 
+import numpy as np
+
+from devito.parameters import configuration
 from devito.types import CompositeObject, LocalObject, Symbol
 
-__all__ = ['Timer', 'VoidPointer', 'VolatileInt', 'c_volatile_int',
+__all__ = ['Timer', 'PerfCounters', 'Tracer', 'SliceStore', 'CompressedStore',
+           'DiskStore', 'VoidPointer', 'VolatileInt', 'c_volatile_int',
            'c_volatile_int_p']
 
 
@@ -37,6 +46,506 @@ class Timer(CompositeObject):
     _pickle_args = ['name', 'sections']
 
 
+class PerfCounters(CompositeObject):
+
+    """
+    The hardware performance counters of a set of code sections.
+
+    For each section, the counters are accumulated in a buffer of
+    `maxthreads*nevents` entries, that is one entry per thread per event.
+    The file descriptors of the opened counters are stored in `fds`, with
+    -1 denoting a counter that couldn't be opened.
+
+    Parameters
+    ----------
+    name : str
+        Name of the object.
+    sections : list of str
+        The names of the code sections.
+    events : list of 2-tuples
+        The `(type, config)` of the events, as in the Linux `perf_event_attr`.
+    """
+
+    def __init__(self, name, sections, events):
+        self.events = tuple(tuple(i) for i in events)
+        self._buffers = {}
+
+        pfields = [('size', c_int), ('nevents', c_int), ('maxthreads', c_int),
+                   ('types', POINTER(c_int)), ('configs', POINTER(c_int64)),
+                   ('fds', POINTER(c_int))]
+        pfields.extend([(i, POINTER(c_int64)) for i in sections])
+        super().__init__(name, 'perfcounters', pfields)
+
+    @property
+    def sections(self):
+        return self.fields[6:]
+
+    @property
+    def nevents(self):
+        return len(self.events)
+
+    def _arg_values(self, args=None, **kwargs):
+        values = super()._arg_values(args=args, **kwargs)
+
+        # Enough room for any thread the Operator may run on
+        maxthreads = max(kwargs.get('nthreads') or 1,
+                         int(os.environ.get('OMP_NUM_THREADS', 1)),
+                         configuration['platform'].cores_logical or 1)
+        size = maxthreads*self.nevents
+
+        # Fresh buffers at each run, so that the counters start from zero
+        self._buffers = {
+            'types': np.array([i for i, _ in self.events], dtype=np.int32),
+            'configs': np.array([i for _, i in self.events], dtype=np.int64),
+            'fds': np.full(size, -1, dtype=np.int32)
+        }
+        self._buffers.update({i: np.zeros(size, dtype=np.int64)
+                              for i in self.sections})
+
+        obj = values[self.name]._obj
+        obj.size = size
+        obj.nevents = self.nevents
+        obj.maxthreads = maxthreads
+        for k, v in self._buffers.items():
+            setattr(obj, k, v.ctypes.data_as(dict(self.pfields)[k]))
+
+        return values
+
+    def reset(self):
+        """Zero the counters, as if no section had been executed yet."""
+        for k, v in self._buffers.items():
+            if k == 'fds':
+                v.fill(-1)
+            elif k in self.sections:
+                v.fill(0)
+        return self.value
+
+    def read(self, obj):
+        """
+        Retrieve the counters from the C struct `obj`, as a mapper from section
+        names to arrays of shape `(nthreads, nevents)`, in which the events
+        that couldn't be opened are masked out, and the thread-wise file
+        descriptors as an array of the same shape.
+        """
+        shape = (obj.maxthreads, obj.nevents)
+        fds = np.ctypeslib.as_array(obj.fds, shape=(obj.size,)).reshape(shape)
+
+        # Drop the threads that didn't take part in the run
+        fds = fds[(fds >= 0).any(axis=1)]
+        nthreads = fds.shape[0]
+
+        ret = {}
+        for i in self.sections:
+            v = np.ctypeslib.as_array(getattr(obj, i), shape=(obj.size,))
+            v = v.reshape(shape)[:nthreads]
+            ret[i] = np.ma.masked_array(v, mask=(fds < 0))
+
+        return ret, fds
+
+    # Pickling support
+    _pickle_args = ['name', 'sections', 'events']
+
+
+class Tracer(CompositeObject):
+
+    """
+    A ring buffer of timestamped events, each event being one execution of a
+    code section.
+
+    The buffer has room for `capacity` events; once full, the oldest events
+    are overwritten, so the memory footprint is bounded regardless of the
+    number of timesteps. Each event consists of the index of the section in
+    `sections`, the timestep at which it was executed (-1 if not within a
+    time loop), and the begin and end timestamps in microseconds.
+
+    Parameters
+    ----------
+    name : str
+        Name of the object.
+    sections : list of str
+        The names of the code sections.
+    capacity : int
+        The maximum number of events retained.
+    """
+
+    def __init__(self, name, sections, capacity):
+        self.sections = tuple(sections)
+        self.capacity = capacity
+        self._buffers = {}
+
+        pfields = [('size', c_int), ('count', c_int64),
+                   ('ids', POINTER(c_int)), ('steps', POINTER(c_int)),
+                   ('begins', POINTER(c_int64)), ('ends', POINTER(c_int64))]
+        super().__init__(name, 'tracer', pfields)
+
+    def _arg_values(self, args=None, **kwargs):
+        values = super()._arg_values(args=args, **kwargs)
+
+        self._buffers = {
+            'ids': np.zeros(self.capacity, dtype=np.int32),
+            'steps': np.zeros(self.capacity, dtype=np.int32),
+            'begins': np.zeros(self.capacity, dtype=np.int64),
+            'ends': np.zeros(self.capacity, dtype=np.int64)
+        }
+
+        obj = values[self.name]._obj
+        obj.size = self.capacity
+        obj.count = 0
+        for k, v in self._buffers.items():
+            setattr(obj, k, v.ctypes.data_as(dict(self.pfields)[k]))
+
+        return values
+
+    def reset(self):
+        """Drop all of the recorded events."""
+        self.value._obj.count = 0
+        return self.value
+
+    def read(self, obj):
+        """
+        Retrieve the events from the C struct `obj`, in chronological order, as
+        a list of 4-tuples `(section, timestep, begin, end)`, along with the
+        number of events that were overwritten.
+        """
+        count = obj.count
+        n = min(count, obj.size)
+
+        # Unroll the ring buffer, oldest event first
+        order = np.roll(np.arange(n), -(count % obj.size) if count > n else 0)
+        ids, steps, begins, ends = [np.ctypeslib.as_array(getattr(obj, i),
+                                                          shape=(obj.size,))[order]
+                                    for i in ('ids', 'steps', 'begins', 'ends')]
+
+        events = [(self.sections[i], int(t), int(b), int(e))
+                  for i, t, b, e in zip(ids, steps, begins, ends)]
+
+        return events, count - n
+
+    # Pickling support
+    _pickle_args = ['name', 'sections', 'capacity']
+
+
+_live_stores = weakref.WeakValueDictionary()
+"""The SliceStores alive in this process, by `key`."""
+
+
+def _rebuild_store(cls, key, args, kwargs):
+    try:
+        return _live_stores[key]
+    except KeyError:
+        return cls(*args, **kwargs)
+
+
+class SliceStore(CompositeObject):
+
+    """
+    Base class for the storage of the time slices of a TimeFunction, if not
+    its data (e.g., ``save=Compressed(...)``).
+
+    The data of the TimeFunction is an alternating buffer of `nslots` slices;
+    the generated code transfers the slices between the buffer and the store.
+    For each slot, `tags` tells which slice it's currently holding (-1 if
+    unknown), so that a slice is never transferred twice in a row. The first
+    failed transfer, if any, is recorded in `error`, and reported once the
+    Operator returns.
+
+    A SliceStore is pickled by reference: within the same process, unpickling
+    returns the live object, rather than a copy, since the stored slices must
+    neither be duplicated nor lost.
+
+    Parameters
+    ----------
+    name : str
+        Name of the object.
+    pname : str
+        Name of the C struct.
+    pfields : list of 2-tuples
+        The store-specific fields of the C struct.
+    fname : str
+        Name of the TimeFunction whose slices are stored.
+    shape : tuple of ints
+        The allocated shape of a time slice, halo and padding included.
+    fdtype : data-type
+        The data type of the TimeFunction.
+    nt : int
+        The maximum number of slices retained.
+    nslots : int
+        The number of slots of the alternating buffer.
+    """
+
+    def __init__(self, name, pname, pfields, fname, shape, fdtype, nt, nslots):
+        self.fname = fname
+        self.shape = tuple(shape)
+        self.fdtype = np.dtype(fdtype)
+        self.nt = nt
+        self.nslots = nslots
+
+        pfields = [('nt', c_int), ('size', c_int64), ('itemsize', c_int),
+                   ('nslots', c_int), ('tags', POINTER(c_int)),
+                   ('error', c_int)] + list(pfields)
+        super().__init__(name, pname, pfields)
+
+        # Unlike the other CompositeObjects, the struct is set up once and for
+        # all, since the slices must be retrievable by any subsequent run
+        self.tags = np.full(nslots, -1, dtype=np.int32)
+
+        obj = self.value._obj
+        obj.nt = nt
+        obj.size = self.size
+        obj.itemsize = self.fdtype.itemsize
+        obj.nslots = nslots
+        obj.tags = self.tags.ctypes.data_as(POINTER(c_int))
+
+        _live_stores[self.key] = self
+
+    def _arg_values(self, args=None, **kwargs):
+        # The user may override the TimeFunction at `apply` time, in which
+        # case its own slices must be used
+        try:
+            return {self.name: kwargs[self.fname].storage.value}
+        except (KeyError, AttributeError):
+            return super()._arg_values(args=args, **kwargs)
+
+    def _arg_apply(self, value, *args, **kwargs):
+        obj = value._obj
+        if obj.error:
+            error, obj.error = obj.error, 0
+            self._raise(error)
+
+    def _raise(self, error):
+        """Raise the exception corresponding to the C-level `error`."""
+        raise NotImplementedError
+
+    @property
+    def key(self):
+        """A string uniquely identifying the stored slices."""
+        raise NotImplementedError
+
+    @property
+    def size(self):
+        """The number of points in a time slice."""
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes_slice(self):
+        """The size of a time slice, in bytes."""
+        return self.size*self.fdtype.itemsize
+
+    def read(self, t):
+        """
+        Retrieve the `t`-th slice, as an array with the allocated shape of a
+        time slice.
+        """
+        raise NotImplementedError
+
+    def __reduce_ex__(self, proto):
+        args, kwargs = self.__getnewargs_ex__()
+        return (_rebuild_store, (type(self), self.key, args, kwargs))
+
+
+class CompressedStore(SliceStore):
+
+    """
+    The compressed time slices of a TimeFunction with ``save=Compressed(...)``.
+
+    The slices are compressed and decompressed by the generated code, which
+    also allocates the memory for them; here we only keep track of the
+    pointers to, and the lengths of, the compressed slices, so that they
+    outlive the Operator run that produced them.
+
+    Parameters
+    ----------
+    name : str
+        Name of the object.
+    fname : str
+        Name of the TimeFunction whose slices are stored.
+    shape : tuple of ints
+        The allocated shape of a time slice, halo and padding included.
+    fdtype : data-type
+        The data type of the TimeFunction.
+    nt : int
+        The maximum number of slices retained.
+    nslots : int
+        The number of slots of the alternating buffer.
+    tolerance : float
+        The maximum pointwise error introduced by the compression.
+    """
+
+    def __init__(self, name, fname, shape, fdtype, nt, nslots, tolerance):
+        self.tolerance = tolerance
+        self._key = uuid4().hex
+
+        pfields = [('tolerance', c_double), ('blobs', POINTER(c_void_p)),
+                   ('lengths', POINTER(c_int64))]
+        super().__init__(name, 'zstore', pfields, fname, shape, fdtype, nt, nslots)
+
+        self.blobs = np.zeros(nt, dtype=np.uintp)
+        self.lengths = np.zeros(nt, dtype=np.int64)
+
+        obj = self.value._obj
+        obj.tolerance = tolerance
+        obj.blobs = self.blobs.ctypes.data_as(POINTER(c_void_p))
+        obj.lengths = self.lengths.ctypes.data_as(POINTER(c_int64))
+
+        weakref.finalize(self, _free_blobs, self.blobs, self.lengths)
+
+    @property
+    def key(self):
+        return self._key
+
+    def _raise(self, error):
+        if error == errno.ENOMEM:
+            raise MemoryError("Couldn't allocate memory for the time slices of `%s`"
+                              % self.fname)
+        # Otherwise, a zlib error code
+        raise RuntimeError("Couldn't (de)compress the time slices of `%s` "
+                           "[zlib error %d]" % (self.fname, error))
+
+    @property
+    def nbytes(self):
+        """The memory footprint of the compressed slices, in bytes."""
+        return int(self.lengths.sum())
+
+    @property
+    def ratio(self):
+        """The compression ratio of the stored slices."""
+        nslices = np.count_nonzero(self.lengths)
+        if nslices == 0:
+            return 0.
+        return nslices*self.nbytes_slice / self.nbytes
+
+    def read(self, t):
+        """
+        Decompress the `t`-th slice, as an array with the allocated shape of a
+        time slice. A slice that was never stored is returned as all zeros.
+        """
+        if self.lengths[t] == 0:
+            return np.zeros(self.shape, dtype=self.fdtype)
+
+        itemsize = 8 if self.tolerance > 0 else self.fdtype.itemsize
+
+        # Undo the byte shuffle
+        data = zlib.decompress(string_at(int(self.blobs[t]), int(self.lengths[t])))
+        data = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, self.size)
+        data = np.ascontiguousarray(data.T)
+
+        if self.tolerance > 0:
+            values = data.view(np.int64).ravel() * (2*self.tolerance)
+        else:
+            values = data.view(self.fdtype).ravel()
+
+        return values.astype(self.fdtype).reshape(self.shape)
+
+    def clear(self):
+        """Release the memory of all stored slices."""
+        _free_blobs(self.blobs, self.lengths)
+
+    # Pickling support
+    _pickle_args = ['name', 'fname', 'shape', 'fdtype', 'nt', 'nslots', 'tolerance']
+
+
+def _free_blobs(blobs, lengths):
+    # The compressed slices are allocated by the generated code via `malloc`
+    free = CDLL(None).free
+    free.argtypes = [c_void_p]
+    for i in np.flatnonzero(blobs):
+        free(int(blobs[i]))
+    blobs[:] = 0
+    lengths[:] = 0
+
+
+class DiskStore(SliceStore):
+
+    """
+    The time slices of a TimeFunction with ``save=Disk(...)``, stored in a
+    file, the `t`-th slice at offset `t*nbytes_slice`.
+
+    The file is created, or truncated unless `truncate=False`, upon construction,
+    and it's kept open until the object is garbage collected. The generated code
+    reads and writes the slices through POSIX asynchronous I/O; for the control
+    blocks, one per slot, the generated code allocates `aio` upon the first run.
+
+    Parameters
+    ----------
+    name : str
+        Name of the object.
+    fname : str
+        Name of the TimeFunction whose slices are stored.
+    shape : tuple of ints
+        The allocated shape of a time slice, halo and padding included.
+    fdtype : data-type
+        The data type of the TimeFunction.
+    nt : int
+        The maximum number of slices retained.
+    nslots : int
+        The number of slots of the alternating buffer.
+    path : str
+        The path to the file.
+    truncate : bool, optional
+        If False, the slices already in the file are retained. Defaults to True.
+    """
+
+    def __init__(self, name, fname, shape, fdtype, nt, nslots, path, truncate=True):
+        self.path = path
+
+        pfields = [('fd', c_int), ('pending', POINTER(c_int)), ('aio', c_void_p)]
+        super().__init__(name, 'diskstore', pfields, fname, shape, fdtype, nt, nslots)
+
+        # The slices never written read as zeros
+        flags = os.O_RDWR | os.O_CREAT
+        if truncate:
+            flags |= os.O_TRUNC
+        self.fd = os.open(path, flags, 0o644)
+        os.ftruncate(self.fd, nt*self.nbytes_slice)
+
+        self.pending = np.zeros(nslots, dtype=np.int32)
+
+        obj = self.value._obj
+        obj.fd = self.fd
+        obj.pending = self.pending.ctypes.data_as(POINTER(c_int))
+
+        weakref.finalize(self, _close_disk, self.fd, obj)
+
+    @classmethod
+    def lookup(cls, path):
+        """The live DiskStore using the file `path`, if any, None otherwise."""
+        return _live_stores.get(os.path.realpath(path))
+
+    @property
+    def key(self):
+        return os.path.realpath(self.path)
+
+    def _raise(self, error):
+        raise OSError(error, "Couldn't transfer the time slices of `%s` [%s]"
+                      % (self.fname, os.strerror(error)))
+
+    def read(self, t):
+        """
+        Read the `t`-th slice, as an array with the allocated shape of a time
+        slice. A slice that was never stored is returned as all zeros.
+        """
+        data = os.pread(self.fd, self.nbytes_slice, t*self.nbytes_slice)
+        return np.frombuffer(data, dtype=self.fdtype).reshape(self.shape).copy()
+
+    # Pickling support
+    _pickle_args = ['name', 'fname', 'shape', 'fdtype', 'nt', 'nslots', 'path']
+
+    def __getnewargs_ex__(self):
+        args, kwargs = super().__getnewargs_ex__()
+        # Outside of this process, the file gets reopened rather than recreated
+        return args, dict(kwargs, truncate=False)
+
+
+def _close_disk(fd, obj):
+    # The control blocks are allocated by the generated code via `calloc`
+    if obj.aio:
+        free = CDLL(None).free
+        free.argtypes = [c_void_p]
+        free(obj.aio)
+        obj.aio = None
+    os.close(fd)
+
+
 class VoidPointer(LocalObject):
 
     dtype = type('void*', (c_void_p,), {})
@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from itertools import product
 
 import sympy
@@ -7,7 +7,8 @@ from cached_property import cached_property
 
 from devito.finite_differences import generate_fd_shortcuts
 from devito.mpi import MPI, SparseDistributor
-from devito.operations import LinearInterpolator, PrecomputedInterpolator
+from devito.operations import (LinearInterpolator, PrecomputedInterpolator,
+                               LagrangeInterpolator, SincInterpolator)
 from devito.symbolics import (INT, FLOOR, cast_mapper, indexify,
                               retrieve_function_carriers)
 from devito.tools import (ReducerMap, as_tuple, flatten, prod, filter_ordered,
@@ -21,6 +22,18 @@ __all__ = ['SparseFunction', 'SparseTimeFunction', 'PrecomputedSparseFunction',
            'PrecomputedSparseTimeFunction', 'MatrixSparseTimeFunction']
 
 
+DistIndex = namedtuple('DistIndex', 'owners scatter_mask gather_mask ssparse rsparse')
+"""
+The point ownership index of an AbstractSparseFunction:
+
+    * `owners`: the MPI rank requiring each entry of `scatter_mask`;
+    * `scatter_mask`: the sparse points to be sent out, grouped by MPI rank;
+    * `gather_mask`: the entries of `scatter_mask` to be retained upon return;
+    * `ssparse`, `rsparse`: how many sparse points are sent to/received from
+      each MPI rank.
+"""
+
+
 class AbstractSparseFunction(DiscreteFunction):
 
     """
@@ -41,6 +54,9 @@ class AbstractSparseFunction(DiscreteFunction):
         self._npoint = kwargs['npoint']
         self._space_order = kwargs.get('space_order', 0)
 
+        # The point ownership index, lazily built when running with MPI
+        self._dist_index_cache = (None, None)
+
         # Dynamically add derivative short-cuts
         self._fd = self.__fd_setup__()
 
@@ -112,34 +128,138 @@ class AbstractSparseFunction(DiscreteFunction):
         return self.interpolator.inject(*args, **kwargs)
 
     @property
-    def _support(self):
+    def _gridpoints_array(self):
         """
-        The grid points surrounding each sparse point within the radius of self's
-        injection/interpolation operators.
+        The reference grid point of each sparse point, as an integer array of
+        shape ``(npoint, grid.dim)``.
         """
-        ret = []
-        for i in self.gridpoints:
-            support = [range(max(0, j - self._radius + 1), min(M, j + self._radius + 1))
-                       for j, M in zip(i, self.grid.shape)]
-            ret.append(tuple(product(*support)))
-        return tuple(ret)
+        ret = np.array(self.gridpoints, dtype=np.int64)
+        return ret.reshape(len(ret), self.grid.dim)
 
     @property
-    def _dist_datamap(self):
-        return self._build_dist_datamap(support=self._support)
+    def _dist_index_key(self):
+        """
+        The rank-local data from which the point ownership index is derived,
+        as a numpy array. The index is rebuilt whenever the values change; None
+        means the index cannot be cached.
+        """
+        return None
 
-    @memoized_meth
-    def _build_dist_datamap(self, support=None):
+    @property
+    def _dist_index(self):
+        """
+        The point ownership index, that is the (immutable) metadata describing
+        which MPI ranks require which sparse points. The index is built upon
+        first access, and then only checked for staleness, through
+        :meth:`_dist_index_refresh`, at each scatter.
+
+        Notes
+        -----
+        The first access is a collective operation.
+        """
+        index = self._dist_index_cache[1]
+        if index is None:
+            index = self._dist_index_refresh()
+        return index
+
+    def _dist_index_refresh(self):
+        """
+        Rebuild the point ownership index if the sparse points moved since it
+        was last built, and return it.
+
+        Notes
+        -----
+        This is a collective operation, since whether the index must be rebuilt
+        or not depends on the sparse points owned by all MPI ranks.
+        """
+        key = self._dist_index_key
+        cached_key, index = self._dist_index_cache
+        # NOTE: the data may be written through any previously obtained view,
+        # so the only reliable staleness check is on the values themselves
+        stale = index is None or key is None or not np.array_equal(key, cached_key)
+
+        # All ranks must agree, as rebuilding the index entails communication
+        if self.grid.distributor.comm.allreduce(stale, op=MPI.LOR):
+            index = self._build_dist_index()
+            self._dist_index_cache = (None if key is None else np.array(key), index)
+
+        return index
+
+    def _build_dist_index(self):
+        """
+        Build the point ownership index. Each sparse point is required by all
+        MPI ranks owning at least one of the grid points within the radius of
+        self's injection/interpolation operators.
+        """
+        distributor = self.grid.distributor
+        gridpoints = self._gridpoints_array
+
+        # Map the support of each sparse point, along each Dimension, to the
+        # first and last intersected MPI rank coordinates
+        valid = np.ones(len(gridpoints), dtype=bool)
+        lower = []
+        upper = []
+        for i, M, dec in zip(gridpoints.T, self.grid.shape, distributor.decomposition):
+            start = np.maximum(0, i - self._radius + 1)
+            stop = np.minimum(M, i + self._radius + 1) - 1
+            valid &= start <= stop
+            dmin = np.array([min(j) for j in dec])
+            dmax = np.array([max(j) for j in dec])
+            lower.append(np.searchsorted(dmax, start, side='left'))
+            upper.append(np.searchsorted(dmin, stop, side='right') - 1)
+        lower = np.stack(lower, axis=1)
+        upper = np.stack(upper, axis=1)
+
+        # The MPI rank at each position of the topology
+        ranks = np.empty(distributor.topology, dtype=np.int64)
+        for r, c in enumerate(distributor.all_coords):
+            ranks[c] = r
+
+        # Enumerate the `(rank, point)` pairs. A support spans very few MPI
+        # ranks along each Dimension, so we just iterate over the offsets
+        # from `lower`, rather than over the sparse points
+        if valid.any():
+            span = (upper - lower + 1)[valid].max(axis=0)
+        else:
+            span = np.zeros(self.grid.dim, dtype=np.int64)
+        owners = [np.empty(0, dtype=np.int64)]
+        points = [np.empty(0, dtype=np.int64)]
+        for offset in product(*[range(i) for i in span]):
+            coords = lower + np.array(offset, dtype=np.int64)
+            mask = valid & np.all(coords <= upper, axis=1)
+            owners.append(ranks[tuple(coords[mask].T)])
+            points.append(np.flatnonzero(mask))
+        owners = np.concatenate(owners)
+        points = np.concatenate(points)
+
+        # Group by rank, retaining the original ordering of the points
+        perm = np.lexsort((points, owners))
+        owners = owners[perm]
+        scatter_mask = points[perm]
+
+        # Upon the return trip, only the first copy of each point is retained,
+        # in the original ordering of the points (`np.unique` sorts by point)
+        gather_mask = np.unique(scatter_mask, return_index=True)[1]
+
+        ssparse = np.bincount(owners, minlength=distributor.nprocs).astype(int)
+        rsparse = np.empty(distributor.nprocs, dtype=int)
+        distributor.comm.Alltoall(ssparse, rsparse)
+
+        for i in (owners, scatter_mask, gather_mask, ssparse, rsparse):
+            i.setflags(write=False)
+
+        return DistIndex(owners, scatter_mask, gather_mask, ssparse, rsparse)
+
+    @property
+    def _dist_datamap(self):
         """
         Mapper ``M : MPI rank -> required sparse data``.
         """
+        index = self._dist_index
         ret = {}
-        support = support or self._support
-        for i, s in enumerate(support):
-            # Sparse point `i` is "required" by the following ranks
-            for r in self.grid.distributor.glb_to_rank(s):
-                ret.setdefault(r, []).append(i)
-        return {k: filter_ordered(v) for k, v in ret.items()}
+        for r, i in zip(index.owners, index.scatter_mask):
+            ret.setdefault(int(r), []).append(int(i))
+        return ret
 
     @property
     def _dist_scatter_mask(self):
@@ -150,10 +270,8 @@ class AbstractSparseFunction(DiscreteFunction):
         values accessible by the i-th MPI rank.  Thus, sparse data values along
         the boundary of two or more MPI ranks are duplicated.
         """
-        dmap = self._dist_datamap
-        mask = np.array(flatten(dmap[i] for i in sorted(dmap)), dtype=int)
         ret = [slice(None) for i in range(self.ndim)]
-        ret[self._sparse_position] = mask
+        ret[self._sparse_position] = self._dist_index.scatter_mask
         return tuple(ret)
 
     @property
@@ -173,12 +291,8 @@ class AbstractSparseFunction(DiscreteFunction):
         duplicate sparse data values have been discarded. The resulting data
         array can thus be used to populate ``self.data``.
         """
-        ret = list(self._dist_scatter_mask)
-        mask = ret[self._sparse_position]
-        inds = np.unique(mask, return_index=True)[1]
-        inds.sort()
-        ret[self._sparse_position] = inds.tolist()
-
+        ret = [slice(None) for i in range(self.ndim)]
+        ret[self._sparse_position] = self._dist_index.gather_mask
         return tuple(ret)
 
     @property
@@ -196,14 +310,8 @@ class AbstractSparseFunction(DiscreteFunction):
         A 2-tuple of comm-sized iterables, which tells how many sparse points
         is this MPI rank expected to send/receive to/from each other MPI rank.
         """
-        dmap = self._dist_datamap
-        comm = self.grid.distributor.comm
-
-        ssparse = np.array([len(dmap.get(i, [])) for i in range(comm.size)], dtype=int)
-        rsparse = np.empty(comm.size, dtype=int)
-        comm.Alltoall(ssparse, rsparse)
-
-        return ssparse, rsparse
+        index = self._dist_index
+        return index.ssparse, index.rsparse
 
     @cached_property
     def _dist_reorder_mask(self):
@@ -345,6 +453,12 @@ class AbstractSparseTimeFunction(AbstractSparseFunction):
     _time_position = 0
     """Position of time index among the function indices."""
 
+    _sparse_position = 1
+    """
+    Position of sparse index among the function indices. Any further index,
+    e.g. a batch of shots, follows the sparse one.
+    """
+
     def __init_finalize__(self, *args, **kwargs):
         self._time_dim = self.indices[self._time_position]
         self._time_order = kwargs.get('time_order', 1)
@@ -385,6 +499,17 @@ class AbstractSparseTimeFunction(AbstractSparseFunction):
 
             shape = list(AbstractSparseFunction.__shape_setup__(**kwargs))
             shape.insert(cls._time_position, nt)
+        elif len(shape) > cls._sparse_position + 1:
+            # Further Dimensions follow the sparse one (e.g., a batch of shots).
+            # The user-provided `shape` carries the global number of sparse
+            # points, while each MPI rank only allocates its own ones
+            if shape[cls._sparse_position] != kwargs['npoint']:
+                raise ValueError("`shape` and `npoint` mismatch along the "
+                                 "sparse Dimension")
+            kwargs = dict(kwargs, shape=None)
+            npoint, = AbstractSparseFunction.__shape_setup__(**kwargs)
+            shape = list(shape)
+            shape[cls._sparse_position] = npoint
 
         return tuple(shape)
 
@@ -413,7 +538,8 @@ class SparseFunction(AbstractSparseFunction):
     the computational grid. As such, each data value is associated some coordinates.
     A SparseFunction provides symbolic interpolation routines to convert between
     Functions and sparse data points. These are based upon standard [bi,tri]linear
-    interpolation.
+    interpolation, or, optionally, upon higher order (Lagrange or Kaiser-windowed
+    sinc) interpolation.
 
     Parameters
     ----------
@@ -425,6 +551,14 @@ class SparseFunction(AbstractSparseFunction):
         The computational domain from which the sparse points are sampled.
     coordinates : np.ndarray, optional
         The coordinates of each sparse point.
+    interpolation : str, optional
+        The interpolation scheme, among 'linear' ([bi,tri]linear), 'lagrange'
+        (Lagrange polynomials) and 'sinc' (Kaiser-windowed sinc). Defaults to
+        'linear'.
+    r : int, optional
+        The radius of the interpolation scheme, that is a sparse point interacts
+        with the ``2r`` closest grid points along each Dimension. Defaults to 1
+        for 'linear' (the only legal value), 2 for 'lagrange', and 4 for 'sinc'.
     space_order : int, optional
         Discretisation order for space derivatives. Defaults to 0.
     shape : tuple of ints, optional
@@ -496,15 +630,41 @@ class SparseFunction(AbstractSparseFunction):
 
     _sub_functions = ('coordinates',)
 
+    _interpolators = {'linear': LinearInterpolator,
+                      'lagrange': LagrangeInterpolator,
+                      'sinc': SincInterpolator}
+
     def __init_finalize__(self, *args, **kwargs):
         super(SparseFunction, self).__init_finalize__(*args, **kwargs)
-        self.interpolator = LinearInterpolator(self)
+
+        # Set up the interpolation scheme
+        self._interpolation = kwargs.get('interpolation') or 'linear'
+        try:
+            interpolator = self._interpolators[self._interpolation]
+        except KeyError:
+            raise ValueError("Unknown interpolation `%s`; expected one of %s"
+                             % (self._interpolation, sorted(self._interpolators)))
+        r = kwargs.get('r')
+        if interpolator is LinearInterpolator:
+            if r not in (None, 1):
+                raise ValueError("Linear interpolation requires `r=1`")
+            self.interpolator = LinearInterpolator(self)
+        elif r is None:
+            self.interpolator = interpolator(self)
+            self._radius = self.interpolator.r
+        else:
+            self.interpolator = interpolator(self, r)
+            self._radius = r
+        self._sub_functions = (('coordinates',) +
+                               self.interpolator._sub_functions)
+        self._interpolation_cache = (None, None)
+
         # Set up sparse point coordinates
         coordinates = kwargs.get('coordinates', kwargs.get('coordinates_data'))
         if isinstance(coordinates, Function):
             self._coordinates = coordinates
         else:
-            dimensions = (self.indices[-1], Dimension(name='d'))
+            dimensions = (self._sparse_dim, Dimension(name='d'))
             # Only retain the local data region
             if coordinates is not None:
                 coordinates = np.array(coordinates)
@@ -537,6 +697,16 @@ class SparseFunction(AbstractSparseFunction):
     def coordinates_data(self):
         return self.coordinates.data.view(np.ndarray)
 
+    @property
+    def interpolation(self):
+        """The interpolation scheme."""
+        return self._interpolation
+
+    @property
+    def r(self):
+        """The radius of the interpolation scheme."""
+        return self._radius
+
     @cached_property
     def _point_symbols(self):
         """Symbol for coordinate value in each dimension of the point."""
@@ -573,7 +743,7 @@ class SparseFunction(AbstractSparseFunction):
     @cached_property
     def _coordinate_symbols(self):
         """Symbol representing the coordinate values in each dimension."""
-        p_dim = self.indices[-1]
+        p_dim = self._sparse_dim
         return tuple([self.coordinates.indexify((p_dim, i))
                       for i in range(self.grid.dim)])
 
@@ -615,13 +785,23 @@ class SparseFunction(AbstractSparseFunction):
 
     @property
     def gridpoints(self):
+        return tuple(tuple(i) for i in self._gridpoints_array.tolist())
+
+    @property
+    def _gridpoints_array(self):
         if self.coordinates._data is None:
             raise ValueError("No coordinates attached to this SparseFunction")
-        ret = []
-        for coords in self.coordinates.data._local:
-            ret.append(tuple(int(np.floor(c - o)/s) for c, o, s in
-                             zip(coords, self.grid.origin, self.grid.spacing)))
-        return tuple(ret)
+        coords = np.asarray(self.coordinates.data_ro_domain._local, dtype=np.float64)
+        coords = coords.reshape(-1, self.grid.dim)
+        origin = np.array(self.grid.origin, dtype=np.float64)
+        spacing = np.array(self.grid.spacing, dtype=np.float64)
+        # NOTE: `astype` truncates towards zero, like `int`
+        return (np.floor(coords - origin)/spacing).astype(np.int64)
+
+    @property
+    def _dist_index_key(self):
+        # The sparse points only move if the coordinates change
+        return self.coordinates.data_ro_domain._local
 
     def guard(self, expr=None, offset=0):
         """
@@ -698,17 +878,43 @@ class SparseFunction(AbstractSparseFunction):
 
         return sshape, scount, sdisp, rshape, rcount, rdisp
 
+    def _build_dist_index(self):
+        # The sparse points may have moved across MPI ranks
+        self._interpolation_cache = (None, None)
+        return super()._build_dist_index()
+
+    def _interpolation_values(self, coords):
+        """
+        The runtime values of the interpolator's SubFunctions, derived from the
+        rank-local coordinates ``coords``. They are cached until the sparse
+        points move.
+        """
+        cached_coords, values = self._interpolation_cache
+        # NOTE: the coordinates may be written through any previously obtained
+        # view, so the only reliable staleness check is on their values
+        if values is None or not np.array_equal(coords, cached_coords):
+            values = self.interpolator._sub_function_values(coords)
+            self._interpolation_cache = (np.array(coords), values)
+        return values
+
     def _dist_scatter(self, data=None):
         data = data if data is not None else self.data._local
         distributor = self.grid.distributor
 
         # If not using MPI, don't waste time
         if distributor.nprocs == 1:
-            return {self: data, self.coordinates: self.coordinates.data}
+            coords = self.coordinates.data_ro_domain
+            ret = {self: data, self.coordinates: coords}
+            ret.update(self._interpolation_values(coords))
+            return ret
 
         comm = distributor.comm
         mpitype = MPI._typedict[np.dtype(self.dtype).char]
 
+        # The sparse points may have moved since the last scatter. The
+        # matching gather reuses the same index
+        self._dist_index_refresh()
+
         # Pack sparse data values so that they can be sent out via an Alltoallv
         data = data[self._dist_scatter_mask]
         data = np.ascontiguousarray(np.transpose(data, self._dist_reorder_mask))
@@ -722,7 +928,7 @@ class SparseFunction(AbstractSparseFunction):
         data = np.ascontiguousarray(np.transpose(data, self._dist_reorder_mask))
 
         # Pack (reordered) coordinates so that they can be sent out via an Alltoallv
-        coords = self.coordinates.data._local[self._dist_subfunc_scatter_mask]
+        coords = self.coordinates.data_ro_domain._local[self._dist_subfunc_scatter_mask]
         # Send out the sparse point coordinates
         _, scount, sdisp, rshape, rcount, rdisp = self._dist_subfunc_alltoall
         scattered = np.empty(shape=rshape, dtype=self.coordinates.dtype)
@@ -733,7 +939,9 @@ class SparseFunction(AbstractSparseFunction):
         # Translate global coordinates into local coordinates
         coords = coords - np.array(self.grid.origin_offset, dtype=self.dtype)
 
-        return {self: data, self.coordinates: coords}
+        ret = {self: data, self.coordinates: coords}
+        ret.update(self._interpolation_values(coords))
+        return ret
 
     def _dist_gather(self, data, coords):
         distributor = self.grid.distributor
@@ -772,7 +980,8 @@ class SparseFunction(AbstractSparseFunction):
         # `_dist_scatter` is here sent.
 
     # Pickling support
-    _pickle_kwargs = AbstractSparseFunction._pickle_kwargs + ['coordinates_data']
+    _pickle_kwargs = (AbstractSparseFunction._pickle_kwargs +
+                      ['coordinates_data', 'interpolation', 'r'])
 
 
 class SparseTimeFunction(AbstractSparseTimeFunction, SparseFunction):
@@ -785,7 +994,8 @@ class SparseTimeFunction(AbstractSparseTimeFunction, SparseFunction):
     associated some coordinates.
     A SparseTimeFunction provides symbolic interpolation routines to convert
     between TimeFunctions and sparse data points. These are based upon standard
-    [bi,tri]linear interpolation.
+    [bi,tri]linear interpolation, or, optionally, upon higher order (Lagrange or
+    Kaiser-windowed sinc) interpolation.
 
     Parameters
     ----------
@@ -799,6 +1009,14 @@ class SparseTimeFunction(AbstractSparseTimeFunction, SparseFunction):
         The computational domain from which the sparse points are sampled.
     coordinates : np.ndarray, optional
         The coordinates of each sparse point.
+    interpolation : str, optional
+        The interpolation scheme, among 'linear' ([bi,tri]linear), 'lagrange'
+        (Lagrange polynomials) and 'sinc' (Kaiser-windowed sinc). Defaults to
+        'linear'.
+    r : int, optional
+        The radius of the interpolation scheme, that is a sparse point interacts
+        with the ``2r`` closest grid points along each Dimension. Defaults to 1
+        for 'linear' (the only legal value), 2 for 'lagrange', and 4 for 'sinc'.
     space_order : int, optional
         Discretisation order for space derivatives. Defaults to 0.
     time_order : int, optional
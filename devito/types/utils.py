@@ -1,7 +1,7 @@
 from devito.tools import EnrichedTuple, Tag
 # Additional Function-related APIs
 
-__all__ = ['Buffer', 'DimensionTuple', 'NODE', 'CELL']
+__all__ = ['Buffer', 'Compressed', 'Disk', 'DimensionTuple', 'NODE', 'CELL']
 
 
 class Buffer(Tag):
@@ -10,6 +10,105 @@ class Buffer(Tag):
         super(Buffer, self).__init__('Buffer', value)
 
 
+class Storage(Tag):
+    """
+    Where the time slices of a TimeFunction are stored, if not in its data.
+
+    Only a circular buffer of ``time_order + 1`` slices, plus `_extra_slots`,
+    is kept in the data of the TimeFunction, as with ``save=None``; the
+    generated code transfers the slices between such buffer and the actual
+    storage as they are produced and consumed.
+    """
+
+    _extra_slots = 0
+
+    def __init__(self, name, nt):
+        if not (isinstance(nt, int) and nt > 0):
+            raise ValueError("`nt` must be a positive int, not %s" % str(nt))
+        super(Storage, self).__init__(name, nt)
+
+    @property
+    def nt(self):
+        """The maximum number of time slices retained."""
+        return self.val
+
+    def _make_store(self, function):
+        """The SliceStore of the TimeFunction `function`."""
+        raise NotImplementedError
+
+
+class Compressed(Storage):
+    """
+    Keep up to `nt` time slices of a TimeFunction compressed in memory.
+
+    Each slice is compressed with zlib after a byte shuffle. With a non-zero
+    `tolerance`, the values are also quantized so that the decompressed values
+    differ by at most `tolerance` from the original ones, which usually
+    improves the compression ratio by orders of magnitude.
+    """
+
+    def __init__(self, nt, tolerance=0.):
+        if tolerance < 0:
+            raise ValueError("`tolerance` must be non-negative")
+        super(Compressed, self).__init__('Compressed', nt)
+        self.tolerance = float(tolerance)
+
+    def _make_store(self, function):
+        from devito.types.misc import CompressedStore
+        return CompressedStore('%s_store' % function.name, function.name,
+                               function.shape_allocated[1:], function.dtype,
+                               self.nt, function._time_size, self.tolerance)
+
+
+class Disk(Storage):
+    """
+    Keep up to `nt` time slices of a TimeFunction in the file `path`.
+
+    The slices are written asynchronously as they're produced, and read back
+    with a prefetch of the next slice that will be needed, into an extra slot
+    of the alternating buffer. Under MPI, each rank uses its own file, namely
+    `path` suffixed by the rank.
+    """
+
+    _extra_slots = 1
+
+    def __init__(self, path, nt):
+        super(Disk, self).__init__('Disk', nt)
+        self.path = str(path)
+        # The files created through self, in any process, as it's pickled along
+        # with the TimeFunction
+        self._created = set()
+
+    def _make_store(self, function):
+        from devito.types.misc import DiskStore
+        distributor = function.grid.distributor
+        if distributor.nprocs > 1:
+            path = '%s.%d' % (self.path, distributor.myrank)
+        else:
+            path = self.path
+
+        name = '%s_store' % function.name
+        shape = function.shape_allocated[1:]
+        nslots = function._time_size
+
+        # E.g., the TimeFunction is being unpickled
+        store = DiskStore.lookup(path)
+        if store is not None:
+            if (store.name, store.shape, store.fdtype, store.nt, store.nslots) != \
+               (name, shape, function.dtype, self.nt, nslots):
+                raise ValueError("File `%s` already in use by another TimeFunction"
+                                 % path)
+            return store
+
+        # The file is only truncated upon creation, as the stored slices must
+        # survive e.g. unpickling the TimeFunction in another process
+        truncate = path not in self._created
+        self._created.add(path)
+
+        return DiskStore(name, function.name, shape, function.dtype, self.nt, nslots,
+                         path, truncate=truncate)
+
+
 class Stagger(Tag):
     """Stagger region."""
     pass
@@ -26,24 +26,30 @@ class CheckpointOperator(Operator):
         self.args = kwargs
         op_default_args = self.op._prepare_arguments(**kwargs)
         self.start_offset = op_default_args[self.t_arg_names['t_start']]
+        self._handle = None
 
     def _prepare_args(self, t_start, t_end):
         args = self.args.copy()
-        args[self.t_arg_names['t_start']] = t_start + self.start_offset
-        args[self.t_arg_names['t_end']] = t_end - 1 + self.start_offset
+        args.update(self._prepare_time_args(t_start, t_end))
         return args
 
+    def _prepare_time_args(self, t_start, t_end):
+        return {self.t_arg_names['t_start']: t_start + self.start_offset,
+                self.t_arg_names['t_end']: t_end - 1 + self.start_offset}
+
     def apply(self, t_start, t_end):
         """ If the devito operator requires some extra arguments in the call to apply
             they can be stored in the args property of this object so pyRevolve calls
             pyRevolve.Operator.apply() without caring about these extra arguments while
             this method passes them on correctly to devito.Operator
         """
-        # Build the arguments list to invoke the kernel function
-        args = self.op.arguments(**self._prepare_args(t_start, t_end))
-        # Invoke kernel function with args
-        arg_values = [args[p.name] for p in self.op.parameters]
-        self.op.cfunction(*arg_values)
+        # The arguments are processed only once; from then on, only the time
+        # bounds get updated
+        if self._handle is None:
+            self._handle = self.op.bind(**self._prepare_args(t_start, t_end))
+        else:
+            self._handle.update(**self._prepare_time_args(t_start, t_end))
+        self._handle.run()
 
 
 class DevitoCheckpoint(Checkpoint):
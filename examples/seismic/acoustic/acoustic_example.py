@@ -79,6 +79,24 @@ def test_isoacoustic(fs, normrec, dtype):
     assert np.isclose(norm(rec), normrec, rtol=1e-3, atol=0)
 
 
+@pytest.mark.parametrize('fs', [False, True])
+def test_isoacoustic_batch(fs):
+    solver = acoustic_setup(shape=(40, 44, 36), tn=200., nbl=10, fs=fs)
+    src_positions = np.array([[200., 220., 30.], [300., 200., 50.], [100., 350., 20.]])
+
+    rec, u, _ = solver.forward_batch(src_positions=src_positions)
+    assert rec.data.shape == (solver.geometry.nt, solver.geometry.nrec, 3)
+
+    # Reference: one shot at a time
+    src = solver.geometry.src
+    for i, position in enumerate(src_positions):
+        src.coordinates.data[:] = position
+        rec1, u1, _ = solver.forward(src=src)
+
+        assert np.allclose(rec.data[..., i], rec1.data, atol=1e-4, rtol=0)
+        assert np.allclose(u.data[..., i], u1.data, atol=1e-4, rtol=0)
+
+
 if __name__ == "__main__":
     description = ("Example script for a set of acoustic operators.")
     parser = seismic_args(description)
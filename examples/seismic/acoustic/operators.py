@@ -1,5 +1,6 @@
-from devito import Eq, Operator, Function, TimeFunction, Inc, solve, sign
+from devito import Dimension, Eq, Operator, Function, TimeFunction, Inc, solve, sign
 from devito.symbolics import retrieve_functions, INT
+from devito.types import CustomDimension
 from examples.seismic import PointSource, Receiver
 
 
@@ -26,7 +27,8 @@ def freesurface(model, eq):
     # Antisymmetric mirror at negative indices
     # TODO: Make a proper "mirror_indices" tool function
     for f in funcs:
-        zind = f.indices[-1]
+        # Not necessarily the last index, e.g. in case of a batch of shots
+        zind = f.indices[f.dimensions.index(z)]
         if (zind - z).as_coeff_Mul()[0] < 0:
             s = sign(zind.subs({z: zfs, z.spacing: 1}))
             mapper.update({f: s * f.subs({zind: INT(abs(zind))})})
@@ -93,8 +95,76 @@ def iso_stencil(field, model, kernel, **kwargs):
     return eqns
 
 
+def batch_functions(model, geometry, nshots, space_order=4):
+    """
+    Create the wavefield, source and receivers for a batch of shots, modelled
+    together by a single Operator.
+
+    The shots are batched along the innermost Dimension, ``shot``, so that the
+    generated code loads each model parameter once and reuses it across the whole
+    batch. Each shot has its own source, that is the i-th sparse point of ``src``
+    only fires into the i-th shot (see ``batch_injection``), with the wavelet of
+    ``geometry.src``; the receivers are those of ``geometry``, for all shots.
+
+    Parameters
+    ----------
+    model : Model
+        Object containing the physical parameters.
+    geometry : AcquisitionGeometry
+        Geometry object that contains the source (SparseTimeFunction) and
+        receivers (SparseTimeFunction) and their position.
+    nshots : int
+        The number of shots in the batch.
+    space_order : int, optional
+        Space discretization order.
+    """
+    grid = model.grid
+    if grid.distributor.nprocs > 1:
+        # The i-th shot is identified by the i-th sparse point of `src`, while
+        # each MPI rank only sees (and numbers) its own sparse points
+        raise NotImplementedError("Batches of shots aren't supported with MPI")
+
+    # The batch size is hardcoded in the generated code, so that the compiler can
+    # fully vectorize the shot loop
+    shot = CustomDimension(name='shot', symbolic_min=0, symbolic_max=nshots - 1,
+                           symbolic_size=nshots)
+
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=space_order,
+                     dimensions=(grid.stepping_dim,) + grid.dimensions + (shot,),
+                     shape=(3,) + grid.shape + (nshots,))
+
+    # One source point per shot, each firing the same wavelet
+    src = PointSource(name='src', grid=grid, time_range=geometry.time_axis,
+                      npoint=nshots)
+    src.data[:] = geometry.src.wavelet[:, None]
+
+    rec = Receiver(name='rec', grid=grid, time_range=geometry.time_axis,
+                   dimensions=(grid.time_dim, Dimension(name='p_rec'), shot),
+                   shape=(geometry.nt, geometry.nrec, nshots), npoint=geometry.nrec,
+                   coordinates=geometry.rec_positions)
+
+    return u, src, rec
+
+
+def batch_injection(u, src, expr):
+    """
+    Inject ``expr`` into the next time slice of the batch of wavefields ``u``,
+    as laid out by ``batch_functions``, with the i-th sparse point of ``src``
+    only firing into the i-th shot.
+    """
+    # The i-th sparse point only iterates over the i-th shot. The shot Dimension
+    # is derived from the sparse one, rather than being the sparse one itself,
+    # which must be ordered before the interpolation Dimensions it is the
+    # parent of
+    p = src._sparse_dim
+    shot = CustomDimension(name='%s_shot' % src.name, symbolic_min=p,
+                           symbolic_max=p, symbolic_size=1, parent=p)
+
+    return src.inject(field=u.forward.subs(u.dimensions[-1], shot), expr=expr)
+
+
 def ForwardOperator(model, geometry, space_order=4,
-                    save=False, kernel='OT2', **kwargs):
+                    save=False, kernel='OT2', nshots=None, **kwargs):
     """
     Construct a forward modelling operator in an acoustic medium.
 
@@ -112,24 +182,35 @@ def ForwardOperator(model, geometry, space_order=4,
         Defaults to False.
     kernel : str, optional
         Type of discretization, 'OT2' or 'OT4'.
+    nshots : int, optional
+        Model a batch of ``nshots`` shots at once, as laid out by
+        ``batch_functions``.
     """
     m = model.m
 
     # Create symbols for forward wavefield, source and receivers
-    u = TimeFunction(name='u', grid=model.grid,
-                     save=geometry.nt if save else None,
-                     time_order=2, space_order=space_order)
-    src = PointSource(name='src', grid=geometry.grid, time_range=geometry.time_axis,
-                      npoint=geometry.nsrc)
-
-    rec = Receiver(name='rec', grid=geometry.grid, time_range=geometry.time_axis,
-                   npoint=geometry.nrec)
+    if nshots:
+        if save:
+            raise ValueError("Cannot save the wavefield of a batch of shots")
+        u, src, rec = batch_functions(model, geometry, nshots, space_order=space_order)
+    else:
+        u = TimeFunction(name='u', grid=model.grid,
+                         save=geometry.nt if save else None,
+                         time_order=2, space_order=space_order)
+        src = PointSource(name='src', grid=geometry.grid,
+                          time_range=geometry.time_axis, npoint=geometry.nsrc)
+
+        rec = Receiver(name='rec', grid=geometry.grid, time_range=geometry.time_axis,
+                       npoint=geometry.nrec)
 
     s = model.grid.stepping_dim.spacing
     eqn = iso_stencil(u, model, kernel)
 
     # Construct expression to inject source values
-    src_term = src.inject(field=u.forward, expr=src * s**2 / m)
+    if nshots:
+        src_term = batch_injection(u, src, src * s**2 / m)
+    else:
+        src_term = src.inject(field=u.forward, expr=src * s**2 / m)
 
     # Create interpolation expression for receivers
     rec_term = rec.interpolate(expr=u)
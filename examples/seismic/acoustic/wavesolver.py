@@ -1,7 +1,9 @@
+import numpy as np
+
 from devito import Function, TimeFunction
 from devito.tools import memoized_meth
 from examples.seismic.acoustic.operators import (
-    ForwardOperator, AdjointOperator, GradientOperator, BornOperator
+    ForwardOperator, AdjointOperator, GradientOperator, BornOperator, batch_functions
 )
 from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
 from pyrevolve import Revolver
@@ -46,11 +48,11 @@ class AcousticWaveSolver(object):
         return self.model.critical_dt
 
     @memoized_meth
-    def op_fwd(self, save=None):
+    def op_fwd(self, save=None, nshots=None):
         """Cached operator for forward runs with buffered wavefield"""
         return ForwardOperator(self.model, save=save, geometry=self.geometry,
                                kernel=self.kernel, space_order=self.space_order,
-                               **self._kwargs)
+                               nshots=nshots, **self._kwargs)
 
     @memoized_meth
     def op_adj(self):
@@ -116,6 +118,45 @@ class AcousticWaveSolver(object):
                                           dt=kwargs.pop('dt', self.dt), **kwargs)
         return rec, u, summary
 
+    def forward_batch(self, src_positions=None, model=None, **kwargs):
+        """
+        Forward modelling function for a batch of shots, all of which are
+        advanced by a single operator run.
+
+        Parameters
+        ----------
+        src_positions : array_like, optional
+            The source position of each shot, which fires the wavelet of
+            ``geometry.src``. Defaults to the geometry's source positions.
+        model : Model, optional
+            Object containing the physical parameters.
+        vp : Function or float, optional
+            The time-constant velocity.
+
+        Returns
+        -------
+        Receiver, wavefield and performance summary. Both the receiver data and
+        the wavefield carry the shots along their last Dimension.
+        """
+        if src_positions is None:
+            src_positions = self.geometry.src_positions
+        src_positions = np.reshape(src_positions, (-1, self.model.dim))
+        nshots = src_positions.shape[0]
+
+        u, src, rec = batch_functions(self.model, self.geometry, nshots,
+                                      space_order=self.space_order)
+        src.coordinates.data[:] = src_positions
+
+        model = model or self.model
+        # Pick vp from model unless explicitly provided
+        kwargs.update(model.physical_params(**kwargs))
+
+        # Execute operator and return wavefield and receiver data
+        summary = self.op_fwd(nshots=nshots).apply(src=src, rec=rec, u=u,
+                                                   dt=kwargs.pop('dt', self.dt),
+                                                   **kwargs)
+        return rec, u, summary
+
     def adjoint(self, rec, srca=None, v=None, model=None, **kwargs):
         """
         Adjoint modelling function that creates the necessary
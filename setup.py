@@ -58,4 +58,7 @@ setup(name='devito',
       packages=find_packages(exclude=exclude),
       install_requires=reqs,
       extras_require=extras_require,
+      entry_points={
+          'console_scripts': ['devito-cache=devito.arch.jitcache:main'],
+      },
       test_suite='tests')
@@ -1,10 +1,12 @@
 import pytest
 import numpy as np
+import sympy
 
 from conftest import skipif
 from devito import Grid, TimeFunction, Eq, Operator, configuration, switchconfig
 from devito.data import LEFT
-from devito.core.autotuning import options  # noqa
+from devito.core.autotuning import (AutotuningDB, autotuning_db, neighbours,  # noqa
+                                    options)
 
 
 @switchconfig(log_level='DEBUG')
@@ -338,3 +340,163 @@ def test_few_timesteps():
     op.apply(autotune=True)
     assert op._state['autotuning'][0]['runs'] == 2
     assert op._state['autotuning'][0]['tpr'] == 2  # Induced by `save`
+
+
+def test_time_tiling():
+    grid = Grid(shape=(32, 32, 32))
+    f = TimeFunction(name='f', grid=grid, space_order=2)
+
+    op = Operator(Eq(f.forward, f + 0.1*f.laplace),
+                  opt=('advanced', {'time-tiling': True, 'openmp': False}))
+    op.apply(time=0, autotune=True)
+
+    # The time tile heights are tuned along with the block shapes, over enough
+    # timesteps for at least two of the tallest time tiles
+    heights = options['blocksize-time']
+    assert op._state['autotuning'][0]['runs'] == len(heights)*4
+    assert op._state['autotuning'][0]['tpr'] == 2*max(heights)
+    assert set(op._state['autotuning'][0]['tuned']) == {'time0_blk0_size',
+                                                        'x0_blk0_size',
+                                                        'y0_blk0_size'}
+
+
+@pytest.mark.parametrize('opt_options', [{}, {'blocklevels': 2}])
+def test_model_search(opt_options):
+    grid = Grid(shape=(64, 64, 64))
+    f = TimeFunction(name='f', grid=grid, space_order=4)
+
+    opt_options.update({'openmp': False})
+    op = Operator(Eq(f.forward, f.laplace + 1.), opt=('advanced', opt_options))
+
+    op.apply(time_M=0, autotune='aggressive')
+    exhaustive = op._state['autotuning'][0]
+
+    switchconfig(autotuning_search='model')(op.apply)(time_M=0, autotune='aggressive')
+    model = op._state['autotuning'][1]
+
+    # Note: the number of steps of the descent depends on the timings, so we can
+    # only expect that not all of the candidates are tried
+    assert model['runs'] < exhaustive['runs']
+    assert model['tuned'].keys() == exhaustive['tuned'].keys()
+
+    # The search trajectory is reported
+    assert len(model['trajectory']) == model['runs']
+    assert len(exhaustive['trajectory']) == exhaustive['runs']
+    tried = [i for i, _ in exhaustive['trajectory']]
+    assert all(i in tried for i, _ in model['trajectory'])
+
+    # The block shape picked by the model is nearly as fast as the best one found
+    # by the exhaustive search. To filter out the noise, the fastest of the runs
+    # with the picked block shape, across both searches, is retained
+    best = min(v for _, v in exhaustive['trajectory'] if v is not None)
+    picked = min(v for i, v in exhaustive['trajectory'] + model['trajectory']
+                 if i == model['tuned'] and v is not None)
+    assert picked <= 2*best
+
+
+def test_neighbours():
+    block_shapes = [(('x', i), ('y', j)) for i in (8, 16, 32) for j in (8, 16, 32)]
+    block_shapes.remove((('x', 16), ('y', 32)))
+
+    assert set(neighbours((('x', 16), ('y', 16)), block_shapes)) == {
+        (('x', 8), ('y', 16)), (('x', 32), ('y', 16)), (('x', 16), ('y', 8))
+    }
+    assert set(neighbours((('x', 8), ('y', 8)), block_shapes)) == {
+        (('x', 16), ('y', 8)), (('x', 8), ('y', 16))
+    }
+
+
+class TestAutotuningDB(object):
+
+    @pytest.fixture
+    def db(self, tmpdir):
+        configuration['autotuning-db'] = str(tmpdir.join('autotuning.json'))
+        yield autotuning_db
+        configuration['autotuning-db'] = None
+
+    def test_reuse(self, db):
+        grid = Grid(shape=(32, 32, 32))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f + 1.), openmp=False)
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][0]['runs'] == 4
+        tuned = op._state['autotuning'][0]['tuned']
+        assert len(db.entries) == 1
+
+        # No search at all, in this as well as in any other Operator generating
+        # the same code
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][1]['runs'] == 0
+        assert op._state['autotuning'][1]['tuned'] == tuned
+
+        f1 = TimeFunction(name='f', grid=grid)
+        op1 = Operator(Eq(f1.forward, f1 + 1.), openmp=False)
+        op1.apply(time_M=10, autotune=True)
+        assert op1._state['autotuning'][0]['runs'] == 0
+        assert np.all(f1.data[1] == 11.)
+
+        # A different grid shape or autotuning level require a new search
+        g = TimeFunction(name='f', grid=Grid(shape=(48, 32, 32)))
+        op2 = Operator(Eq(g.forward, g + 1.), openmp=False)
+        op2.apply(time_M=10, autotune=True)
+        assert op2._state['autotuning'][0]['runs'] == 5
+        op2.apply(time_M=10, autotune='aggressive')
+        assert op2._state['autotuning'][1]['runs'] > 5
+        assert len(db.entries) == 3
+
+    def test_export_merge(self, db, tmpdir):
+        grid = Grid(shape=(32, 32, 32))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f + 1.), openmp=False)
+        op.apply(time_M=10, autotune=True)
+        (key, entry), = db.entries.items()
+
+        exported = str(tmpdir.join('exported.json'))
+        db.export(exported)
+        db.clear()
+        assert len(db.entries) == 0
+
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][1]['runs'] == 4
+
+        # Upon import, the faster of two clashing entries wins
+        db.put(key, entry['tuned'], entry['time']*10)
+        db.merge(exported)
+        assert db.entries[key]['time'] == entry['time']
+
+        other = AutotuningDB(tmpdir.join('other.json'))
+        other.merge(exported)
+        assert other.entries == {key: entry}
+
+    @switchconfig(autotuning_db_revalidate=True)
+    def test_revalidate(self, db):
+        grid = Grid(shape=(32, 32, 32))
+        f = TimeFunction(name='f', grid=grid)
+
+        op = Operator(Eq(f.forward, f + 1.), openmp=False)
+        op.apply(time_M=10, autotune=True)
+        (key, entry), = db.entries.items()
+
+        # An entry in line with the achieved performance is retained...
+        db.put(key, entry['tuned'], 1e3)
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][1]['runs'] == 0
+        assert key in db.entries
+
+        # ... while a stale one is dropped, so that the next run tunes again
+        db.put(key, entry['tuned'], 1e-12)
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][2]['runs'] == 0
+        assert key not in db.entries
+
+        op.apply(time_M=10, autotune=True)
+        assert op._state['autotuning'][3]['runs'] == 4
+        assert key in db.entries
+
+    def test_sympy_values(self, db):
+        # E.g., the degenerate block shape is computed symbolically
+        db.put('key', {'x0_blk0_size': sympy.Integer(48), 'nthreads': 4}, 1e-3)
+        assert db.entries['key']['tuned'] == {'x0_blk0_size': 48, 'nthreads': 4}
+        assert all(type(v) is int for v in db.entries['key']['tuned'].values())
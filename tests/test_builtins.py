@@ -4,9 +4,10 @@ from scipy.ndimage import gaussian_filter
 from scipy import misc
 
 from conftest import skipif
-from devito import Grid, Function, TimeFunction, switchconfig
-from devito.builtins import (assign, norm, gaussian_smooth, initialize_function,
-                             inner, mmin, mmax)
+from devito import Eq, Grid, Function, Operator, TimeFunction, switchconfig
+from devito.builtins import (assign, norm, norms, gaussian_smooth, initialize_function,
+                             inner, mmin, mmax, smooth, sumall)
+from devito.builtins.utils import builtins_registry
 from devito.data import LEFT, RIGHT
 from devito.tools import as_tuple
 from devito.types import SubDomain, SparseTimeFunction
@@ -54,6 +55,21 @@ class TestAssign(object):
         assert np.all(g.data == 2)
         assert np.all(h.data == 3)
 
+    def test_reuse_kernel(self):
+        grid = Grid(shape=(4, 4))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+
+        assign(f, 1)
+        nkernels = len(builtins_registry)
+        assign(g, 2)
+        assign(f, 3)
+
+        assert len(builtins_registry) == nkernels
+        assert np.all(f.data == 3)
+        assert np.all(g.data == 2)
+
     def test_equations_with_options(self):
 
         class CompDomain(SubDomain):
@@ -369,3 +385,50 @@ class TestBuiltinsResult(object):
         term1 = np.max(rec0.data)
         term2 = mmax(rec0)
         assert np.isclose(term1/term2 - 1, 0.0, rtol=0.0, atol=1e-5)
+
+    def test_reuse_kernel(self):
+        grid = Grid(shape=(10, 10))
+
+        f = Function(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+        f.data[:] = np.random.rand(*f.shape).astype(grid.dtype)
+        g.data[:] = np.random.rand(*g.shape).astype(grid.dtype)
+
+        norm(f)
+        inner(f, g)
+        nkernels = len(builtins_registry)
+
+        assert np.isclose(norm(g), np.linalg.norm(g.data), rtol=1e-5)
+        # The reduction buffer is allocated once per kernel
+        kernel = list(builtins_registry.values())[-1]
+        assert np.isclose(kernel.n.data[0], np.sum(g.data**2), rtol=1e-5)
+        assert np.isclose(inner(g, f), np.sum(f.data*g.data), rtol=1e-5)
+        assert np.isclose(sumall(f), np.sum(f.data), rtol=1e-5)
+        assert len(builtins_registry) == nkernels + 1
+
+        h0 = Function(name='h0', grid=grid)
+        h1 = Function(name='h1', grid=grid)
+        smooth(h0, f)
+        smooth(h0, g)
+        Operator(Eq(h1, g.avg(dims=grid.dimensions[-1])))()
+        assert np.allclose(h0.data, h1.data, rtol=1e-5)
+        assert len(builtins_registry) == nkernels + 2
+
+    def test_norms(self):
+        grid = Grid(shape=(10, 10))
+
+        u = TimeFunction(name='u', grid=grid)
+        v = TimeFunction(name='v', grid=grid)
+        rec = SparseTimeFunction(name='rec', grid=grid, nt=2, npoint=3)
+        u.data[:] = np.random.rand(*u.shape).astype(grid.dtype)
+        v.data[:] = np.random.rand(*v.shape).astype(grid.dtype)
+        rec.data[:] = np.random.rand(*rec.shape).astype(grid.dtype)
+
+        for order in [1, 2]:
+            values = norms([u, v, rec], order=order)
+            assert np.allclose(values, [norm(i, order=order) for i in [u, v, rec]],
+                               rtol=1e-5)
+
+        # The reductions over `u` and `v` are fused
+        assert np.allclose(norms([u, v]), [np.linalg.norm(u.data),
+                                           np.linalg.norm(v.data)], rtol=1e-5)
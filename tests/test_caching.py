@@ -6,7 +6,9 @@ import pytest
 from devito import (Grid, Function, TimeFunction, SparseFunction, SparseTimeFunction,
                     ConditionalDimension, SubDimension, Constant, Operator, Eq, Dimension,
                     DefaultDimension, _SymbolCache, clear_cache, solve, VectorFunction,
-                    TensorFunction, TensorTimeFunction, VectorTimeFunction)
+                    TensorFunction, TensorTimeFunction, VectorTimeFunction,
+                    configuration, lowering_cache)
+from devito.operator import caching
 from devito.types import Scalar, Symbol, NThreadsBase, DeviceID, NPThreads, ThreadID
 
 
@@ -758,3 +760,111 @@ class TestMemoryLeaks(object):
         assert len(_SymbolCache) == 1
         clear_cache()
         assert len(_SymbolCache) == 0
+
+
+@pytest.fixture
+def lowering_cache_in_tmpdir(tmpdir):
+    """
+    Run the test with the lowering-cache enabled and pointing to an empty
+    directory.
+    """
+    path = lowering_cache.path
+    lowering_cache.path = str(tmpdir)
+    lowering_cache.hits = lowering_cache.misses = 0
+    lowering_cache.stores = lowering_cache.evictions = 0
+    configuration['lowering-cache'] = True
+    yield lowering_cache
+    configuration['lowering-cache'] = False
+    lowering_cache.path = path
+
+
+class TestLoweringCache(object):
+
+    def test_hit(self, lowering_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        c = Constant(name='c', value=2.)
+
+        eq = Eq(u.forward, u + c)
+        op0 = Operator(eq)
+        op1 = Operator(eq)
+
+        stats = lowering_cache_in_tmpdir.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['stores'] == 1
+        assert stats['entries'] == 1
+
+        assert str(op0.ccode) == str(op1.ccode)
+        assert op0._soname == op1._soname
+
+        # The Operator retrieved from the cache is bound to the live objects
+        assert op1.input == op0.input
+        assert all(i is j for i, j in zip(op1.input, op0.input))
+        op1.apply(time_M=0)
+        assert np.all(u.data[1] == 2)
+
+    def test_hit_sparse(self, lowering_cache_in_tmpdir):
+        grid = Grid(shape=(11, 11))
+        u = TimeFunction(name='u', grid=grid)
+        sf = SparseTimeFunction(name='sf', grid=grid, npoint=2, nt=5,
+                                coordinates=np.array([[.3, .3], [.6, .6]]))
+
+        eqns = ([Eq(u.forward, u + 1)] + sf.inject(u.forward, expr=sf) +
+                sf.interpolate(u))
+        op0 = Operator(eqns)
+        op1 = Operator(eqns)
+
+        assert lowering_cache_in_tmpdir.hits == 1
+        assert str(op0.ccode) == str(op1.ccode)
+
+        sf.data[:] = 1.
+        op1.apply(time_M=3)
+        ref = sf.data.copy()
+        u.data[:] = 0.
+        sf.data[:] = 1.
+        op0.apply(time_M=3)
+        assert np.all(sf.data == ref)
+
+    def test_miss_upon_different_metadata(self, lowering_cache_in_tmpdir):
+        grid0 = Grid(shape=(4, 4))
+        grid1 = Grid(shape=(5, 5))
+        u0 = TimeFunction(name='u', grid=grid0, space_order=2)
+        u1 = TimeFunction(name='u', grid=grid1, space_order=4)
+
+        Operator(Eq(u0.forward, u0.laplace))
+        Operator(Eq(u1.forward, u1.laplace))
+        Operator(Eq(u0.forward, u0.laplace), opt='noop')
+
+        assert lowering_cache_in_tmpdir.hits == 0
+        assert lowering_cache_in_tmpdir.misses == 3
+
+    def test_miss_upon_different_devito(self, lowering_cache_in_tmpdir,
+                                        monkeypatch):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+
+        Operator(Eq(f, f + 1))
+        monkeypatch.setattr(caching, '_devito_signature', lambda: 'other')
+        Operator(Eq(f, f + 1))
+
+        stats = lowering_cache_in_tmpdir.stats()
+        assert stats['hits'] == 0
+        assert stats['misses'] == 2
+
+    def test_eviction(self, lowering_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+        f = Function(name='f', grid=grid)
+
+        Operator(Eq(f, f + 1))
+        nbytes = lowering_cache_in_tmpdir.nbytes
+
+        lowering_cache_in_tmpdir.maxsize = int(1.5*nbytes)
+        try:
+            Operator(Eq(f, f + 2))
+        finally:
+            lowering_cache_in_tmpdir.maxsize = 2**30
+
+        stats = lowering_cache_in_tmpdir.stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 1
@@ -4,7 +4,9 @@ import pytest
 from pyrevolve import Revolver
 import numpy as np
 
-from devito import Grid, TimeFunction, Operator, Function, Eq, switchconfig, Constant
+from devito import (Grid, TimeFunction, Operator, Function, Eq, switchconfig, Constant,
+                    CheckpointSchedule, Disk, revolve)
+from devito.operator.checkpointing import ADVANCE, REVERSE
 from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
 from examples.seismic.acoustic.acoustic_example import acoustic_setup
 
@@ -242,3 +244,94 @@ def test_index_alignment():
     wrp.apply_reverse()
     assert(np.allclose(v.data[0, :, :], 0))
     assert(np.allclose(prod.data, final_value))
+
+
+@pytest.mark.parametrize('ncheckpoints', [1, 2, 3, 5])
+def test_revolve_optimal(ncheckpoints):
+    """
+    Test that the binomial schedule reverses all timesteps, in order, with
+    the minimum number of forward timesteps.
+    """
+    # Brute-force minimum number of forward timesteps, including the ones
+    # of the forward sweep
+    def cost(n, c, cache={}):
+        if n == 1:
+            return 0
+        if c == 1:
+            return n*(n-1)//2
+        if (n, c) not in cache:
+            cache[n, c] = min(m + cost(n-m, c-1) + cost(m, c) for m in range(1, n))
+        return cache[n, c]
+
+    for nt in range(1, 60):
+        schedule = revolve(nt, ncheckpoints)
+        reversed_ = [s.start for s in schedule if s.action is REVERSE]
+        assert reversed_ == list(range(nt-1, -1, -1))
+        nadvance = sum(s.end - s.start for s in schedule if s.action is ADVANCE)
+        assert nadvance == cost(nt, ncheckpoints)
+
+
+@switchconfig(log_level='WARNING')
+@pytest.mark.parametrize('ncheckpoints,ndisk', [(2, 0), (1, 3), (2, 3)])
+def test_checkpoint_schedule_index_alignment(ncheckpoints, ndisk, tmpdir):
+    """
+    Same as `test_index_alignment`, but with the built-in CheckpointSchedule, over
+    two shots.
+    """
+    nt = 10
+    grid = Grid(shape=(2, 2))
+    u = TimeFunction(name='u', grid=grid)
+    v = TimeFunction(name='v', grid=grid)
+    prod = Function(name='prod', grid=grid)
+
+    fwd_op = Operator(Eq(u.forward, u + 1.))
+    rev_op = Operator([Eq(v, v.forward - 1.), Eq(prod, prod + u*v)])
+
+    disk = Disk(str(tmpdir.join('cp.bin')), ndisk) if ndisk else None
+    schedule = CheckpointSchedule(fwd_op, rev_op, u, nt, ncheckpoints=ncheckpoints,
+                                  disk=disk)
+
+    for _ in range(2):
+        u.data[:] = 0.
+        prod.data[:] = 0.
+        schedule.apply_forward()
+        assert np.all(u.data[nt % 2] == nt)
+
+        v.data[nt % 2] = u.data[nt % 2]
+        schedule.apply_reverse()
+        assert np.all(v.data[0] == 0)
+        assert np.all(prod.data == sum(n**2 for n in range(nt)))
+
+
+@switchconfig(log_level='WARNING')
+def test_checkpoint_schedule_gradient(tmpdir):
+    """
+    Test that the gradient computed with the CheckpointSchedule, with a memory
+    budget, matches the one computed with the whole forward wavefield saved.
+    """
+    solver = acoustic_setup(shape=(40, 40), spacing=(15.0, 15.0), tn=300.,
+                            space_order=4, nbl=10)
+    grid = solver.model.grid
+    dt = solver.model.critical_dt
+
+    rec0, u0, _ = solver.forward(save=True)
+    grad0, _ = solver.jacobian_adjoint(rec0, u0)
+
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=4)
+    v = TimeFunction(name='v', grid=grid, time_order=2, space_order=4)
+    grad = Function(name='grad', grid=grid)
+    rec = solver.geometry.rec
+    nt = rec.data.shape[0] - 2
+
+    # A budget of six checkpoints in memory, plus two on disk
+    memory = 4*u._data_allocated.nbytes
+    disk = Disk(str(tmpdir.join('cp.bin')), 2)
+    schedule = CheckpointSchedule(solver.op_fwd(save=False), solver.op_grad(save=False),
+                                  u, nt, memory=memory, disk=disk)
+    assert schedule.ncheckpoints == 6
+
+    schedule.apply_forward(src=solver.geometry.src, rec=rec, u=u, dt=dt)
+    assert np.all(rec.data == rec0.data)
+
+    schedule.apply_reverse(rec=rec0, u=u, v=v, grad=grad, dt=dt)
+    assert np.all(grad.data == grad0.data)
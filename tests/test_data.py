@@ -1,12 +1,18 @@
+import mmap
+import os
+import tempfile
+
 import pytest
 import numpy as np
 
 from devito import (Grid, Function, TimeFunction, SparseTimeFunction, Dimension, # noqa
-                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT, configuration, switchconfig)
+                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT, configuration, switchconfig,
+                    clear_cache)
 from devito.data import LEFT, RIGHT, Decomposition, loc_data_idx, convert_index
 from devito.tools import as_tuple
 from devito.types import Scalar
-from devito.data.allocators import ExternalAllocator
+from devito.data.allocators import (ExternalAllocator, PooledAllocator,
+                                    default_allocator)
 
 
 class TestDataBasic(object):
@@ -376,6 +382,58 @@ class TestDecomposition(object):
         d3 = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 3)
         assert d3.index_loc_to_glb((1, 3)) == (9, 11)
 
+    def test_glb_to_loc_array(self):
+        d = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 2)
+
+        # All local
+        idx = d.index_glb_to_loc(np.array([[7, 5], [6, -5]]))
+        assert idx.dtype != object
+        assert np.all(idx == [[2, 0], [1, 2]])
+        assert np.all(d.index_glb_to_loc(np.array([7, 5]), rel=False) == [7, 5])
+
+        # Partly non-local, and out of bounds
+        idx = d.index_glb_to_loc(np.array([6, 3, 12, 5]))
+        assert list(idx) == [1, None, 12, 0]
+        assert list(idx) == [d.index_glb_to_loc(i) for i in [6, 3, 12, 5]]
+
+        # Empty local subdomain
+        d1 = Decomposition([[0, 1, 2], [], [3, 4]], 1)
+        assert list(d1.index_glb_to_loc(np.array([0, 4]))) == [None, None]
+
+        with pytest.raises(TypeError):
+            d.index_glb_to_loc(np.array([True, False]))
+
+    def test_glb_to_loc_cached(self):
+        d = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 2)
+
+        v = d.index_glb_to_loc(slice(4, 10, 1))
+        assert v == slice(0, 3, 1)
+        assert d.index_glb_to_loc(slice(4, 10, 1)) is v
+        assert d.index_glb_to_loc(slice(4, 10, 1), rel=False) == slice(5, 8, 1)
+        assert d.index_glb_to_loc((4, 9)) is d.index_glb_to_loc((4, 9))
+
+        # Only the most recently used translations are retained
+        maxsize = d._glb_to_loc_cache_maxsize
+        for i in range(maxsize):
+            d.index_glb_to_loc(slice(i, i + 12, 1))
+        assert len(d._glb_to_loc_cache) == maxsize
+        assert (4, 10, 1, True) not in d._glb_to_loc_cache
+        assert d.index_glb_to_loc(slice(4, 10, 1)) == v
+
+        # A cache hit makes a translation the most recently used
+        w = d.index_glb_to_loc(slice(1, 13, 1))
+        d.index_glb_to_loc(slice(0, 3, 1))
+        assert d.index_glb_to_loc(slice(1, 13, 1)) is w
+        assert (2, 14, 1, True) not in d._glb_to_loc_cache
+
+    def test_loc_to_glb_array(self):
+        d = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 2)
+
+        assert np.all(d.index_loc_to_glb(np.array([2, 0, 1])) == [7, 5, 6])
+        assert np.all(convert_index(np.array([0, 2]), d, mode='loc_to_glb') == [5, 7])
+        idx = d.index_loc_to_glb(np.array([1, 3]))
+        assert list(idx) == [d.index_loc_to_glb(i) for i in [1, 3]]
+
     def test_convert_index(self):
         d0 = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 2)
         d1 = Decomposition([[0, 1, 2], [3, 4], [5, 6, 7], [8, 9, 10, 11]], 3)
@@ -1345,6 +1403,55 @@ class TestDataGather(object):
             assert ans.shape == (0, )*len(grid.shape)
 
 
+class TestDataDump(object):
+
+    def test_dump_load(self, tmpdir):
+        grid = Grid(shape=(6, 7))
+        f = TimeFunction(name='f', grid=grid, space_order=2, save=3)
+        dat = np.arange(126, dtype=np.float32).reshape(f.shape)
+        f.data[:] = dat
+
+        filename = str(tmpdir.join('f.npy'))
+        f.data_dump(filename)
+        assert np.all(np.load(filename) == dat)
+
+        # Different halo, same domain
+        g = TimeFunction(name='g', grid=grid, space_order=4, save=3)
+        g.data_load(filename)
+        assert np.all(g.data == dat)
+
+        h = Function(name='h', grid=grid)
+        with pytest.raises(ValueError):
+            h.data_load(filename)
+
+    @pytest.mark.parallel(mode=4)
+    def test_dump_load_distributed(self):
+        grid = Grid(shape=(10, 11, 12))
+        comm = grid.distributor.comm
+        f = TimeFunction(name='f', grid=grid, space_order=2, save=3)
+        dat = np.arange(3*10*11*12, dtype=np.float32).reshape(f.shape_global)
+        f.data[:] = dat
+
+        path = comm.bcast(tempfile.mkdtemp() if comm.rank == 0 else None, root=0)
+
+        # Each rank writes its own subdomain into a `numpy.load`-able file
+        f.data_dump(os.path.join(path, 'f.npy'))
+        assert np.all(np.load(os.path.join(path, 'f.npy')) == dat)
+
+        # A single time slice
+        f.data[1]._dump(os.path.join(path, 'f1.npy'))
+        assert np.all(np.load(os.path.join(path, 'f1.npy')) == dat[1])
+
+        # Each rank reads back its own subdomain only
+        g = TimeFunction(name='g', grid=grid, space_order=4, save=3)
+        g.data_load(os.path.join(path, 'f.npy'))
+        assert np.all(g.data_ro_domain._local == f.data_ro_domain._local)
+
+        h = Function(name='h', grid=grid)
+        h.data_load(os.path.join(path, 'f1.npy'))
+        assert np.all(h.data_ro_domain._local == f.data_ro_domain._local[1])
+
+
 def test_scalar_arg_substitution():
     """
     Tests the relaxed (compared to other devito sympy subclasses)
@@ -1416,6 +1523,95 @@ def test_external_allocator():
     assert(np.array_equal(f.data, numpy_array))
 
 
+class TestPooledAllocator(object):
+
+    def test_recycling(self):
+        allocator = PooledAllocator(ALLOC_FLAT, maxsize=2**30)
+        grid = Grid(shape=(40, 40))
+
+        u = Function(name='u', grid=grid, allocator=allocator)
+        u.data[:] = 1.
+        address = u._data.ctypes.data
+        del u
+        clear_cache()
+        assert allocator.nbytes > 0
+        assert allocator.stats()['blocks'] == 1
+
+        # Same size class, so the released block gets reused
+        v = Function(name='v', grid=grid, allocator=allocator)
+        assert np.all(v.data == 0.)
+        assert v._data.ctypes.data == address
+        assert allocator.nbytes == 0
+
+        stats = allocator.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+        # Different size class, so a miss
+        w = Function(name='w', grid=Grid(shape=(400, 400)), allocator=allocator)
+        w.data[:] = 1.
+        assert w._data.ctypes.data != address
+        assert allocator.stats()['misses'] == 2
+
+    def test_size_classes(self):
+        allocator = PooledAllocator(ALLOC_FLAT)
+        pagesize = mmap.PAGESIZE
+
+        assert allocator._size_class(1) == pagesize
+        assert allocator._size_class(pagesize + 1) == 2*pagesize
+        for nbytes in [2**20 + 1, 2**20 + 2**18, 3*2**30 + 7]:
+            size = allocator._size_class(nbytes)
+            assert size % pagesize == 0
+            assert nbytes <= size <= 1.25*nbytes + pagesize
+        # Nearby sizes share the same class
+        assert allocator._size_class(2**20 + 1) == allocator._size_class(2**20 + 2**17)
+
+    def test_maxsize_and_trim(self):
+        allocator = PooledAllocator(ALLOC_FLAT, maxsize=0)
+        grid = Grid(shape=(40, 40))
+
+        u = Function(name='u', grid=grid, allocator=allocator)
+        u.data[:] = 1.
+        del u
+        clear_cache()
+        assert allocator.nbytes == 0
+        assert allocator.stats()['blocks'] == 0
+
+        allocator.maxsize = 2**30
+        functions = [Function(name='f%d' % i, grid=grid, allocator=allocator)
+                     for i in range(3)]
+        for f in functions:
+            f.data[:] = 1.
+        del f, functions
+        clear_cache()
+        assert allocator.stats()['blocks'] == 3
+        nbytes = allocator.nbytes
+
+        # The cap is enforced as soon as blocks are released
+        allocator.maxsize = nbytes // 3
+        u = Function(name='u', grid=grid, allocator=allocator)
+        u.data[:] = 1.
+        del u
+        clear_cache()
+        assert allocator.nbytes == nbytes // 3
+
+        assert allocator.trim() == nbytes // 3
+        assert allocator.nbytes == 0
+        assert allocator.trim() == 0
+
+    @switchconfig(**{'alloc-pool-maxsize': 2**30})
+    def test_default_allocator(self):
+        allocator = default_allocator()
+        assert isinstance(allocator, PooledAllocator)
+        assert default_allocator() is allocator
+
+        grid = Grid(shape=(4, 4))
+        u = Function(name='u', grid=grid)
+        assert u._allocator is allocator
+        u.data[:] = 1.
+        assert np.all(u.data == 1.)
+
+
 if __name__ == "__main__":
     configuration['mpi'] = True
     TestDataDistributed().test_misc_data()
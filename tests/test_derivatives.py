@@ -1,11 +1,14 @@
 import numpy as np
 import pytest
-from sympy import simplify, diff, Float
+from sympy import simplify, diff, finite_diff_weights, Float
 
 from devito import (Grid, Function, TimeFunction, Eq, Operator, NODE, cos, sin,
-                    ConditionalDimension, left, right, centered, div, grad)
+                    ConditionalDimension, left, right, centered, div, grad,
+                    switchconfig)
 from devito.finite_differences import Derivative, Differentiable
 from devito.finite_differences.differentiable import Add, EvalDerivative
+from devito.finite_differences.tools import (WeightsTable, generate_indices,
+                                             numeric_weights)
 from devito.symbolics import indexify, retrieve_indexed
 
 _PRECISION = 9
@@ -490,6 +493,70 @@ class TestFD(object):
             assert gi == getattr(f, 'd%s' % d.name)(x0=x0).evaluate
 
 
+class TestWeightsTable(object):
+
+    @pytest.mark.parametrize('deriv_order', [1, 2, 3])
+    @pytest.mark.parametrize('so', [1, 2, 4, 16])
+    @pytest.mark.parametrize('staggered', [None, True])
+    @pytest.mark.parametrize('x0', [None, 'left', 'right', 1])
+    def test_vs_sympy(self, deriv_order, so, staggered, x0):
+        grid = Grid(shape=(11, 11))
+        x, y = grid.dimensions
+        h_x = x.spacing
+        f = Function(name='f', grid=grid, space_order=so,
+                     staggered=staggered and x)
+
+        x0 = {'left': {x: x - h_x/2}, 'right': {x: x + h_x/2}}.get(x0, x0)
+        if x0 == 1:
+            x0 = {x: 1}
+        indices, x0 = generate_indices(f, x, so, x0=x0)
+
+        # The very same expressions as those computed by SymPy
+        expected = finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+        assert list(numeric_weights(deriv_order, indices, x0)) == list(expected)
+
+    def test_time(self):
+        grid = Grid(shape=(11, 11))
+        t = grid.stepping_dim
+        indices = (t - t.spacing, t, t + t.spacing)
+
+        expected = finite_diff_weights(2, indices, t)[-1][-1]
+        assert list(numeric_weights(2, indices, t)) == list(expected)
+
+    def test_persistence(self, tmpdir):
+        path = str(tmpdir.join('weights.json'))
+        offsets = (-1, 0, 1)
+
+        table = WeightsTable(path)
+        assert table.get(2, offsets) == [1, -2, 1]
+
+        # The new entries are written in batches
+        assert WeightsTable(path)._read() == {}
+        table.flush()
+
+        # The weights are on disk, e.g. for use by a new process
+        assert WeightsTable(path)._read() == {'2:-1,0,1': ['1', '-2', '1']}
+
+        # Entries added by different tables are merged
+        table1 = WeightsTable(path)
+        table1.flush_interval = 1
+        table1.get(1, offsets)
+        assert set(WeightsTable(path)._read()) == {'2:-1,0,1', '1:-1,0,1'}
+
+        table.clear()
+        assert WeightsTable(path)._read() == {}
+
+    @switchconfig(fd_weights_cache=False)
+    def test_no_persistence(self, tmpdir):
+        path = str(tmpdir.join('weights.json'))
+
+        table = WeightsTable(path)
+        assert table.get(2, (-1, 0, 1)) == [1, -2, 1]
+        table.flush()
+
+        assert not tmpdir.listdir()
+
+
 def bypass_uneval(expr):
     unevals = expr.find(EvalDerivative)
     mapper = {i: Add(*i.args) for i in unevals}
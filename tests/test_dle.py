@@ -792,3 +792,101 @@ class TestNestedParallelism(object):
         assert trees[0][2].pragmas[0].value == ('omp parallel for collapse(2) '
                                                 'schedule(dynamic,1) '
                                                 'num_threads(nthreads_nested)')
+
+
+class TestTimeTiling(object):
+
+    @staticmethod
+    def _setup(shape, space_order=2, time_order=1):
+        grid = Grid(shape=shape)
+        u = TimeFunction(name='u', grid=grid, space_order=space_order,
+                         time_order=time_order)
+        u.data_with_halo[:] = np.random.RandomState(0).rand(*u.shape_with_halo)
+        if time_order == 1:
+            eq = Eq(u.forward, u + 0.1*u.laplace)
+        else:
+            eq = Eq(u.forward, 2*u - u.backward + 0.01*u.laplace)
+        return u, eq
+
+    @pytest.mark.parametrize('shape,space_order,time_order', [
+        ((16, 16), 2, 1),
+        ((16, 16), 4, 2),
+        ((12, 12, 12), 4, 1),
+    ])
+    @pytest.mark.parametrize('tile', [(1, 3), (2, 16), (3, 5), (8, 7)])
+    def test_numerics(self, shape, space_order, time_order, tile):
+        u, eq = self._setup(shape, space_order, time_order)
+        u0 = u.data_with_halo.copy()
+
+        op0 = Operator(eq, opt=('advanced', {'openmp': False}))
+        op0.apply(time_M=9)
+        expected = u.data.copy()
+
+        u.data_with_halo[:] = u0
+        op1 = Operator(eq, opt=('advanced', {'openmp': False, 'time-tiling': True}))
+        height, bs = tile
+        # The innermost Dimension isn't tiled by default
+        blocksizes = {'%s0_blk0_size' % d.name: min(bs, s)
+                      for d, s in zip(u.grid.dimensions[:-1], shape)}
+        op1.apply(time_M=9, time0_blk0_size=height, **blocksizes)
+
+        assert np.all(u.data == expected)
+
+    def test_structure(self):
+        u, eq = self._setup((16, 16, 16))
+
+        op = Operator(eq, opt=('advanced', {'openmp': True, 'time-tiling': True}))
+
+        trees = retrieve_iteration_tree(op)
+        assert len(trees) == 1
+        tree = trees[0]
+        assert len(tree) == 7
+        t = u.grid.time_dim
+        x, y, z = u.grid.dimensions
+        # Time tiles, then blocks, then the timesteps within a tile
+        assert tree[0].dim.is_Incr and tree[0].dim.parent is t
+        assert tree[1].dim.is_Incr and tree[1].dim.parent is x
+        assert tree[2].dim.is_Incr and tree[2].dim.parent is y
+        assert tree[3].dim.is_Incr and tree[3].dim.parent is tree[0].dim
+        assert tree[4].dim.is_Incr and tree[4].dim.parent is tree[1].dim
+        assert tree[5].dim.is_Incr and tree[5].dim.parent is tree[2].dim
+        assert tree[6].dim is z
+        # No remainder functions; parallelism within a block
+        assert not op._func_table
+        assert not any(i.pragmas for i in tree[:4])
+        assert 'omp for' in tree[4].pragmas[0].value
+        assert op.arguments(time_M=9)['time0_blk0_size'] == 8
+
+    def test_sparse(self):
+        grid = Grid(shape=(21, 21), extent=(20., 20.))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=3, nt=12)
+        src.coordinates.data[:] = [[0.5, 0.5], [10.2, 13.7], [19.5, 4.1]]
+        src.data[:] = np.linspace(1., 2., 36).reshape(12, 3)
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=4, nt=12)
+        rec.coordinates.data[:] = [[0., 0.], [10.5, 10.5], [3.3, 17.9], [20., 12.]]
+
+        eqns = [Eq(u.forward, u + 0.1*u.laplace)]
+        eqns += src.inject(field=u.forward, expr=src)
+        eqns += rec.interpolate(expr=u)
+
+        op0 = Operator(eqns, opt=('advanced', {'openmp': False}))
+        op0.apply(time_M=10)
+        expected_u = u.data.copy()
+        expected_rec = rec.data.copy()
+
+        u.data[:] = 0.
+        rec.data[:] = 0.
+        op1 = Operator(eqns, opt=('advanced', {'openmp': False, 'time-tiling': True}))
+        op1.apply(time_M=10, time0_blk0_size=4, x0_blk0_size=5)
+
+        assert np.allclose(u.data, expected_u, rtol=1e-6)
+        assert np.allclose(rec.data, expected_rec, rtol=1e-6)
+
+    def test_backward_unsupported(self):
+        u, _ = self._setup((16, 16))
+
+        op = Operator(Eq(u.backward, u + 0.1*u.laplace),
+                      opt=('advanced', {'openmp': False, 'time-tiling': True}))
+
+        assert 'time0_blk0_size' not in op._known_arguments
@@ -3,7 +3,7 @@ from math import sin, floor
 import numpy as np
 import pytest
 
-from devito import (Grid, Operator, Dimension, SparseFunction, SparseTimeFunction,
+from devito import (Grid, Operator, Dimension, Eq, SparseFunction, SparseTimeFunction,
                     Function, TimeFunction,
                     PrecomputedSparseFunction, PrecomputedSparseTimeFunction,
                     MatrixSparseTimeFunction)
@@ -531,6 +531,216 @@ def test_edge_sparse():
     assert sf1.data[0] == 0
 
 
+def test_inject_interpolate_batch():
+    """
+    Test injection and interpolation with a SparseTimeFunction carrying an extra
+    Dimension after the sparse one, e.g. a batch of shots.
+    """
+    grid = Grid(shape=(11, 11), extent=(10., 10.))
+    x, y = grid.dimensions
+    time = grid.time_dim
+    shot = Dimension(name='shot')
+    nshots, nt = 3, 4
+
+    coords = np.array([[2.5, 3.], [6., 7.5], [4.2, 4.2]])
+    values = np.arange(1., nt*nshots + 1.).reshape(nt, 1, nshots)
+
+    u = TimeFunction(name='u', grid=grid, dimensions=(grid.stepping_dim, x, y, shot),
+                     shape=(2, 11, 11, nshots))
+    src = SparseTimeFunction(name='src', grid=grid, npoint=1, nt=nt,
+                             dimensions=(time, Dimension(name='p_src'), shot),
+                             shape=(nt, 1, nshots), coordinates=coords[:1])
+    rec = SparseTimeFunction(name='rec', grid=grid, npoint=2, nt=nt,
+                             dimensions=(time, Dimension(name='p_rec'), shot),
+                             shape=(nt, 2, nshots), coordinates=coords[1:])
+    assert src._sparse_dim.name == 'p_src'
+    assert rec.coordinates.shape == (2, 2)
+    with pytest.raises(ValueError):
+        SparseTimeFunction(name='rec', grid=grid, npoint=2, nt=nt,
+                           dimensions=(time, Dimension(name='p_rec'), shot),
+                           shape=(nt, 3, nshots))
+    src.data[:] = values
+
+    op = Operator([Eq(u.forward, u + 1)] + src.inject(u.forward, expr=src) +
+                  rec.interpolate(u))
+    op(time_M=nt-2)
+
+    # Reference: one shot at a time
+    u1 = TimeFunction(name='u1', grid=grid)
+    src1 = SparseTimeFunction(name='src1', grid=grid, npoint=1, nt=nt,
+                              coordinates=coords[:1])
+    rec1 = SparseTimeFunction(name='rec1', grid=grid, npoint=2, nt=nt,
+                              coordinates=coords[1:])
+    op1 = Operator([Eq(u1.forward, u1 + 1)] + src1.inject(u1.forward, expr=src1) +
+                   rec1.interpolate(u1))
+    for i in range(nshots):
+        u1.data[:] = 0
+        src1.data[:] = values[..., i]
+        op1(time_M=nt-2)
+
+        assert np.allclose(u.data[..., i], u1.data)
+        assert np.allclose(rec.data[..., i], rec1.data)
+
+
+@pytest.mark.parametrize('interpolation,r', [
+    ('lagrange', 1),
+    ('lagrange', 2),
+    ('lagrange', 3),
+])
+def test_interpolate_lagrange_exact(interpolation, r):
+    """
+    Test that Lagrange interpolation of radius ``r`` is exact for polynomials
+    of degree ``2r - 1``.
+    """
+    grid = Grid(shape=(13, 11), extent=(12., 10.))
+    x, y = grid.dimensions
+    xx, yy = np.meshgrid(np.arange(13.), np.arange(11.), indexing='ij')
+    f = Function(name='f', grid=grid, space_order=2*r)
+    f.data[:] = 0.01*xx**(2*r - 1) + yy
+
+    coords = np.array([(3.3, 4.7), (6., 2.5), (7.9, 5.1)])
+    sf = SparseFunction(name='sf', grid=grid, npoint=3, coordinates=coords,
+                        interpolation=interpolation, r=r)
+    Operator(sf.interpolate(f))()
+
+    expected = 0.01*coords[:, 0]**(2*r - 1) + coords[:, 1]
+    assert np.allclose(sf.data, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize('interpolation,r,tol', [
+    ('linear', None, 2e-2),
+    ('lagrange', 2, 1e-3),
+    ('lagrange', 4, 1e-5),
+    ('sinc', 4, 5e-3),
+    ('sinc', 6, 1e-3),
+])
+def test_interpolate_high_order(interpolation, r, tol):
+    """
+    Test the accuracy of the interpolation of a smooth field on a coarse grid.
+    """
+    grid = Grid(shape=(31, 31), extent=(30., 30.))
+    xx, yy = np.meshgrid(np.arange(31.), np.arange(31.), indexing='ij')
+    f = Function(name='f', grid=grid, space_order=8)
+    f.data[:] = np.sin(0.4*xx)*np.cos(0.3*yy)
+
+    coords = np.random.RandomState(0).uniform(8., 22., size=(20, 2))
+    sf = SparseFunction(name='sf', grid=grid, npoint=20, coordinates=coords,
+                        interpolation=interpolation, r=r)
+    Operator(sf.interpolate(f))()
+
+    expected = np.sin(0.4*coords[:, 0])*np.cos(0.3*coords[:, 1])
+    assert np.max(np.abs(sf.data - expected)) < tol
+
+
+def test_interpolate_sinc_gridpoints():
+    """
+    Test that sinc interpolation is exact at the grid points.
+    """
+    grid = Grid(shape=(11, 11), extent=(10., 10.))
+    f = Function(name='f', grid=grid, space_order=4)
+    f.data[:] = np.random.RandomState(0).rand(11, 11)
+
+    coords = np.array([(2., 3.), (5., 5.), (8., 1.)])
+    sf = SparseFunction(name='sf', grid=grid, npoint=3, coordinates=coords,
+                        interpolation='sinc', r=4)
+    Operator(sf.interpolate(f))()
+
+    assert np.allclose(sf.data, [f.data[2, 3], f.data[5, 5], f.data[8, 1]])
+
+
+@pytest.mark.parametrize('interpolation,r', [
+    ('lagrange', 2),
+    ('lagrange', 3),
+    ('sinc', 3),
+])
+def test_inject_high_order(interpolation, r):
+    """
+    Test that the injection weights add up to one, and that sparse points
+    close to the boundary don't cause any out-of-bounds access.
+    """
+    grid = Grid(shape=(11, 11), extent=(10., 10.))
+    f = Function(name='f', grid=grid, space_order=2)
+
+    coords = np.array([(4.5, 5.2), (0.3, 9.9), (9.7, 0.)])
+    sf = SparseFunction(name='sf', grid=grid, npoint=3, coordinates=coords,
+                        interpolation=interpolation, r=r)
+    sf.data[:] = [1., 0., 0.]
+    Operator(sf.inject(f, sf))()
+
+    assert np.isclose(np.sum(f.data), 1., rtol=1e-2)
+    assert np.all(np.isfinite(f.data_with_halo))
+
+    # Moving the sparse points is reflected in the next run
+    sf.coordinates.data[0] = (2.5, 3.2)
+    f.data[:] = 0.
+    Operator(sf.inject(f, sf))()
+
+    assert np.isclose(np.sum(f.data), 1., rtol=1e-2)
+    assert np.isclose(np.sum(f.data[:, 7:]), 0.)
+
+
+@pytest.mark.parametrize('interpolation,r', [
+    ('linear', None),
+    ('lagrange', 2),
+    ('sinc', 3),
+])
+def test_interpolate_moved_points(interpolation, r):
+    """
+    Test that moving the sparse points through a previously obtained view of
+    the coordinates is reflected in the next run.
+    """
+    grid = Grid(shape=(11, 11), extent=(10., 10.))
+    xx, _ = np.meshgrid(np.arange(11.), np.arange(11.), indexing='ij')
+    f = Function(name='f', grid=grid, space_order=6)
+    f.data[:] = xx
+
+    sf = SparseFunction(name='sf', grid=grid, npoint=1, coordinates=[(2.5, 2.5)],
+                        interpolation=interpolation, r=r)
+    coords = sf.coordinates.data
+    op = Operator(sf.interpolate(f))
+
+    op()
+    assert np.isclose(sf.data[0], 2.5, rtol=1e-2)
+
+    coords[0] = [7.5, 7.5]
+    op()
+    assert np.isclose(sf.data[0], 7.5, rtol=1e-2)
+
+
+def test_interpolate_inject_time_high_order():
+    """
+    Test high order interpolation and injection with SparseTimeFunctions.
+    """
+    grid = Grid(shape=(11, 11), extent=(10., 10.))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    xx, yy = np.meshgrid(np.arange(11.), np.arange(11.), indexing='ij')
+    u.data[:] = xx**3 + yy
+
+    coords = np.array([(4.5, 5.2), (3.1, 6.9)])
+    rec = SparseTimeFunction(name='rec', grid=grid, npoint=2, nt=5,
+                             coordinates=coords, interpolation='lagrange')
+    src = SparseTimeFunction(name='src', grid=grid, npoint=2, nt=5,
+                             coordinates=coords, interpolation='lagrange')
+    src.data[:] = 1.
+
+    op = Operator(rec.interpolate(u) + src.inject(u.forward, src))
+    op.apply(time_M=0)
+
+    assert np.allclose(rec.data[0], coords[:, 0]**3 + coords[:, 1])
+    assert np.isclose(np.sum(u.data[1] - u.data[0]), 2.)
+
+
+def test_interpolation_errors():
+    grid = Grid(shape=(11, 11))
+
+    with pytest.raises(ValueError):
+        SparseFunction(name='sf', grid=grid, npoint=1, interpolation='cubic')
+    with pytest.raises(ValueError):
+        SparseFunction(name='sf', grid=grid, npoint=1, interpolation='linear', r=2)
+    with pytest.raises(ValueError):
+        SparseFunction(name='sf', grid=grid, npoint=1, interpolation='sinc', r=1)
+
+
 def test_msf_interpolate():
     """ Test interpolation with MatrixSparseTimeFunction which accepts
         precomputed values for interpolation coefficients, but this time
@@ -9,9 +9,10 @@ from devito.ir.equations import LoweredEq
 from devito.ir.equations.algorithms import dimension_sort
 from devito.ir.iet import Iteration, FindNodes
 from devito.ir.support.basic import (IterationInstance, TimedAccess, Scope,
-                                     Vector, AFFINE, REGULAR, IRREGULAR)
+                                     ScopeCache, Vector, AFFINE, REGULAR, IRREGULAR)
 from devito.ir.support.space import (NullInterval, Interval, Forward, Backward,
                                      IterationSpace)
+from devito.tools import timed_pass, timed_region
 from devito.types import Scalar, Array
 
 
@@ -703,6 +704,54 @@ class TestDependenceAnalysis(object):
         # Sanity check: we did find all of the expected dependences
         assert len(expected) == 0
 
+    def test_scope_cache(self, ti0, ti1, ti3):
+        exprs = [LoweredEq(i) for i in EVAL(['Eq(ti0[x,y,z], ti1[x,y,z])',
+                                             'Eq(ti3[x,y,z], ti0[x,y-1,z])',
+                                             'Eq(ti1[x,y,z], ti3[x+1,y,z])'],
+                                            ti0.base, ti1.base, ti3.base)]
+        rewritten = LoweredEq(EVAL('Eq(ti3[x,y,z], ti0[x-2,y,z])', ti0.base, ti3.base))
+
+        def deps(scope):
+            return sorted((str(d), str(d.distance)) for d in scope.d_all)
+
+        expected = deps(Scope(exprs))
+        expected1 = deps(Scope(exprs[:1] + [rewritten] + exprs[2:]))
+
+        with ScopeCache():
+            scope = Scope(exprs)
+            assert Scope(exprs) is scope
+            assert Scope(list(exprs), rules=lambda i: True) is not scope
+            assert deps(scope) == expected
+
+            # Only the rewritten expression gets new TimedAccesses
+            scope1 = Scope(exprs[:1] + [rewritten] + exprs[2:])
+            assert scope1 is not scope
+            assert deps(scope1) == expected1
+            assert scope1.getwrites(ti1.function) == scope.getwrites(ti1.function)
+            assert scope1.getwrites(ti1.function)[0] is scope.getwrites(ti1.function)[0]
+
+            # Shifted expressions get copies of their TimedAccesses, which reuse
+            # the previously computed distances
+            scope2 = Scope([rewritten] + exprs)
+            w, w2 = scope.getwrites(ti1.function)[0], scope2.getwrites(ti1.function)[0]
+            assert w is not w2
+            assert (w.timestamp, w2.timestamp) == (2, 3)
+            assert w._distances is w2._distances
+
+        assert Scope(exprs) is not scope
+
+        # The reuse is recorded in the timings of the ongoing pass
+        @timed_pass(name='analysis')
+        def analyze():
+            with ScopeCache():
+                for _ in range(3):
+                    deps(Scope(exprs))
+
+        with timed_region('lowering') as r:
+            analyze()
+        assert r.timings['analysis']['reused-scopes'] == 2
+        assert r.timings['analysis']['reused-time'] > 0
+
 
 class TestAnalysis(object):
 
@@ -1,9 +1,14 @@
+import gc
+import json
+import os
+import tempfile
+
 import numpy as np
 import pytest
 from cached_property import cached_property
 
 from conftest import skipif, _R
-from devito import (Grid, Constant, Function, TimeFunction, SparseFunction,
+from devito import (Grid, Compressed, Constant, Function, TimeFunction, SparseFunction,
                     SparseTimeFunction, Dimension, ConditionalDimension, SubDimension,
                     SubDomain, Eq, Ne, Inc, NODE, Operator, norm, inner, configuration,
                     switchconfig, generic_derivative)
@@ -11,7 +16,9 @@ from devito.data import LEFT, RIGHT
 from devito.ir.iet import (Call, Conditional, Iteration, FindNodes, FindSymbols,
                            retrieve_iteration_tree)
 from devito.mpi import MPI
-from devito.mpi.routines import HaloUpdateCall
+from devito.mpi.routines import HaloUpdateCall, MPIMsgPersistent
+from devito.operator.profiling import timeline
+from devito.tools import flatten
 from examples.seismic.acoustic import acoustic_setup
 
 pytestmark = skipif(['nompi'], whole_module=True)
@@ -277,6 +284,40 @@ class TestFunction(object):
         assert np.all(f._data_ro_with_inhalo[:, :1] == 0.)
         assert np.all(f._data_ro_with_inhalo[:, -2:] == 0.)
 
+    @pytest.mark.parallel(mode=2)
+    def test_halo_exchange_repeated(self):
+        """
+        Test that the halo exchange, once set up, keeps tracking the data values
+        across subsequent updates.
+        """
+        grid = Grid(shape=(12, 12))
+        x, y = grid.dimensions
+        glb_pos_map = grid.distributor.glb_pos_map
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+
+        for n in range(3):
+            u.data[:] = grid.distributor.myrank + 1 + n
+            u.data[1] = -1.
+
+            # Now trigger a halo exchange...
+            u.data_with_halo   # noqa
+
+            peer = 2 + n if LEFT in glb_pos_map[x] else 1 + n
+            if LEFT in glb_pos_map[x]:
+                assert np.all(u._data_ro_with_inhalo[0, -2:, 2:-2] == peer)
+            else:
+                assert np.all(u._data_ro_with_inhalo[0, :2, 2:-2] == peer)
+            assert np.all(u._data_ro_with_inhalo[1, 2:-2, 2:-2] == -1.)
+
+        # The persistent requests are released along with the Function
+        _, requests, free = u._halo_plan
+        assert free.alive
+        del u
+        gc.collect()
+        assert not free.alive
+        assert all(i == MPI.REQUEST_NULL for i in flatten(requests))
+
     @pytest.mark.parallel(mode=4)
     def test_halo_exchange_quadrilateral(self):
         """
@@ -455,6 +496,41 @@ class TestSparseFunction(object):
         assert len(sf.data) == 1
         assert np.all(sf.data == data[sf.local_indices]*2)
 
+    @pytest.mark.parallel(mode=4)
+    def test_dist_index_caching(self):
+        """
+        Test that the point ownership index is reused across scatters, and
+        rebuilt by the first scatter after the coordinates change.
+        """
+        grid = Grid(shape=(4, 4), extent=(4.0, 4.0))
+
+        data = np.array([3, 2, 1, 0])
+        coords = np.array([(3., 3.), (3., 1.), (1., 3.), (1., 1.)])
+        sf = SparseFunction(name='sf', grid=grid, npoint=len(coords), coordinates=coords)
+        sf.data[:] = data
+        view = sf.coordinates.data
+
+        loc_data = sf._dist_scatter()[sf]
+        assert loc_data[0] == grid.distributor.myrank
+        index = sf._dist_index
+        sf._dist_scatter()
+        assert sf._dist_index is index
+        # Merely accessing the coordinates doesn't invalidate the index
+        sf.coordinates.data
+        assert sf._dist_index is index
+
+        # Move all sparse points onto rank0, through a previously obtained view.
+        # The index is only checked for staleness upon the next scatter
+        view[:] = 1.
+        assert sf._dist_index is index
+
+        loc_data = sf._dist_scatter()[sf]
+        assert sf._dist_index is not index
+        if grid.distributor.myrank == 0:
+            assert np.all(np.sort(loc_data) == [0, 1, 2, 3])
+        else:
+            assert len(loc_data) == 0
+
     @pytest.mark.parallel(mode=4)
     def test_sparse_coords(self):
         grid = Grid(shape=(21, 31, 21), extent=(20, 30, 20))
@@ -522,6 +598,65 @@ class TestOperatorSimple(object):
             assert np.all(f.data_ro_domain[0, :-1] == 3.)
             assert f.data_ro_domain[0, -1] == 2.
 
+    @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag2'), (4, 'overlap'),
+                                (4, 'full'), (4, 'persistent'), (4, 'neighborhood')])
+    def test_bind_vs_apply(self):
+        grid = Grid(shape=(12, 12))
+        x, y = grid.dimensions
+        t = grid.stepping_dim
+
+        u0 = TimeFunction(name='u', grid=grid, space_order=2)
+        u1 = TimeFunction(name='u', grid=grid, space_order=2)
+        u0.data[:, 4:8, 4:8] = 1.
+        u1.data[:, 4:8, 4:8] = 1.
+
+        op = Operator(Eq(u0.forward, u0.laplace + u0[t, x-1, y-1]))
+
+        # The MPI messages, released upon returning from C-land, are set up
+        # again at each run, including those with no `update` in between
+        handle = op.bind(u=u1, time_M=0)
+        for i in range(4):
+            op.apply(u=u0, time_m=i, time_M=i)
+            handle.update(time_m=i, time_M=i)
+            handle.run()
+            op.apply(u=u0, time_m=i, time_M=i)
+            handle.run()
+        assert np.all(u0.data == u1.data)
+        assert np.any(u1.data != 0.)
+
+    @pytest.mark.parallel(mode=2)
+    @switchconfig(profiling='trace')
+    def test_trace_halo(self):
+        grid = Grid(shape=(32,))
+        x = grid.dimensions[0]
+        t = grid.stepping_dim
+        comm = grid.distributor.comm
+
+        f = TimeFunction(name='f', grid=grid)
+
+        path = comm.bcast(tempfile.mkdtemp() if comm.rank == 0 else None, root=0)
+        path = os.path.join(path, 'trace.json')
+        configuration['profiling-trace'], path = path, configuration['profiling-trace']
+        timeline.clear()
+
+        op = Operator(Eq(f.forward, f[t, x-1] + f[t, x+1] + 1))
+        summary = op.apply(time_M=2)
+
+        # Each rank traces its own halo exchanges, one per timestep
+        assert [(i.kind, i.rank, i.timestep) for i in summary.timeline] == \
+            [(k, comm.rank, n) for n in range(3) for k in ('haloupdate', 'compute')]
+
+        # The per-rank timelines are merged on rank 0
+        if comm.rank == 0:
+            timeline.dump()
+            with open(configuration['profiling-trace'], 'r') as f:
+                trace = json.load(f)['traceEvents']
+            assert sorted({i['pid'] for i in trace}) == [0, 1]
+            assert len([i for i in trace if i['ph'] == 'X']) == 12
+
+        configuration['profiling-trace'] = path
+        timeline.clear()
+
     @pytest.mark.parallel(mode=2)
     def test_trivial_eq_1d_save(self):
         grid = Grid(shape=(32,))
@@ -544,7 +679,9 @@ class TestOperatorSimple(object):
             assert np.all(f.data_ro_domain[-1, :-time_M] == 31.)
 
     @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag'), (4, 'overlap'),
-                                (4, 'overlap2'), (4, 'diag2'), (4, 'full')])
+                                (4, 'overlap2'), (4, 'diag2'), (4, 'full'),
+                                (4, 'persistent'), (4, 'overlap-persistent'),
+                                (4, 'neighborhood')])
     def test_trivial_eq_2d(self):
         grid = Grid(shape=(8, 8,))
         x, y = grid.dimensions
@@ -580,7 +717,9 @@ class TestOperatorSimple(object):
             assert np.all(f.data_ro_domain[0, -1:, :-1] == side)
 
     @pytest.mark.parallel(mode=[(8, 'basic'), (8, 'diag'), (8, 'overlap'),
-                                (8, 'overlap2'), (8, 'diag2'), (8, 'full')])
+                                (8, 'overlap2'), (8, 'diag2'), (8, 'full'),
+                                (8, 'persistent'), (8, 'overlap-persistent'),
+                                (8, 'neighborhood')])
     def test_trivial_eq_3d(self):
         grid = Grid(shape=(8, 8, 8))
         x, y, z = grid.dimensions
@@ -668,6 +807,33 @@ class TestOperatorSimple(object):
         assert np.all(f1.data == 1.)
         assert np.all(f2.data == 1.)
 
+    @pytest.mark.parallel(mode=2)
+    def test_compressed_halo(self):
+        """
+        Test that the halo of the slices of a TimeFunction with
+        ``save=Compressed(...)`` is exchanged as they're loaded, even though
+        the TimeFunction is only read.
+        """
+        nt = 6
+        grid = Grid(shape=(16, 16))
+        x, y = grid.dimensions
+        time = grid.time_dim
+
+        u0 = TimeFunction(name='u', grid=grid, save=nt)
+        u1 = TimeFunction(name='u', grid=grid, save=Compressed(nt))
+        for u in [u0, u1]:
+            t = u.time_dim
+            u.data[0, 6:10, 6:10] = 1.
+            Operator(Eq(u.forward, u + u[t, x+1, y] + 1))(time_M=nt-2)
+
+        v0 = Function(name='v', grid=grid)
+        v1 = Function(name='v', grid=grid)
+        for u, v in [(u0, v0), (u1, v1)]:
+            t = u.time_dim
+            Operator(Inc(v, time*(u[t+1, x-1, y] - u)))(time_M=nt-2)
+
+        assert np.all(v0.data_ro_domain == v1.data_ro_domain)
+
 
 class TestCodeGeneration(object):
 
@@ -960,6 +1126,104 @@ class TestCodeGeneration(object):
         op.apply()
         assert np.all(f.data[:] == 2.)
 
+    @pytest.mark.parallel(mode=[(2, 'persistent'), (2, 'overlap-persistent')])
+    def test_persistent_requests(self):
+        grid = Grid(shape=(10,))
+        x = grid.dimensions[0]
+        t = grid.stepping_dim
+
+        f = TimeFunction(name='f', grid=grid)
+        f.data_with_halo[:] = 1.
+
+        op = Operator(Eq(f.forward, f[t, x-1] + f[t, x+1] + 1.))
+
+        # The requests are only (re)activated, never posted, in C-land
+        haloupdate = op._func_table['haloupdate0'].root
+        calls = [i.name for i in FindNodes(Call).visit(haloupdate)]
+        assert calls.count('MPI_Start') == 2
+        assert 'MPI_Isend' not in calls
+        assert 'MPI_Irecv' not in calls
+
+        # The requests are created and freed at each apply
+        op.apply(time=1)
+        msg = [i for i in op.parameters if isinstance(i, MPIMsgPersistent)].pop()
+        assert msg._requests == []
+        op.apply(time=1)
+        assert msg._requests == []
+
+        glb_pos_map = f.grid.distributor.glb_pos_map
+        if LEFT in glb_pos_map[x]:
+            assert np.all(f.data_ro_domain[0] == [15., 25., 29., 31., 31.])
+        else:
+            assert np.all(f.data_ro_domain[0] == [31., 31., 29., 25., 15.])
+
+    @pytest.mark.parallel(mode=[(4, 'neighborhood')])
+    def test_neighborhood_collective(self):
+        grid = Grid(shape=(8, 8))
+        x, y = grid.dimensions
+        t = grid.stepping_dim
+
+        u = TimeFunction(name='u', grid=grid)
+        v = TimeFunction(name='v', grid=grid)
+        u0 = np.arange(64, dtype=np.float32).reshape(8, 8) % 7
+        v0 = np.arange(64, dtype=np.float32).reshape(8, 8) % 5
+        u.data[0] = u0
+        v.data[0] = v0
+
+        op = Operator([Eq(u.forward, u[t, x-1, y] + u[t, x+1, y] + v[t, x, y-1]),
+                       Eq(v.forward, v[t, x-1, y-1] + u[t, x+1, y+1])])
+
+        # The halos of both `u` and `v` are exchanged through a single collective,
+        # without explicit gather/scatter
+        calls = FindNodes(HaloUpdateCall).visit(op)
+        assert len(calls) == 1
+        assert u in calls[0].arguments and v in calls[0].arguments
+        haloupdate = op._func_table[calls[0].name].root
+        calls = FindNodes(Call).visit(haloupdate)
+        assert [i.name for i in calls] == ['MPI_Pack', 'MPI_Neighbor_alltoallw']
+        assert calls[1].arguments[0] != calls[1].arguments[4]
+        assert not any(i.startswith(('gather', 'scatter')) for i in op._func_table)
+
+        # The graph communicator connects to all neighbours, diagonal ones included
+        distributor = grid.distributor
+        assert len(distributor.neighbours) == 3
+        assert distributor.graph_comm.Get_dist_neighbors_count() == (3, 3, False)
+
+        op.apply(time_M=1)
+
+        # Serial reference, with zero boundary halos
+        def step(u, v):
+            pu = np.pad(u, 1)
+            pv = np.pad(v, 1)
+            return (pu[:-2, 1:-1] + pu[2:, 1:-1] + pv[1:-1, :-2],
+                    pv[:-2, :-2] + pu[2:, 2:])
+        u1, v1 = step(u0, v0)
+        u2, v2 = step(u1, v1)
+
+        # The whole local domain depends on the halo and corner values
+        gx, gy = distributor.glb_numb
+        assert np.all(u.data_ro_domain[0] == u2[np.ix_(gx, gy)])
+        assert np.all(v.data_ro_domain[0] == v2[np.ix_(gx, gy)])
+
+        # The halo regions read by the stencils, diagonal ones included, carry
+        # the neighbours' values of the last exchange, that is of `u1` and `v1`
+        glb_pos_map = distributor.glb_pos_map
+        pu1 = np.pad(u1, 1)[gx[0]:gx[-1]+3, gy[0]:gy[-1]+3]
+        pv1 = np.pad(v1, 1)[gx[0]:gx[-1]+3, gy[0]:gy[-1]+3]
+        uh = np.array(u._data_ro_with_inhalo[1])
+        vh = np.array(v._data_ro_with_inhalo[1])
+        if LEFT in glb_pos_map[x]:
+            assert np.all(uh[-1, 1:-1] == pu1[-1, 1:-1])
+        if RIGHT in glb_pos_map[x]:
+            assert np.all(uh[0, 1:-1] == pu1[0, 1:-1])
+            assert np.all(vh[0, 1:-1] == pv1[0, 1:-1])
+        if RIGHT in glb_pos_map[y]:
+            assert np.all(vh[1:-1, 0] == pv1[1:-1, 0])
+        if LEFT in glb_pos_map[x] and LEFT in glb_pos_map[y]:
+            assert uh[-1, -1] == pu1[-1, -1]
+        if RIGHT in glb_pos_map[x] and RIGHT in glb_pos_map[y]:
+            assert vh[0, 0] == pv1[0, 0]
+
     @pytest.mark.parallel(mode=2)
     def test_avoid_haloudate_if_flowdep_along_other_dim(self):
         grid = Grid(shape=(10,))
@@ -1795,7 +2059,8 @@ class TestOperatorAdvanced(object):
         assert dims[0].is_Modulo
         assert dims[0].origin is t
 
-    @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag2'), (4, 'overlap2')])
+    @pytest.mark.parallel(mode=[(4, 'basic'), (4, 'diag2'), (4, 'overlap2'),
+                                (4, 'neighborhood')])
     def test_cire(self):
         """
         Check correctness when the DSE extracts aliases and places them
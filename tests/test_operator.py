@@ -1,20 +1,31 @@
+import json
+import os
+import subprocess
+import sys
 import numpy as np
 import pytest
+from collections import OrderedDict
 from itertools import permutations
 
+from codepy import CompileError
+
 from conftest import skipif
 from devito import (Grid, Eq, Operator, Constant, Function, TimeFunction,
                     SparseFunction, SparseTimeFunction, Dimension, error, SpaceDimension,
                     NODE, CELL, dimensions, configuration, TensorFunction,
-                    TensorTimeFunction, VectorFunction, VectorTimeFunction, switchconfig)
+                    TensorTimeFunction, VectorFunction, VectorTimeFunction, switchconfig,
+                    compile_all)
 from devito import  Le, Lt, Ge, Gt  # noqa
-from devito.exceptions import InvalidOperator
+from devito.arch.jitcache import jit_cache
+from devito.exceptions import InvalidArgument, InvalidOperator
 from devito.finite_differences.differentiable import diff2sympy
 from devito.ir.equations import ClusterizedEq
 from devito.ir.equations.algorithms import lower_exprs
 from devito.ir.iet import (Callable, Conditional, Expression, Iteration, TimedList,
                            FindNodes, IsPerfectIteration, retrieve_iteration_tree)
 from devito.ir.support import Any, Backward, Forward
+from devito.operator.profiling import (PerfEventProfiler, PerfKey, TraceProfiler,
+                                       available_perf_events, timeline)
 from devito.passes.iet import DataManager
 from devito.symbolics import ListInitializer, indexify, retrieve_indexed
 from devito.tools import flatten, powerset, timed_region
@@ -1203,6 +1214,57 @@ class TestApplyArguments(object):
         # The h_x that was passed to the C code must be the one `grid2`, not `grid`
         assert u2.data[2, 2] == grid2.spacing[0]
 
+    def test_bind(self):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid, save=10)
+        c = Constant(name='c', value=1.)
+
+        op = Operator(Eq(u.forward, u + c))
+
+        handle = op.bind(time_M=3)
+        handle.run()
+        assert np.all(u.data[:, 5, 5] == [0, 1, 2, 3, 4, 0, 0, 0, 0, 0])
+
+        # Only the updated scalars change
+        handle.update(time_m=6, time_M=7)
+        assert handle.args['time_m'] == 6
+        assert handle.args['time_M'] == 7
+        assert handle.args['x_M'] == 10
+        handle.run()
+        assert np.all(u.data[:, 5, 5] == [0, 1, 2, 3, 4, 0, 0, 1, 2, 0])
+
+        # Going back to a previous value
+        handle.update(time_m=0)
+        handle.run()
+        assert np.all(u.data[:, 5, 5] == [0, 1, 2, 3, 4, 5, 6, 7, 8, 0])
+
+        # Non-scalar updates trigger a new binding
+        handle.update(c=2.)
+        handle.run()
+        assert np.all(u.data[:, 5, 5] == [0, 2, 4, 6, 8, 10, 12, 14, 16, 0])
+
+        # Out-of-bounds still detected
+        with pytest.raises(InvalidArgument):
+            handle.update(time_M=9)
+
+    def test_bind_vs_apply(self):
+        grid = Grid(shape=(11, 11))
+
+        u0 = TimeFunction(name='u', grid=grid, space_order=2)
+        u1 = TimeFunction(name='u', grid=grid, space_order=2)
+        u0.data[:, 4:7, 4:7] = 1.
+        u1.data[:, 4:7, 4:7] = 1.
+
+        op = Operator(Eq(u0.forward, u0.laplace + u0))
+
+        handle = op.bind(u=u1, time_M=0)
+        for i in range(4):
+            op.apply(u=u0, time_m=i, time_M=i)
+            handle.update(time_m=i, time_M=i)
+            handle.run()
+        assert np.all(u0.data == u1.data)
+
 
 @skipif('device')
 class TestDeclarator(object):
@@ -1875,3 +1937,264 @@ class TestLoopScheduling(object):
         assert tree[0].dim is time
         assert tree[1].dim is x
         assert tree[2].dim is y
+
+
+class TestJITCompilation(object):
+
+    def test_compile_async(self):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+
+        future = op.compile_async()
+        assert op.compile_async() is future
+
+        # `apply` waits on the pending compilation
+        op.apply(time_M=1)
+        assert future.done()
+        assert op._lib is not None
+        assert np.all(u.data[0] == 2.)
+
+    def test_compile_all(self):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        ops = [Operator(Eq(u.forward, u + i), name='op%d' % i) for i in range(3)]
+
+        compile_all(ops, workers=2)
+        assert all(op._compilation.done() for op in ops)
+
+        for i, op in enumerate(ops):
+            u.data[:] = 0.
+            op.apply(time_M=0)
+            assert np.all(u.data[1] == i)
+
+    def test_compile_async_error(self, jit_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+        op._compiler = op._compiler.__new_from__()
+        op._compiler.cflags += ['-Werror=some-unknown-warning']
+
+        future = op.compile_async()
+        with pytest.raises(CompileError):
+            future.result()
+        with pytest.raises(CompileError):
+            op.apply(time_M=0)
+
+    @pytest.fixture
+    def jit_cache_in_tmpdir(self, tmpdir):
+        jit_cache.path = str(tmpdir)
+        yield jit_cache
+        jit_cache.path = None
+        jit_cache.maxsize = None
+
+    def test_jit_cache(self, jit_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op0 = Operator(Eq(u.forward, u + 1))
+        op0.apply(time_M=0)
+        assert len(jit_cache.entries) == 1
+        nbytes = jit_cache.nbytes
+
+        # Same code, hence no recompilation
+        op1 = Operator(Eq(u.forward, u + 1))
+        assert op1._soname == op0._soname
+        assert op1._compiler.jit_compile(op1._soname, str(op1.ccode))[0] is False
+
+        # Eviction
+        jit_cache.maxsize = int(1.5*nbytes)
+        for i in range(2, 5):
+            Operator(Eq(u.forward, u + i)).apply(time_M=0)
+        assert len(jit_cache.entries) == 1
+
+        # Evicted entries leave no lock files behind, nor per-thread locks
+        assert len(list(jit_cache.path.glob('*.lock'))) == 1
+        assert len(jit_cache._thread_locks) == 0
+
+        # An evicted entry gets recompiled
+        op2 = Operator(Eq(u.forward, u + 1))
+        assert op2._compiler.jit_compile(op2._soname, str(op2.ccode))[0] is True
+        u.data[:] = 0.
+        op2.apply(time_M=0)
+        assert np.all(u.data[1] == 1.)
+
+    def test_jit_cache_evict_vs_load(self, jit_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op0 = Operator(Eq(u.forward, u + 1))
+        op0.apply(time_M=0)
+        jit_cache.maxsize = 1
+
+        # An entry being loaded by another process is never evicted
+        lockfile = jit_cache.path.joinpath(op0._soname).with_suffix('.lock')
+        script = ("import fcntl, sys\n"
+                  "f = open(sys.argv[1], 'a+')\n"
+                  "fcntl.lockf(f, fcntl.LOCK_SH)\n"
+                  "print('locked', flush=True)\n"
+                  "sys.stdin.read()\n")
+        proc = subprocess.Popen([sys.executable, '-c', script, str(lockfile)],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                universal_newlines=True)
+        try:
+            assert proc.stdout.readline().strip() == 'locked'
+            assert jit_cache.evict() == 0
+        finally:
+            proc.communicate()
+        assert len(jit_cache.entries) == 1
+
+        # An entry evicted in between compilation and loading gets recompiled
+        op1 = Operator(Eq(u.forward, u + 2))
+        op1._jit_compile()
+        jit_cache.evict()
+        assert len(jit_cache.entries) == 0
+        u.data[:] = 0.
+        op1.apply(time_M=0)
+        assert np.all(u.data[1] == 2.)
+        assert op1._soname in jit_cache.entries
+
+    def test_jit_cache_concurrent(self, jit_cache_in_tmpdir):
+        grid = Grid(shape=(4, 4))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        # Same `_soname`, so only one compilation actually takes place
+        ops = [Operator(Eq(u.forward, u + 1)) for _ in range(4)]
+        compile_all(ops, workers=4)
+
+        assert len(jit_cache.entries) == 1
+        for op in ops:
+            u.data[:] = 0.
+            op.apply(time_M=0)
+            assert np.all(u.data[1] == 1.)
+
+
+class TestPerfEventProfiling(object):
+
+    @pytest.fixture
+    def perf_events(self):
+        events = available_perf_events(tuple(PerfEventProfiler._events.items()))
+        if not events:
+            pytest.skip("perf_event unavailable")
+        return events
+
+    @pytest.mark.parametrize('openmp', [False, True])
+    @switchconfig(profiling='perf')
+    def test_counters(self, perf_events, openmp):
+        grid = Grid(shape=(16, 16, 16))
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+
+        op = Operator(Eq(u.forward, u.laplace + 1),
+                      opt=('advanced', {'openmp': openmp}))
+        assert 'counters' in [i.name for i in op.parameters]
+
+        summary = op.apply(time_M=4, **({'nthreads': 2} if openmp else {}))
+        assert np.all(u.data[1] != 0.)
+
+        entry = summary.counters[PerfKey('section0', None)]
+        assert list(entry.counters) == list(perf_events)
+        assert all(len(v) == (2 if openmp else 1) for v in entry.threads.values())
+        assert all(sum(v) == entry.counters[k] for k, v in entry.threads.items())
+        if 'task-clock' in entry.counters:
+            assert entry.counters['task-clock'] > 0
+
+        # Measured metrics are only derived from the available events
+        if 'llc-misses' not in perf_events:
+            assert entry.gbytess is None and entry.oi is None
+
+    def test_unavailable(self):
+        class BogusProfiler(PerfEventProfiler):
+            _events = OrderedDict([('bogus', (0xdead, 0))])
+
+        assert not BogusProfiler('timers').initialized
+
+
+class TestTraceProfiling(object):
+
+    @pytest.fixture
+    def trace_in_tmpdir(self, tmpdir):
+        path = configuration['profiling-trace']
+        configuration['profiling-trace'] = str(tmpdir.join('trace.json'))
+        timeline.clear()
+        yield configuration['profiling-trace']
+        configuration['profiling-trace'] = path
+        timeline.clear()
+
+    @switchconfig(profiling='trace')
+    def test_timeline(self, trace_in_tmpdir):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=1, nt=5)
+        rec = SparseTimeFunction(name='rec', grid=grid, npoint=1, nt=5)
+
+        op = Operator([Eq(u.forward, u.laplace + 1)] +
+                      src.inject(field=u.forward, expr=src) + rec.interpolate(u))
+
+        summary = op.apply(time_M=3)
+
+        # One event per Section per timestep, in order of execution
+        assert [(i.kind, i.timestep) for i in summary.timeline] == \
+            [(k, t) for t in range(4) for k in ('compute', 'injection', 'interpolation')]
+        assert all(i.begin <= i.end for i in summary.timeline)
+        assert all(i.end <= j.begin for i, j in zip(summary.timeline,
+                                                    summary.timeline[1:]))
+
+        # Runs accumulate in the timeline, which is written to file on request
+        op.apply(time_M=1)
+        assert not os.path.exists(trace_in_tmpdir)
+        timeline.dump()
+        with open(trace_in_tmpdir, 'r') as f:
+            trace = json.load(f)['traceEvents']
+        events = [i for i in trace if i['ph'] == 'X']
+        assert len(events) == 12 + 6
+        assert [i['args']['run'] for i in events] == [0]*12 + [1]*6
+
+    @switchconfig(profiling='trace')
+    def test_bind(self, trace_in_tmpdir):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+        tracer = op._profiler.tracer
+
+        # Each run of a bound Operator starts from an empty trace
+        handle = op.bind(time_M=3)
+        for _ in range(2):
+            summary = handle.run()
+            assert [i.timestep for i in summary.timeline] == [0, 1, 2, 3]
+
+        # Updating the scalar arguments doesn't set up the Objects again
+        buffers = tracer._buffers
+        handle.update(time_M=1)
+        assert tracer._buffers is buffers
+        summary = handle.run()
+        assert [i.timestep for i in summary.timeline] == [0, 1]
+        assert np.all(u.data[0] == 10.)
+
+    @switchconfig(profiling='trace')
+    def test_ring_buffer(self, trace_in_tmpdir, monkeypatch):
+        monkeypatch.setattr(TraceProfiler, '_capacity', 4)
+
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid)
+
+        op = Operator(Eq(u.forward, u + 1))
+
+        summary = op.apply(time_M=9)
+
+        # Only the most recent events are retained
+        assert [i.timestep for i in summary.timeline] == [6, 7, 8, 9]
+        assert np.all(u.data[0] == 10.)
@@ -81,6 +81,18 @@ def test_sparse_function():
     assert sf.npoint == new_sf.npoint
 
 
+def test_sparse_function_interpolation():
+    grid = Grid(shape=(11,))
+    sf = SparseFunction(name='sf', grid=grid, npoint=3, interpolation='sinc', r=3,
+                        coordinates=[(0.,), (0.5,), (1.,)])
+
+    new_sf = pickle.loads(pickle.dumps(sf))
+
+    assert new_sf.interpolation == 'sinc'
+    assert new_sf.r == 3
+    assert isinstance(new_sf.interpolator, type(sf.interpolator))
+
+
 def test_internal_symbols():
     s = dSymbol(name='s', dtype=np.float32)
     pkl_s = pickle.dumps(s)
@@ -1,6 +1,13 @@
+import os
+import pickle
+
 import numpy as np
+import pytest
 
-from devito import Buffer, Grid, Eq, Operator, TimeFunction, solve
+from devito import (Buffer, Compressed, ConditionalDimension, Disk, Grid, Eq,
+                    Function, Inc, Operator, TimeFunction, lowering_cache, solve,
+                    switchconfig)
+from devito.ir.iet import Conditional, FindNodes
 
 
 def initial(nt, nx, ny):
@@ -52,3 +59,216 @@ def test_buffer_api():
     assert u0._time_buffering
     assert not u1._time_buffering
     assert u2._time_buffering
+
+
+@pytest.mark.parametrize('tolerance', [0, 1e-3])
+def test_compressed(tolerance):
+    """
+    Tests that the slices of a TimeFunction with ``save=Compressed(...)``
+    are stored by the Operator computing it and then loaded by an Operator
+    reading it backward in time, as in a gradient computation.
+    """
+    nt = 12
+    grid = Grid(shape=(30, 30))
+    time = grid.time_dim
+    u0 = TimeFunction(name='u', grid=grid, save=nt, time_order=2, space_order=2)
+    u1 = TimeFunction(name='u', grid=grid, time_order=2, space_order=2,
+                      save=Compressed(nt, tolerance=tolerance))
+
+    assert u1.shape[TimeFunction._time_position] == 3
+    assert u1._time_buffering
+    assert u1.storage.nt == nt
+
+    for u in [u0, u1]:
+        u.data[:2] = initial(2, *grid.shape)
+        op = Operator(Eq(u.forward, 2*u - u.backward + 1e-5*u.laplace))
+        op.apply(time_M=nt-2, dt=1.)
+
+    mask = u1._mask_domain[1:]
+    for t in range(nt):
+        assert np.allclose(u1.storage.read(t)[mask], u0.data[t],
+                           rtol=0, atol=tolerance*(1 + 1e-6))
+    assert u1.storage.ratio > 1
+
+    # Read back the slices in reverse order
+    v0 = Function(name='v', grid=grid)
+    v1 = Function(name='v', grid=grid)
+    for u, v in [(u0, v0), (u1, v1)]:
+        op = Operator(Inc(v, time*(u.forward - u)))
+        op.apply(time_M=nt-2)
+
+    assert np.allclose(v0.data, v1.data, rtol=0, atol=2*nt**2*tolerance + 1e-6)
+
+
+def test_compressed_override():
+    """
+    Tests that the storage of the TimeFunction passed at `apply` time is used.
+    """
+    nt = 5
+    grid = Grid(shape=(4, 4))
+    u = TimeFunction(name='u', grid=grid, save=Compressed(nt))
+    u1 = TimeFunction(name='u', grid=grid, save=Compressed(nt))
+    u1.data[:] = 1.
+
+    op = Operator(Eq(u.forward, u + 1))
+    op.apply(time_M=nt-2)
+    op.apply(time_M=nt-2, u=u1)
+
+    assert np.all(u1.storage.read(nt-1)[u1._mask_domain[1:]] == nt)
+    assert np.all(u.storage.read(nt-1)[u._mask_domain[1:]] == nt-1)
+
+
+def test_disk(tmpdir):
+    """
+    Tests that the slices of a TimeFunction with ``save=Disk(...)`` are
+    written to file and then read back, in reverse order, with prefetching.
+    """
+    nt = 12
+    grid = Grid(shape=(30, 30))
+    time = grid.time_dim
+    u0 = TimeFunction(name='u', grid=grid, save=nt, time_order=2, space_order=2)
+    u1 = TimeFunction(name='u', grid=grid, time_order=2, space_order=2,
+                      save=Disk(str(tmpdir.join('u.bin')), nt))
+
+    # One more slot than with `save=None`, to prefetch into
+    assert u1.shape[TimeFunction._time_position] == 4
+
+    for u in [u0, u1]:
+        u.data[:2] = initial(2, *grid.shape)
+        op = Operator(Eq(u.forward, 2*u - u.backward + 1e-5*u.laplace))
+        op.apply(time_M=nt-2, dt=1.)
+
+    mask = u1._mask_domain[1:]
+    for t in range(nt):
+        assert np.all(u1.storage.read(t)[mask] == u0.data[t])
+
+    v0 = Function(name='v', grid=grid)
+    v1 = Function(name='v', grid=grid)
+    for u, v in [(u0, v0), (u1, v1)]:
+        op = Operator(Inc(v, time*(u.forward - u)))
+        op.apply(time_M=nt-2)
+
+    assert 'DPREFETCH' in str(op)
+    assert np.all(v0.data == v1.data)
+
+
+def test_storage_errors(tmpdir):
+    """
+    Tests that failing to transfer the time slices makes the Operator fail.
+    """
+    nt = 5
+    grid = Grid(shape=(4, 4))
+    path = str(tmpdir.join('u.bin'))
+    u = TimeFunction(name='u', grid=grid, save=Disk(path, nt))
+    v = TimeFunction(name='v', grid=grid, save=Compressed(nt))
+
+    # Writing to a read-only file
+    fd = os.open(path, os.O_RDONLY)
+    os.dup2(fd, u.storage.fd)
+    os.close(fd)
+    op = Operator(Eq(u.forward, u + 1))
+    with pytest.raises(OSError):
+        op.apply(time_M=nt-2)
+
+    # Decompressing a corrupted slice
+    Operator(Eq(v.forward, v + 1)).apply(time_M=nt-2)
+    v.storage.lengths[nt-1] //= 2
+    f = Function(name='f', grid=grid)
+    op = Operator(Inc(f, v))
+    with pytest.raises(RuntimeError):
+        op.apply(time_m=nt-1, time_M=nt-1)
+
+    # The error is reported only once
+    op.apply(time_m=nt-2, time_M=nt-2)
+
+
+@switchconfig(lowering_cache=True)
+def test_disk_pickling(tmpdir):
+    """
+    Tests that unpickling a TimeFunction with ``save=Disk(...)``, either
+    explicitly or through the lowering-cache, doesn't lose the stored slices.
+    """
+    path = lowering_cache.path
+    lowering_cache.path = str(tmpdir.mkdir('lowcache'))
+
+    try:
+        nt = 6
+        grid = Grid(shape=(8, 8))
+        u = TimeFunction(name='u', grid=grid,
+                         save=Disk(str(tmpdir.join('u.bin')), nt))
+        mask = u._mask_domain[1:]
+
+        Operator(Eq(u.forward, u + 1)).apply(time_M=nt-2)
+        assert np.all(u.storage.read(nt-2)[mask] == nt-2)
+
+        u1 = pickle.loads(pickle.dumps(u))
+        assert u1.storage is u.storage
+        assert np.all(u.storage.read(nt-2)[mask] == nt-2)
+
+        v = Function(name='v', grid=grid)
+        for _ in range(2):
+            Operator(Inc(v, u))
+            assert np.all(u.storage.read(nt-2)[mask] == nt-2)
+
+        # Upon a lowering-cache hit, the Operator uses the slices of the
+        # TimeFunction it's built for
+        w = TimeFunction(name='u', grid=grid,
+                         save=Disk(str(tmpdir.join('w.bin')), nt))
+        hits = lowering_cache.hits
+        Operator(Eq(w.forward, w + 1)).apply(time_M=nt-2)
+        assert lowering_cache.hits == hits + 1
+        assert np.all(w.storage.read(nt-2)[mask] == nt-2)
+        assert np.all(u.storage.read(nt-2)[mask] == nt-2)
+    finally:
+        lowering_cache.path = path
+
+
+@pytest.mark.parametrize('storage', ['disk', 'compressed'])
+def test_snapshots(storage, tmpdir):
+    """
+    Tests storing subsampled snapshots, and reading them back in a gradient-like
+    Operator running backward in time.
+    """
+    nt = 21
+    factor = 4
+    nsnaps = (nt + factor - 1) // factor
+    grid = Grid(shape=(20, 20), extent=(19., 19.))
+    time_sub = ConditionalDimension('t_sub', parent=grid.time_dim, factor=factor)
+    save = {'disk': Disk(str(tmpdir.join('usave.bin')), nsnaps),
+            'compressed': Compressed(nsnaps)}[storage]
+
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=2)
+    w = TimeFunction(name='w', grid=grid, time_order=2, space_order=2)
+    usave0 = TimeFunction(name='usave', grid=grid, time_order=0, save=nsnaps,
+                          time_dim=time_sub)
+    usave1 = TimeFunction(name='usave', grid=grid, time_order=0, save=save,
+                          time_dim=time_sub)
+
+    grads = []
+    for usave in [usave0, usave1]:
+        u.data[:] = 0.
+        u.data[:2, 8:12, 8:12] = 1.
+        op = Operator([Eq(u.forward, 2*u - u.backward + 0.1*u.laplace),
+                       Eq(usave, u)])
+        op.apply(time_M=nt-2)
+
+        # A slot is waited on only at the time steps in which it's overwritten
+        if usave is usave1 and storage == 'disk':
+            conds = [c for c in FindNodes(Conditional).visit(op)
+                     if 'DWAIT' in str(c)]
+            assert len(conds) == 1
+            assert 'DSTORE' not in str(conds[0])
+
+        grad = Function(name='grad', grid=grid)
+        w.data[:] = 0.
+        w.data[:, 3:5, 3:5] = 1.
+        op = Operator([Eq(w.backward, 2*w - w.forward + 0.1*w.laplace),
+                       Inc(grad, usave*w, implicit_dims=time_sub)])
+        op.apply(time_M=nt-2)
+        grads.append(grad.data.copy())
+
+    mask = usave1._mask_domain[1:]
+    for t in range(nsnaps):
+        assert np.all(usave1.storage.read(t)[mask] == usave0.data[t])
+    assert np.all(grads[0] == grads[1])
+    assert np.any(grads[1] != 0)
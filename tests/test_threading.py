@@ -1,6 +1,9 @@
+import sys
 from concurrent.futures import ThreadPoolExecutor
-from devito import Operator, TimeFunction, Grid, Eq
+from devito import (Operator, Function, TimeFunction, SparseTimeFunction, Grid, Eq,
+                    clear_cache)
 from devito.logger import info
+from devito.types import Scalar
 import numpy as np
 from threading import current_thread
 
@@ -46,3 +49,56 @@ def test_concurrent_executing_operators():
     # Get results - exceptions will be raised here if there are any
     for f in futures:
         f.result()
+
+
+def test_concurrent_building_operators():
+    def build(i):
+        grid = Grid(shape=(10 + i, 12))
+        u = TimeFunction(name='u', grid=grid, space_order=2*(1 + i % 3))
+        f = Function(name='f', grid=grid)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=1 + i % 4, nt=5)
+        eqns = [Eq(u.forward, u.laplace*f + i)] + src.inject(u.forward, src)
+        return str(Operator(eqns, name='Op%d' % i))
+
+    nops = 8
+    expected = [build(i) for i in range(nops)]
+
+    # Switch threads as often as possible, so as to maximize the chances that
+    # they query the same SymPy objects at once
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=nops) as tpe:
+            for _ in range(3):
+                # Also clear the caches while the Operators are being built
+                futures = [tpe.submit(clear_cache)]
+                futures.extend(tpe.submit(build, i) for i in range(nops))
+                futures[0].result()
+
+                # Exceptions will be raised here if there are any
+                assert [f.result() for f in futures[1:]] == expected
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_concurrent_assumptions():
+    grid = Grid(shape=(4, 4))
+    x, y = grid.dimensions
+
+    def query(objs):
+        return [(hash(i), i >= 0, i.is_extended_positive, i.is_integer) for i in objs]
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as tpe:
+            for n in range(10):
+                # Devito caches, and thus shares, the same objects across threads
+                objs = [Scalar(name='s%d_%d' % (n, i)) for i in range(300)]
+                objs.extend(Function(name='f%d_%d' % (n, i), grid=grid)
+                            for i in range(20))
+
+                results = list(tpe.map(query, [objs]*8))
+                assert all(i == results[0] for i in results)
+    finally:
+        sys.setswitchinterval(interval)